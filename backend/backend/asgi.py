@@ -0,0 +1,25 @@
+"""
+Модуль конфігурації ASGI для проєкту Tracker Books.
+
+Він експортує об'єкт `application` рівня модуля як змінну з назвою `application`.
+ASGI (Asynchronous Server Gateway Interface) дозволяє одному процесу
+обслуговувати багато одночасних запитів: асинхронні представлення (зовнішній
+пошук книг) не блокують воркер під час очікування відповіді Google Books.
+
+Документація Django щодо цього файлу:
+https://docs.djangoproject.com/en/stable/howto/deployment/asgi/
+"""
+import os
+
+from django.core.asgi import get_asgi_application
+
+# Встановлення змінної оточення для налаштувань Django за замовчуванням.
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
+
+#: Об'єкт ASGI-застосунку, що використовується серверами (uvicorn) для обробки запитів.
+application = get_asgi_application()
+
+# Покоління кешу мають бути спільними для воркерів: без DEBUG кеш у пам'яті процесу заборонено
+from tracker.cache import require_shared_cache  # noqa: E402
+
+require_shared_cache()
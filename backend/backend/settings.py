@@ -95,6 +95,9 @@ TEMPLATES = [
 
 WSGI_APPLICATION = "backend.wsgi.application"
 
+#: Точка входу ASGI (Procfile: gunicorn з воркерами uvicorn).
+ASGI_APPLICATION = "backend.asgi.application"
+
 
 # --- БАЗА ДАНИХ ---
 
@@ -107,6 +110,65 @@ DATABASES = {
 }
 
 
+# --- КЕШУВАННЯ ---
+
+#: Бекенд кешу. Локально — пам'ять процесу (`locmem`) або файли (`filebased`),
+#: у продакшені — спільний бекенд (Redis або `DatabaseCache`), заданий через
+#: змінні оточення. Без `DEBUG` застосунок не запускається з `locmem`
+#: (`tracker.cache.require_shared_cache`): покоління кешу мають бути спільними для воркерів.
+CACHES = {
+    "default": {
+        "BACKEND": os.getenv(
+            "CACHE_BACKEND", "django.core.cache.backends.locmem.LocMemCache"
+        ),
+        "LOCATION": os.getenv("CACHE_LOCATION", "tracker-books"),
+    }
+}
+
+#: Час життя кешованих відповідей користувача (секунди). Актуальність даних
+#: забезпечує інвалідація за поколіннями, тому час життя може бути тривалим.
+TRACKER_CACHE_TIMEOUT = int(os.getenv("TRACKER_CACHE_TIMEOUT", 3600))
+
+#: Строк зберігання журналу видалень для дельта-синхронізації (дні). Клієнти
+#: зі старшим маркером отримують повний знімок бібліотеки.
+TRACKER_TOMBSTONE_RETENTION_DAYS = int(os.getenv("TRACKER_TOMBSTONE_RETENTION_DAYS", 90))
+
+#: Вік сесій читання (дні), після якого вони ущільнюються до однієї сесії на
+#: книгу за день (`python manage.py compact_sessions`).
+TRACKER_SESSION_COMPACTION_DAYS = int(os.getenv("TRACKER_SESSION_COMPACTION_DAYS", 90))
+
+#: Інтервал (години) автоматичного ущільнення сесій після запитів; 0 — вимкнено
+#: (ущільнення запускається командою, наприклад, з планувальника).
+TRACKER_SESSION_COMPACTION_INTERVAL_HOURS = float(os.getenv("TRACKER_SESSION_COMPACTION_INTERVAL_HOURS", 0))
+
+#: Кеш результатів Google Books у пам'яті процесу: час свіжості запису
+#: (секунди), додатковий час, протягом якого застарілий запис віддається з
+#: фоновим оновленням (секунди), та максимальна кількість записів (LRU).
+TRACKER_SEARCH_CACHE_TTL = int(os.getenv("TRACKER_SEARCH_CACHE_TTL", 600))
+TRACKER_SEARCH_CACHE_STALE = int(os.getenv("TRACKER_SEARCH_CACHE_STALE", 3600))
+TRACKER_SEARCH_CACHE_SIZE = int(os.getenv("TRACKER_SEARCH_CACHE_SIZE", 1000))
+
+#: Найбільша кількість одночасних фонових завантажень наступної сторінки
+#: пошуку в процесі (0 вимикає попереднє завантаження).
+TRACKER_SEARCH_PREFETCH_CONCURRENCY = int(os.getenv("TRACKER_SEARCH_PREFETCH_CONCURRENCY", 4))
+
+#: Час свіжості запиту в спільному каталозі книг у БД (секунди); старіші
+#: запити оновлюються з Google, а при його недоступності віддаються як є.
+TRACKER_CATALOG_TTL = int(os.getenv("TRACKER_CATALOG_TTL", 7 * 24 * 3600))
+
+#: Клієнт Google Books: тайм-аут читання однієї спроби (секунди), кількість
+#: повторів після збою, загальний ліміт часу запиту з повторами (секунди),
+#: кількість невдалих спроб поспіль, що розмикає запобіжник, і час до пробної
+#: спроби після розмикання (секунди), найбільша кількість одночасних з'єднань
+#: із Google на воркер.
+TRACKER_GOOGLE_BOOKS_TIMEOUT = float(os.getenv("TRACKER_GOOGLE_BOOKS_TIMEOUT", 4))
+TRACKER_GOOGLE_BOOKS_RETRIES = int(os.getenv("TRACKER_GOOGLE_BOOKS_RETRIES", 2))
+TRACKER_GOOGLE_BOOKS_DEADLINE = float(os.getenv("TRACKER_GOOGLE_BOOKS_DEADLINE", 6))
+TRACKER_GOOGLE_BOOKS_BREAKER_THRESHOLD = int(os.getenv("TRACKER_GOOGLE_BOOKS_BREAKER_THRESHOLD", 5))
+TRACKER_GOOGLE_BOOKS_BREAKER_RESET = float(os.getenv("TRACKER_GOOGLE_BOOKS_BREAKER_RESET", 30))
+TRACKER_GOOGLE_BOOKS_MAX_CONNECTIONS = int(os.getenv("TRACKER_GOOGLE_BOOKS_MAX_CONNECTIONS", 100))
+
+
 # --- ПОЛІТИКА ПАРОЛІВ ---
 
 #: Список валідаторів складності паролів. Включає вбудовані правила
@@ -161,7 +223,7 @@ REST_FRAMEWORK = {
         "rest_framework.renderers.JSONRenderer",
         "rest_framework.renderers.BrowsableAPIRenderer",  # МАЄ БУТИ ТУТ
     ),
-    "DEFAULT_PAGINATION_CLASS": "rest_framework.pagination.PageNumberPagination",
+    "DEFAULT_PAGINATION_CLASS": "tracker.pagination.KeysetPagination",
     "PAGE_SIZE": 20,
 }
 
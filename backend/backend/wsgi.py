@@ -16,4 +16,9 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'backend.settings')
 
 #: Об'єкт WSGI-застосунку, що використовується серверами для обробки запитів.
-application = get_wsgi_application()
\ No newline at end of file
+application = get_wsgi_application()
+
+# Покоління кешу мають бути спільними для воркерів: без DEBUG кеш у пам'яті процесу заборонено
+from tracker.cache import require_shared_cache  # noqa: E402
+
+require_shared_cache()
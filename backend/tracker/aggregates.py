@@ -0,0 +1,86 @@
+"""
+Модуль однопрохідних агрегатних запитів для статистики бібліотеки.
+
+Замість окремого `.count()` на кожен статус, прапорець "улюблене" чи "додано
+вручну" всі скалярні показники обчислюються умовними агрегатами
+(`Count(filter=...)`, `Sum(filter=...)`) за одне сканування таблиці:
+
+- `book_aggregates` — один запит до `tracker_book`;
+- `session_aggregates` — один запит до `tracker_readingsession`.
+
+Модуль використовується як ендпоінтом категорій (`get_stats`), так і
+перерахунком матеріалізованої статистики (`tracker.stats`).
+"""
+
+from django.db.models import Count, Q, Sum
+from django.db.models.functions import Coalesce
+
+from .models import Book, ReadingSession
+
+#: Умова "книга прочитана", спільна для агрегатів прочитаних книг.
+READ = Q(status="read")
+
+
+def book_aggregates(user):
+    """Обчислює всі скалярні показники книг користувача одним запитом.
+
+    Args:
+        user (User): Власник бібліотеки.
+
+    Returns:
+        dict: Лічильники книг за статусами та прапорцями, а також суми
+        сторінок і оцінок прочитаних книг (ключі збігаються з полями
+        `UserReadingStats`).
+    """
+    return Book.objects.filter(user=user).aggregate(
+        total_books=Count("id"),
+        reading_count=Count("id", filter=Q(status="reading")),
+        read_count=Count("id", filter=READ),
+        want_count=Count("id", filter=Q(status="want-to-read")),
+        favorite_count=Count("id", filter=Q(isFavorite=True)),
+        custom_count=Count("id", filter=Q(isCustom=True)),
+        read_pages_total=Coalesce(Sum("totalPages", filter=READ), 0),
+        read_pages_books=Count("totalPages", filter=READ),
+        rating_total=Coalesce(Sum("rating", filter=READ), 0),
+        rating_count=Count("rating", filter=READ),
+    )
+
+
+def session_aggregates(user):
+    """Обчислює всі скалярні показники сесій читання одним запитом.
+
+    Args:
+        user (User): Власник бібліотеки.
+
+    Returns:
+        dict: Кількість сесій, сумарна тривалість, кількість сесій із
+        заповненою тривалістю та кількість книг, що мають такі сесії.
+    """
+    return ReadingSession.objects.filter(book__user=user).aggregate(
+        session_count=Count("id"),
+        session_duration_total=Coalesce(Sum("duration"), 0),
+        session_duration_count=Count("duration"),
+        books_with_sessions=Count(
+            "book", distinct=True, filter=Q(duration__isnull=False)
+        ),
+    )
+
+
+def category_counts(user):
+    """Повертає кількість книг за категоріями бібліотеки (вкладки головної сторінки).
+
+    Args:
+        user (User): Власник бібліотеки.
+
+    Returns:
+        dict: Ключі `all`, `reading`, `read`, `want`, `fav`, `customCount`.
+    """
+    totals = book_aggregates(user)
+    return {
+        "all": totals["total_books"],
+        "reading": totals["reading_count"],
+        "read": totals["read_count"],
+        "want": totals["want_count"],
+        "fav": totals["favorite_count"],
+        "customCount": totals["custom_count"],
+    }
@@ -33,6 +33,10 @@ class TrackerConfig(AppConfig):
         """
         Метод, що викликається після повної реєстрації застосунку.
 
-        Використовується для виконання ініціалізаційних дій.
+        Використовується для виконання ініціалізаційних дій, зокрема
+        підключення обробників сигналів матеріалізованої статистики,
+        щоденних зведень, пошукових індексів, журналу видалень та інвалідації кешу.
         """
+        from . import cache, compaction, rollups, search, stats, sync, trigrams  # noqa: F401
+
         logger.info("Application 'tracker' is initialized and ready.")
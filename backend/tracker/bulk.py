@@ -0,0 +1,125 @@
+"""
+Модуль масових операцій над книгами (створення, оновлення, видалення).
+
+Звичайне збереження книги — це окремий `Book.save` з читанням попереднього
+стану, правилами життєвого циклу, можливою автоматичною сесією та набором
+обробників `post_save` (статистика, зведення, кеш, пошукові індекси). Для
+пакета з сотень книг це сотні запитів.
+
+`apply_bulk` виконує пакет інакше:
+
+1. Попередні стани оновлюваних книг читаються одним запитом.
+2. Правила життєвого циклу (`Book.apply_lifecycle_rules`) застосовуються
+   в одному проході по всіх книгах без звернень до БД.
+3. Нові книги записуються `bulk_create`, змінені — `bulk_update`,
+   автоматичні сесії читання — одним `bulk_create`.
+4. Замість `post_save` для кожного об'єкта надсилається один сигнал
+   `books_bulk_saved`; модулі статистики, зведень, кешу та пошукових
+   індексів обробляють увесь пакет кількома запитами.
+
+Видалення виконується одним `QuerySet.delete()`, тобто зі звичайними
+сигналами видалення (каскад сесій, нотаток, цитат і журнал видалень).
+"""
+
+import copy
+
+from django.db import transaction
+from django.dispatch import Signal
+from django.utils import timezone
+
+from .models import Book, ReadingCycle, ReadingSession
+
+#: Сигнал масового збереження книг. Аргументи:
+#: `user_id` (int), `created` (list[Book]), `updated` (list[tuple[Book, Book]] —
+#: пари `(попередній стан, новий стан)`), `sessions` (list[ReadingSession] —
+#: створені сесії читання) та `cycles` (list[ReadingCycle] — створені цикли).
+books_bulk_saved = Signal()
+
+#: Поля, що записуються `bulk_update` (усі змінювані поля книги).
+UPDATE_FIELDS = [
+    field.name
+    for field in Book._meta.concrete_fields
+    if not field.primary_key and field.name not in ("user", "addedDate")
+]
+
+
+def apply_bulk(user, creates=(), updates=(), delete_ids=(), history=None):
+    """Застосовує пакет змін до книг користувача в одній транзакції.
+
+    Args:
+        user (User): Власник книг.
+        creates (Iterable[dict]): Валідовані дані нових книг.
+        updates (Iterable[tuple[Book, dict]]): Пари `(книга, валідовані зміни)`;
+            книги мають бути завантажені з БД і належати користувачу.
+        delete_ids (Iterable[int]): Ідентифікатори книг для видалення.
+        history (list[dict], optional): Історія читання для кожної нової книги
+            (у порядку `creates`): `sessions` — дані сесій (`date`, `pages_read`,
+            `duration`, `note`), `cycles` — дані циклів (`start_date`,
+            `end_date`). Якщо передано, автоматичні сесії для нових книг не
+            створюються — їх замінює історія (імпорт з інших трекерів).
+
+    Returns:
+        tuple: `(created, updated, deleted)` — створені та оновлені книги і
+        кількість видалених книг.
+    """
+    today = timezone.now().date()
+    now = timezone.now()
+
+    created = [Book(user=user, **data) for data in creates]
+    pairs = []
+    for book, changes in updates:
+        previous = copy.copy(book)
+        for field, value in changes.items():
+            setattr(book, field, value)
+        pairs.append((previous, book))
+
+    # Попередній прохід: правила життєвого циклу та сторінки для автоматичних сесій
+    pages = []
+    for book in created:
+        book.apply_lifecycle_rules(today)
+        if history is None:
+            pages.append((book, book.currentPage))
+    for previous, book in pairs:
+        book.apply_lifecycle_rules(today)
+        book.updatedAt = now
+        pages.append((book, book.currentPage - previous.currentPage))
+
+    with transaction.atomic():
+        deleted = 0
+        if delete_ids:
+            deleted = Book.objects.filter(user=user, pk__in=list(delete_ids)).delete()[1].get(
+                Book._meta.label, 0
+            )
+        if created:
+            Book.objects.bulk_create(created)
+        if pairs:
+            Book.objects.bulk_update([book for _, book in pairs], UPDATE_FIELDS, batch_size=200)
+
+        sessions = [ReadingSession(book=book, pages_read=delta, duration=0) for book, delta in pages if delta > 0]
+        cycles = []
+        dated = []
+        for book, entry in zip(created, history or ()):
+            for data in entry.get("sessions", ()):
+                session = ReadingSession(book=book, **data)
+                sessions.append(session)
+                if data.get("date"):
+                    dated.append((session, data["date"]))
+            cycles.extend(ReadingCycle(book=book, **data) for data in entry.get("cycles", ()))
+
+        ReadingSession.objects.bulk_create(sessions, batch_size=500)
+        if dated:
+            # `date` має `auto_now_add`, тому історичні дати записуються окремо
+            for session, date in dated:
+                session.date = date
+            ReadingSession.objects.bulk_update([session for session, _ in dated], ["date"], batch_size=200)
+        ReadingCycle.objects.bulk_create(cycles, batch_size=500)
+
+        # Записані значення стають знімком відстеження змін (`TrackedFieldsMixin`)
+        for instance in [*created, *(book for _, book in pairs), *sessions]:
+            instance.mark_clean()
+
+        books_bulk_saved.send(
+            sender=Book, user_id=user.pk, created=created, updated=pairs, sessions=sessions, cycles=cycles
+        )
+
+    return created, [book for _, book in pairs], deleted
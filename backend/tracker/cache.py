@@ -0,0 +1,238 @@
+"""
+Модуль версіонованого кешу відповідей на рівні користувача.
+
+Кеш побудований на стандартному фреймворку кешування Django, тому працює
+з будь-яким бекендом (`locmem`/`file` локально, спільний Redis/Memcached у
+продакшені). Інвалідація реалізована через **покоління (generation)**:
+
+1. Для кожного користувача в кеші зберігається номер покоління.
+2. Ключі кешованих відповідей містять поточне покоління користувача.
+3. Будь-яке збереження чи видалення книги, сесії, нотатки, цитати або циклу
+   читання збільшує покоління — старі ключі просто перестають використовуватися
+   і з часом витісняються бекендом. Сканувати чи видаляти ключі не потрібно.
+
+Покоління базується на часі (наносекунди), тому після витіснення чи втрати
+лічильника нове значення не збігається з жодним із попередніх.
+
+Покоління мають бути спільними для всіх воркерів: з `LocMemCache` воркер, що
+не обробляв зміну, віддавав би застарілі відповіді до кінця
+`TRACKER_CACHE_TIMEOUT`. Тому без `DEBUG` застосунок не запускається з
+кешем у пам'яті процесу (`require_shared_cache`).
+"""
+
+import hashlib
+import logging
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache, caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .bulk import books_bulk_saved
+from .compaction import sessions_compacted
+from .models import Book, Note, Quote, ReadingCycle, ReadingSession, User
+
+logger = logging.getLogger("tracker")
+
+#: Префікс усіх ключів кешу застосунку.
+KEY_PREFIX = "tracker"
+
+# Позначка відсутності значення в кеші (None може бути валідним значенням).
+_MISSING = object()
+
+# Книги, що видаляються в поточному потоці, та їхні власники: дозволяє
+# визначити користувача для каскадно видалених сесій і циклів без запитів до БД.
+_deletion_state = threading.local()
+
+
+def _generation_key(user_id, scope=None):
+    key = f"{KEY_PREFIX}:gen:{user_id}"
+    return f"{key}:{scope}" if scope else key
+
+
+def _timeout():
+    return getattr(settings, "TRACKER_CACHE_TIMEOUT", 3600)
+
+
+def get_generation(user_id, scope=None):
+    """Повертає поточне покоління кешу користувача, ініціалізуючи його за потреби.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        scope (str, optional): Окрема область інвалідації (наприклад, історія
+            зведень). За замовчуванням — загальне покоління користувача.
+
+    Returns:
+        int: Номер покоління.
+    """
+    key = _generation_key(user_id, scope)
+    generation = cache.get(key)
+    if generation is None:
+        cache.add(key, time.time_ns(), timeout=None)
+        generation = cache.get(key)
+    return generation
+
+
+def bump_generation(user_id, scope=None):
+    """Інвалідує всі кешовані відповіді користувача, збільшуючи його покоління.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        scope (str, optional): Область інвалідації (див. `get_generation`).
+
+    Returns:
+        int: Нове покоління.
+    """
+    key = _generation_key(user_id, scope)
+    generation = max(time.time_ns(), (cache.get(key) or 0) + 1)
+    cache.set(key, generation, timeout=None)
+    return generation
+
+
+def make_key(user_id, name, params=None, generation=None):
+    """Формує ключ кешу для відповіді користувача.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        name (str): Назва кешованого ресурсу (наприклад, 'stats').
+        params (Mapping, optional): Параметри запиту, від яких залежить відповідь.
+        generation (int, optional): Покоління (за замовчуванням — поточне).
+
+    Returns:
+        str: Ключ кешу.
+    """
+    if generation is None:
+        generation = get_generation(user_id)
+    key = f"{KEY_PREFIX}:{user_id}:{generation}:{name}"
+    if params:
+        items = sorted((str(k), str(v)) for k, v in params.items())
+        digest = hashlib.md5(repr(items).encode(), usedforsecurity=False).hexdigest()
+        key = f"{key}:{digest}"
+    return key
+
+
+def cached_payload(user_id, name, builder, params=None, timeout=None):
+    """Повертає відповідь із кешу або обчислює та кешує її.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        name (str): Назва кешованого ресурсу.
+        builder (callable): Функція без аргументів, що обчислює відповідь.
+        params (Mapping, optional): Параметри запиту, що входять до ключа.
+        timeout (int, optional): Час життя запису (за замовчуванням
+            `settings.TRACKER_CACHE_TIMEOUT`).
+
+    Returns:
+        Any: Закешована або щойно обчислена відповідь.
+    """
+    key = make_key(user_id, name, params)
+    payload = cache.get(key, _MISSING)
+    if payload is _MISSING:
+        payload = builder()
+        cache.set(key, payload, timeout if timeout is not None else _timeout())
+    else:
+        logger.debug(f"Cache hit: {name} for user {user_id}")
+    return payload
+
+
+def invalidate_user(user_id):
+    """Інвалідує кеш користувача зараз і ще раз після фіксації транзакції.
+
+    Повторне збільшення покоління після `COMMIT` закриває вікно, у якому
+    паралельний запит міг прочитати ще не зафіксовані дані та покласти їх
+    у кеш під новим поколінням.
+
+    Args:
+        user_id (int | None): Ідентифікатор користувача.
+    """
+    if user_id is None:
+        return
+    bump_generation(user_id)
+    transaction.on_commit(lambda: bump_generation(user_id))
+
+
+def require_shared_cache():
+    """Перевіряє, що без `DEBUG` кеш спільний для всіх процесів.
+
+    Викликається під час запуску застосунку (`backend.asgi`, `backend.wsgi`).
+
+    Raises:
+        ImproperlyConfigured: `DEBUG` вимкнено, а кеш — `LocMemCache`.
+    """
+    if not settings.DEBUG and isinstance(caches["default"], LocMemCache):
+        raise ImproperlyConfigured(
+            "LocMemCache is per-process: set CACHE_BACKEND to a shared cache "
+            "(Redis or DatabaseCache) when DEBUG is off."
+        )
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ ---
+
+
+def _deleting_books():
+    if not hasattr(_deletion_state, "books"):
+        _deletion_state.books = {}
+    return _deletion_state.books
+
+
+def _owner_id(instance):
+    """Визначає користувача, якому належить об'єкт бібліотеки."""
+    if isinstance(instance, User):
+        return instance.pk
+    if isinstance(instance, (Book, Note, Quote)):
+        return instance.user_id
+
+    # Сесії та цикли читання прив'язані до користувача через книгу
+    if type(instance).book.is_cached(instance):
+        return instance.book.user_id
+    if instance.book_id in _deleting_books():
+        return _deleting_books()[instance.book_id]
+    return (
+        Book.objects.filter(pk=instance.book_id).values_list("user_id", flat=True).first()
+    )
+
+
+@receiver(pre_delete, sender=Book)
+def remember_deleted_book(sender, instance, **kwargs):
+    """Запам'ятовує власника книги перед каскадним видаленням її сесій."""
+    _deleting_books()[instance.pk] = instance.user_id
+
+
+@receiver(post_save, sender=User)
+@receiver(post_save, sender=Book)
+@receiver(post_save, sender=ReadingSession)
+@receiver(post_save, sender=Note)
+@receiver(post_save, sender=Quote)
+@receiver(post_save, sender=ReadingCycle)
+def invalidate_on_save(sender, instance, **kwargs):
+    """Інвалідує кеш власника при створенні або зміні об'єкта."""
+    invalidate_user(_owner_id(instance))
+
+
+@receiver(post_delete, sender=Book)
+@receiver(post_delete, sender=ReadingSession)
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Quote)
+@receiver(post_delete, sender=ReadingCycle)
+def invalidate_on_delete(sender, instance, **kwargs):
+    """Інвалідує кеш власника при видаленні об'єкта."""
+    if sender is Book:
+        _deleting_books().pop(instance.pk, None)
+        invalidate_user(instance.user_id)
+    elif instance.book_id in _deleting_books():
+        # Кеш буде інвалідовано один раз при видаленні самої книги
+        return
+    else:
+        invalidate_user(_owner_id(instance))
+
+
+@receiver(books_bulk_saved)
+@receiver(sessions_compacted)
+def invalidate_on_bulk_save(sender, user_id, **kwargs):
+    """Інвалідує кеш власника один раз на весь пакет масових змін."""
+    invalidate_user(user_id)
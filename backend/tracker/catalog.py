@@ -0,0 +1,250 @@
+"""
+Модуль спільного локального каталогу книг Google Books.
+
+Кеш пошуку (`tracker.external_search.search_cache`) живе в пам'яті процесу:
+після перезапуску воркера чи витіснення запису запит знову йде до Google, а
+кожен воркер наповнює свій кеш окремо. Каталог зберігає відформатовані
+результати в БД, спільно для всіх процесів і користувачів:
+
+* `CatalogVolume` — один рядок на видання; дублікати об'єднуються за Google
+  ID та ISBN-13 (різні томи Google з однаковим ISBN стають одним записом);
+* `CatalogQuery` — упорядкований список томів для нормалізованого ключа
+  запиту, тож повторний пошук — це два індексовані запити до БД;
+* запис свіжий `TRACKER_CATALOG_TTL` секунд; для застарілого або відсутнього
+  запису виконується запит до Google, а результат оновлює каталог. Якщо
+  Google недоступний, повертається застарілий запис каталогу.
+
+Каталог стоїть за кешем у пам'яті: до БД звертаються лише промахи та фонові
+оновлення кешу процесу. Книги бібліотеки посилаються на том каталогу
+(`Book.catalog`), з якого їх додано.
+"""
+
+import datetime
+import hashlib
+import json
+import logging
+import re
+import threading
+
+import httpx
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import DatabaseError, IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import CatalogQuery, CatalogVolume
+
+logger = logging.getLogger("tracker")
+
+#: Поля тому, що копіюються з відформатованого результату пошуку.
+VOLUME_FIELDS = (
+    "title",
+    "author",
+    "genre",
+    "language",
+    "year",
+    "pages",
+    "description",
+    "cover",
+    "externalRating",
+    "ratingsCount",
+)
+
+
+def catalog_ttl():
+    """Час свіжості запису каталогу (`TRACKER_CATALOG_TTL`, за замовчуванням 7 днів)."""
+    return datetime.timedelta(seconds=getattr(settings, "TRACKER_CATALOG_TTL", 7 * 24 * 3600))
+
+
+def normalize_isbn(value):
+    """Повертає ISBN-13 без дефісів; ISBN-10 перетворюється, некоректні значення — `None`."""
+    value = re.sub(r"[\s-]", "", str(value or "")).upper()
+    if re.fullmatch(r"\d{13}", value):
+        return value
+    if re.fullmatch(r"\d{9}[\dX]", value):
+        digits = "978" + value[:9]
+        check = (10 - sum(int(digit) * (3 if index % 2 else 1) for index, digit in enumerate(digits)) % 10) % 10
+        return f"{digits}{check}"
+    return None
+
+
+def isbn_from_identifiers(identifiers):
+    """ISBN-13 тому з `volumeInfo.industryIdentifiers` (ISBN_13 має перевагу над ISBN_10)."""
+    values = {item.get("type"): item.get("identifier") for item in identifiers or ()}
+    return normalize_isbn(values.get("ISBN_13")) or normalize_isbn(values.get("ISBN_10"))
+
+
+def query_digest(key):
+    """SHA-256 ключа запиту з `make_key` (ключ `CatalogQuery`)."""
+    return hashlib.sha256(json.dumps(list(key), ensure_ascii=False).encode()).hexdigest()
+
+
+def as_search_result(volume):
+    """Том каталогу у форматі результату `/api/search/external/`."""
+    return {
+        "id": volume.googleId,
+        "catalogId": volume.pk,
+        "isbn": volume.isbn,
+        **{field: getattr(volume, field) for field in VOLUME_FIELDS},
+        "isCustom": False,
+        "isFavorite": False,
+    }
+
+
+def lookup(key):
+    """Результат запиту з каталогу.
+
+    Args:
+        key (tuple): Ключ із `make_key`.
+
+    Returns:
+        tuple: `(результати, свіжий)`; для відсутнього запиту — `(None, False)`.
+    """
+    entry = CatalogQuery.objects.filter(key=query_digest(key)).first()
+    if entry is None:
+        return None, False
+    volumes = CatalogVolume.objects.in_bulk(entry.volumes)
+    results = [as_search_result(volumes[pk]) for pk in entry.volumes if pk in volumes]
+    return results, timezone.now() - entry.fetchedAt < catalog_ttl()
+
+
+def _upsert_volumes(results, now):
+    """Створює або оновлює томи результатів; повертає їх у порядку Google без дублікатів."""
+    google_ids = [result["id"] for result in results]
+    isbns = [result["isbn"] for result in results if result.get("isbn")]
+    by_google, by_isbn = {}, {}
+    for volume in CatalogVolume.objects.filter(Q(googleId__in=google_ids) | Q(isbn__in=isbns)):
+        by_google[volume.googleId] = volume
+        if volume.isbn:
+            by_isbn[volume.isbn] = volume
+
+    volumes, created, updated = [], [], []
+    for result in results:
+        isbn = result.get("isbn")
+        volume = by_google.get(result["id"]) or (isbn and by_isbn.get(isbn))
+        if volume is None:
+            volume = CatalogVolume(googleId=result["id"])
+            created.append(volume)
+        elif any(volume is seen for seen in volumes):
+            continue
+        elif volume.pk is not None:
+            updated.append(volume)
+        by_google[volume.googleId] = volume
+        # ISBN, що вже належить іншому тому, не переноситься
+        if isbn and by_isbn.setdefault(isbn, volume) is volume:
+            volume.isbn = isbn
+        for field in VOLUME_FIELDS:
+            value = result[field]
+            max_length = CatalogVolume._meta.get_field(field).max_length
+            # Довгі переліки авторів чи категорій обрізаються до розміру колонки
+            setattr(volume, field, value[:max_length] if max_length and value else value)
+        volume.updatedAt = now
+        volumes.append(volume)
+
+    CatalogVolume.objects.bulk_create(created)
+    CatalogVolume.objects.bulk_update(updated, ["isbn", *VOLUME_FIELDS, "updatedAt"])
+    return volumes
+
+
+def store(key, results):
+    """Зберігає результати запиту в каталозі.
+
+    Args:
+        key (tuple): Ключ із `make_key`.
+        results (list[dict]): Відформатовані результати Google Books.
+
+    Returns:
+        list[dict]: Результати з каталогу (з `catalogId`, без дублікатів за ISBN).
+    """
+    for attempt in range(2):
+        now = timezone.now()
+        try:
+            with transaction.atomic():
+                volumes = _upsert_volumes(results, now)
+                CatalogQuery.objects.update_or_create(
+                    key=query_digest(key),
+                    defaults={"query": key[0], "volumes": [volume.pk for volume in volumes], "fetchedAt": now},
+                )
+        except IntegrityError:
+            # Ті самі томи одночасно додав інший процес — друга спроба їх оновить
+            if attempt:
+                raise
+            continue
+        return [as_search_result(volume) for volume in volumes]
+
+
+class LocalCatalog:
+    """Пошук через каталог із запитом до Google лише для відсутніх і застарілих записів.
+
+    Лічильники процесу: `hits` (свіжий запис), `stale` і `misses` (запит до
+    Google), `fallbacks` (Google недоступний, віддано застарілий запис).
+    """
+
+    COUNTERS = ("hits", "stale", "misses", "fallbacks")
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    async def search(self, key, fetch):
+        """Повертає результати запиту з каталогу або з Google через `fetch`.
+
+        Args:
+            key (tuple): Ключ із `make_key`.
+            fetch (Callable[[], Awaitable[list[dict]]]): Запит до Google Books.
+
+        Returns:
+            list[dict]: Результати пошуку.
+
+        Raises:
+            httpx.HTTPError: Google недоступний, а в каталозі запиту немає.
+        """
+        try:
+            results, fresh = await sync_to_async(lookup)(key)
+        except DatabaseError:
+            # Недоступний каталог не заважає пошуку напряму в Google
+            logger.exception(f"Failed to read catalog for {key!r}")
+            results, fresh = None, False
+        if fresh:
+            self._count("hits")
+            return results
+        try:
+            fetched = await fetch()
+        except httpx.HTTPError as exc:
+            if results is None:
+                raise
+            logger.warning(f"Google Books unavailable, serving stale catalog entry for {key!r}: {exc}")
+            self._count("fallbacks")
+            return results
+        self._count("misses" if results is None else "stale")
+        try:
+            return await sync_to_async(store)(key, fetched)
+        except DatabaseError:
+            # Збій запису в каталог не заважає віддати знайдене
+            logger.exception(f"Failed to store search results in catalog for {key!r}")
+            return fetched
+
+    def clear(self):
+        """Скидає лічильники (дані каталогу в БД не змінюються)."""
+        with self._lock:
+            self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+    def stats(self):
+        """Лічильники процесу та розмір каталогу."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {
+            **counters,
+            "volumes": CatalogVolume.objects.count(),
+            "queries": CatalogQuery.objects.count(),
+            "ttl": catalog_ttl().total_seconds(),
+        }
+
+
+#: Спільний каталог для представлення зовнішнього пошуку.
+local_catalog = LocalCatalog()
@@ -0,0 +1,236 @@
+"""
+Модуль ущільнення старих сесій читання.
+
+`Book.save` створює сесію на кожне збільшення поточної сторінки, тож повзунок
+прогресу дає десятки рядків за день, а таблиця сесій росте без обмежень і
+сповільнює кожен агрегат статистики. Ущільнення об'єднує сесії, старші за
+`TRACKER_SESSION_COMPACTION_DAYS`, в один рядок на книгу за день (у часовому
+поясі користувача):
+
+* зберігається найраніша сесія дня; її `pages_read` і `duration` стають
+  сумами групи (`duration` лишається `None`, лише якщо вона порожня в усіх
+  сесіях), тексти `note` і `quote` об'єднуються в хронологічному порядку;
+* решта сесій групи видаляється одним запитом без сигналів видалення.
+
+Похідні дані оновлюються одним сигналом `sessions_compacted` на пакет книг:
+статистика й щоденні зведення отримують дельти (сторінки та час не
+змінюються, зменшується лише кількість сесій), пошуковий індекс — нові
+тексти нотаток, журнал видалень — записи про видалені сесії, кеш —
+нове покоління.
+
+Запуск: команда `compact_sessions` (зокрема `--dry-run`) або періодичний хук
+`request_finished`, якщо задано `TRACKER_SESSION_COMPACTION_INTERVAL_HOURS`.
+"""
+
+import datetime
+import itertools
+import logging
+import time
+import zoneinfo
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.signals import request_finished
+from django.db import connection, transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+
+from .models import ReadingSession, User
+
+logger = logging.getLogger("tracker")
+
+#: Сигнал ущільнення сесій користувача. Аргументи: `user_id` (int) та
+#: `merged` (list[tuple[dict, ReadingSession, list[ReadingSession]]] — трійки
+#: `(попередній стан збереженої сесії, збережена сесія, видалені сесії)`).
+sessions_compacted = Signal()
+
+#: Поля стану сесії, що передаються обробникам (як `ReadingSession._previous_state`).
+STATE_FIELDS = ("date", "pages_read", "duration", "note")
+
+#: Ключ кешу, що обмежує періодичний запуск одним на інтервал для всіх процесів.
+PERIODIC_LOCK_KEY = "tracker:session-compaction"
+
+#: Кількість книг, чиї старі сесії завантажуються одним запитом.
+BOOKS_PER_BATCH = 100
+
+#: Орієнтовна кількість видалених сесій на одну транзакцію.
+MAX_REMOVED_PER_BATCH = 500
+
+#: Поля збереженої сесії, що перезаписуються при об'єднанні.
+MERGED_FIELDS = ("pages_read", "duration", "note", "quote", "updatedAt")
+
+
+def compaction_age():
+    """Вік сесій, що підлягають ущільненню (`TRACKER_SESSION_COMPACTION_DAYS`)."""
+    return datetime.timedelta(days=getattr(settings, "TRACKER_SESSION_COMPACTION_DAYS", 90))
+
+
+class CompactionReport:
+    """Підсумок ущільнення: кількість груп, рядків до та після і час виконання."""
+
+    def __init__(self):
+        self.user_ids = []
+        self.groups = 0
+        self.sessions_before = 0
+        self.sessions_after = 0
+        self.started = time.monotonic()
+
+    @property
+    def users(self):
+        return len(self.user_ids)
+
+    @property
+    def reclaimed(self):
+        return self.sessions_before - self.sessions_after
+
+    @property
+    def seconds(self):
+        return time.monotonic() - self.started
+
+
+def _join_texts(values):
+    """Об'єднує непорожні тексти групи без повторів; `None`, якщо їх немає."""
+    texts = list(dict.fromkeys(value.strip() for value in values if value and value.strip()))
+    return "\n\n".join(texts) or None
+
+
+def _merge(sessions):
+    """Об'єднує сесії групи в першу з них; повертає `(попередній стан, сесія, видалені)`."""
+    survivor, *removed = sessions
+    previous = {field: getattr(survivor, field) for field in STATE_FIELDS}
+    durations = [session.duration for session in sessions if session.duration is not None]
+    survivor.pages_read = sum(session.pages_read for session in sessions)
+    survivor.duration = sum(durations) if durations else None
+    survivor.note = _join_texts(session.note for session in sessions)
+    survivor.quote = _join_texts(session.quote for session in sessions)
+    return previous, survivor, removed
+
+
+def _candidate_groups(user_id, zone, before):
+    """Книги та дні (у поясі користувача), де старих сесій більше однієї."""
+    return set(
+        ReadingSession.objects.filter(book__user_id=user_id, date__lt=before)
+        .annotate(day=TruncDate("date", tzinfo=zone))
+        .values("book_id", "day")
+        .annotate(count=Count("id"))
+        .filter(count__gt=1)
+        .values_list("book_id", "day")
+    )
+
+
+def _columns(*names):
+    return [connection.ops.quote_name(ReadingSession._meta.get_field(name).column) for name in names]
+
+
+def _apply(user_id, batch, report):
+    """Записує об'єднані групи в одній транзакції та надсилає `sessions_compacted`."""
+    removed_ids = [session.pk for _, _, removed in batch for session in removed]
+    now = timezone.now()
+    table = connection.ops.quote_name(ReadingSession._meta.db_table)
+    pk, *columns = _columns("id", *MERGED_FIELDS)
+    assignments = ", ".join(f"{column} = %s" for column in columns)
+    adapted_now = connection.ops.adapt_datetimefield_value(now)
+    with transaction.atomic():
+        # `executemany` з простим UPDATE за ключем швидший за `bulk_update` з виразами CASE
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"UPDATE {table} SET {assignments} WHERE {pk} = %s",
+                [
+                    (survivor.pages_read, survivor.duration, survivor.note, survivor.quote, adapted_now, survivor.pk)
+                    for _, survivor, _ in batch
+                ],
+            )
+            # Без сигналів видалення: похідні дані оновлює `sessions_compacted`;
+            # `MAX_REMOVED_PER_BATCH` обмежує кількість параметрів запиту
+            if removed_ids:
+                placeholders = ", ".join(["%s"] * len(removed_ids))
+                cursor.execute(f"DELETE FROM {table} WHERE {pk} IN ({placeholders})", removed_ids)
+        for _, survivor, _ in batch:
+            survivor.updatedAt = now
+            survivor.mark_clean()
+        sessions_compacted.send(sender=ReadingSession, user_id=user_id, merged=batch)
+    report.groups += len(batch)
+    report.sessions_before += len(batch) + len(removed_ids)
+    report.sessions_after += len(batch)
+
+
+def compact_user_sessions(user_id, zone, before, report):
+    """Ущільнює старі сесії одного користувача.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        zone (tzinfo): Часовий пояс користувача (межі днів).
+        before (datetime): Ущільнюються сесії, старші за цей момент.
+        report (CompactionReport): Звіт, що доповнюється.
+    """
+    candidates = _candidate_groups(user_id, zone, before)
+    if not candidates:
+        return
+    report.user_ids.append(user_id)
+
+    book_ids = sorted({book_id for book_id, _ in candidates})
+    for offset in range(0, len(book_ids), BOOKS_PER_BATCH):
+        sessions = ReadingSession.objects.filter(
+            book_id__in=book_ids[offset:offset + BOOKS_PER_BATCH], date__lt=before
+        ).order_by("book_id", "date", "id")
+        groups = itertools.groupby(
+            sessions, key=lambda session: (session.book_id, timezone.localdate(session.date, zone))
+        )
+        batch, removed = [], 0
+        for key, group in groups:
+            if key not in candidates:
+                continue
+            batch.append(_merge(list(group)))
+            removed += len(batch[-1][2])
+            # Обмежує транзакцію та списки `IN` (ліміт параметрів SQLite)
+            if removed >= MAX_REMOVED_PER_BATCH:
+                _apply(user_id, batch, report)
+                batch, removed = [], 0
+        if batch:
+            _apply(user_id, batch, report)
+
+
+def compact_sessions(before=None, users=None):
+    """Ущільнює сесії, старші за `before`, до одного рядка на книгу за день.
+
+    Args:
+        before (datetime, optional): Межа віку сесій; за замовчуванням —
+            зараз мінус `compaction_age()`.
+        users (QuerySet, optional): Користувачі (за замовчуванням — усі, що
+            мають старі сесії).
+
+    Returns:
+        CompactionReport: Підсумок ущільнення.
+    """
+    before = before or timezone.now() - compaction_age()
+    report = CompactionReport()
+    if users is None:
+        users = User.objects.filter(books__reading_sessions__date__lt=before).distinct()
+    for user_id, zone_name in list(users.order_by("pk").values_list("pk", "timezone")):
+        compact_user_sessions(user_id, zoneinfo.ZoneInfo(zone_name or settings.TIME_ZONE), before, report)
+    return report
+
+
+@receiver(request_finished)
+def run_periodic_compaction(sender, **kwargs):
+    """Періодичний хук: ущільнює сесії не частіше ніж раз на інтервал.
+
+    Працює, якщо задано `TRACKER_SESSION_COMPACTION_INTERVAL_HOURS`;
+    `cache.add` гарантує, що за інтервал ущільнення запускає лише один
+    запит серед усіх процесів (за спільного бекенду кешу).
+    """
+    hours = getattr(settings, "TRACKER_SESSION_COMPACTION_INTERVAL_HOURS", 0)
+    if not hours or not cache.add(PERIODIC_LOCK_KEY, timezone.now().isoformat(), timeout=int(hours * 3600)):
+        return
+    try:
+        report = compact_sessions()
+    except Exception:
+        logger.exception("Periodic session compaction failed")
+        cache.delete(PERIODIC_LOCK_KEY)
+        return
+    logger.info(
+        f"Session compaction: {report.reclaimed} rows reclaimed in {report.groups} groups "
+        f"for {report.users} users ({report.seconds:.1f}s)"
+    )
@@ -0,0 +1,86 @@
+"""
+Модуль умовних GET-запитів (`ETag` / `304 Not Modified`).
+
+Валідатором відповіді слугує покоління кешу користувача (`tracker.cache`):
+воно змінюється при будь-якій зміні бібліотеки. Тому перевірка
+`If-None-Match` не потребує запитів до БД, а у разі збігу відповідь `304`
+повертається без виконання представлення та без серіалізації JSON.
+
+`Last-Modified` не віддається: його точність — секунда, тож клієнт, що
+перевіряє відповідь лише через `If-Modified-Since`, отримав би `304` для
+зміни, зробленої в ту саму секунду, що й попередня відповідь.
+
+Покоління читається зі спільного кешу, тож усі воркери бачать ту саму
+зміну: воркер із власним кешем у пам'яті повертав би `304` для змінених
+даних. Тому без `DEBUG` кеш у пам'яті процесу заборонено
+(`tracker.cache.require_shared_cache`).
+
+ETag додатково залежить від повного шляху запиту (фільтри, сортування,
+курсор), заголовка `Accept` та поточного дня користувача — відповіді
+статистики (серії, теплова карта) змінюються з початком нового дня навіть
+без змін у бібліотеці.
+"""
+
+import functools
+import hashlib
+import zoneinfo
+
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from rest_framework.request import Request
+
+from .cache import get_generation
+
+
+def response_etag(request):
+    """Обчислює ETag відповіді для запиту автентифікованого користувача.
+
+    Args:
+        request (Request): Запит DRF.
+
+    Returns:
+        str: ETag у лапках.
+    """
+    user_id = request.user.pk
+    generation = get_generation(user_id)
+    today = timezone.localdate(timezone=zoneinfo.ZoneInfo(request.user.timezone))
+    source = "|".join(
+        [
+            str(user_id),
+            str(generation),
+            request.get_full_path(),
+            request.META.get("HTTP_ACCEPT", ""),
+            today.isoformat(),
+        ]
+    )
+    digest = hashlib.md5(source.encode(), usedforsecurity=False).hexdigest()
+    return f'"{digest}"'
+
+
+def conditional_get(view_method):
+    """Декоратор обробника GET, що підтримує умовні запити.
+
+    Якщо ETag клієнта збігається з поточним, повертає `304` без виклику
+    обробника. Інакше викликає обробник і додає до успішної відповіді
+    заголовки `ETag` та `Cache-Control: private, no-cache`
+    (браузер зберігає відповідь, але щоразу її перевіряє).
+
+    Підходить як для методів ViewSet/APIView, так і для функціональних
+    представлень (під `@api_view`).
+    """
+
+    @functools.wraps(view_method)
+    def wrapper(*args, **kwargs):
+        request = args[0] if isinstance(args[0], Request) else args[1]
+        etag = response_etag(request)
+
+        response = get_conditional_response(request, etag=etag)
+        if response is None:
+            response = view_method(*args, **kwargs)
+        if response.status_code in (200, 304):
+            response["ETag"] = etag
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ["Authorization"])
+        return response
+
+    return wrapper
@@ -0,0 +1,169 @@
+"""
+Модуль потокового експорту всієї бібліотеки користувача.
+
+Формати:
+
+* `csv` — книги (поля `BookSerializer` без вкладених колекцій); файл
+  придатний для повторного імпорту (`tracker.imports`);
+* `jsonl` — по одній книзі на рядок із вкладеними `readingSessions`,
+  `reading_cycles`, `book_notes` і `book_quotes` (історію читання імпорт
+  також розуміє);
+* `zip` — архів з окремими CSV для книг, сесій, нотаток, цитат і циклів.
+
+Дані читаються курсорами `.iterator(chunk_size=CHUNK_SIZE)` через проєкції
+`.values()` (`tracker.projections`), а відповідь формується генератором для
+`StreamingHttpResponse`: перші байти віддаються одразу після першої порції
+книг, а пам'ять не залежить від розміру бібліотеки. Вкладені колекції для
+JSON lines з'єднуються злиттям відсортованих потоків (книги за `id`, дочірні
+об'єкти за `(book, id)`), без окремого запиту на кожну книгу.
+
+Під ASGI Django збирає синхронний ітератор `StreamingHttpResponse` у список
+перед відправленням, тому там генератор обгортається `async_chunks`:
+порції читаються по одній через `sync_to_async`.
+"""
+
+import csv
+import io
+import zipfile
+
+from asgiref.sync import sync_to_async
+from rest_framework.utils.encoders import JSONEncoder
+
+from .projections import build_projection
+from .sync import library_collections
+
+#: Розмір порції курсора та кількість рядків між віддачами даних клієнту.
+CHUNK_SIZE = 2000
+
+#: Типи вмісту відповіді для форматів.
+CONTENT_TYPES = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson",
+    "zip": "application/zip",
+}
+
+#: Назви вкладених колекцій книги для дочірніх наборів даних (як у `BookSerializer`).
+NESTED_KEYS = {
+    "sessions": "readingSessions",
+    "cycles": "reading_cycles",
+    "notes": "book_notes",
+    "quotes": "book_quotes",
+}
+
+#: Поля дочірніх об'єктів, що дублюють книгу у вкладеному представленні.
+NESTED_OMIT = {"book", "bookTitle", "bookAuthor", "user_email"}
+
+
+def _stream(user_id):
+    """Повертає `{назва: (поля, ітератор представлень)}` для всіх наборів даних."""
+    streams = {}
+    for name, queryset, serializer in library_collections(user_id):
+        projection = build_projection(serializer)
+        ordering = ("id",) if name == "books" else ("book_id", "id")
+        rows = projection.values(queryset.order_by(*ordering)).iterator(chunk_size=CHUNK_SIZE)
+        fields = [column_name for column_name, _, _ in projection.columns]
+        streams[name] = (fields, map(projection.represent, rows))
+    return streams
+
+
+def _csv_chunks(fields, items):
+    """Віддає CSV порціями по `CHUNK_SIZE` рядків."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=fields, extrasaction="ignore")
+    writer.writeheader()
+    for index, item in enumerate(items, start=1):
+        writer.writerow(item)
+        if index % CHUNK_SIZE == 0:
+            yield buffer.getvalue()
+            buffer.seek(0)
+            buffer.truncate()
+    yield buffer.getvalue()
+
+
+def export_csv(user_id):
+    """Генератор CSV із книгами користувача."""
+    fields, books = _stream(user_id)["books"]
+    for chunk in _csv_chunks(fields, books):
+        yield chunk.encode()
+
+
+def export_jsonl(user_id):
+    """Генератор JSON lines: книга з усіма вкладеними колекціями на рядок."""
+    streams = _stream(user_id)
+    _, books = streams.pop("books")
+    # Поточний (ще не використаний) елемент кожного дочірнього потоку
+    children = {name: (items, next(items, None)) for name, (_, items) in streams.items()}
+    encoder = JSONEncoder(ensure_ascii=False)
+    lines = []
+    for book in books:
+        for name, (items, current) in children.items():
+            nested = []
+            # Об'єкти книг, яких немає в потоці (створені під час експорту), пропускаються
+            while current is not None and current["book"] < book["id"]:
+                current = next(items, None)
+            while current is not None and current["book"] == book["id"]:
+                nested.append({key: value for key, value in current.items() if key not in NESTED_OMIT})
+                current = next(items, None)
+            children[name] = (items, current)
+            book[NESTED_KEYS[name]] = nested
+        lines.append(encoder.encode(book))
+        if len(lines) >= CHUNK_SIZE:
+            yield ("\n".join(lines) + "\n").encode()
+            lines = []
+    if lines:
+        yield ("\n".join(lines) + "\n").encode()
+
+
+class _Sink:
+    """Непрокручуваний приймач байтів для `ZipFile`, що віддається порціями."""
+
+    def __init__(self):
+        self.chunks = []
+
+    def write(self, data):
+        self.chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self):
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+def export_zip(user_id):
+    """Генератор ZIP-архіву з CSV-файлами всіх наборів даних."""
+    sink = _Sink()
+    with zipfile.ZipFile(sink, "w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, (fields, items) in _stream(user_id).items():
+            with archive.open(f"{name}.csv", "w", force_zip64=True) as entry:
+                for chunk in _csv_chunks(fields, items):
+                    entry.write(chunk.encode())
+                    data = sink.drain()
+                    if data:
+                        yield data
+    yield sink.drain()
+
+
+async def async_chunks(chunks):
+    """Асинхронний ітератор над генератором експорту для відповіді під ASGI.
+
+    Кожна порція (разом із запитами до БД) готується в потоці через
+    `sync_to_async`, тож цикл подій не блокується, а експорт не збирається в
+    пам'яті. Закриття ітератора (клієнт розірвав з'єднання) закриває й
+    генератор із його курсорами.
+    """
+    try:
+        while True:
+            chunk = await sync_to_async(next)(chunks, None)
+            if chunk is None:
+                return
+            yield chunk
+    finally:
+        await sync_to_async(chunks.close)()
+
+
+#: Генератори експорту для підтримуваних форматів.
+EXPORTERS = {"csv": export_csv, "jsonl": export_jsonl, "zip": export_zip}
@@ -0,0 +1,609 @@
+"""
+Модуль зовнішнього пошуку книг (Google Books API): кеш результатів і HTTP-клієнт.
+
+Пошук із фронтенду надсилає запит на кожне натискання клавіші та кожну
+сторінку (`startIndex`), а популярні запити повторюються різними
+користувачами впродовж дня. Кожен запит до Google коштує 200–800 мс і
+частину квоти, тому відформатовані результати кешуються спільно для всіх
+користувачів:
+
+* ключ — нормалізований запит Google (`intitle:...` тощо, без зайвих
+  пробілів і без урахування регістру), `startIndex` та `langRestrict`;
+* протягом `TRACKER_SEARCH_CACHE_TTL` секунд запис свіжий (`hit`);
+* ще `TRACKER_SEARCH_CACHE_STALE` секунд після цього застарілий запис
+  повертається одразу (`stale`), а оновлення виконується фоновою задачею
+  (stale-while-revalidate); старші записи вважаються відсутніми (`miss`);
+* кількість записів обмежена `TRACKER_SEARCH_CACHE_SIZE`, найдавніше
+  використані витісняються (LRU);
+* після відповіді з майже повною сторінкою наступна сторінка (`startIndex`
+  + 20) завантажується у фоні (speculative prefetch), тож «Завантажити ще»
+  відповідає з кешу. Одночасних попередніх завантажень у процесі не більше
+  `TRACKER_SEARCH_PREFETCH_CONCURRENCY`: понад ліміт вони пропускаються, а не
+  стають у чергу, тож не відбирають з'єднання з Google у реальних запитів.
+
+Кеш живе в пам'яті процесу: відповідь із кешу не потребує мережі чи
+серіалізації з бекенду кешу. Лічильники (`stats()`) теж рахуються для
+процесу.
+
+Пошук асинхронний (представлення обслуговується через ASGI): очікування
+Google не займає воркер, тож один процес тримає сотні запитів одночасно.
+Одночасні промахи з однаковим ключем об'єднуються (single-flight): до Google
+іде один запит, а всі очікувачі отримують його результат.
+
+Фонові оновлення та попередні завантаження виконуються в циклі подій
+процесу. Під WSGI чи `runserver` кожен запит обслуговує окремий цикл
+`async_to_sync`, що закривається разом із запитом, тому там вони переходять
+у довготривалий фоновий цикл (`background_loop`), а пул з'єднань циклу
+запиту закривається наприкінці запиту.
+
+Промахи кешу йдуть через спільний клієнт `google_books`:
+
+* один `httpx.AsyncClient` з пулом з'єднань на цикл подій процесу — TCP і
+  TLS встановлюються один раз, далі з'єднання перевикористовуються
+  (keep-alive);
+* помилки з'єднання, тайм-аути та відповіді 429/5xx повторюються до
+  `TRACKER_GOOGLE_BOOKS_RETRIES` разів із випадковою експоненційною затримкою
+  (full jitter), але не довше за `TRACKER_GOOGLE_BOOKS_DEADLINE` секунд на
+  весь запит;
+* запобіжник (circuit breaker) після `TRACKER_GOOGLE_BOOKS_BREAKER_THRESHOLD`
+  невдалих спроб поспіль розмикається: наступні запити одразу отримують
+  `CircuitOpenError` без звернення до Google, доки через
+  `TRACKER_GOOGLE_BOOKS_BREAKER_RESET` секунд одна пробна спроба не покаже,
+  що сервіс відновився.
+"""
+
+import asyncio
+import collections
+import logging
+import random
+import threading
+import time
+import weakref
+
+import httpx
+from asgiref.sync import AsyncToSync, sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+logger = logging.getLogger("tracker")
+
+#: Стани відповіді кешу (значення заголовка `X-Cache`).
+HIT, STALE, MISS = "HIT", "STALE", "MISS"
+
+
+def make_key(full_query, start_index=0, lang_restrict=""):
+    """Нормалізований ключ запиту: `(запит, startIndex, langRestrict)`."""
+    try:
+        start_index = max(0, int(start_index))
+    except (TypeError, ValueError):
+        start_index = 0
+    return (" ".join(str(full_query).split()).casefold(), start_index, lang_restrict or "")
+
+
+#: Фонові задачі оновлення (посилання не дає збирачу сміття їх знищити).
+_background_tasks: set[asyncio.Task] = set()
+
+_background_loop = None
+_background_lock = threading.Lock()
+
+
+def request_scoped_loop():
+    """Чи поточний цикл подій створено `async_to_sync` лише для одного виклику.
+
+    Так Django виконує асинхронні представлення під WSGI та `runserver`: цикл
+    закривається разом із запитом і скасовує незавершені задачі.
+    """
+    return asyncio.get_running_loop() in AsyncToSync.loop_thread_executors
+
+
+def background_loop():
+    """Довготривалий цикл подій процесу для фонових задач (потік-демон, створюється при потребі)."""
+    global _background_loop
+    with _background_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(target=loop.run_forever, name="tracker-background", daemon=True).start()
+            _background_loop = loop
+        return _background_loop
+
+
+async def _run_detached(func):
+    try:
+        await func()
+    finally:
+        # Потік фонового циклу не отримує `request_finished`, тож з'єднання з БД закриваються тут
+        await sync_to_async(close_old_connections)()
+
+
+def _run_in_background(func):
+    if request_scoped_loop():
+        # Задачу в циклі запиту скасувало б завершення `async_to_sync`
+        asyncio.run_coroutine_threadsafe(_run_detached(func), background_loop())
+        return
+    task = asyncio.ensure_future(func())
+    _background_tasks.add(task)
+    task.add_done_callback(_background_tasks.discard)
+
+
+class SingleFlight:
+    """Об'єднує одночасні виклики з однаковим ключем в одну задачу.
+
+    Перший виклик запускає задачу, решта чекають на неї ж і отримують той
+    самий результат або виняток. Скасування одного очікувача (клієнт закрив
+    з'єднання) не скасовує спільну задачу. Задачі прив'язані до циклу подій.
+    """
+
+    def __init__(self):
+        self._calls = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self.coalesced = 0
+
+    async def run(self, key, func):
+        """Виконує `await func()` або приєднується до вже запущеного виклику з тим самим ключем."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            calls = self._calls.setdefault(loop, {})
+            task = calls.get(key)
+            if task is None:
+                task = calls[key] = loop.create_task(func())
+                task.add_done_callback(lambda done: self._finish(calls, key, done))
+            else:
+                self.coalesced += 1
+        return await asyncio.shield(task)
+
+    def _finish(self, calls, key, task):
+        with self._lock:
+            if calls.get(key) is task:
+                del calls[key]
+        # Виняток отримують очікувачі; якщо всі скасовані — не логувати «never retrieved»
+        if not task.cancelled():
+            task.exception()
+
+
+class SearchResultCache:
+    """Кеш результатів пошуку з TTL, обмеженням розміру (LRU) та stale-while-revalidate.
+
+    Attributes:
+        revalidate (Callable[[Callable], None]): Запускає фонове оновлення —
+            отримує функцію без аргументів, що повертає корутину (за
+            замовчуванням — задача поточного циклу подій).
+        prefetcher (Callable[[Callable], None]): Так само запускає фонове
+            попереднє завантаження (`prefetch`).
+    """
+
+    COUNTERS = (
+        "hits",
+        "misses",
+        "stale",
+        "refreshes",
+        "refreshErrors",
+        "evictions",
+        "prefetches",
+        "prefetchHits",
+        "prefetchErrors",
+        "prefetchSkipped",
+    )
+
+    def __init__(self, ttl=None, stale=None, max_size=None, clock=time.monotonic):
+        self._ttl = ttl
+        self._stale = stale
+        self._max_size = max_size
+        self.clock = clock
+        self.revalidate = _run_in_background
+        self.prefetcher = _run_in_background
+        self._flight = SingleFlight()
+        self._entries = collections.OrderedDict()
+        self._refreshing = set()
+        # Ключ -> чи вже дочекався його реальний запит (поки завантаження триває)
+        self._prefetching = {}
+        # Завантажені наперед записи, яких ще ніхто не прочитав
+        self._prefetched = set()
+        self._lock = threading.Lock()
+        self._counters = dict.fromkeys(self.COUNTERS, 0)
+
+    @property
+    def ttl(self):
+        return self._ttl if self._ttl is not None else getattr(settings, "TRACKER_SEARCH_CACHE_TTL", 600)
+
+    @property
+    def stale(self):
+        return self._stale if self._stale is not None else getattr(settings, "TRACKER_SEARCH_CACHE_STALE", 3600)
+
+    @property
+    def max_size(self):
+        return self._max_size if self._max_size is not None else getattr(settings, "TRACKER_SEARCH_CACHE_SIZE", 1000)
+
+    @property
+    def prefetch_limit(self):
+        return getattr(settings, "TRACKER_SEARCH_PREFETCH_CONCURRENCY", 4)
+
+    def _count(self, counter):
+        self._counters[counter] += 1
+
+    def lookup(self, key):
+        """Повертає `(значення, стан)`; для відсутнього чи надто старого запису — `(None, MISS)`."""
+        now = self.clock()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, stored_at = entry
+                age = now - stored_at
+                if age < self.ttl + self.stale:
+                    self._entries.move_to_end(key)
+                    if key in self._prefetched:
+                        self._prefetched.discard(key)
+                        self._count("prefetchHits")
+                    state = HIT if age < self.ttl else STALE
+                    self._count("hits" if state == HIT else "stale")
+                    return value, state
+                del self._entries[key]
+                self._prefetched.discard(key)
+            self._count("misses")
+            return None, MISS
+
+    def store(self, key, value):
+        """Зберігає значення, витісняючи найдавніше використані записи понад ліміт."""
+        with self._lock:
+            self._entries[key] = (value, self.clock())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                evicted, _ = self._entries.popitem(last=False)
+                self._prefetched.discard(evicted)
+                self._count("evictions")
+
+    async def _load(self, key, fetch):
+        value = await fetch()
+        self.store(key, value)
+        return value
+
+    async def _refresh(self, key, fetch):
+        try:
+            await self._flight.run(key, lambda: self._load(key, fetch))
+            with self._lock:
+                self._count("refreshes")
+        except Exception as exc:
+            # Застарілий запис лишається до кінця вікна stale
+            logger.warning(f"Search cache revalidation failed for {key!r}: {exc}")
+            with self._lock:
+                self._count("refreshErrors")
+        finally:
+            with self._lock:
+                self._refreshing.discard(key)
+
+    async def get_or_fetch(self, key, fetch):
+        """Повертає результат із кешу або отримує його через `fetch`.
+
+        Одночасні промахи з тим самим ключем чекають на один виклик `fetch`.
+        Для застарілого запису повертає його одразу й запускає одне фонове
+        оновлення на ключ. Винятки `fetch` при промаху не перехоплюються і
+        нічого не кешується.
+
+        Args:
+            key (tuple): Ключ із `make_key`.
+            fetch (Callable[[], Awaitable]): Отримує свіже значення з API.
+
+        Returns:
+            tuple: `(значення, стан)`, де стан — `HIT`, `STALE` або `MISS`.
+        """
+        value, state = self.lookup(key)
+        if state == MISS:
+            with self._lock:
+                # Запит приєднується до попереднього завантаження, що вже триває
+                if self._prefetching.get(key) is False:
+                    self._prefetching[key] = True
+                    self._count("prefetchHits")
+            value = await self._flight.run(key, lambda: self._load(key, fetch))
+        elif state == STALE:
+            with self._lock:
+                start = key not in self._refreshing
+                self._refreshing.add(key)
+            if start:
+                self.revalidate(lambda: self._refresh(key, fetch))
+        return value, state
+
+    async def _prefetch(self, key, fetch):
+        loaded = False
+        try:
+            await self._flight.run(key, lambda: self._load(key, fetch))
+            loaded = True
+        except Exception as exc:
+            logger.info(f"Search prefetch failed for {key!r}: {exc}")
+            with self._lock:
+                self._count("prefetchErrors")
+        finally:
+            with self._lock:
+                waited = self._prefetching.pop(key, False)
+                if loaded and not waited and key in self._entries:
+                    self._prefetched.add(key)
+
+    def prefetch(self, key, fetch):
+        """Запускає фонове завантаження запису, якого ще немає в кеші.
+
+        Якщо в процесі вже виконується `TRACKER_SEARCH_PREFETCH_CONCURRENCY`
+        попередніх завантажень, нове пропускається (`prefetchSkipped`).
+        Прочитання завантаженого наперед запису (або очікування на нього)
+        рахується як `prefetchHits`.
+
+        Args:
+            key (tuple): Ключ із `make_key`.
+            fetch (Callable[[], Awaitable]): Отримує значення з API.
+
+        Returns:
+            bool: Чи запущено завантаження.
+        """
+        limit = self.prefetch_limit
+        if limit <= 0:
+            return False
+        with self._lock:
+            if key in self._entries or key in self._prefetching:
+                return False
+            if len(self._prefetching) >= limit:
+                self._count("prefetchSkipped")
+                return False
+            self._prefetching[key] = False
+            self._count("prefetches")
+        self.prefetcher(lambda: self._prefetch(key, fetch))
+        return True
+
+    def clear(self):
+        """Очищає записи та лічильники."""
+        with self._lock:
+            self._entries.clear()
+            # Завантаження, що ще тривають, завершаться без позначки «наперед»
+            self._prefetching.clear()
+            self._prefetched.clear()
+            self._counters = dict.fromkeys(self.COUNTERS, 0)
+            self._flight.coalesced = 0
+
+    def stats(self):
+        """Лічильники кешу, його розмір і частка влучань (свіжих та застарілих)."""
+        with self._lock:
+            counters = dict(self._counters)
+            size = len(self._entries)
+            prefetching = len(self._prefetching)
+        lookups = counters["hits"] + counters["stale"] + counters["misses"]
+        prefetches = counters["prefetches"]
+        return {
+            **counters,
+            "coalesced": self._flight.coalesced,
+            "prefetching": prefetching,
+            "prefetchHitRatio": round(counters["prefetchHits"] / prefetches, 3) if prefetches else 0.0,
+            "size": size,
+            "maxSize": self.max_size,
+            "ttl": self.ttl,
+            "staleWindow": self.stale,
+            "hitRatio": round((counters["hits"] + counters["stale"]) / lookups, 3) if lookups else 0.0,
+        }
+
+
+#: Спільний кеш результатів пошуку Google Books для процесу.
+search_cache = SearchResultCache()
+
+
+#: Адреса пошуку томів Google Books API.
+GOOGLE_BOOKS_URL = "https://www.googleapis.com/books/v1/volumes"
+
+#: Статуси відповіді, після яких спроба повторюється (перевантаження та збої сервера).
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+#: Тайм-аут встановлення з'єднання (секунди).
+CONNECT_TIMEOUT = 2
+
+#: Базова та максимальна затримка між повторами (секунди).
+BACKOFF_BASE = 0.1
+BACKOFF_CAP = 1.0
+
+#: Кількість з'єднань пулу, що лишаються відкритими між запитами.
+KEEPALIVE_CONNECTIONS = 20
+
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Запобіжник розімкнено: запит до Google не виконувався."""
+
+
+class CircuitBreaker:
+    """Запобіжник для зовнішнього сервісу (стани `closed`, `open`, `half-open`).
+
+    Після `threshold` невдалих спроб поспіль запобіжник розмикається на
+    `reset_timeout` секунд; потім пропускає одну пробну спробу: успіх
+    замикає його, невдача розмикає знову.
+    """
+
+    CLOSED, OPEN, HALF_OPEN = "closed", "open", "half-open"
+
+    def __init__(self, threshold=None, reset_timeout=None, clock=time.monotonic):
+        self._threshold = threshold
+        self._reset_timeout = reset_timeout
+        self.clock = clock
+        self._lock = threading.Lock()
+        self.reset()
+
+    @property
+    def threshold(self):
+        return self._threshold if self._threshold is not None else _setting("TRACKER_GOOGLE_BOOKS_BREAKER_THRESHOLD", 5)
+
+    @property
+    def reset_timeout(self):
+        return self._reset_timeout if self._reset_timeout is not None else _setting("TRACKER_GOOGLE_BOOKS_BREAKER_RESET", 30)
+
+    def reset(self):
+        """Замикає запобіжник і скидає лічильники."""
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+            self.opened_at = None
+            self.times_opened = 0
+            self.rejected = 0
+
+    def allow(self):
+        """Чи можна виконати спробу зараз (у стані `half-open` — лише одну)."""
+        with self._lock:
+            if self.state == self.CLOSED:
+                return True
+            if self.state == self.OPEN and self.clock() - self.opened_at >= self.reset_timeout:
+                self.state = self.HALF_OPEN
+                return True
+            self.rejected += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.state = self.CLOSED
+            self.failures = 0
+
+    def release(self):
+        """Завершує спробу без результату (тайм-аут пулу, скасування).
+
+        Пробна спроба в стані `half-open` не дала відповіді, тож запобіжник
+        знову розмикається на `reset_timeout` секунд — інакше він лишився б
+        напіврозімкненим назавжди.
+        """
+        with self._lock:
+            if self.state == self.HALF_OPEN:
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self.state == self.HALF_OPEN or (self.state == self.CLOSED and self.failures >= self.threshold):
+                self.state = self.OPEN
+                self.opened_at = self.clock()
+                self.times_opened += 1
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "failures": self.failures,
+                "opened": self.times_opened,
+                "rejected": self.rejected,
+            }
+
+
+class GoogleBooksClient:
+    """Асинхронний HTTP-клієнт Google Books з пулом з'єднань, повторами та запобіжником.
+
+    `httpx.AsyncClient` прив'язаний до циклу подій, тому клієнт створюється
+    для кожного циклу (під ASGI — один на воркер) і перевикористовується.
+    Клієнт циклу одного запиту (WSGI) закривається через `aclose`.
+
+    Attributes:
+        url (str): Адреса пошуку томів.
+        breaker (CircuitBreaker): Запобіжник.
+    """
+
+    def __init__(self, url=GOOGLE_BOOKS_URL, breaker=None):
+        self.url = url
+        self.breaker = breaker or CircuitBreaker()
+        self._clients = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+        self._counters = {"requests": 0, "attempts": 0, "retries": 0}
+
+    def _count(self, counter):
+        with self._lock:
+            self._counters[counter] += 1
+
+    def _client(self):
+        loop = asyncio.get_running_loop()
+        client = self._clients.get(loop)
+        if client is None:
+            limits = httpx.Limits(
+                max_connections=_setting("TRACKER_GOOGLE_BOOKS_MAX_CONNECTIONS", 100),
+                max_keepalive_connections=KEEPALIVE_CONNECTIONS,
+            )
+            client = self._clients[loop] = httpx.AsyncClient(limits=limits)
+        return client
+
+    @staticmethod
+    def backoff(attempt):
+        """Затримка перед повтором `attempt` (full jitter)."""
+        return random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+
+    async def search(self, params):
+        """Виконує GET-запит пошуку томів і повертає розібраний JSON.
+
+        Args:
+            params (dict): Параметри запиту (`q`, `startIndex`, `key` тощо).
+
+        Returns:
+            dict: Відповідь Google Books API.
+
+        Raises:
+            CircuitOpenError: Запобіжник розімкнено.
+            httpx.HTTPError: Помилка мережі, тайм-аут, статус 4xx/5xx після
+                всіх повторів або тіло відповіді, що не є JSON.
+        """
+        self._count("requests")
+        retries = _setting("TRACKER_GOOGLE_BOOKS_RETRIES", 2)
+        read_timeout = _setting("TRACKER_GOOGLE_BOOKS_TIMEOUT", 4)
+        deadline = time.monotonic() + _setting("TRACKER_GOOGLE_BOOKS_DEADLINE", 6)
+        client = self._client()
+
+        for attempt in range(retries + 1):
+            if not self.breaker.allow():
+                raise CircuitOpenError("Google Books API is unavailable (circuit open)")
+            self._count("attempts")
+            remaining = max(0.1, deadline - time.monotonic())
+            timeout = httpx.Timeout(min(read_timeout, remaining), connect=CONNECT_TIMEOUT, pool=remaining)
+            try:
+                response = await client.get(self.url, params=params, timeout=timeout)
+            except httpx.PoolTimeout:
+                # Усі з'єднання пулу зайняті — це перевантаження процесу, а не збій Google
+                self.breaker.release()
+                raise
+            except httpx.TransportError as exc:
+                error = exc
+            except BaseException:
+                # Скасований запит не є ні успіхом, ні збоєм сервісу
+                self.breaker.release()
+                raise
+            else:
+                if response.status_code not in RETRY_STATUSES:
+                    # 4xx (крім 429) — помилка запиту, а не збій сервісу
+                    self.breaker.record_success()
+                    response.raise_for_status()
+                    try:
+                        return response.json()
+                    except ValueError as exc:
+                        raise httpx.DecodingError(
+                            f"Google Books API returned an invalid JSON body: {exc}", request=response.request
+                        ) from exc
+                error = httpx.HTTPStatusError(
+                    f"Google Books API responded with {response.status_code}", request=response.request, response=response
+                )
+            self.breaker.record_failure()
+
+            delay = self.backoff(attempt)
+            if attempt == retries or time.monotonic() + delay >= deadline:
+                break
+            logger.warning(f"Google Books API attempt {attempt + 1} failed ({error}), retrying in {delay:.2f}s")
+            self._count("retries")
+            await asyncio.sleep(delay)
+        raise error
+
+    async def aclose(self):
+        """Закриває пул з'єднань поточного циклу подій."""
+        client = self._clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    def reset(self):
+        """Скидає запобіжник і лічильники."""
+        self.breaker.reset()
+        with self._lock:
+            self._counters = dict.fromkeys(self._counters, 0)
+
+    def stats(self):
+        """Лічильники запитів, спроб і повторів та стан запобіжника."""
+        with self._lock:
+            counters = dict(self._counters)
+        return {**counters, "circuit": self.breaker.stats()}
+
+
+#: Спільний клієнт Google Books для процесу.
+google_books = GoogleBooksClient()
@@ -0,0 +1,297 @@
+"""
+Модуль потокового імпорту бібліотеки з інших трекерів.
+
+Підтримувані формати:
+
+* `csv` — заголовки збігаються з полями `BookSerializer` (`title`, `author`,
+  `genre`, `status`, `totalPages`, `startDate`, ...);
+* `goodreads` — експорт Goodreads (`Title`, `Author`, `Exclusive Shelf`,
+  `Date Read`, ...); визначається автоматично за заголовками CSV;
+* `jsonl` — по одному JSON-об'єкту книги на рядок; крім полів книги може
+  містити історію `readingSessions` (`date`, `pages_read`, `duration`,
+  `note`) та `reading_cycles` (`start_date`, `end_date`).
+
+Файл читається потоково (`csv.DictReader` / построково), тож у пам'яті
+одночасно перебуває лише поточний пакет рядків. Кожен рядок валідується тим
+самим `BookSerializer` (один екземпляр на весь імпорт), некоректні рядки
+пропускаються й потрапляють у звіт. Валідні рядки записуються пакетами через
+`tracker.bulk.apply_bulk` (`bulk_create` книг, історичних сесій і циклів,
+одне оновлення статистики, зведень та індексів на пакет). Кожен пакет — окрема
+транзакція: при збої посеред файлу вже записані пакети залишаються.
+"""
+
+import csv
+import datetime
+import io
+import json
+import time
+
+from django.utils import timezone
+from rest_framework import serializers
+
+from .bulk import apply_bulk
+from .rollups import user_zone
+from .serializers import BookSerializer, ImportCycleSerializer, ImportSessionSerializer
+
+#: Підтримувані формати імпорту.
+FORMATS = ("csv", "goodreads", "jsonl")
+
+#: Кількість книг в одному пакеті запису.
+BATCH_SIZE = 500
+
+#: Скільки помилок рядків зберігається у звіті (решта лише рахуються).
+MAX_REPORTED_ERRORS = 100
+
+#: Жанр для книг без жанру (як у формі додавання книги).
+DEFAULT_GENRE = "Без жанру"
+
+#: Поля книги, що приймаються з файлу імпорту.
+IMPORT_FIELDS = (
+    "title",
+    "author",
+    "genre",
+    "year",
+    "rating",
+    "status",
+    "totalPages",
+    "currentPage",
+    "cover",
+    "description",
+    "note",
+    "startDate",
+    "endDate",
+    "isFavorite",
+    "externalRating",
+    "ratingsCount",
+    "isCustom",
+)
+
+#: Заголовки, за якими розпізнається експорт Goodreads.
+GOODREADS_COLUMNS = {"Title", "Author", "Exclusive Shelf"}
+
+#: Відповідність полиць Goodreads статусам книги.
+GOODREADS_SHELVES = {
+    "read": "read",
+    "currently-reading": "reading",
+    "to-read": "want-to-read",
+}
+
+
+class ImportReport:
+    """Звіт імпорту: лічильники, помилки рядків і пропускна здатність."""
+
+    def __init__(self):
+        self.processed = 0
+        self.created = 0
+        self.skipped = 0
+        self.errors = []
+        self.started = time.monotonic()
+
+    def add_error(self, line, errors):
+        self.skipped += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"line": line, "errors": errors})
+
+    @property
+    def seconds(self):
+        return time.monotonic() - self.started
+
+    @property
+    def rows_per_second(self):
+        return self.processed / self.seconds if self.seconds > 0 else 0.0
+
+    def as_dict(self):
+        """Представлення звіту для API."""
+        return {
+            "processed": self.processed,
+            "created": self.created,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "seconds": round(self.seconds, 3),
+            "rowsPerSecond": round(self.rows_per_second, 1),
+        }
+
+
+def _parse_date(value):
+    """Дата з рядка `YYYY-MM-DD` або `YYYY/MM/DD` (Goodreads); `None` для порожніх."""
+    value = (value or "").strip()
+    if not value:
+        return None
+    try:
+        return datetime.date.fromisoformat(value.replace("/", "-")[:10]).isoformat()
+    except ValueError:
+        return value  # помилку поверне валідація серіалізатора
+
+
+def _goodreads_row(row):
+    """Перетворює рядок експорту Goodreads на дані книги."""
+    shelves = [shelf.strip() for shelf in (row.get("Bookshelves") or "").split(",") if shelf.strip()]
+    genres = [shelf for shelf in shelves if shelf not in GOODREADS_SHELVES and shelf != "favorites"]
+    data = {
+        "title": row.get("Title"),
+        "author": row.get("Author"),
+        "genre": genres[0] if genres else DEFAULT_GENRE,
+        "year": row.get("Original Publication Year") or row.get("Year Published"),
+        "totalPages": row.get("Number of Pages"),
+        "status": GOODREADS_SHELVES.get((row.get("Exclusive Shelf") or "").strip(), "want-to-read"),
+        "startDate": _parse_date(row.get("Date Started")),
+        "endDate": _parse_date(row.get("Date Read")),
+        "note": row.get("My Review") or row.get("Private Notes"),
+        "isFavorite": "favorites" in shelves,
+    }
+    if row.get("My Rating") not in (None, "", "0"):
+        data["rating"] = row["My Rating"]
+    return data
+
+
+def _book_row(row):
+    """Прибирає порожні значення, щоб для них діяли типові значення полів."""
+    return {key: value for key, value in row.items() if key and value not in (None, "")}
+
+
+def iter_rows(stream, format="csv"):
+    """Потоково читає файл імпорту.
+
+    Args:
+        stream (IO[bytes]): Двійковий потік файлу.
+        format (str): `csv`, `goodreads` або `jsonl`.
+
+    Yields:
+        tuple: `(номер рядка, дані)`, де дані — словник або рядок з описом
+        помилки розбору (для некоректного JSON).
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    try:
+        if format == "jsonl":
+            for line_number, line in enumerate(text, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    yield line_number, "Некоректний JSON."
+                    continue
+                yield line_number, row if isinstance(row, dict) else "Рядок має бути JSON-об'єктом."
+            return
+
+        reader = csv.DictReader(text)
+        goodreads = format == "goodreads" or GOODREADS_COLUMNS <= set(reader.fieldnames or ())
+        for row in reader:
+            yield reader.line_num, _goodreads_row(row) if goodreads else row
+    finally:
+        # Потік належить викликачу (наприклад, завантажений файл) — не закриваємо його
+        text.detach()
+
+
+def _history(data, sessions, cycles, zone):
+    """Історія читання книги: явна з файлу або виведена з дат книги.
+
+    Без явних сесій книга з датою завершення (чи початку для поточного
+    читання) отримує одну сесію цього дня на прочитані сторінки.
+    """
+    if sessions or cycles:
+        return {"sessions": sessions, "cycles": cycles}
+
+    status = data.get("status")
+    pages = data.get("currentPage") or 0
+    day = None
+    if status == "read":
+        pages = data.get("totalPages") or pages
+        day = data.get("endDate")
+    elif status == "reading":
+        day = data.get("startDate")
+    if not day or pages <= 0:
+        return {}
+    moment = timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)), zone)
+    return {"sessions": [{"date": moment, "pages_read": pages, "duration": None}]}
+
+
+class _RowValidator:
+    """Валідує рядки імпорту серіалізаторами, створеними один раз на імпорт."""
+
+    def __init__(self, zone):
+        self.zone = zone
+        self.book = BookSerializer(fields=IMPORT_FIELDS)
+        self.session = ImportSessionSerializer()
+        self.cycle = ImportCycleSerializer()
+
+    def __call__(self, row):
+        """Повертає `(дані книги, історія)` або кидає `ValidationError`."""
+        if isinstance(row, str):
+            raise serializers.ValidationError(row)
+        row = dict(row)
+        sessions = row.pop("readingSessions", None) or []
+        cycles = row.pop("reading_cycles", None) or []
+        if not isinstance(sessions, list) or not isinstance(cycles, list):
+            raise serializers.ValidationError("readingSessions та reading_cycles мають бути масивами.")
+
+        row = _book_row(row)
+        row.setdefault("genre", DEFAULT_GENRE)
+        row.setdefault("isCustom", True)
+        data = dict(self.book.run_validation(row))
+        errors = {}
+        history_sessions = []
+        for index, item in enumerate(sessions):
+            try:
+                history_sessions.append(dict(self.session.run_validation(item)))
+            except serializers.ValidationError as exc:
+                errors[f"readingSessions[{index}]"] = exc.detail
+        history_cycles = []
+        for index, item in enumerate(cycles):
+            try:
+                history_cycles.append(dict(self.cycle.run_validation(item)))
+            except serializers.ValidationError as exc:
+                errors[f"reading_cycles[{index}]"] = exc.detail
+        if errors:
+            raise serializers.ValidationError(errors)
+        return data, _history(data, history_sessions, history_cycles, self.zone)
+
+
+def import_library(user, stream, format="csv", batch_size=BATCH_SIZE, on_progress=None):
+    """Імпортує книги з файлу в бібліотеку користувача.
+
+    Args:
+        user (User): Власник книг.
+        stream (IO[bytes]): Двійковий потік файлу (читається потоково).
+        format (str): `csv` (Goodreads розпізнається автоматично), `goodreads` або `jsonl`.
+        batch_size (int): Кількість книг в одному пакеті запису.
+        on_progress (Callable[[ImportReport], None], optional): Викликається
+            після запису кожного пакета.
+
+    Returns:
+        ImportReport: Звіт імпорту.
+
+    Raises:
+        ValueError: Невідомий формат.
+        UnicodeDecodeError, csv.Error: Файл не вдалося розібрати (записані
+            пакети залишаються).
+    """
+    if format not in FORMATS:
+        raise ValueError(f"Невідомий формат імпорту: {format}")
+
+    report = ImportReport()
+    validate = _RowValidator(zone=user_zone(user.pk))
+    creates, history = [], []
+
+    def flush():
+        if creates:
+            created, _, _ = apply_bulk(user, creates=creates, history=history)
+            report.created += len(created)
+            creates.clear()
+            history.clear()
+        if on_progress:
+            on_progress(report)
+
+    for line, row in iter_rows(stream, format):
+        report.processed += 1
+        try:
+            data, entry = validate(row)
+        except serializers.ValidationError as exc:
+            report.add_error(line, exc.detail)
+            continue
+        creates.append(data)
+        history.append(entry)
+        if len(creates) >= batch_size:
+            flush()
+    flush()
+    return report
@@ -0,0 +1,156 @@
+"""
+Модуль пакетного прийому сесій читання з офлайн-таймерів.
+
+Звичайне створення сесії (`ReadingSessionViewSet.perform_create`) читає
+книгу, за потреби зберігає її і вставляє один рядок з повним набором
+обробників `post_save`. Таймер, що накопичив десятки сесій без мережі,
+відправляє їх одним пакетом (`record_sessions`):
+
+1. Власність усіх книг пакета перевіряється одним запитом `IN`.
+2. Кожна сесія має ключ ідемпотентності від клієнта (`client_key`,
+   унікальний у межах книги). Уже збережені ключі знаходяться одним
+   запитом, тож повторне відправлення пакета після обриву зв'язку нічого
+   не дублює і повертає ідентифікатори існуючих сесій.
+3. Нові сесії записуються одним `bulk_create`; книги зі статусом
+   `want-to-read` переводяться в `reading` одним `bulk_update` (по одному
+   разу на книгу).
+4. Статистика, зведення, кеш і пошуковий індекс оновлюються одним сигналом
+   `books_bulk_saved` на пакет.
+
+Якщо той самий пакет одночасно записує інший запит, унікальний індекс
+відхиляє вставку, і пакет обробляється повторно з урахуванням щойно
+збережених ключів.
+"""
+
+import copy
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from rest_framework import serializers
+
+from .bulk import UPDATE_FIELDS, books_bulk_saved
+from .models import Book, ReadingSession
+from .serializers import SessionBatchItemSerializer
+
+#: Максимальна кількість сесій в одному пакеті.
+MAX_ITEMS = 500
+
+#: Скільки разів пакет обробляється повторно після конфлікту ключів.
+CONFLICT_RETRIES = 1
+
+
+def _validate(items):
+    """Валідує сесії пакета одним екземпляром серіалізатора.
+
+    Returns:
+        list: Пари `(валідний, дані)`; для некоректних сесій дані — готовий
+        результат зі статусом `invalid` і помилками.
+    """
+    serializer = SessionBatchItemSerializer()
+    validated = []
+    for item in items:
+        try:
+            validated.append((True, dict(serializer.run_validation(item))))
+        except serializers.ValidationError as exc:
+            key = item.get("key") if isinstance(item, dict) else None
+            validated.append((False, {"key": key, "status": "invalid", "errors": exc.detail}))
+    return validated
+
+
+def _write(user, entries):
+    """Записує валідовані сесії; повертає результати у порядку пакета."""
+    book_ids = {data["book"] for valid, data in entries if valid}
+    books = Book.objects.filter(user=user, pk__in=book_ids).in_bulk()
+    keys = {data["key"] for valid, data in entries if valid and data["book"] in books}
+    existing = {
+        (book_id, key): session_id
+        for book_id, key, session_id in ReadingSession.objects.filter(
+            book_id__in=list(books), client_key__in=keys
+        ).values_list("book_id", "client_key", "id")
+    }
+
+    results = []
+    pending = {}
+    sessions, dated = [], []
+    for valid, data in entries:
+        if not valid:
+            results.append(data)
+            continue
+        book = books.get(data["book"])
+        lookup = (data["book"], data["key"])
+        if book is None:
+            results.append({"key": data["key"], "status": "not_found"})
+        elif lookup in existing or lookup in pending:
+            session = existing[lookup] if lookup in existing else pending[lookup]
+            results.append({"key": data["key"], "status": "duplicate", "session": session})
+        else:
+            session = ReadingSession(
+                book=book,
+                client_key=data["key"],
+                pages_read=data.get("pages_read", 0),
+                duration=data.get("duration", 0),
+                note=data.get("note"),
+            )
+            if data.get("date"):
+                dated.append((session, data["date"]))
+            pending[lookup] = session
+            sessions.append(session)
+            results.append({"key": data["key"], "status": "created", "session": session})
+
+    # Як і `perform_create`: перша сесія переводить книгу в статус «читаю»
+    today = timezone.now().date()
+    now = timezone.now()
+    pairs = []
+    for book in {session.book_id: session.book for session in sessions}.values():
+        if book.status == "want-to-read":
+            previous = copy.copy(book)
+            book.status = "reading"
+            book.apply_lifecycle_rules(today)
+            book.updatedAt = now
+            pairs.append((previous, book))
+
+    with transaction.atomic():
+        ReadingSession.objects.bulk_create(sessions, batch_size=500)
+        if dated:
+            # `date` має `auto_now_add`, тому час з таймера записується окремо
+            for session, date in dated:
+                session.date = date
+            ReadingSession.objects.bulk_update([session for session, _ in dated], ["date"], batch_size=200)
+        if pairs:
+            Book.objects.bulk_update([book for _, book in pairs], UPDATE_FIELDS, batch_size=200)
+        for instance in [*sessions, *(book for _, book in pairs)]:
+            instance.mark_clean()
+        if sessions:
+            books_bulk_saved.send(
+                sender=ReadingSession, user_id=user.pk, created=[], updated=pairs, sessions=sessions, cycles=[]
+            )
+
+    for result in results:
+        if isinstance(result.get("session"), ReadingSession):
+            result["session"] = result["session"].pk
+    return results
+
+
+def record_sessions(user, items):
+    """Записує пакет сесій офлайн-таймера.
+
+    Args:
+        user (User): Власник книг.
+        items (list[dict]): Сесії (`key`, `book`, `date`, `pages_read`,
+            `duration`, `note`).
+
+    Returns:
+        list[dict]: Результат для кожної сесії у порядку пакета: `status`
+        (`created`, `duplicate`, `not_found` або `invalid`), `key`,
+        `session` (ідентифікатор збереженої сесії) або `errors`.
+        Некоректні сесії та сесії чужих книг пропускаються, решта
+        записується.
+    """
+    entries = _validate(items)
+    for attempt in range(CONFLICT_RETRIES + 1):
+        try:
+            return _write(user, entries)
+        except IntegrityError:
+            # Ключі з пакета щойно записав паралельний запит
+            if attempt == CONFLICT_RETRIES:
+                raise
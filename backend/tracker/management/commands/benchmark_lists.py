@@ -0,0 +1,107 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+
+from tracker.models import Book, Quote, User
+from tracker.projections import build_projection
+from tracker.serializers import BookSerializer, QuoteSerializer
+
+
+class _Rollback(Exception):
+    """Скасовує транзакцію з тестовими даними після вимірювань."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Порівнює CPU-вартість одного рядка списку книг і цитат для ModelSerializer "
+        "та швидкого шляху через .values() (tracker.projections). Тестові дані "
+        "створюються в транзакції, яка відкочується після вимірювань."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rows",
+            type=int,
+            nargs="+",
+            default=[1000, 10000, 50000],
+            help="Кількість рядків для кожного вимірювання (за замовчуванням 1000 10000 50000).",
+        )
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=3,
+            help="Кількість повторів; береться найкращий результат.",
+        )
+
+    def handle(self, *args, **options):
+        self.stdout.write(
+            f"{'модель':<8}{'рядків':>8}{'serializer мкс/рядок':>24}"
+            f"{'values мкс/рядок':>20}{'прискорення':>14}"
+        )
+        for rows in options["rows"]:
+            try:
+                with transaction.atomic():
+                    self.measure(rows, options["repeat"])
+                    raise _Rollback
+            except _Rollback:
+                pass
+
+    def measure(self, rows, repeat):
+        user = User.objects.create(username="bench", email="bench-lists@example.com")
+        Book.objects.bulk_create(
+            (
+                Book(
+                    user=user,
+                    title=f"Книга {i}",
+                    author=f"Автор {i % 50}",
+                    genre="Драма",
+                    status="reading",
+                    totalPages=300,
+                    currentPage=i % 300,
+                    progress=(i % 300) // 3,
+                    note="Примітка" if i % 2 else None,
+                )
+                for i in range(rows)
+            ),
+            batch_size=1000,
+        )
+        book_ids = list(Book.objects.filter(user=user).values_list("id", flat=True))
+        Quote.objects.bulk_create(
+            (Quote(user=user, book_id=book_id, content=f"Цитата {book_id}") for book_id in book_ids),
+            batch_size=1000,
+        )
+
+        books = Book.objects.filter(user=user).order_by("-addedDate", "-id")
+        quotes = Quote.objects.filter(user=user).select_related("book", "user").order_by("-createdAt", "-id")
+        cases = [
+            ("books", books, BookSerializer(fields=BookSerializer.LIST_FIELDS)),
+            ("quotes", quotes, QuoteSerializer()),
+        ]
+        for name, queryset, serializer in cases:
+            slow = self.best(repeat, lambda: self.serialize(queryset, serializer))
+            fast = self.best(repeat, lambda: self.project(queryset, serializer))
+            self.stdout.write(
+                f"{name:<8}{rows:>8}{slow / rows * 1e6:>24.2f}"
+                f"{fast / rows * 1e6:>20.2f}{slow / fast:>13.1f}x"
+            )
+
+    @staticmethod
+    def best(repeat, func):
+        timings = []
+        for _ in range(repeat):
+            started = time.process_time()
+            func()
+            timings.append(time.process_time() - started)
+        return min(timings)
+
+    @staticmethod
+    def serialize(queryset, serializer):
+        data = type(serializer)(list(queryset), many=True, **serializer._kwargs).data
+        return JSONRenderer().render(data)
+
+    @staticmethod
+    def project(queryset, serializer):
+        projection = build_projection(serializer)
+        return JSONRenderer().render([projection.represent(row) for row in projection.values(queryset)])
@@ -0,0 +1,82 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+
+from tracker.aggregates import session_aggregates
+from tracker.compaction import compact_sessions, compaction_age
+from tracker.models import User
+from tracker.series import session_series
+
+
+class _Rollback(Exception):
+    """Скасовує транзакцію пробного запуску після вимірювань."""
+
+
+class Command(BaseCommand):
+    help = (
+        "Ущільнює сесії читання, старші за TRACKER_SESSION_COMPACTION_DAYS, до однієї "
+        "сесії на книгу за день: сторінки й тривалість сумуються, нотатки та цитати "
+        "об'єднуються. З --dry-run ущільнення виконується в транзакції, що "
+        "відкочується, і виводить кількість звільнених рядків та час запитів "
+        "статистики до й після."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--days", type=int, help="Вік сесій у днях (за замовчуванням — з налаштувань).")
+        parser.add_argument("--user", dest="email", help="Email користувача (за замовчуванням — усі).")
+        parser.add_argument("--dry-run", action="store_true", help="Лише звіт, без змін у БД.")
+        parser.add_argument("--repeat", type=int, default=3, help="Повтори вимірювання; береться найкращий.")
+
+    def handle(self, *args, **options):
+        age = compaction_age() if options["days"] is None else datetime.timedelta(days=options["days"])
+        before = timezone.now() - age
+        users = None
+        if options["email"]:
+            users = User.objects.filter(email=options["email"])
+            if not users.exists():
+                raise CommandError(f"Користувача {options['email']} не знайдено.")
+
+        if not options["dry_run"]:
+            report = compact_sessions(before, users)
+            self.write_report(report, prefix="Ущільнення завершено: ")
+            return
+
+        try:
+            with transaction.atomic():
+                candidates = list((users or User.objects).filter(books__reading_sessions__date__lt=before).distinct())
+                slow = self.measure(candidates, options["repeat"])
+                report = compact_sessions(before, users)
+                fast = self.measure(candidates, options["repeat"])
+                raise _Rollback
+        except _Rollback:
+            pass
+        self.write_report(report, prefix="Пробний запуск (зміни скасовано): ")
+        if candidates:
+            self.stdout.write(
+                f"Запити статистики сесій для {len(candidates)} користувачів: "
+                f"{slow * 1000:.1f} мс -> {fast * 1000:.1f} мс ({slow / fast if fast else 0:.1f}x)."
+            )
+
+    def write_report(self, report, prefix):
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"{prefix}об'єднано {report.groups} груп у {report.users} користувачів, "
+                f"сесій {report.sessions_before} -> {report.sessions_after}, "
+                f"звільнено рядків: {report.reclaimed} ({report.seconds:.1f} с)."
+            )
+        )
+
+    @staticmethod
+    def measure(users, repeat):
+        """Найкращий час агрегатів сесій і денного ряду для користувачів."""
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            for user in users:
+                session_aggregates(user)
+                session_series(user.pk, "day")
+            timings.append(time.perf_counter() - started)
+        return min(timings)
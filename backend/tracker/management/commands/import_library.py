@@ -0,0 +1,53 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.imports import BATCH_SIZE, FORMATS, import_library
+from tracker.models import User
+
+
+class Command(BaseCommand):
+    help = (
+        "Потоково імпортує книги з файлу (CSV, експорт Goodreads або JSON lines) "
+        "у бібліотеку користувача. Рядки валідуються BookSerializer і записуються "
+        "пакетами; після кожного пакета виводиться прогрес і швидкість (рядків/с)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Шлях до файлу імпорту.")
+        parser.add_argument("--user", required=True, help="Email власника книг.")
+        parser.add_argument(
+            "--format",
+            choices=FORMATS,
+            help="Формат файлу (за замовчуванням — за розширенням; Goodreads визначається за заголовками).",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE, help="Книг в одному пакеті запису.")
+
+    def handle(self, *args, **options):
+        user = User.objects.filter(email=options["user"]).first()
+        if user is None:
+            raise CommandError(f"Користувача {options['user']} не знайдено.")
+
+        path = options["path"]
+        import_format = options["format"] or ("jsonl" if path.lower().endswith((".jsonl", ".ndjson")) else "csv")
+
+        def on_progress(report):
+            self.stdout.write(
+                f"Оброблено {report.processed} рядків, створено {report.created} книг "
+                f"({report.rows_per_second:.0f} рядків/с)"
+            )
+
+        try:
+            with open(path, "rb") as stream:
+                report = import_library(
+                    user, stream, import_format, batch_size=options["batch_size"], on_progress=on_progress
+                )
+        except OSError as exc:
+            raise CommandError(f"Не вдалося відкрити файл: {exc}") from exc
+
+        for error in report.errors:
+            self.stderr.write(f"Рядок {error['line']}: {error['errors']}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Імпорт завершено: створено {report.created} книг, пропущено {report.skipped} "
+                f"за {report.seconds:.1f} с ({report.rows_per_second:.0f} рядків/с)."
+            )
+        )
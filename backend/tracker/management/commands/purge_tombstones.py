@@ -0,0 +1,19 @@
+from django.core.management.base import BaseCommand
+
+from tracker.sync import purge_tombstones, tombstone_retention
+
+
+class Command(BaseCommand):
+    help = (
+        "Видаляє записи журналу видалень (Tombstone), старші за строк зберігання "
+        "TRACKER_TOMBSTONE_RETENTION_DAYS. Клієнти з маркером синхронізації, "
+        "старшим за цей строк, отримують повний знімок бібліотеки."
+    )
+
+    def handle(self, *args, **options):
+        deleted = purge_tombstones()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Видалено записів: {deleted} (строк зберігання — {tombstone_retention().days} дн.)."
+            )
+        )
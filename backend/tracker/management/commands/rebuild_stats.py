@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import User
+from tracker.rollups import rebuild_user_rollups
+from tracker.stats import rebuild_user_stats
+
+
+class Command(BaseCommand):
+    help = (
+        "Перераховує матеріалізовану статистику читання (UserReadingStats) та "
+        "щоденні зведення (DailyReadingRollup) з нуля і повідомляє про розбіжності "
+        "з інкрементально накопиченими значеннями."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            dest="email",
+            help="Email користувача (за замовчуванням — усі користувачі).",
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by("pk")
+        if options["email"]:
+            users = users.filter(email=options["email"])
+            if not users.exists():
+                raise CommandError(f"Користувача {options['email']} не знайдено.")
+
+        total = 0
+        drifted = 0
+        for user in users.iterator():
+            total += 1
+            _, drift = rebuild_user_stats(user)
+            changed_days = rebuild_user_rollups(user)
+            if not drift and not changed_days:
+                continue
+
+            drifted += 1
+            self.stdout.write(self.style.WARNING(f"Розбіжність для {user.email}:"))
+            for field, (stored, actual) in sorted(drift.items()):
+                self.stdout.write(f"  {field}: {stored!r} -> {actual!r}")
+            if changed_days:
+                self.stdout.write(f"  щоденних зведень виправлено: {changed_days}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Перераховано статистику для {total} користувачів, розбіжностей: {drifted}."
+        ))
@@ -13,8 +13,10 @@ import time
 import traceback
 import uuid
 
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
 from django.conf import settings
 from django.http import JsonResponse
+from django.utils.functional import SimpleLazyObject
 
 # Ініціалізація системного логера застосунку
 logger = logging.getLogger('tracker')
@@ -28,8 +30,14 @@ class ExceptionLoggingMiddleware:
     3. Збір контекстної інформації (користувач, маршрут, параметри).
     4. Запис детального трейсу в систему логування.
     5. Формування безпечної JSON-відповіді для фронтенду.
+
+    Підтримує обидва режими: під ASGI асинхронні представлення не
+    переводяться в окремий потік через цей middleware.
     """
 
+    sync_capable = True
+    async_capable = True
+
     def __init__(self, get_response):
         """Ініціалізація екземпляру middleware.
 
@@ -37,6 +45,26 @@ class ExceptionLoggingMiddleware:
             get_response (callable): Функція, що представляє наступний крок у ланцюжку Django.
         """
         self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+
+    def _log_performance(self, request, response, start_time, user):
+        """Записує метрику тривалості запиту (WARNING для запитів, довших за 500 мс)."""
+        # Розрахунок тривалості обробки в мілісекундах
+        duration = (time.time() - start_time) * 1000
+
+        # Формування метрики продуктивності
+        log_message = (
+            f"Performance Metrics | Path: {request.path} | "
+            f"Method: {request.method} | Duration: {duration:.2f}ms | "
+            f"Status: {response.status_code} | User ID: {user.id if user.is_authenticated else 'Anon'}"
+        )
+
+        # Перевірка порогу продуктивності
+        if duration > 500:
+            logger.warning(f"SLOW_ENDPOINT detected: {log_message}")
+        else:
+            logger.info(log_message)
 
     def __call__(self, request):
         """
@@ -58,24 +86,21 @@ class ExceptionLoggingMiddleware:
         # Логування вхідного запиту для аудиту безпеки
         logger.info(f"Request: {request.method} {request.get_full_path()} from {request.META.get('REMOTE_ADDR')}")
         
-        response = self.get_response(request)
+        if iscoroutinefunction(self):
+            return self.__acall__(request, start_time)
 
-        # Розрахунок тривалості обробки в мілісекундах
-        duration = (time.time() - start_time) * 1000  
-        
-        # Формування метрики продуктивності
-        log_message = (
-            f"Performance Metrics | Path: {request.path} | "
-            f"Method: {request.method} | Duration: {duration:.2f}ms | "
-            f"Status: {response.status_code} | User ID: {request.user.id if request.user.is_authenticated else 'Anon'}"
-        )
+        response = self.get_response(request)
+        self._log_performance(request, response, start_time, request.user)
+        return response
 
-        # Перевірка порогу продуктивності
-        if duration > 500: 
-            logger.warning(f"SLOW_ENDPOINT detected: {log_message}")
-        else:
-            logger.info(log_message)
-            
+    async def __acall__(self, request, start_time):
+        """Асинхронний варіант `__call__` для ASGI."""
+        response = await self.get_response(request)
+        user = request.user
+        # Користувача сесії (ще не завантаженого) читаємо без синхронного запиту до БД
+        if isinstance(user, SimpleLazyObject):
+            user = await request.auser()
+        self._log_performance(request, response, start_time, user)
         return response
 
     def process_exception(self, request, exception):
@@ -0,0 +1,40 @@
+# Generated by Django 6.0.2 on 2026-10-18 00:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0009_alter_user_username'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UserReadingStats',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='reading_stats', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total_books', models.IntegerField(default=0)),
+                ('reading_count', models.IntegerField(default=0)),
+                ('read_count', models.IntegerField(default=0)),
+                ('want_count', models.IntegerField(default=0)),
+                ('favorite_count', models.IntegerField(default=0)),
+                ('custom_count', models.IntegerField(default=0)),
+                ('read_pages_total', models.IntegerField(default=0)),
+                ('read_pages_books', models.IntegerField(default=0)),
+                ('rating_total', models.IntegerField(default=0)),
+                ('rating_count', models.IntegerField(default=0)),
+                ('session_count', models.IntegerField(default=0)),
+                ('session_duration_total', models.IntegerField(default=0)),
+                ('session_duration_count', models.IntegerField(default=0)),
+                ('books_with_sessions', models.IntegerField(default=0)),
+                ('genre_counts', models.JSONField(default=dict)),
+                ('author_counts', models.JSONField(default=dict)),
+                ('monthly_read_counts', models.JSONField(default=dict)),
+                ('recent_books', models.JSONField(default=list)),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
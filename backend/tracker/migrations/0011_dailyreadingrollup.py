@@ -0,0 +1,66 @@
+# Generated by Django 6.0.2 on 2026-10-18 01:05
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+def backfill_rollups(apps, schema_editor):
+    """Заповнює щоденні зведення з наявних сесій, циклів та прочитаних книг."""
+    Book = apps.get_model('tracker', 'Book')
+    ReadingSession = apps.get_model('tracker', 'ReadingSession')
+    ReadingCycle = apps.get_model('tracker', 'ReadingCycle')
+    DailyReadingRollup = apps.get_model('tracker', 'DailyReadingRollup')
+
+    rollups = {}
+
+    def row(user_id, day):
+        return rollups.setdefault(
+            (user_id, day),
+            {'pages_read': 0, 'seconds_read': 0, 'sessions_count': 0, 'books_finished': 0},
+        )
+
+    sessions = ReadingSession.objects.values_list('book__user_id', 'date', 'pages_read', 'duration')
+    for user_id, date, pages_read, duration in sessions.iterator():
+        values = row(user_id, timezone.localdate(date))
+        values['pages_read'] += pages_read or 0
+        values['seconds_read'] += duration or 0
+        values['sessions_count'] += 1
+
+    finished = Book.objects.filter(status='read', endDate__isnull=False).values_list('user_id', 'endDate')
+    cycles = ReadingCycle.objects.values_list('book__user_id', 'end_date')
+    for user_id, day in [*finished.iterator(), *cycles.iterator()]:
+        row(user_id, day)['books_finished'] += 1
+
+    DailyReadingRollup.objects.bulk_create(
+        [DailyReadingRollup(user_id=user_id, day=day, **values) for (user_id, day), values in rollups.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0010_userreadingstats'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyReadingRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField()),
+                ('pages_read', models.IntegerField(default=0)),
+                ('seconds_read', models.IntegerField(default=0)),
+                ('sessions_count', models.IntegerField(default=0)),
+                ('books_finished', models.IntegerField(default=0)),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_rollups', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['day'],
+                'constraints': [models.UniqueConstraint(fields=('user', 'day'), name='unique_user_daily_rollup')],
+            },
+        ),
+        migrations.RunPython(backfill_rollups, migrations.RunPython.noop),
+    ]
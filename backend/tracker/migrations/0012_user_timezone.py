@@ -0,0 +1,19 @@
+# Generated by Django 6.0.2 on 2026-10-18 02:10
+
+import tracker.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0011_dailyreadingrollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='timezone',
+            field=models.CharField(default='UTC', help_text='Часовий пояс IANA для підрахунку днів активності', max_length=64, validators=[tracker.models.validate_timezone]),
+        ),
+    ]
@@ -0,0 +1,126 @@
+# Generated by Django 6.0.2 on 2026-10-18 03:20
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import OperationalError, migrations, models, transaction
+
+FTS_TABLE = "tracker_searchdocument_fts"
+
+CREATE_FTS = [
+    f"""
+    CREATE VIRTUAL TABLE {FTS_TABLE} USING fts5(
+        owner, title, content, tokenize = 'unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER tracker_searchdocument_ai AFTER INSERT ON tracker_searchdocument BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, owner, title, content)
+        VALUES (new.id, 'u' || new.user_id, new.title, new.content);
+    END
+    """,
+    f"""
+    CREATE TRIGGER tracker_searchdocument_ad AFTER DELETE ON tracker_searchdocument BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+    END
+    """,
+    f"""
+    CREATE TRIGGER tracker_searchdocument_au AFTER UPDATE ON tracker_searchdocument BEGIN
+        DELETE FROM {FTS_TABLE} WHERE rowid = old.id;
+        INSERT INTO {FTS_TABLE}(rowid, owner, title, content)
+        VALUES (new.id, 'u' || new.user_id, new.title, new.content);
+    END
+    """,
+]
+
+DROP_FTS = [
+    "DROP TRIGGER IF EXISTS tracker_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS tracker_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS tracker_searchdocument_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def create_fts(apps, schema_editor):
+    """Створює таблицю FTS5 і тригери синхронізації (лише SQLite з підтримкою FTS5)."""
+    if schema_editor.connection.vendor != "sqlite":
+        return
+    try:
+        with transaction.atomic(using=schema_editor.connection.alias):
+            for statement in CREATE_FTS:
+                schema_editor.execute(statement)
+    except OperationalError:
+        # SQLite зібрано без FTS5 — пошук працюватиме через резервний шлях
+        pass
+
+
+def drop_fts(apps, schema_editor):
+    if schema_editor.connection.vendor == "sqlite":
+        for statement in DROP_FTS:
+            schema_editor.execute(statement)
+
+
+def backfill_documents(apps, schema_editor):
+    """Індексує наявні книги, нотатки, цитати та нотатки сесій."""
+    Book = apps.get_model("tracker", "Book")
+    Note = apps.get_model("tracker", "Note")
+    Quote = apps.get_model("tracker", "Quote")
+    ReadingSession = apps.get_model("tracker", "ReadingSession")
+    SearchDocument = apps.get_model("tracker", "SearchDocument")
+
+    def documents():
+        for book in Book.objects.values("id", "user_id", "title", "author", "description"):
+            yield SearchDocument(
+                user_id=book["user_id"],
+                book_id=book["id"],
+                kind="book",
+                object_id=book["id"],
+                title=f"{book['title']} {book['author']}",
+                content=book["description"] or "",
+            )
+        for kind, model in (("note", Note), ("quote", Quote)):
+            for row in model.objects.values("id", "user_id", "book_id", "content"):
+                yield SearchDocument(
+                    user_id=row["user_id"],
+                    book_id=row["book_id"],
+                    kind=kind,
+                    object_id=row["id"],
+                    content=row["content"],
+                )
+        sessions = ReadingSession.objects.exclude(note__isnull=True).exclude(note="")
+        for row in sessions.values("id", "book_id", "book__user_id", "note"):
+            yield SearchDocument(
+                user_id=row["book__user_id"],
+                book_id=row["book_id"],
+                kind="session",
+                object_id=row["id"],
+                content=row["note"],
+            )
+
+    SearchDocument.objects.bulk_create(documents(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_user_timezone'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('book', 'Книга'), ('note', 'Нотатка'), ('quote', 'Цитата'), ('session', 'Сесія читання')], max_length=10)),
+                ('object_id', models.IntegerField()),
+                ('title', models.CharField(blank=True, default='', max_length=512)),
+                ('content', models.TextField(blank=True, default='')),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to='tracker.book')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_documents', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('kind', 'object_id'), name='unique_search_document')],
+            },
+        ),
+        migrations.RunPython(create_fts, drop_fts),
+        migrations.RunPython(backfill_documents, migrations.RunPython.noop),
+    ]
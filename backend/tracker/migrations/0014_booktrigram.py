@@ -0,0 +1,44 @@
+# Generated by Django 6.0.2 on 2026-10-18 03:55
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from tracker.trigrams import book_trigrams
+
+
+def backfill_trigrams(apps, schema_editor):
+    """Індексує триграми назв і авторів наявних книг."""
+    Book = apps.get_model("tracker", "Book")
+    BookTrigram = apps.get_model("tracker", "BookTrigram")
+
+    def rows():
+        for book in Book.objects.values("id", "user_id", "title", "author").iterator():
+            for trigram in book_trigrams(book["title"], book["author"]):
+                yield BookTrigram(user_id=book["user_id"], book_id=book["id"], trigram=trigram)
+
+    BookTrigram.objects.bulk_create(rows(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0013_searchdocument'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BookTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('book', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='trigrams', to='tracker.book')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='book_trigrams', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'trigram', 'book'], name='book_trigram_lookup')],
+                'constraints': [models.UniqueConstraint(fields=('book', 'trigram'), name='unique_book_trigram')],
+            },
+        ),
+        migrations.RunPython(backfill_trigrams, migrations.RunPython.noop),
+    ]
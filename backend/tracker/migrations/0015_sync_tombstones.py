@@ -0,0 +1,65 @@
+# Generated by Django 6.0.2 on 2026-10-18 04:30
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0014_booktrigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('book', 'Книга'), ('session', 'Сесія читання'), ('note', 'Нотатка'), ('quote', 'Цитата'), ('cycle', 'Цикл читання')], max_length=10)),
+                ('object_id', models.IntegerField()),
+                ('deletedAt', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='note',
+            name='updatedAt',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='quote',
+            name='updatedAt',
+            field=models.DateTimeField(auto_now=True),
+        ),
+        migrations.AddField(
+            model_name='readingcycle',
+            name='updatedAt',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddField(
+            model_name='readingsession',
+            name='updatedAt',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['user', 'updatedAt'], name='book_user_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='note',
+            index=models.Index(fields=['user', 'updatedAt'], name='note_user_updated'),
+        ),
+        migrations.AddIndex(
+            model_name='quote',
+            index=models.Index(fields=['user', 'updatedAt'], name='quote_user_updated'),
+        ),
+        migrations.AddField(
+            model_name='tombstone',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='tombstones', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddIndex(
+            model_name='tombstone',
+            index=models.Index(fields=['user', 'deletedAt'], name='tombstone_user_deleted'),
+        ),
+    ]
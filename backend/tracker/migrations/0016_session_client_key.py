@@ -0,0 +1,22 @@
+# Generated by Django 6.0.2 on 2026-10-18 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0015_sync_tombstones'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='readingsession',
+            name='client_key',
+            field=models.CharField(blank=True, editable=False, max_length=64, null=True),
+        ),
+        migrations.AddConstraint(
+            model_name='readingsession',
+            constraint=models.UniqueConstraint(condition=models.Q(('client_key__isnull', False)), fields=('book', 'client_key'), name='unique_session_client_key'),
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 6.0.2 on 2026-10-18 06:10
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0016_session_client_key'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogQuery',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.CharField(max_length=64, unique=True)),
+                ('query', models.TextField()),
+                ('volumes', models.JSONField(default=list)),
+                ('fetchedAt', models.DateTimeField()),
+            ],
+        ),
+        migrations.CreateModel(
+            name='CatalogVolume',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('googleId', models.CharField(max_length=64, unique=True)),
+                ('isbn', models.CharField(blank=True, max_length=13, null=True, unique=True)),
+                ('title', models.CharField(max_length=512)),
+                ('author', models.CharField(max_length=512)),
+                ('genre', models.CharField(max_length=255)),
+                ('language', models.CharField(max_length=16)),
+                ('year', models.IntegerField(default=0)),
+                ('pages', models.IntegerField(default=0)),
+                ('description', models.TextField(blank=True, default='')),
+                ('cover', models.TextField(blank=True, null=True)),
+                ('externalRating', models.FloatField(blank=True, null=True)),
+                ('ratingsCount', models.IntegerField(blank=True, null=True)),
+                ('updatedAt', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='book',
+            name='catalog',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='books', to='tracker.catalogvolume'),
+        ),
+    ]
@@ -6,9 +6,12 @@
 таку як автоматичний розрахунок відсотка прочитаного та фіксацію дат завершення.
 """
 
+import copy
 import logging
+import zoneinfo
 
 from django.contrib.auth.models import AbstractUser, Group, Permission
+from django.core.exceptions import ValidationError
 from django.db import models
 from django.utils import timezone
 
@@ -16,6 +19,108 @@ from django.utils import timezone
 logger = logging.getLogger("tracker")
 
 
+def validate_timezone(value):
+    """Перевіряє, що значення є назвою часового поясу IANA (наприклад, 'Europe/Kyiv').
+
+    Raises:
+        ValidationError: Якщо часовий пояс невідомий.
+    """
+    if value not in zoneinfo.available_timezones():
+        raise ValidationError(f"Невідомий часовий пояс: {value}")
+
+
+class TrackedFieldsMixin(models.Model):
+    """Відстеження змінених полів моделі без додаткового читання з БД.
+
+    Під час завантаження з БД (`from_db`, `refresh_from_db`) і після кожного
+    збереження запам'ятовуються значення полів. Порівняння з ними в пам'яті
+    дає попередній стан об'єкта та перелік змінених полів, тож `save` оновлює
+    лише їх (`update_fields`) замість запису всіх колонок.
+
+    Знімок відображає стан на момент завантаження: зміни, зроблені в БД в обхід
+    екземпляра (наприклад, `QuerySet.update()`), він не бачить.
+
+    Абстрактна модель (без полів), тож `from_db` і `refresh_from_db`
+    перевизначають методи `Model` з тими самими сигнатурами.
+    """
+
+    class Meta:
+        abstract = True
+
+    def _field_snapshot(self, fields=None):
+        snapshot = dict(getattr(self, "_loaded_values", None) or {})
+        for field in self._meta.concrete_fields:
+            if field.primary_key or (fields is not None and field.attname not in fields and field.name not in fields):
+                continue
+            value = self.__dict__.get(field.attname, models.DEFERRED)
+            if value is models.DEFERRED or hasattr(value, "resolve_expression"):
+                snapshot.pop(field.attname, None)
+            else:
+                snapshot[field.attname] = value
+        self._loaded_values = snapshot
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._field_snapshot()
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._field_snapshot(fields)
+
+    def mark_clean(self):
+        """Вважає поточні значення полів збереженими (після запису в обхід `save`)."""
+        self._loaded_values = None
+        self._field_snapshot()
+
+    def is_tracked(self):
+        """Чи відомий стан об'єкта в БД (завантажений або збережений екземпляр)."""
+        return self.pk is not None and getattr(self, "_loaded_values", None) is not None
+
+    def changed_fields(self):
+        """Повертає назви полів, значення яких відрізняються від збережених.
+
+        Поля, значення яких невідоме (відкладені й згодом присвоєні),
+        вважаються зміненими.
+        """
+        loaded = getattr(self, "_loaded_values", None) or {}
+        changed = set()
+        for field in self._meta.concrete_fields:
+            if field.primary_key or field.attname not in self.__dict__:
+                continue
+            if field.attname not in loaded or loaded[field.attname] != self.__dict__[field.attname]:
+                changed.add(field.name)
+        return changed
+
+    def previous_values(self, fields):
+        """Збережені значення полів `fields` або `None`, якщо якесь із них невідоме."""
+        loaded = getattr(self, "_loaded_values", None) or {}
+        attnames = {name: self._meta.get_field(name).attname for name in fields}
+        if not self.is_tracked() or any(attname not in loaded for attname in attnames.values()):
+            return None
+        return {name: loaded[attname] for name, attname in attnames.items()}
+
+    def previous_instance(self):
+        """Копія об'єкта зі збереженими значеннями полів (без запиту до БД)."""
+        previous = copy.copy(self)
+        previous.__dict__.update(self._loaded_values)
+        return previous
+
+    def save(self, *args, **kwargs):
+        """Зберігає лише змінені поля (та поля `auto_now`) відстежуваного об'єкта."""
+        if (
+            self.is_tracked()
+            and not args
+            and kwargs.get("update_fields") is None
+            and not kwargs.get("force_insert")
+        ):
+            auto_now = {field.name for field in self._meta.concrete_fields if getattr(field, "auto_now", False)}
+            kwargs["update_fields"] = self.changed_fields() | auto_now
+        super().save(*args, **kwargs)
+        self._field_snapshot()
+
+
 class User(AbstractUser):
     """Кастомна модель користувача, що розширює стандартну модель Django `AbstractUser`.
 
@@ -30,6 +135,8 @@ class User(AbstractUser):
         bio (TextField, optional): Коротка інформація про користувача.
         yearly_goal (IntegerField): Мета користувача щодо кількості прочитаних книг на рік (за замовчуванням 12).
         avatar (ImageField, optional): Зображення профілю користувача.
+        timezone (CharField): Часовий пояс IANA, у якому рахуються дні активності
+            (щоденні зведення, теплова карта, серії читання).
 
     """
 
@@ -80,6 +187,13 @@ class User(AbstractUser):
 
     avatar = models.ImageField(upload_to="avatars/", blank=True, null=True)
 
+    timezone = models.CharField(
+        max_length=64,
+        default="UTC",
+        validators=[validate_timezone],
+        help_text="Часовий пояс IANA для підрахунку днів активності",
+    )
+
     def __str__(self):
         """Повертає рядкове представлення користувача.
 
@@ -90,7 +204,7 @@ class User(AbstractUser):
         return self.email or self.username
 
 
-class Book(models.Model):
+class Book(TrackedFieldsMixin, models.Model):
     """Модель, що представляє книгу в особистій бібліотеці користувача.
 
     Містить метадані книги, інформацію про джерело (Google Books або ручне введення)
@@ -121,6 +235,8 @@ class Book(models.Model):
         endDate (DateField, optional): Дата завершення читання. Встановлюється автоматично
             при переході статусу в `read`.
         note (TextField, optional): Загальна нотатка до книги.
+        catalog (ForeignKey, optional): Том спільного каталогу (`CatalogVolume`),
+            з якого книгу додано з пошуку Google Books.
 
     """
 
@@ -148,6 +264,9 @@ class Book(models.Model):
     ratingsCount = models.IntegerField(
         null=True, blank=True
     )  # Кількість голосів для рейтингу Google
+    catalog = models.ForeignKey(
+        "CatalogVolume", null=True, blank=True, on_delete=models.SET_NULL, related_name="books"
+    )
 
     # Статус та прогрес (динамічні поля)
     status = models.CharField(
@@ -169,43 +288,26 @@ class Book(models.Model):
     endDate = models.DateField(null=True, blank=True)
     note = models.TextField(null=True, blank=True)
 
-    def save(self, *args, **kwargs):
-        """Перевизначений метод збереження моделі з інтегрованою бізнес-логікою життєвого циклу книги.
+    class Meta:
+        indexes = [models.Index(fields=["user", "updatedAt"], name="book_user_updated")]
 
-        Цей метод діє як "запобіжник" та автоматизує рутинні оновлення даних перед фактичним
-        записом у базу даних. Він виконує чотири основні перевірки:
+    def apply_lifecycle_rules(self, today):
+        """Застосовує правила життєвого циклу книги до полів екземпляра (без запису в БД).
 
-        1. Динамічний прогрес: Автоматично обчислює поле `progress` (0-100%) на основі
-           відношення `currentPage` до `totalPages`.
-        2. Автоматичний фініш (Сторінки -> Статус): Якщо користувач вказав поточну сторінку,
-           яка дорівнює або перевищує загальну кількість сторінок, статус книги
-           автоматично змінюється на 'read'.
-        3. Авто-старт читання: При переході статусу в 'reading' автоматично фіксується
-           поточна дата у `startDate` (якщо вона ще не була встановлена).
-        4. Синхронізація завершення: При статусі 'read' автоматично встановлюється `endDate`.
-           Якщо статус змінено на 'read' вручну (або через API), але сторінки не оновлені,
-           метод примусово підтягує `currentPage` до максимуму та встановлює `progress` на 100%.
+        Правила описані в `save`: прогрес зі сторінок, автоматичний фініш,
+        дата початку читання, дата завершення та примусовий повний прогрес.
+        Метод не звертається до БД, тому використовується і при масових
+        операціях (`tracker.bulk`) для попереднього проходу по всіх книгах.
 
         Args:
-            *args: Позиційні аргументи, що передаються в базовий метод `save` (наприклад, force_insert).
-            **kwargs: Іменовані аргументи (наприклад, update_fields).
+            today (date): Дата, що підставляється у `startDate`/`endDate`.
 
-        Raises:
-            Exception: У разі критичного збою при записі об'єкта в базу даних.
-                       Помилка перехоплюється для логування (CRITICAL), після чого прокидається далі.
+        Returns:
+            set: Назви застосованих правил, що потребують логування
+            (`started`, `forced_full_progress`).
         """
+        applied = set()
 
-        # ЗАПАМ'ЯТОВУЄМО СТАН ДО ЗБЕРЕЖЕННЯ 
-        old_current_page = 0
-        is_new = self.pk is None
-        
-        if not is_new:
-            try:
-                old_book = Book.objects.get(pk=self.pk)
-                old_current_page = old_book.currentPage
-            except Book.DoesNotExist:
-                pass
-            
         # Розрахунок відсоткового прогресу
         if self.totalPages and self.totalPages > 0:
             self.progress = min(100, round((self.currentPage / self.totalPages) * 100))
@@ -222,19 +324,70 @@ class Book(models.Model):
 
         # Автоматична дата початку (якщо почали читати)
         if self.status == "reading" and not self.startDate:
-            self.startDate = timezone.now().date()
-            logger.info(f"Book {self.id}: Start date set.")
+            self.startDate = today
+            applied.add("started")
 
         # Автоматична дата завершення (якщо статус 'read')
         if self.status == "read":
             if not self.endDate:
-                self.endDate = timezone.now().date()
+                self.endDate = today
 
             # На випадок, якщо статус змінили вручну, але сторінки не підтягнули
             if self.totalPages and self.currentPage < self.totalPages:
                 self.currentPage = self.totalPages
                 self.progress = 100
-                logger.info(f"Book {self.id}: Status 'read' forced full progress.")
+                applied.add("forced_full_progress")
+
+        return applied
+
+    def save(self, *args, **kwargs):
+        """Перевизначений метод збереження моделі з інтегрованою бізнес-логікою життєвого циклу книги.
+
+        Цей метод діє як "запобіжник" та автоматизує рутинні оновлення даних перед фактичним
+        записом у базу даних. Він виконує чотири основні перевірки:
+
+        1. Динамічний прогрес: Автоматично обчислює поле `progress` (0-100%) на основі
+           відношення `currentPage` до `totalPages`.
+        2. Автоматичний фініш (Сторінки -> Статус): Якщо користувач вказав поточну сторінку,
+           яка дорівнює або перевищує загальну кількість сторінок, статус книги
+           автоматично змінюється на 'read'.
+        3. Авто-старт читання: При переході статусу в 'reading' автоматично фіксується
+           поточна дата у `startDate` (якщо вона ще не була встановлена).
+        4. Синхронізація завершення: При статусі 'read' автоматично встановлюється `endDate`.
+           Якщо статус змінено на 'read' вручну (або через API), але сторінки не оновлені,
+           метод примусово підтягує `currentPage` до максимуму та встановлює `progress` на 100%.
+
+        Попередній стан (для автоматичної сесії та сигналів) береться зі знімка
+        `TrackedFieldsMixin`, а оновлення записує лише змінені поля.
+
+        Args:
+            *args: Позиційні аргументи, що передаються в базовий метод `save` (наприклад, force_insert).
+            **kwargs: Іменовані аргументи (наприклад, update_fields).
+
+        Raises:
+            Exception: У разі критичного збою при записі об'єкта в базу даних.
+                       Помилка перехоплюється для логування (CRITICAL), після чого прокидається далі.
+        """
+
+        # ЗАПАМ'ЯТОВУЄМО СТАН ДО ЗБЕРЕЖЕННЯ
+        # Попередній стан запису використовується сигналами для інкрементального
+        # оновлення статистики (див. `tracker.stats`). Для завантаженої книги він
+        # відомий зі знімка `TrackedFieldsMixin`, тож додатковий SELECT не потрібен.
+        old_current_page = 0
+        self._previous_state = None
+
+        if self.is_tracked():
+            self._previous_state = self.previous_instance()
+        elif self.pk is not None:
+            self._previous_state = Book.objects.filter(pk=self.pk).first()
+        if self._previous_state is not None:
+            old_current_page = self._previous_state.currentPage
+
+        applied = self.apply_lifecycle_rules(timezone.now().date())
+        if "started" in applied:
+            logger.info(f"Book {self.id}: Start date set.")
+        if "forced_full_progress" in applied:
+            logger.info(f"Book {self.id}: Status 'read' forced full progress.")
 
         try:
             super().save(*args, **kwargs)
@@ -264,7 +417,7 @@ class Book(models.Model):
         return f"{self.title} by {self.author} ({self.user.email})"
 
 
-class ReadingSession(models.Model):
+class ReadingSession(TrackedFieldsMixin, models.Model):
     """Модель, що представляє окрему сесію читання книги користувачем.
 
     Дозволяє відстежувати, скільки часу користувач витратив на читання певної книги
@@ -275,6 +428,9 @@ class ReadingSession(models.Model):
         date (DateField): Дата проведення сесії (встановлюється автоматично).
         duration (IntegerField): Тривалість читання в секундах.
         note (TextField, optional): Короткий запис або думки щодо цієї конкретної сесії.
+        updatedAt (DateTimeField): Час останньої зміни (для дельта-синхронізації).
+        client_key (CharField, optional): Ключ ідемпотентності, згенерований клієнтом
+            (офлайн-таймер); унікальний у межах книги.
 
     """
 
@@ -286,9 +442,31 @@ class ReadingSession(models.Model):
     duration = models.IntegerField(help_text="Тривалість у секундах", null=True, blank=True, default=0)
     note = models.TextField(blank=True, null=True)
     quote = models.TextField(blank=True, null=True)
+    updatedAt = models.DateTimeField(auto_now=True, db_index=True)
+    client_key = models.CharField(max_length=64, null=True, blank=True, editable=False)
     
     class Meta:
         ordering = ["-date"] # Найновіші сесії зверху
+        constraints = [
+            models.UniqueConstraint(
+                fields=["book", "client_key"],
+                condition=models.Q(client_key__isnull=False),
+                name="unique_session_client_key",
+            )
+        ]
+
+    def save(self, *args, **kwargs):
+        """Зберігає сесію, запам'ятовуючи її попередній стан.
+
+        Попередні значення `date`, `pages_read`, `duration` та `note`
+        використовуються сигналами для інкрементального оновлення статистики,
+        щоденних зведень та пошукового індексу.
+        """
+        fields = ("date", "pages_read", "duration", "note")
+        self._previous_state = self.previous_values(fields)
+        if self._previous_state is None and self.pk is not None:
+            self._previous_state = ReadingSession.objects.filter(pk=self.pk).values(*fields).first()
+        super().save(*args, **kwargs)
 
     def __str__(self):
         """Повертає рядкове представлення сесії читання.
@@ -311,6 +489,7 @@ class Note(models.Model):
         book (ForeignKey): Посилання на книгу, якої стосується нотатка (Book).
         content (TextField): Текст нотатки.
         createdAt (DateTimeField): Дата та час створення нотатки.
+        updatedAt (DateTimeField): Час останньої зміни нотатки.
         isFavorite (BooleanField): Прапорець, що вказує, чи додана нотатка до улюблених.
 
     """
@@ -319,8 +498,12 @@ class Note(models.Model):
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="book_notes")
     content = models.TextField()
     createdAt = models.DateTimeField(auto_now_add=True)
+    updatedAt = models.DateTimeField(auto_now=True)
     isFavorite = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "updatedAt"], name="note_user_updated")]
+
     def __str__(self):
         """Повертає рядкове представлення нотатки.
 
@@ -342,6 +525,7 @@ class Quote(models.Model):
         book (ForeignKey): Посилання на книгу, з якої взято цитату (Book).
         content (TextField): Текст цитати.
         createdAt (DateTimeField): Дата та час збереження цитати.
+        updatedAt (DateTimeField): Час останньої зміни цитати.
         isFavorite (BooleanField): Прапорець, що вказує, чи додана цитата до улюблених.
 
     """
@@ -350,8 +534,12 @@ class Quote(models.Model):
     book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="book_quotes")
     content = models.TextField()
     createdAt = models.DateTimeField(auto_now_add=True)
+    updatedAt = models.DateTimeField(auto_now=True)
     isFavorite = models.BooleanField(default=False)
 
+    class Meta:
+        indexes = [models.Index(fields=["user", "updatedAt"], name="quote_user_updated")]
+
     def __str__(self):
         """Повертає рядкове представлення цитати.
 
@@ -368,9 +556,320 @@ class ReadingCycle(models.Model):
     )
     start_date = models.DateField()
     end_date = models.DateField()
+    updatedAt = models.DateTimeField(auto_now=True, db_index=True)
 
     class Meta:
         ordering = ["-end_date"]  # Останні прочитані будуть зверху
 
     def __str__(self):
         return f"{self.book.title}: {self.start_date} - {self.end_date}"
+
+
+class UserReadingStats(models.Model):
+    """Матеріалізована модель читання (read model) зі зведеною статистикою користувача.
+
+    Запис оновлюється інкрементально (дельтами) при збереженні та видаленні книг
+    і сесій читання, тому ендпоінт статистики віддає його одним запитом за
+    первинним ключем замість десятка агрегацій над `Book` та `ReadingSession`.
+    Повний перерахунок виконує команда `rebuild_stats`.
+
+    Attributes:
+        user (OneToOneField): Власник статистики (одночасно первинний ключ).
+        total_books (IntegerField): Загальна кількість книг у бібліотеці.
+        reading_count (IntegerField): Кількість книг зі статусом 'reading'.
+        read_count (IntegerField): Кількість прочитаних книг.
+        want_count (IntegerField): Кількість книг зі статусом 'want-to-read'.
+        favorite_count (IntegerField): Кількість улюблених книг.
+        custom_count (IntegerField): Кількість книг, доданих вручну.
+        read_pages_total (IntegerField): Сума `totalPages` прочитаних книг.
+        read_pages_books (IntegerField): Кількість прочитаних книг із відомим `totalPages`.
+        rating_total (IntegerField): Сума оцінок прочитаних книг.
+        rating_count (IntegerField): Кількість прочитаних книг з оцінкою.
+        session_count (IntegerField): Кількість сесій читання.
+        session_duration_total (IntegerField): Сумарна тривалість сесій (секунди).
+        session_duration_count (IntegerField): Кількість сесій із заповненою тривалістю.
+        books_with_sessions (IntegerField): Кількість книг, що мають хоча б одну сесію з тривалістю.
+        genre_counts (JSONField): Лічильники книг за жанрами.
+        author_counts (JSONField): Лічильники книг за авторами.
+        monthly_read_counts (JSONField): Кількість прочитаних книг за місяцями (ключ 'YYYY-MM').
+        recent_books (JSONField): П'ять останніх доданих книг (для блоку "Остання активність").
+        updatedAt (DateTimeField): Час останнього оновлення запису.
+
+    """
+
+    user = models.OneToOneField(
+        User, on_delete=models.CASCADE, primary_key=True, related_name="reading_stats"
+    )
+
+    # Лічильники книг
+    total_books = models.IntegerField(default=0)
+    reading_count = models.IntegerField(default=0)
+    read_count = models.IntegerField(default=0)
+    want_count = models.IntegerField(default=0)
+    favorite_count = models.IntegerField(default=0)
+    custom_count = models.IntegerField(default=0)
+
+    # Агрегати прочитаних книг
+    read_pages_total = models.IntegerField(default=0)
+    read_pages_books = models.IntegerField(default=0)
+    rating_total = models.IntegerField(default=0)
+    rating_count = models.IntegerField(default=0)
+
+    # Агрегати сесій читання
+    session_count = models.IntegerField(default=0)
+    session_duration_total = models.IntegerField(default=0)
+    session_duration_count = models.IntegerField(default=0)
+    books_with_sessions = models.IntegerField(default=0)
+
+    # Розподіли для графіків
+    genre_counts = models.JSONField(default=dict)
+    author_counts = models.JSONField(default=dict)
+    monthly_read_counts = models.JSONField(default=dict)
+    recent_books = models.JSONField(default=list)
+
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Повертає рядкове представлення статистики.
+
+        Returns:
+            str: Рядок із зазначенням користувача.
+
+        """
+        return f"Reading stats of user {self.user_id}"
+
+
+class DailyReadingRollup(models.Model):
+    """Щоденне зведення читацької активності користувача.
+
+    Один рядок на користувача та день. Рядки оновлюються інкрементально при
+    створенні, зміні та видаленні сесій читання, а також при завершенні книг,
+    тому статистика за довільний період рахується за кількістю днів, а не
+    за кількістю сесій.
+
+    Attributes:
+        user (ForeignKey): Користувач, якому належить зведення.
+        day (DateField): Календарний день.
+        pages_read (IntegerField): Кількість прочитаних за день сторінок.
+        seconds_read (IntegerField): Сумарна тривалість читання за день (секунди).
+        sessions_count (IntegerField): Кількість сесій читання за день.
+        books_finished (IntegerField): Кількість книг, завершених цього дня.
+
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="daily_rollups")
+    day = models.DateField()
+    pages_read = models.IntegerField(default=0)
+    seconds_read = models.IntegerField(default=0)
+    sessions_count = models.IntegerField(default=0)
+    books_finished = models.IntegerField(default=0)
+
+    class Meta:
+        ordering = ["day"]
+        constraints = [
+            models.UniqueConstraint(fields=["user", "day"], name="unique_user_daily_rollup")
+        ]
+
+    def __str__(self):
+        """Повертає рядкове представлення зведення.
+
+        Returns:
+            str: Рядок із зазначенням користувача та дня.
+
+        """
+        return f"Rollup of user {self.user_id} on {self.day}"
+
+
+class SearchDocument(models.Model):
+    """Документ пошукового індексу бібліотеки.
+
+    Один рядок на книгу, нотатку, цитату або сесію читання з непорожньою
+    нотаткою. Таблиця синхронізується сигналами при збереженні та видаленні
+    вихідних об'єктів. На SQLite тригери додатково дзеркалюють її у
+    повнотекстовий індекс FTS5 (`tracker_searchdocument_fts`), на інших БД
+    пошук виконується за цією таблицею напряму.
+
+    Attributes:
+        user (ForeignKey): Власник документа.
+        book (ForeignKey): Книга, до якої належить документ (або сама книга).
+        kind (CharField): Тип вихідного об'єкта.
+        object_id (IntegerField): Ідентифікатор вихідного об'єкта.
+        title (CharField): Назва та автор книги (лише для документів книг).
+        content (TextField): Текст для пошуку.
+
+    """
+
+    KIND_CHOICES = [
+        ("book", "Книга"),
+        ("note", "Нотатка"),
+        ("quote", "Цитата"),
+        ("session", "Сесія читання"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="search_documents")
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="search_documents")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.IntegerField()
+    title = models.CharField(max_length=512, blank=True, default="")
+    content = models.TextField(blank=True, default="")
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["kind", "object_id"], name="unique_search_document")
+        ]
+
+    def __str__(self):
+        """Повертає рядкове представлення документа.
+
+        Returns:
+            str: Рядок із типом та ідентифікатором вихідного об'єкта.
+
+        """
+        return f"{self.kind} #{self.object_id}"
+
+
+class BookTrigram(models.Model):
+    """Триграма назви або автора книги для нечіткого автодоповнення.
+
+    Для кожної книги зберігаються унікальні триграми нормалізованих назви та
+    автора (див. `tracker.trigrams`). Індекс `(user, trigram, book)` дозволяє
+    знайти книги зі спільними з запитом триграмами без сканування бібліотеки.
+
+    Attributes:
+        user (ForeignKey): Власник книги.
+        book (ForeignKey): Книга.
+        trigram (CharField): Три символи нормалізованого тексту.
+
+    """
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="book_trigrams")
+    book = models.ForeignKey(Book, on_delete=models.CASCADE, related_name="trigrams")
+    trigram = models.CharField(max_length=3)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "trigram", "book"], name="book_trigram_lookup")]
+        constraints = [
+            models.UniqueConstraint(fields=["book", "trigram"], name="unique_book_trigram")
+        ]
+
+    def __str__(self):
+        """Повертає рядкове представлення триграми.
+
+        Returns:
+            str: Рядок із триграмою та ідентифікатором книги.
+
+        """
+        return f"'{self.trigram}' of book {self.book_id}"
+
+
+class Tombstone(models.Model):
+    """Запис журналу видалень для дельта-синхронізації клієнтів.
+
+    Створюється при видаленні книги, сесії, нотатки, цитати або циклу
+    читання (зокрема каскадному разом із книгою), щоб клієнт із локальною
+    копією бібліотеки дізнався про видалення через `/api/sync/`.
+
+    Attributes:
+        user (ForeignKey): Власник видаленого об'єкта.
+        kind (CharField): Тип видаленого об'єкта.
+        object_id (IntegerField): Ідентифікатор видаленого об'єкта.
+        deletedAt (DateTimeField): Час видалення.
+
+    """
+
+    KIND_CHOICES = [
+        ("book", "Книга"),
+        ("session", "Сесія читання"),
+        ("note", "Нотатка"),
+        ("quote", "Цитата"),
+        ("cycle", "Цикл читання"),
+    ]
+
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name="tombstones")
+    kind = models.CharField(max_length=10, choices=KIND_CHOICES)
+    object_id = models.IntegerField()
+    deletedAt = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["user", "deletedAt"], name="tombstone_user_deleted")]
+
+    def __str__(self):
+        """Повертає рядкове представлення запису видалення.
+
+        Returns:
+            str: Рядок із типом та ідентифікатором видаленого об'єкта.
+
+        """
+        return f"Deleted {self.kind} #{self.object_id}"
+
+
+class CatalogVolume(models.Model):
+    """Том Google Books у спільному локальному каталозі.
+
+    Один рядок на видання для всіх користувачів: результати зовнішнього
+    пошуку зберігаються тут (див. `tracker.catalog`), а книги бібліотеки
+    посилаються на том, з якого їх додано. Дублікати об'єднуються за
+    Google ID та ISBN-13.
+
+    Attributes:
+        googleId (CharField): Ідентифікатор тому в Google Books.
+        isbn (CharField, optional): ISBN-13 (ISBN-10 перетворюється на ISBN-13).
+        title, author, genre, language, year, pages, description, cover,
+        externalRating, ratingsCount: Відформатовані метадані тому (як у
+            результатах `/api/search/external/`).
+        updatedAt (DateTimeField): Час останнього оновлення з Google.
+
+    """
+
+    googleId = models.CharField(max_length=64, unique=True)
+    isbn = models.CharField(max_length=13, null=True, blank=True, unique=True)
+    title = models.CharField(max_length=512)
+    author = models.CharField(max_length=512)
+    genre = models.CharField(max_length=255)
+    language = models.CharField(max_length=16)
+    year = models.IntegerField(default=0)
+    pages = models.IntegerField(default=0)
+    description = models.TextField(blank=True, default="")
+    cover = models.TextField(null=True, blank=True)
+    externalRating = models.FloatField(null=True, blank=True)
+    ratingsCount = models.IntegerField(null=True, blank=True)
+    updatedAt = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        """Повертає рядкове представлення тому.
+
+        Returns:
+            str: Назва та автор тому.
+
+        """
+        return f"{self.title} — {self.author}"
+
+
+class CatalogQuery(models.Model):
+    """Упорядкований результат пошукового запиту до Google Books.
+
+    Ключ — дайджест нормалізованого запиту (`tracker.external_search.make_key`),
+    тож повторний пошук читає один рядок за унікальним індексом і томи за
+    первинними ключами.
+
+    Attributes:
+        key (CharField): SHA-256 нормалізованого ключа запиту.
+        query (TextField): Нормалізований запит Google (для налагодження).
+        volumes (JSONField): Ідентифікатори `CatalogVolume` у порядку Google.
+        fetchedAt (DateTimeField): Час отримання результату з Google.
+
+    """
+
+    key = models.CharField(max_length=64, unique=True)
+    query = models.TextField()
+    volumes = models.JSONField(default=list)
+    fetchedAt = models.DateTimeField()
+
+    def __str__(self):
+        """Повертає рядкове представлення запиту.
+
+        Returns:
+            str: Нормалізований запит і кількість томів.
+
+        """
+        return f"'{self.query}' ({len(self.volumes)} volumes)"
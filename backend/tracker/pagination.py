@@ -0,0 +1,226 @@
+"""
+Модуль пагінації за ключем (keyset / cursor pagination) для списків API.
+
+Посторінкова пагінація (`PageNumberPagination`) виконує додатковий `COUNT(*)`
+на кожну сторінку, а глибокі сторінки перетворюються на повільні сканування з
+`OFFSET`. `KeysetPagination` натомість продовжує список з останнього
+повернутого рядка: курсор містить значення всіх полів сортування цього рядка,
+а наступна сторінка вибирається умовою "рядок іде після курсора" в
+лексикографічному порядку. Вартість сторінки не залежить від її номера.
+
+Курсор підписаний (`django.core.signing`), а його значення перед побудовою
+умови перевіряються полями сортування: змінений або пошкоджений курсор дає
+404, а не помилку запиту до БД.
+
+Порядок сортування береться з `order_by()` набору даних, тому його визначає
+сам ViewSet. Сортування має складатися з назв полів (або анотацій) і
+закінчуватися унікальним полем — за потреби `id` додається автоматично.
+
+Для зворотної сумісності наявність параметра `page` вмикає класичну
+посторінкову пагінацію з полем `count`.
+"""
+
+import datetime
+
+from django.core import signing
+from django.core.exceptions import ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import replace_query_param
+
+#: Назви полів, що вважаються унікальним завершенням сортування.
+UNIQUE_FIELDS = ("id", "pk")
+
+#: Сіль підпису курсора (`django.core.signing`).
+CURSOR_SALT = "tracker.pagination.cursor"
+
+
+def _encode_value(value):
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        # Повна точність (з мікросекундами), на відміну від DjangoJSONEncoder
+        return value.isoformat()
+    return value
+
+
+def _ordering_field(queryset, name):
+    """Поле моделі або анотації, за яким сортується набір (`book__title`, `pk`)."""
+    if name in queryset.query.annotations:
+        return queryset.query.annotations[name].output_field
+    model = queryset.model
+    *relations, last = name.split("__")
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    field = model._meta.pk if last == "pk" else model._meta.get_field(last)
+    return field.target_field if field.is_relation else field
+
+
+def _resolve(obj, field):
+    """Повертає значення поля сортування, зокрема через зв'язки (`book__title`).
+
+    Підтримує як об'єкти моделей, так і рядки `.values()` (словники).
+    """
+    if isinstance(obj, dict):
+        return obj[field]
+    for attr in field.split("__"):
+        obj = getattr(obj, attr)
+    return obj
+
+
+class KeysetPagination(BasePagination):
+    """Пагінація за складеним ключем сортування з прямим курсором `next`.
+
+    Attributes:
+        page_size (int): Кількість елементів на сторінці.
+        cursor_query_param (str): Параметр URL із закодованим курсором.
+        page_query_param (str): Параметр, що вмикає посторінковий режим.
+    """
+
+    page_size = api_settings.PAGE_SIZE
+    cursor_query_param = "cursor"
+    page_query_param = "page"
+
+    def paginate_queryset(self, queryset, request, view=None):
+        """Повертає сторінку набору даних, що йде після курсора із запиту.
+
+        Args:
+            queryset (QuerySet): Відсортований набір даних.
+            request (Request): Об'єкт запиту.
+            view (APIView, optional): Представлення, що виконує пагінацію.
+
+        Returns:
+            list: Об'єкти поточної сторінки.
+        """
+        self.request = request
+        self.page_number_pagination = None
+        if self.page_query_param in request.query_params:
+            self.page_number_pagination = PageNumberPagination()
+            return self.page_number_pagination.paginate_queryset(queryset, request, view)
+
+        queryset, self.ordering = self.get_ordering(queryset)
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.after(self.clean_cursor(cursor, queryset)))
+
+        rows = list(queryset[: self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        self.page = rows[: self.page_size]
+        return self.page
+
+    def get_ordering(self, queryset):
+        """Визначає складений ключ сортування та за потреби додає `id`.
+
+        Returns:
+            tuple: Набір даних і список пар `(поле, за спаданням)`.
+        """
+        order_by = [
+            field for field in queryset.query.order_by if isinstance(field, str)
+        ] or list(queryset.model._meta.ordering)
+        if not order_by or order_by[-1].lstrip("-") not in UNIQUE_FIELDS:
+            descending = bool(order_by) and order_by[0].startswith("-")
+            order_by.append("-id" if descending else "id")
+            queryset = queryset.order_by(*order_by)
+        return queryset, [(field.lstrip("-"), field.startswith("-")) for field in order_by]
+
+    def after(self, values):
+        """Будує умову "рядок іде після курсора" для складеного ключа.
+
+        Для ключа `(a, b, id)` це `a > va OR (a = va AND b > vb) OR
+        (a = va AND b = vb AND id > vid)` з урахуванням напрямку кожного поля.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound("Недійсний курсор.")
+
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(self.ordering, values):
+            lookup = "lt" if descending else "gt"
+            condition |= equal & Q(**{f"{field}__{lookup}": value})
+            equal &= Q(**{field: value})
+        return condition
+
+    def clean_cursor(self, values, queryset):
+        """Перетворює значення курсора на типи полів сортування.
+
+        Raises:
+            NotFound: Кількість значень не відповідає ключу сортування,
+                значення порожнє, складене або не приводиться до типу поля.
+        """
+        if len(values) != len(self.ordering):
+            raise NotFound("Недійсний курсор.")
+        cleaned = []
+        for (field, _), value in zip(self.ordering, values):
+            # Ключі сортування списків не містять NULL (див. `get_queryset` представлень)
+            if value is None or isinstance(value, (list, dict)):
+                raise NotFound("Недійсний курсор.")
+            try:
+                cleaned.append(_ordering_field(queryset, field).to_python(value))
+            except (ValidationError, TypeError, ValueError):
+                raise NotFound("Недійсний курсор.") from None
+        return cleaned
+
+    def decode_cursor(self, request):
+        """Декодує й перевіряє підпис курсора із запиту; `None`, якщо це перша сторінка."""
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = signing.loads(encoded, salt=CURSOR_SALT)
+        except signing.BadSignature:
+            raise NotFound("Недійсний курсор.") from None
+        if not isinstance(values, list):
+            raise NotFound("Недійсний курсор.")
+        return values
+
+    def encode_cursor(self, obj):
+        """Кодує та підписує значення ключа сортування об'єкта."""
+        return signing.dumps(
+            [_encode_value(_resolve(obj, field)) for field, _ in self.ordering], salt=CURSOR_SALT
+        )
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_paginated_response(self, data):
+        if self.page_number_pagination is not None:
+            return self.page_number_pagination.get_paginated_response(data)
+        return Response({"next": self.get_next_link(), "results": data})
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+    def get_schema_operation_parameters(self, view):
+        return [
+            {
+                "name": self.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Курсор наступної сторінки (з поля `next`).",
+                "schema": {"type": "string"},
+            },
+            {
+                "name": self.page_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Номер сторінки (вмикає посторінковий режим з `count`).",
+                "schema": {"type": "integer"},
+            },
+        ]
+
+    def get_html_context(self):
+        if self.page_number_pagination is not None:
+            return self.page_number_pagination.get_html_context()
+        return {"previous_url": None, "next_url": self.get_next_link()}
+
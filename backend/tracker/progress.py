@@ -0,0 +1,122 @@
+"""
+Модуль швидкого оновлення прогресу читання ("я на сторінці N").
+
+Це найчастіший запис у застосунку. Звичайний шлях — `Book.save` з
+правилами життєвого циклу та серіалізацією всієї книги у відповіді.
+`record_progress` обробляє типовий випадок (сторінка збільшилась, книга
+ще не дочитана) двома інструкціями в одній транзакції:
+
+1. `INSERT ... SELECT ... RETURNING` створює сесію читання з різницею
+   сторінок, обчисленою з поточного рядка книги. Умова `WHERE` одночасно
+   перевіряє власника та те, що випадок справді "швидкий"; рядок книги
+   блокується (`FOR UPDATE`, де підтримується).
+2. Умовний `UPDATE ... RETURNING` записує `currentPage`, `progress`
+   (обчислюється виразом у БД так само, як `round()` у `Book.save`),
+   `startDate` і `updatedAt`.
+
+Статус і дата завершення при цьому не змінюються, тож внесок книги у
+статистику той самий; сигнал `post_save` надсилається лише для нової сесії
+(статистика, зведення, кеш). Усі інші випадки (завершення книги, зменшення
+сторінки, статус 'read') повертають `None`, і виклик іде звичайним шляхом.
+"""
+
+from django.db import connection, transaction
+from django.db.models.signals import post_save
+from django.utils import timezone
+
+from .models import Book, ReadingSession
+
+
+def _columns(model, *names):
+    return [connection.ops.quote_name(model._meta.get_field(name).column) for name in names]
+
+
+def fast_path_supported():
+    """Чи підтримує БД `RETURNING` (SQLite 3.35+, PostgreSQL)."""
+    return connection.features.can_return_columns_from_insert
+
+
+def _insert_session_sql():
+    book_table = connection.ops.quote_name(Book._meta.db_table)
+    session_table = connection.ops.quote_name(ReadingSession._meta.db_table)
+    book_id, date, pages_read, duration, updated_at = _columns(
+        ReadingSession, "book", "date", "pages_read", "duration", "updatedAt"
+    )
+    pk, user, current, status, total = _columns(Book, "id", "user", "currentPage", "status", "totalPages")
+    lock = " FOR UPDATE" if connection.features.has_select_for_update else ""
+    return (
+        f"INSERT INTO {session_table} ({book_id}, {date}, {pages_read}, {duration}, {updated_at}) "
+        f"SELECT {pk}, %(now)s, %(page)s - {current}, 0, %(now)s FROM {book_table} "
+        f"WHERE {pk} = %(book)s AND {user} = %(user)s AND {current} < %(page)s AND {status} <> 'read' "
+        f"AND ({total} IS NULL OR {total} <= 0 OR %(page)s < {total}){lock} "
+        f"RETURNING {_columns(ReadingSession, 'id')[0]}, {pages_read}"
+    )
+
+
+def _update_book_sql():
+    book_table = connection.ops.quote_name(Book._meta.db_table)
+    pk, current, progress, status, total, start, updated_at = _columns(
+        Book, "id", "currentPage", "progress", "status", "totalPages", "startDate", "updatedAt"
+    )
+    # round(100 * page / total) з округленням до парного, як `round()` у Python
+    quotient = f"(%(percent)s / {total})"
+    twice_rest = f"(2 * (%(percent)s %% {total}))"
+    progress_expression = (
+        f"CASE WHEN {total} > 0 THEN {quotient} + CASE WHEN {twice_rest} > {total} "
+        f"OR ({twice_rest} = {total} AND {quotient} %% 2 = 1) THEN 1 ELSE 0 END ELSE 0 END"
+    )
+    return (
+        f"UPDATE {book_table} SET {current} = %(page)s, {progress} = {progress_expression}, "
+        f"{start} = CASE WHEN {status} = 'reading' AND {start} IS NULL THEN %(today)s ELSE {start} END, "
+        f"{updated_at} = %(now)s WHERE {pk} = %(book)s RETURNING {progress}, {status}"
+    )
+
+
+def record_progress(user_id, book_id, page):
+    """Записує прогрес читання швидким шляхом, якщо це можливо.
+
+    Args:
+        user_id (int): Власник книги.
+        book_id (int): Ідентифікатор книги.
+        page (int): Нова поточна сторінка (невід'ємна).
+
+    Returns:
+        dict | None: Коротке представлення (`id`, `currentPage`, `progress`,
+        `status`, `pagesRead`) або `None`, якщо книгу треба оновити звичайним
+        шляхом (`Book.save`) — зокрема, якщо її немає чи вона чужа.
+    """
+    if not fast_path_supported():
+        return None
+
+    now = timezone.now()
+    params = {
+        "book": book_id,
+        "user": user_id,
+        "page": page,
+        "percent": page * 100,
+        "now": connection.ops.adapt_datetimefield_value(now),
+        "today": connection.ops.adapt_datefield_value(now.date()),
+    }
+    with transaction.atomic(), connection.cursor() as cursor:
+        cursor.execute(_insert_session_sql(), params)
+        inserted = cursor.fetchone()
+        if inserted is None:
+            return None
+        session_id, pages_read = inserted
+        cursor.execute(_update_book_sql(), params)
+        progress, status = cursor.fetchone()
+
+        # Власник відомий, тож сигнали не читають книгу повторно
+        session = ReadingSession(
+            pk=session_id,
+            book=Book(pk=book_id, user_id=user_id),
+            date=now,
+            pages_read=pages_read,
+            duration=0,
+            updatedAt=now,
+        )
+        post_save.send(
+            sender=ReadingSession, instance=session, created=True, update_fields=None, raw=False, using=connection.alias
+        )
+
+    return {"id": book_id, "currentPage": page, "progress": progress, "status": status, "pagesRead": pages_read}
@@ -0,0 +1,184 @@
+"""
+Модуль швидкого шляху читання списків без серіалізації моделей.
+
+`ModelSerializer` для кожного рядка створює екземпляр моделі, проходить
+`get_attribute` по кожному полю та звертається до пов'язаних об'єктів
+(`book.title`, `user.email`). Для великих списків це домінує над часом
+самого SQL-запиту.
+
+`Projection` будується один раз на запит із полів серіалізатора: кожне поле
+відображається на колонку `.values()` (зв'язки — через JOIN, наприклад
+`book__title`), а значення перетворюються тим самим `to_representation`
+поля. Тому результат побайтово збігається з відповіддю серіалізатора, але
+без створення моделей і без додаткових запитів до пов'язаних таблиць.
+
+Перетворення полів підготовлюються один раз на проєкцію: для рядків, чисел
+і логічних значень, що вже мають потрібний тип, виклик `to_representation`
+пропускається, а часовий пояс полів дат визначається один раз, а не для
+кожного значення.
+
+Серіалізатори з вкладеними колекціями або обчислюваними полями
+(`SerializerMethodField`) не підтримуються — для них `build_projection`
+повертає `None`, і представлення використовує звичайний шлях.
+"""
+
+import datetime
+
+from rest_framework import ISO_8601, serializers
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+#: Поля, чиє представлення збігається зі значенням, якщо воно вже має цей тип.
+PASSTHROUGH_TYPES = {
+    serializers.CharField: str,
+    serializers.EmailField: str,
+    serializers.IntegerField: int,
+    serializers.FloatField: float,
+    serializers.BooleanField: bool,
+}
+
+
+class Projection:
+    """Відображення полів серіалізатора на колонки `.values()`.
+
+    Attributes:
+        columns (list): Трійки `(назва поля, колонка, перетворення або None)`.
+    """
+
+    def __init__(self, columns):
+        self.columns = columns
+
+    def values(self, queryset):
+        """Повертає набір словників з колонками полів і полями сортування.
+
+        Поля сортування потрібні пагінації за курсором для побудови `next`.
+        """
+        ordering = [
+            field.lstrip("-") for field in queryset.query.order_by if isinstance(field, str)
+        ]
+        names = dict.fromkeys(["id", *(column for _, column, _ in self.columns), *ordering])
+        return queryset.prefetch_related(None).values(*names)
+
+    def represent(self, row):
+        """Перетворює рядок `.values()` на словник відповіді API."""
+        data = {}
+        for name, column, to_representation in self.columns:
+            value = row[column]
+            if value is not None and to_representation is not None:
+                value = to_representation(value)
+            data[name] = value
+        return data
+
+
+def _passthrough(field, expected_type):
+    to_representation = field.to_representation
+
+    def convert(value):
+        return value if type(value) is expected_type else to_representation(value)
+
+    return convert
+
+
+def _choice_converter(field):
+    # Значення з БД, що є серед варіантів, представляються самі собою
+    choices = {value for value in field.choice_strings_to_values.values()}
+    to_representation = field.to_representation
+
+    def convert(value):
+        return value if value in choices else to_representation(value)
+
+    return convert
+
+
+def _datetime_converter(field):
+    """Перетворення дати й часу з часовим поясом, визначеним один раз.
+
+    Повторює `DateTimeField.to_representation` для ISO 8601 (зокрема
+    заміну `+00:00` на `Z`); для інших випадків використовує саме поле.
+    """
+    output_format = getattr(field, "format", api_settings.DATETIME_FORMAT)
+    if output_format is None or output_format.lower() != ISO_8601:
+        return field.to_representation
+    field_timezone = field.timezone if hasattr(field, "timezone") else field.default_timezone()
+    if field_timezone is None:
+        return field.to_representation
+    to_representation = field.to_representation
+
+    def convert(value):
+        if not isinstance(value, datetime.datetime) or value.utcoffset() is None:
+            return to_representation(value)
+        value = value.astimezone(field_timezone).isoformat()
+        return value[:-6] + "Z" if value.endswith("+00:00") else value
+
+    return convert
+
+
+def _converter(field):
+    """Повертає функцію перетворення значення колонки для поля серіалізатора."""
+    field_type = type(field)
+    if field_type in PASSTHROUGH_TYPES:
+        return _passthrough(field, PASSTHROUGH_TYPES[field_type])
+    if field_type is serializers.ChoiceField:
+        return _choice_converter(field)
+    if field_type is serializers.DateTimeField:
+        return _datetime_converter(field)
+    return field.to_representation
+
+
+def build_projection(serializer):
+    """Будує проєкцію для серіалізатора або повертає `None`, якщо це неможливо.
+
+    Args:
+        serializer (Serializer): Екземпляр серіалізатора (з уже обмеженим
+            набором полів, якщо використовуються `fields`/`expand`).
+
+    Returns:
+        Projection | None: Проєкція для швидкого шляху.
+    """
+    columns = []
+    for name, field in serializer.fields.items():
+        if field.write_only:
+            continue
+        if isinstance(field, (serializers.BaseSerializer, serializers.SerializerMethodField)):
+            return None
+        if field.source == "*":
+            return None
+
+        column = "__".join(field.source_attrs)
+        if isinstance(field, serializers.PrimaryKeyRelatedField):
+            # `.values("book")` повертає саме первинний ключ пов'язаного об'єкта
+            columns.append((name, column, None))
+        elif isinstance(field, serializers.RelatedField):
+            return None
+        else:
+            columns.append((name, column, _converter(field)))
+    return Projection(columns)
+
+
+class ValuesListMixin:
+    """Домішка для ViewSet, що віддає список через `Projection`, якщо це можливо.
+
+    Attributes:
+        values_fast_path (bool): Дозволяє вимкнути швидкий шлях (наприклад,
+            для порівняння з серіалізатором у тестах і бенчмарку).
+    """
+
+    values_fast_path = True
+
+    def get_projection(self):
+        """Повертає проєкцію для поточного запиту або `None` для звичайного шляху."""
+        if not self.values_fast_path:
+            return None
+        return build_projection(self.get_serializer())
+
+    def list(self, request, *args, **kwargs):
+        """Повертає список, формуючи відповідь напряму з `.values()`."""
+        projection = self.get_projection()
+        if projection is None:
+            return super().list(request, *args, **kwargs)
+
+        rows = projection.values(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(rows)
+        if page is not None:
+            return self.get_paginated_response([projection.represent(row) for row in page])
+        return Response([projection.represent(row) for row in rows])
@@ -0,0 +1,593 @@
+"""
+Модуль щоденних зведень читацької активності та статистики за довільний період.
+
+Кожна сесія читання (включно з автоматичними сесіями з `Book.save`) та кожне
+завершення книги інкрементально оновлює рядок `DailyReadingRollup` для
+відповідного користувача та дня. Завдяки цьому статистика за будь-який
+період рахується за кількістю днів/інтервалів, а не за кількістю сесій.
+
+Дні рахуються в часовому поясі користувача (`User.timezone`), тому ті самі
+зведення слугують індексом активності для теплової карти та серій читання:
+обидва ендпоінти працюють за кількістю днів, а не сесій.
+
+Дані минулих років змінюються лише у виняткових випадках (видалення старих
+сесій чи книг), тому вони кешуються без обмеження часу. Такі зміни збільшують
+окреме покоління кешу історії (`HISTORY_SCOPE`), і закешовані роки
+автоматично перестають використовуватися.
+"""
+
+import datetime
+import logging
+import threading
+import zoneinfo
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import Coalesce, TruncDate
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from .bulk import books_bulk_saved
+from .cache import KEY_PREFIX, bump_generation, get_generation, make_key
+from .compaction import sessions_compacted
+from .models import Book, DailyReadingRollup, ReadingCycle, ReadingSession, User
+from .stats import book_owner_id
+
+logger = logging.getLogger("tracker")
+
+#: Поля зведення, що підтримуються дельтами.
+ROLLUP_FIELDS = ("pages_read", "seconds_read", "sessions_count", "books_finished")
+
+#: Допустимі інтервали групування для статистики за період.
+BUCKETS = ("day", "week", "month", "year")
+
+#: Максимальна кількість інтервалів в одній відповіді.
+MAX_BUCKETS = 1000
+
+#: Область покоління кешу для незмінних даних минулих років.
+HISTORY_SCOPE = "rollup-history"
+
+#: Кількість днів теплової карти активності.
+HEATMAP_DAYS = 365
+
+#: Час життя закешованого часового поясу користувача (секунди). Зміна профілю
+#: оновлює кеш одразу; обмежений строк прибирає застарілу назву поясу там,
+#: де кеш її не отримав (інший процес із власним кешем, `update()` без сигналів).
+ZONE_TIMEOUT = 300
+
+# Книги, що видаляються в поточному потоці: {book_id: (user_id, дельти)}.
+_deletion_state = threading.local()
+
+
+def _deleting_books():
+    if not hasattr(_deletion_state, "books"):
+        _deletion_state.books = {}
+    return _deletion_state.books
+
+
+def _zone_key(user_id):
+    return f"{KEY_PREFIX}:tz:{user_id}"
+
+
+def user_zone(user_id):
+    """Повертає часовий пояс користувача.
+
+    Назва поясу кешується на `ZONE_TIMEOUT` секунд, щоб обробники сигналів
+    сесій не виконували додатковий запит до таблиці користувачів на кожне
+    збереження.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+
+    Returns:
+        zoneinfo.ZoneInfo: Часовий пояс користувача.
+    """
+    name = cache.get(_zone_key(user_id))
+    if name is None:
+        name = (
+            User.objects.filter(pk=user_id).values_list("timezone", flat=True).first()
+            or settings.TIME_ZONE
+        )
+        cache.set(_zone_key(user_id), name, timeout=ZONE_TIMEOUT)
+    return zoneinfo.ZoneInfo(name)
+
+
+def user_today(user_id):
+    """Поточний день у часовому поясі користувача."""
+    return timezone.localdate(timezone=user_zone(user_id))
+
+
+def activity_day(moment, zone):
+    """Повертає календарний день, до якого належить момент часу сесії.
+
+    Args:
+        moment (datetime): Час сесії (UTC).
+        zone (tzinfo): Часовий пояс користувача.
+
+    Returns:
+        datetime.date: День у часовому поясі користувача.
+    """
+    return timezone.localdate(moment, zone)
+
+
+def _as_date(value):
+    if isinstance(value, str):
+        return datetime.date.fromisoformat(value)
+    return value
+
+
+def _add(deltas, day, sign=1, **values):
+    """Додає значення до словника дельт `{день: {поле: приріст}}`."""
+    row = deltas.setdefault(day, dict.fromkeys(ROLLUP_FIELDS, 0))
+    for field, value in values.items():
+        row[field] += sign * (value or 0)
+
+
+def _session_deltas(deltas, state, sign, zone):
+    if state is not None:
+        _add(
+            deltas,
+            activity_day(state["date"], zone),
+            sign,
+            pages_read=state["pages_read"],
+            seconds_read=state["duration"],
+            sessions_count=1,
+        )
+
+
+def _finish_day(book):
+    """День завершення книги (або `None`, якщо книга не прочитана)."""
+    if book is None or book.status != "read" or not book.endDate:
+        return None
+    return _as_date(book.endDate)
+
+
+def apply_rollup_deltas(user_id, deltas):
+    """Застосовує дельти до щоденних зведень користувача.
+
+    Оновлення виконується атомарними `UPDATE ... SET field = field + delta`;
+    якщо рядка за день ще немає, він створюється. Лише від'ємні дельти без
+    рядка (наприклад, при видаленні користувача, чиї зведення вже видалено
+    каскадно) пропускаються.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        deltas (dict): Словник `{день: {поле: приріст}}`.
+    """
+    if user_id is None:
+        return
+
+    current_year = user_today(user_id).year
+    history_changed = False
+
+    for day, values in deltas.items():
+        values = {field: value for field, value in values.items() if value}
+        if not values:
+            continue
+
+        rows = DailyReadingRollup.objects.filter(user_id=user_id, day=day)
+        expressions = {field: F(field) + value for field, value in values.items()}
+        if not rows.update(**expressions):
+            if all(value < 0 for value in values.values()):
+                continue
+            try:
+                with transaction.atomic():
+                    DailyReadingRollup.objects.create(user_id=user_id, day=day, **values)
+            except IntegrityError:
+                # Рядок створено паралельним запитом — повторюємо інкремент
+                rows.update(**expressions)
+
+        if day.year < current_year:
+            history_changed = True
+
+    if history_changed:
+        bump_generation(user_id, HISTORY_SCOPE)
+
+
+def rebuild_user_rollups(user):
+    """Перебудовує щоденні зведення користувача з нуля.
+
+    Args:
+        user (User): Користувач.
+
+    Returns:
+        int: Кількість днів, значення яких змінилися.
+    """
+    deltas = {}
+    zone = user_zone(user.pk)
+    sessions = ReadingSession.objects.filter(book__user=user).values(
+        "date", "pages_read", "duration"
+    )
+    for state in sessions.iterator():
+        _session_deltas(deltas, state, 1, zone)
+
+    finished = Book.objects.filter(
+        user=user, status="read", endDate__isnull=False
+    ).values_list("endDate", flat=True)
+    cycles = ReadingCycle.objects.filter(book__user=user).values_list(
+        "end_date", flat=True
+    )
+    for day in [*finished, *cycles]:
+        _add(deltas, day, books_finished=1)
+
+    existing = {
+        row.day: row for row in DailyReadingRollup.objects.filter(user=user)
+    }
+    # Дні без активності лишаються з нульовими значеннями, як і при дельтах
+    for day in existing.keys() - deltas.keys():
+        deltas[day] = dict.fromkeys(ROLLUP_FIELDS, 0)
+
+    changed = 0
+    with transaction.atomic():
+        for day, values in deltas.items():
+            row = existing.get(day)
+            if row is None:
+                DailyReadingRollup.objects.create(user=user, day=day, **values)
+                changed += 1
+            elif any(getattr(row, field) != value for field, value in values.items()):
+                for field, value in values.items():
+                    setattr(row, field, value)
+                row.save()
+                changed += 1
+
+    if changed:
+        bump_generation(user.pk, HISTORY_SCOPE)
+    return changed
+
+
+# --- СТАТИСТИКА ЗА ПЕРІОД ---
+
+
+def _query_rows(user_id, start, end):
+    """Читає щоденні зведення за період безпосередньо з БД."""
+    rows = DailyReadingRollup.objects.filter(
+        user_id=user_id, day__gte=start, day__lte=end
+    ).values_list("day", *ROLLUP_FIELDS)
+    return {row[0]: row[1:] for row in rows}
+
+
+def daily_rows(user_id, start, end):
+    """Повертає щоденні зведення за період `[start, end]`.
+
+    Роки, що вже минули, читаються з кешу (без обмеження часу життя),
+    поточний рік — одним запитом до БД.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        start (datetime.date): Перший день періоду.
+        end (datetime.date): Останній день періоду.
+
+    Returns:
+        dict: Словник `{день: (pages_read, seconds_read, sessions_count, books_finished)}`.
+    """
+    current_year = user_today(user_id).year
+    history_generation = None
+    rows = {}
+
+    for year in range(start.year, end.year + 1):
+        first = max(start, datetime.date(year, 1, 1))
+        last = min(end, datetime.date(year, 12, 31))
+
+        if year >= current_year:
+            rows.update(_query_rows(user_id, first, last))
+            continue
+
+        if history_generation is None:
+            history_generation = get_generation(user_id, HISTORY_SCOPE)
+        key = make_key(user_id, f"rollup-year:{year}", generation=history_generation)
+        year_rows = cache.get(key)
+        if year_rows is None:
+            year_rows = _query_rows(
+                user_id, datetime.date(year, 1, 1), datetime.date(year, 12, 31)
+            )
+            cache.set(key, year_rows, timeout=None)
+        rows.update(
+            (day, values) for day, values in year_rows.items() if first <= day <= last
+        )
+
+    return rows
+
+
+def bucket_start(day, bucket):
+    """Повертає перший день інтервалу, до якого належить `day`."""
+    if bucket == "week":
+        return day - datetime.timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    if bucket == "year":
+        return day.replace(month=1, day=1)
+    return day
+
+
+def _next_bucket(start, bucket):
+    """Початок наступного інтервалу; `None`, якщо він виходить за `date.max`."""
+    try:
+        if bucket == "week":
+            return start + datetime.timedelta(days=7)
+        if bucket == "month":
+            return (start + datetime.timedelta(days=32)).replace(day=1)
+        if bucket == "year":
+            return start.replace(year=start.year + 1)
+        return start + datetime.timedelta(days=1)
+    except (OverflowError, ValueError):
+        return None
+
+
+def bucket_count(start, end, bucket):
+    """Кількість інтервалів, що перетинаються з періодом `[start, end]`."""
+    first, last = bucket_start(start, bucket), bucket_start(end, bucket)
+    if bucket == "day":
+        return (last - first).days + 1
+    if bucket == "week":
+        return (last - first).days // 7 + 1
+    if bucket == "month":
+        return (last.year - first.year) * 12 + last.month - first.month + 1
+    return last.year - first.year + 1
+
+
+def range_stats(user_id, start, end, bucket):
+    """Агрегує щоденні зведення за період у інтервали заданого розміру.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        start (datetime.date): Перший день періоду.
+        end (datetime.date): Останній день періоду.
+        bucket (str): Розмір інтервалу: 'day', 'week', 'month' або 'year'.
+
+    Returns:
+        dict: Дані періоду з ключами `from`, `to`, `bucket`, `results` (усі
+        інтервали, включно з порожніми) та `totals`.
+    """
+    buckets = {}
+    current = bucket_start(start, bucket)
+    while current is not None and current <= end:
+        buckets[current] = [0, 0, 0, 0]
+        current = _next_bucket(current, bucket)
+
+    for day, values in daily_rows(user_id, start, end).items():
+        totals = buckets[bucket_start(day, bucket)]
+        for index, value in enumerate(values):
+            totals[index] += value
+
+    def to_payload(values):
+        return {
+            "pagesRead": values[0],
+            "secondsRead": values[1],
+            "sessions": values[2],
+            "booksFinished": values[3],
+        }
+
+    grand_total = [sum(column) for column in zip(*buckets.values())] or [0, 0, 0, 0]
+    return {
+        "from": start.isoformat(),
+        "to": end.isoformat(),
+        "bucket": bucket,
+        "results": [
+            {"start": day.isoformat(), **to_payload(values)}
+            for day, values in buckets.items()
+        ],
+        "totals": to_payload(grand_total),
+    }
+
+
+def heatmap(user_id, days=HEATMAP_DAYS):
+    """Повертає щоденну активність за останні `days` днів (включно з сьогодні).
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        days (int): Кількість днів.
+
+    Returns:
+        dict: Межі періоду та список `days` із записом для кожного дня
+        (порожні дні заповнені нулями).
+    """
+    end = user_today(user_id)
+    start = end - datetime.timedelta(days=days - 1)
+    rows = _query_rows(user_id, start, end)
+
+    result = []
+    for offset in range(days):
+        day = start + datetime.timedelta(days=offset)
+        pages, seconds, sessions, finished = rows.get(day, (0, 0, 0, 0))
+        result.append(
+            {
+                "date": day.isoformat(),
+                "pagesRead": pages,
+                "secondsRead": seconds,
+                "sessions": sessions,
+                "booksFinished": finished,
+            }
+        )
+    return {"from": start.isoformat(), "to": end.isoformat(), "days": result}
+
+
+def streaks(user_id):
+    """Обчислює поточну та найдовшу серію днів поспіль із сесіями читання.
+
+    Поточна серія не переривається, якщо сьогодні ще не було сесії, але
+    вчора була. Використовується один запит, що повертає лише дні з
+    активністю, та один лінійний прохід.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+
+    Returns:
+        dict: Ключі `current`, `longest` та `lastActiveDay`.
+    """
+    active_days = DailyReadingRollup.objects.filter(
+        user_id=user_id, sessions_count__gt=0
+    ).values_list("day", flat=True).order_by("day")
+
+    longest = run = 0
+    previous = None
+    for day in active_days.iterator():
+        run = run + 1 if previous and (day - previous).days == 1 else 1
+        longest = max(longest, run)
+        previous = day
+
+    today = user_today(user_id)
+    alive = previous is not None and (today - previous).days <= 1
+    return {
+        "current": run if alive else 0,
+        "longest": longest,
+        "lastActiveDay": previous.isoformat() if previous else None,
+    }
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ ---
+
+
+def _session_state(session):
+    return {
+        "date": session.date,
+        "pages_read": session.pages_read,
+        "duration": session.duration,
+    }
+
+
+@receiver(post_save, sender=ReadingSession)
+def session_saved(sender, instance, created, **kwargs):
+    """Додає нову сесію до зведення її дня (або переносить змінену)."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if not created and previous is None:
+        return
+
+    user_id = book_owner_id(instance)
+    zone = user_zone(user_id)
+    deltas = {}
+    _session_deltas(deltas, previous, -1, zone)
+    _session_deltas(deltas, _session_state(instance), 1, zone)
+    apply_rollup_deltas(user_id, deltas)
+
+
+@receiver(post_delete, sender=ReadingSession)
+def session_deleted(sender, instance, **kwargs):
+    """Віднімає видалену сесію зі зведення її дня."""
+    if instance.book_id in _deleting_books():
+        return
+    user_id = book_owner_id(instance)
+    deltas = {}
+    _session_deltas(deltas, _session_state(instance), -1, user_zone(user_id))
+    apply_rollup_deltas(user_id, deltas)
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, created, **kwargs):
+    """Фіксує завершення книги (або його скасування) у зведенні відповідного дня."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if not created and previous is None:
+        return
+
+    old_day, new_day = _finish_day(previous), _finish_day(instance)
+    if old_day == new_day:
+        return
+
+    deltas = {}
+    if old_day:
+        _add(deltas, old_day, -1, books_finished=1)
+    if new_day:
+        _add(deltas, new_day, books_finished=1)
+    apply_rollup_deltas(instance.user_id, deltas)
+
+
+@receiver(pre_delete, sender=Book)
+def book_pre_delete(sender, instance, **kwargs):
+    """Збирає внесок книги, її сесій та циклів до каскадного видалення."""
+    deltas = {}
+    sessions = (
+        ReadingSession.objects.filter(book_id=instance.pk)
+        .annotate(day=TruncDate("date", tzinfo=user_zone(instance.user_id)))
+        .values("day")
+        .annotate(
+            pages=Coalesce(Sum("pages_read"), 0),
+            seconds=Coalesce(Sum("duration"), 0),
+            count=Count("id"),
+        )
+        .order_by()
+    )
+    for row in sessions:
+        _add(
+            deltas,
+            row["day"],
+            -1,
+            pages_read=row["pages"],
+            seconds_read=row["seconds"],
+            sessions_count=row["count"],
+        )
+    for end_date in ReadingCycle.objects.filter(book_id=instance.pk).values_list(
+        "end_date", flat=True
+    ):
+        _add(deltas, end_date, -1, books_finished=1)
+    if _finish_day(instance):
+        _add(deltas, _finish_day(instance), -1, books_finished=1)
+
+    _deleting_books()[instance.pk] = (instance.user_id, deltas)
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    """Застосовує зібраний при видаленні книги внесок до зведень."""
+    user_id, deltas = _deleting_books().pop(instance.pk, (None, None))
+    if deltas:
+        apply_rollup_deltas(user_id, deltas)
+
+
+@receiver(post_save, sender=ReadingCycle)
+def cycle_saved(sender, instance, created, **kwargs):
+    """Архівований цикл читання — це завершення книги в день `end_date`."""
+    if created:
+        apply_rollup_deltas(
+            book_owner_id(instance), {_as_date(instance.end_date): {"books_finished": 1}}
+        )
+
+
+@receiver(post_delete, sender=ReadingCycle)
+def cycle_deleted(sender, instance, **kwargs):
+    """Віднімає завершення видаленого циклу читання."""
+    if instance.book_id in _deleting_books():
+        return
+    apply_rollup_deltas(
+        book_owner_id(instance), {_as_date(instance.end_date): {"books_finished": -1}}
+    )
+
+
+@receiver(books_bulk_saved)
+def books_bulk_saved_handler(sender, user_id, created, updated, sessions, cycles=(), **kwargs):
+    """Додає сесії, цикли та завершення книг пакета до зведень одним проходом."""
+    zone = user_zone(user_id)
+    deltas = {}
+    for session in sessions:
+        _session_deltas(deltas, _session_state(session), 1, zone)
+    for cycle in cycles:
+        if cycle.end_date:
+            _add(deltas, _as_date(cycle.end_date), books_finished=1)
+    for previous, book in [*((None, book) for book in created), *updated]:
+        old_day, new_day = _finish_day(previous), _finish_day(book)
+        if old_day != new_day:
+            if old_day:
+                _add(deltas, old_day, -1, books_finished=1)
+            if new_day:
+                _add(deltas, new_day, books_finished=1)
+    apply_rollup_deltas(user_id, deltas)
+
+
+@receiver(sessions_compacted)
+def sessions_compacted_handler(sender, user_id, merged, **kwargs):
+    """Зменшує кількість сесій у зведеннях днів з об'єднаними сесіями."""
+    zone = user_zone(user_id)
+    deltas = {}
+    for previous, survivor, removed in merged:
+        _session_deltas(deltas, previous, -1, zone)
+        _session_deltas(deltas, _session_state(survivor), 1, zone)
+        for session in removed:
+            _session_deltas(deltas, _session_state(session), -1, zone)
+    apply_rollup_deltas(user_id, deltas)
+
+
+@receiver(post_save, sender=User)
+def user_saved(sender, instance, **kwargs):
+    """Оновлює закешований часовий пояс користувача."""
+    cache.set(_zone_key(instance.pk), instance.timezone, timeout=ZONE_TIMEOUT)
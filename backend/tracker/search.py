@@ -0,0 +1,337 @@
+"""
+Модуль повнотекстового пошуку по бібліотеці користувача.
+
+Пошук охоплює опис книги (разом із назвою та автором), нотатки, цитати та
+нотатки сесій читання. Для кожного такого об'єкта підтримується рядок
+`SearchDocument`, який оновлюється сигналами при збереженні та видаленні
+вихідних об'єктів (документи книги та її дочірніх об'єктів видаляються
+каскадно разом із книгою).
+
+На SQLite тригери міграції дзеркалюють документи у віртуальну таблицю FTS5
+(`tracker_searchdocument_fts`). Запит виконується за інвертованим індексом:
+фільтр власника — це окремий токен колонки `owner`, тому вартість пошуку
+залежить від кількості збігів, а не від розміру бібліотеки. Ранжування —
+BM25 (назва важить удвічі більше за текст), фрагменти з підсвіченими
+збігами будує функція `snippet()`.
+
+Якщо FTS5 недоступний (інша СУБД або SQLite без модуля), використовується
+резервний шлях: `icontains` по таблиці документів з ранжуванням і
+фрагментами, обчисленими в Python для обмеженої кількості кандидатів.
+"""
+
+import html
+import logging
+import re
+import threading
+
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Q
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from .bulk import books_bulk_saved
+from .compaction import sessions_compacted
+from .models import Book, Note, Quote, ReadingSession, SearchDocument
+from .stats import book_owner_id
+
+logger = logging.getLogger("tracker")
+
+#: Віртуальна таблиця FTS5, що дзеркалює `SearchDocument` (створюється міграцією).
+FTS_TABLE = "tracker_searchdocument_fts"
+
+#: Максимальна кількість результатів в одній відповіді.
+MAX_RESULTS = 50
+
+#: Кількість кандидатів, що ранжуються в Python на резервному шляху.
+FALLBACK_CANDIDATES = 500
+
+#: Приблизна довжина фрагмента резервного шляху (у символах).
+SNIPPET_CHARS = 120
+
+# Межі підсвічених збігів у фрагментах FTS5 (замінюються на <mark> після екранування).
+_OPEN, _CLOSE = "\x02", "\x03"
+
+_TOKEN_RE = re.compile(r"\w+")
+
+# Наявність таблиці FTS5 у поточному процесі: {alias підключення: bool}.
+_fts_state: dict[str, bool] = {}
+
+# Книги, що видаляються в поточному потоці: їхні документи видаляються каскадно.
+_deletion_state = threading.local()
+
+
+def _deleting_books():
+    if not hasattr(_deletion_state, "books"):
+        _deletion_state.books = set()
+    return _deletion_state.books
+
+
+def fts_available():
+    """Перевіряє (один раз на процес), чи доступна таблиця FTS5."""
+    if connection.alias not in _fts_state:
+        _fts_state[connection.alias] = (
+            connection.vendor == "sqlite" and FTS_TABLE in connection.introspection.table_names()
+        )
+        if not _fts_state[connection.alias]:
+            logger.info("FTS5 index is unavailable, library search uses the fallback path.")
+    return _fts_state[connection.alias]
+
+
+def query_tokens(query):
+    """Розбиває пошуковий запит на слова (у нижньому регістрі, без дублікатів)."""
+    return list(dict.fromkeys(token.lower() for token in _TOKEN_RE.findall(query)))
+
+
+# --- ІНДЕКСАЦІЯ ---
+
+
+def index_document(kind, object_id, user_id, book_id, content, title=""):
+    """Додає документ до індексу або оновлює наявний.
+
+    Args:
+        kind (str): Тип об'єкта (`book`, `note`, `quote`, `session`).
+        object_id (int): Ідентифікатор вихідного об'єкта.
+        user_id (int): Власник документа.
+        book_id (int): Книга, до якої належить документ.
+        content (str): Текст для пошуку.
+        title (str): Назва та автор (лише для документів книг).
+    """
+    values = {"user_id": user_id, "book_id": book_id, "title": title, "content": content or ""}
+    if SearchDocument.objects.filter(kind=kind, object_id=object_id).update(**values):
+        return
+    try:
+        with transaction.atomic():
+            SearchDocument.objects.create(kind=kind, object_id=object_id, **values)
+    except IntegrityError:
+        # Документ створено паралельно — оновлюємо його
+        SearchDocument.objects.filter(kind=kind, object_id=object_id).update(**values)
+
+
+def remove_document(kind, object_id):
+    """Видаляє документ вихідного об'єкта з індексу."""
+    SearchDocument.objects.filter(kind=kind, object_id=object_id).delete()
+
+
+def _book_document(book):
+    return SearchDocument(
+        user_id=book.user_id,
+        book_id=book.pk,
+        kind="book",
+        object_id=book.pk,
+        title=f"{book.title} {book.author}".strip(),
+        content=book.description or "",
+    )
+
+
+def index_book(book):
+    """Індексує опис, назву та автора книги."""
+    document = _book_document(book)
+    index_document("book", book.pk, book.user_id, book.pk, document.content, title=document.title)
+
+
+def index_books(books):
+    """Переіндексує пакет книг двома запитами (видалення та `bulk_create`)."""
+    if not books:
+        return
+    SearchDocument.objects.filter(kind="book", object_id__in=[book.pk for book in books]).delete()
+    SearchDocument.objects.bulk_create([_book_document(book) for book in books])
+
+
+def _document_changed(previous, book):
+    return previous is None or any(
+        getattr(previous, field) != getattr(book, field) for field in ("title", "author", "description")
+    )
+
+
+# --- ПОШУК ---
+
+
+def _fts_expression(user_id, tokens):
+    words = " ".join(f'"{token}"*' for token in tokens)
+    return f'owner : "u{user_id}" AND {{title content}} : ({words})'
+
+
+def _mark(text):
+    """Екранує фрагмент FTS5 і замінює межі збігів на теги <mark>."""
+    return html.escape(text).replace(_OPEN, "<mark>").replace(_CLOSE, "</mark>")
+
+
+def _search_fts(user_id, tokens, limit):
+    documents = SearchDocument._meta.db_table
+    books = Book._meta.db_table
+    sql = f"""
+        SELECT d.id, d.kind, d.object_id, d.book_id, b.title, b.author,
+               snippet({FTS_TABLE}, 2, %s, %s, '…', 12),
+               snippet({FTS_TABLE}, 1, %s, %s, '…', 12),
+               bm25({FTS_TABLE}, 0.0, 2.0, 1.0) AS score
+        FROM {FTS_TABLE}
+        JOIN {documents} d ON d.id = {FTS_TABLE}.rowid
+        JOIN {books} b ON b.id = d.book_id
+        WHERE {FTS_TABLE} MATCH %s AND d.user_id = %s
+        ORDER BY score
+        LIMIT %s
+    """
+    params = [_OPEN, _CLOSE, _OPEN, _CLOSE, _fts_expression(user_id, tokens), user_id, limit]
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+
+    results = []
+    for _, kind, object_id, book_id, title, author, content_snippet, title_snippet, score in rows:
+        snippet_text = content_snippet if _OPEN in content_snippet or _OPEN not in title_snippet else title_snippet
+        results.append(_result(kind, object_id, book_id, title, author, _mark(snippet_text), -score))
+    return results
+
+
+def _fallback_snippet(text, pattern):
+    """Будує фрагмент навколо першого збігу та підсвічує всі збіги."""
+    match = pattern.search(text)
+    start = 0 if match is None else max(0, match.start() - SNIPPET_CHARS // 2)
+    fragment = text[start:start + SNIPPET_CHARS]
+    marked = pattern.sub(lambda m: f"{_OPEN}{m.group(0)}{_CLOSE}", fragment)
+    prefix = "…" if start > 0 else ""
+    suffix = "…" if start + SNIPPET_CHARS < len(text) else ""
+    return _mark(prefix + marked + suffix)
+
+
+def _search_fallback(user_id, tokens, limit):
+    condition = Q()
+    for token in tokens:
+        condition &= Q(title__icontains=token) | Q(content__icontains=token)
+    candidates = (
+        SearchDocument.objects.filter(condition, user_id=user_id)
+        .order_by("-id")
+        .values_list("kind", "object_id", "book_id", "book__title", "book__author", "title", "content")
+    )[:FALLBACK_CANDIDATES]
+
+    pattern = re.compile(r"\b(?:" + "|".join(re.escape(token) for token in tokens) + r")\w*", re.IGNORECASE)
+    scored = []
+    for kind, object_id, book_id, book_title, author, title, content in candidates:
+        title_hits = len(pattern.findall(title))
+        content_hits = len(pattern.findall(content))
+        score = (2 * title_hits + content_hits) / (1 + len(content) / 1000)
+        scored.append((score, kind, object_id, book_id, book_title, author, title, content, content_hits))
+    scored.sort(key=lambda item: item[0], reverse=True)
+
+    results = []
+    for score, kind, object_id, book_id, book_title, author, title, content, content_hits in scored[:limit]:
+        snippet = _fallback_snippet(content if content_hits or not title else title, pattern)
+        results.append(_result(kind, object_id, book_id, book_title, author, snippet, score))
+    return results
+
+
+def _result(kind, object_id, book_id, book_title, book_author, snippet, rank):
+    return {
+        "type": kind,
+        "id": object_id,
+        "bookId": book_id,
+        "bookTitle": book_title,
+        "bookAuthor": book_author,
+        "snippet": snippet,
+        "rank": round(rank, 6),
+    }
+
+
+def search_library(user_id, query, limit=20):
+    """Шукає збіги в бібліотеці користувача.
+
+    Кожне слово запиту шукається як префікс; документ має містити всі слова.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        query (str): Пошуковий запит.
+        limit (int): Максимальна кількість результатів.
+
+    Returns:
+        list: Результати за спаданням релевантності (ключі `type`, `id`,
+        `bookId`, `bookTitle`, `bookAuthor`, `snippet`, `rank`).
+    """
+    tokens = query_tokens(query)
+    if not tokens:
+        return []
+    if fts_available():
+        return _search_fts(user_id, tokens, limit)
+    return _search_fallback(user_id, tokens, limit)
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ ---
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, created, **kwargs):
+    """Оновлює документ книги, якщо змінилися назва, автор чи опис."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if _document_changed(previous, instance):
+        index_book(instance)
+
+
+@receiver(books_bulk_saved)
+def books_bulk_saved_handler(sender, user_id, created, updated, sessions, **kwargs):
+    """Індексує нові та змінені книги пакета і нотатки створених сесій."""
+    index_books([*created, *(book for previous, book in updated if _document_changed(previous, book))])
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(user_id=user_id, book_id=session.book_id, kind="session", object_id=session.pk, content=session.note)
+            for session in sessions
+            if session.note
+        ]
+    )
+
+
+@receiver(sessions_compacted)
+def sessions_compacted_handler(sender, user_id, merged, **kwargs):
+    """Прибирає документи видалених сесій і переіндексує об'єднані нотатки."""
+    removed_ids = [session.pk for _, _, removed in merged for session in removed if session.note]
+    changed = [survivor for previous, survivor, _ in merged if survivor.note != previous["note"]]
+    SearchDocument.objects.filter(
+        kind="session", object_id__in=[*removed_ids, *(survivor.pk for survivor in changed)]
+    ).delete()
+    SearchDocument.objects.bulk_create(
+        [
+            SearchDocument(user_id=user_id, book_id=survivor.book_id, kind="session", object_id=survivor.pk, content=survivor.note)
+            for survivor in changed
+            if survivor.note
+        ]
+    )
+
+
+@receiver(pre_delete, sender=Book)
+def book_pre_delete(sender, instance, **kwargs):
+    """Позначає книгу: документи її нотаток, цитат і сесій видаляються каскадно."""
+    _deleting_books().add(instance.pk)
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    _deleting_books().discard(instance.pk)
+
+
+@receiver(post_save, sender=Note)
+@receiver(post_save, sender=Quote)
+def text_saved(sender, instance, **kwargs):
+    """Індексує вміст нотатки або цитати."""
+    index_document(sender._meta.model_name, instance.pk, instance.user_id, instance.book_id, instance.content)
+
+
+@receiver(post_save, sender=ReadingSession)
+def session_saved(sender, instance, created, **kwargs):
+    """Індексує нотатку сесії читання (сесії без нотатки в індекс не потрапляють)."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if instance.note:
+        if previous is None or previous["note"] != instance.note:
+            index_document("session", instance.pk, book_owner_id(instance), instance.book_id, instance.note)
+    elif not created and (previous is None or previous["note"]):
+        remove_document("session", instance.pk)
+
+
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Quote)
+@receiver(post_delete, sender=ReadingSession)
+def text_deleted(sender, instance, **kwargs):
+    """Видаляє документ об'єкта, якщо він не видаляється разом із книгою."""
+    if instance.book_id in _deleting_books():
+        return
+    if sender is ReadingSession and not instance.note:
+        return
+    kind = "session" if sender is ReadingSession else sender._meta.model_name
+    remove_document(kind, instance.pk)
@@ -9,7 +9,7 @@
 from djoser.serializers import UserCreateSerializer as DjoserUserCreateSerializer
 from rest_framework import serializers
 
-from .models import Book, Note, Quote, ReadingCycle, ReadingSession, User
+from .models import Book, CatalogVolume, Note, Quote, ReadingCycle, ReadingSession, User
 
 
 class UserCreateSerializer(DjoserUserCreateSerializer):
@@ -55,6 +55,7 @@ class UserSerializer(serializers.ModelSerializer):
             "bio",
             "yearly_goal",
             "avatar",
+            "timezone",
             "date_joined",
         )
         read_only_fields = ("email", "date_joined")
@@ -150,19 +151,62 @@ class ReadingCycleSerializer(serializers.ModelSerializer):
         fields = ["id", "start_date", "end_date"]
 
 
+class ReadingCycleSyncSerializer(ReadingCycleSerializer):
+    """Серіалізатор циклу читання для синхронізації (із посиланням на книгу)."""
+
+    class Meta(ReadingCycleSerializer.Meta):
+        """Поля циклу читання разом з ідентифікатором книги."""
+
+        fields = ["id", "book", "start_date", "end_date"]
+
+
 class BookSerializer(serializers.ModelSerializer):
     """Серіалізатор для книг.
 
     Включає всі основні поля книги, а також вкладені сесії читання,
     пов'язані з цією книгою.
 
+    Підтримує розріджені набори полів: якщо передано аргумент `fields`,
+    серіалізуються лише перелічені поля та вкладені колекції з `expand`.
+    Без аргументів серіалізатор повертає повне представлення.
+
     Attributes:
         readingSessions (ReadingSessionSerializer): Список пов'язаних сесій читання (лише для читання).
         reading_cycles (ReadingCycleSerializer): Історія попередніх циклів читання (лише для читання).
         book_quotes (QuoteSerializer): Колекція збережених цитат до даної книги.
         book_notes (NoteSerializer): Колекція збережених нотаток до даної книги.
+        catalogId (PrimaryKeyRelatedField): Том спільного каталогу (`catalogId`
+            результату зовнішнього пошуку), з якого додано книгу.
     """
 
+    #: Вкладені колекції та відповідні їм зв'язки моделі (для `prefetch_related`).
+    EXPANDABLE_FIELDS = {
+        "readingSessions": "reading_sessions",
+        "reading_cycles": "reading_cycles",
+        "book_notes": "book_notes",
+        "book_quotes": "book_quotes",
+    }
+
+    #: Компактне представлення книги для списку (сітка головної сторінки).
+    LIST_FIELDS = (
+        "id",
+        "title",
+        "author",
+        "genre",
+        "year",
+        "rating",
+        "status",
+        "progress",
+        "totalPages",
+        "currentPage",
+        "cover",
+        "addedDate",
+        "updatedAt",
+        "note",
+        "isFavorite",
+        "isCustom",
+    )
+
     readingSessions = ReadingSessionSerializer(
         many=True, read_only=True, source="reading_sessions"
     )
@@ -172,6 +216,25 @@ class BookSerializer(serializers.ModelSerializer):
     book_quotes = QuoteSerializer(many=True, read_only=True)
     book_notes = NoteSerializer(many=True, read_only=True)
 
+    catalogId = serializers.PrimaryKeyRelatedField(
+        source="catalog", queryset=CatalogVolume.objects.all(), required=False, allow_null=True
+    )
+
+    def __init__(self, *args, fields=None, expand=(), **kwargs):
+        """Ініціалізує серіалізатор, за потреби обмежуючи набір полів.
+
+        Args:
+            fields (Iterable[str], optional): Поля представлення. `None` — усі поля.
+            expand (Iterable[str]): Вкладені колекції, що додаються до `fields`.
+        """
+        super().__init__(*args, **kwargs)
+        if fields is None:
+            return
+        allowed = set(fields) | set(expand)
+        for name in list(self.fields):
+            if name not in allowed:
+                self.fields.pop(name)
+
     class Meta:
         """Мета-параметри книги з визначенням полів лише для читання."""
 
@@ -202,6 +265,7 @@ class BookSerializer(serializers.ModelSerializer):
             "externalRating",
             "ratingsCount",
             "isCustom",
+            "catalogId",
         )
         read_only_fields = ("progress", "addedDate", "updatedAt")
 
@@ -226,3 +290,61 @@ class BookSerializer(serializers.ModelSerializer):
                         "Поточна сторінка не може бути більшою за загальну кількість сторінок."
                     )
             return data
+
+
+#: Формати дат у файлах імпорту (ISO та Goodreads `2023/05/14`).
+IMPORT_DATE_FORMATS = ["iso-8601", "%Y/%m/%d"]
+
+
+class ImportSessionSerializer(serializers.ModelSerializer):
+    """Серіалізатор історичної сесії читання з файлу імпорту.
+
+    На відміну від `ReadingSessionSerializer`, дата сесії приймається з файлу
+    (дата без часу також допускається).
+    """
+
+    date = serializers.DateTimeField(
+        required=False, allow_null=True, input_formats=[*IMPORT_DATE_FORMATS, "%Y-%m-%d"]
+    )
+
+    class Meta:
+        """Поля історичної сесії читання."""
+
+        model = ReadingSession
+        fields: tuple[str, ...] = ("date", "pages_read", "duration", "note")
+
+
+class ImportCycleSerializer(ReadingCycleSerializer):
+    """Серіалізатор архівного циклу читання з файлу імпорту."""
+
+    start_date = serializers.DateField(input_formats=IMPORT_DATE_FORMATS)
+    end_date = serializers.DateField(input_formats=IMPORT_DATE_FORMATS)
+
+    class Meta(ReadingCycleSerializer.Meta):
+        """Дати початку та завершення циклу."""
+
+        fields = ["start_date", "end_date"]
+
+    def validate(self, data):
+        """Перевіряє, що цикл не завершується раніше, ніж почався."""
+        if data["end_date"] < data["start_date"]:
+            raise serializers.ValidationError("Дата завершення циклу раніша за дату початку.")
+        return data
+
+
+class SessionBatchItemSerializer(ImportSessionSerializer):
+    """Серіалізатор сесії з пакета офлайн-таймера (`/api/sessions/batch/`).
+
+    Книга передається ідентифікатором (власність перевіряється одним запитом
+    на весь пакет), а `key` — ключ ідемпотентності, згенерований клієнтом.
+    """
+
+    key = serializers.CharField(max_length=64)
+    book = serializers.IntegerField(min_value=1)
+    pages_read = serializers.IntegerField(min_value=0, required=False)
+    duration = serializers.IntegerField(min_value=0, required=False, allow_null=True)
+
+    class Meta(ImportSessionSerializer.Meta):
+        """Ключ, книга та дані сесії."""
+
+        fields = ("key", "book", "date", "pages_read", "duration", "note")
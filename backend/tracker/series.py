@@ -0,0 +1,132 @@
+"""
+Модуль часових рядів сесій читання для графіків темпу читання.
+
+Сесії групуються за годинами, днями або тижнями (у часовому поясі
+користувача) одним запитом `GROUP BY` у БД, тож клієнту не потрібно
+завантажувати всі сторінки списку сесій. Повертаються лише інтервали з
+сесіями.
+
+Для довгої історії ряд можна зменшити до заданої кількості точок
+алгоритмом Largest-Triangle-Three-Buckets (LTTB): він зберігає форму
+графіка (піки та спади), відкидаючи точки, що майже не впливають на неї.
+Підсумки `totals` завжди рахуються за повним рядом.
+"""
+
+import datetime
+
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncDay, TruncHour, TruncWeek
+
+from .models import ReadingSession
+from .rollups import user_zone
+
+#: Допустимі інтервали групування сесій.
+BUCKETS = ("hour", "day", "week")
+
+#: Мінімальна кількість точок після зменшення (перша, остання та хоча б одна між ними).
+MIN_POINTS = 3
+
+#: Максимальна кількість точок, яку можна запросити.
+MAX_POINTS = 5000
+
+_TRUNCATE = {"hour": TruncHour, "day": TruncDay, "week": TruncWeek}
+
+
+def lttb(xs, ys, threshold):
+    """Вибирає індекси точок ряду алгоритмом Largest-Triangle-Three-Buckets.
+
+    Перша та остання точки зберігаються завжди. Решта ряду ділиться на
+    `threshold - 2` кошики; з кожного береться точка, що утворює найбільший
+    трикутник з попередньою вибраною точкою та середнім наступного кошика.
+
+    Args:
+        xs (Sequence[float]): Координати X (зростаючі).
+        ys (Sequence[float]): Координати Y.
+        threshold (int): Бажана кількість точок.
+
+    Returns:
+        list[int]: Відсортовані індекси вибраних точок.
+    """
+    count = len(xs)
+    if threshold >= count or threshold < MIN_POINTS:
+        return list(range(count))
+
+    every = (count - 2) / (threshold - 2)
+    selected = [0]
+    previous = 0
+    for index in range(threshold - 2):
+        average_start = int((index + 1) * every) + 1
+        average_end = min(int((index + 2) * every) + 1, count)
+        average_x = sum(xs[average_start:average_end]) / (average_end - average_start)
+        average_y = sum(ys[average_start:average_end]) / (average_end - average_start)
+
+        previous_x, previous_y = xs[previous], ys[previous]
+        best, best_area = None, -1.0
+        for candidate in range(int(index * every) + 1, int((index + 1) * every) + 1):
+            area = abs(
+                (previous_x - average_x) * (ys[candidate] - previous_y)
+                - (previous_x - xs[candidate]) * (average_y - previous_y)
+            )
+            if area > best_area:
+                best, best_area = candidate, area
+        selected.append(best)
+        previous = best
+    selected.append(count - 1)
+    return selected
+
+
+def _payload(values):
+    return {"pagesRead": values[0], "secondsRead": values[1], "sessions": values[2]}
+
+
+def session_series(user_id, bucket="day", book_id=None, start=None, end=None, points=None):
+    """Агрегує сесії користувача (або однієї книги) в часовий ряд.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        bucket (str): Розмір інтервалу: 'hour', 'day' або 'week'.
+        book_id (int, optional): Обмежити ряд сесіями однієї книги.
+        start (datetime.date, optional): Перший день періоду.
+        end (datetime.date, optional): Останній день періоду.
+        points (int, optional): Максимальна кількість точок (LTTB за сторінками).
+
+    Returns:
+        dict: Ключі `bucket`, `book`, `from`, `to`, `count` (інтервалів до
+        зменшення), `downsampled`, `results` (`start`, `pagesRead`,
+        `secondsRead`, `sessions`) та `totals`.
+    """
+    zone = user_zone(user_id)
+    sessions = ReadingSession.objects.filter(book__user_id=user_id)
+    if book_id is not None:
+        sessions = sessions.filter(book_id=book_id)
+    if start is not None:
+        sessions = sessions.filter(date__gte=datetime.datetime.combine(start, datetime.time.min, zone))
+    if end is not None and end < datetime.date.max:
+        next_day = end + datetime.timedelta(days=1)
+        sessions = sessions.filter(date__lt=datetime.datetime.combine(next_day, datetime.time.min, zone))
+
+    rows = list(
+        sessions.order_by()
+        .annotate(bucket=_TRUNCATE[bucket]("date", tzinfo=zone))
+        .values("bucket")
+        .annotate(pages=Sum("pages_read"), seconds=Sum(Coalesce("duration", 0)), count=Count("id"))
+        .order_by("bucket")
+        .values_list("bucket", "pages", "seconds", "count")
+    )
+    totals = [sum(row[index] for row in rows) for index in (1, 2, 3)]
+
+    selected = rows
+    if points is not None and len(rows) > points:
+        indices = lttb([row[0].timestamp() for row in rows], [row[1] for row in rows], points)
+        selected = [rows[index] for index in indices]
+
+    return {
+        "bucket": bucket,
+        "book": book_id,
+        "from": start.isoformat() if start else None,
+        "to": end.isoformat() if end else None,
+        "count": len(rows),
+        "downsampled": len(selected) < len(rows),
+        "results": [{"start": row[0].isoformat(), **_payload(row[1:])} for row in selected],
+        "totals": _payload(totals),
+    }
@@ -0,0 +1,578 @@
+"""
+Модуль матеріалізованої статистики читання (read model).
+
+Замість того щоб на кожне відкриття дашборду виконувати десяток агрегацій над
+`Book` та `ReadingSession`, статистика зберігається у таблиці `UserReadingStats`
+і підтримується в актуальному стані інкрементально:
+
+1. **Дельти книг**: при збереженні книги обчислюється внесок її старого та нового
+   стану в лічильники, і до запису застосовується лише різниця.
+2. **Дельти сесій**: створення, зміна та видалення сесії читання коригує
+   лічильники часу без повторного сканування таблиці сесій.
+3. **Повний перерахунок**: `rebuild_user_stats` обчислює статистику з нуля
+   (використовується при першому зверненні та командою `rebuild_stats`).
+
+Записи, змінені в обхід ORM-сигналів (наприклад, `QuerySet.update`), не
+потрапляють у дельти — розбіжності виявляє та виправляє `rebuild_stats`.
+"""
+
+import logging
+import threading
+
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.db.models.functions import Coalesce, TruncMonth
+from django.db.models.signals import post_delete, post_save, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework.utils.encoders import JSONEncoder
+
+from .aggregates import book_aggregates, session_aggregates
+from .bulk import books_bulk_saved
+from .compaction import sessions_compacted
+from .models import Book, ReadingSession, UserReadingStats
+
+logger = logging.getLogger("tracker")
+
+#: Назви місяців для графіка щомісячної активності.
+MONTH_NAMES = {
+    1: "Січень",
+    2: "Лютий",
+    3: "Березень",
+    4: "Квітень",
+    5: "Травень",
+    6: "Червень",
+    7: "Липень",
+    8: "Серпень",
+    9: "Вересень",
+    10: "Жовтень",
+    11: "Листопад",
+    12: "Грудень",
+}
+
+#: Кількість книг у блоці "Остання активність".
+RECENT_BOOKS_LIMIT = 5
+
+#: Кількість авторів у рейтингу найпопулярніших.
+TOP_AUTHORS_LIMIT = 5
+
+#: Відповідність статусу книги полю-лічильнику статистики.
+STATUS_COUNTERS = {
+    "reading": "reading_count",
+    "read": "read_count",
+    "want-to-read": "want_count",
+}
+
+#: Скалярні лічильники, що підтримуються дельтами.
+SCALAR_FIELDS = (
+    "total_books",
+    "reading_count",
+    "read_count",
+    "want_count",
+    "favorite_count",
+    "custom_count",
+    "read_pages_total",
+    "read_pages_books",
+    "rating_total",
+    "rating_count",
+    "session_count",
+    "session_duration_total",
+    "session_duration_count",
+    "books_with_sessions",
+)
+
+#: Лічильники-словники (розподіли за ключем).
+KEYED_FIELDS = ("genre_counts", "author_counts", "monthly_read_counts")
+
+# Книги, що видаляються в поточному потоці: їхні сесії враховуються одним
+# агрегатом при видаленні самої книги, а не окремо при каскадному видаленні.
+_deletion_state = threading.local()
+
+
+def _deleting_books():
+    if not hasattr(_deletion_state, "books"):
+        _deletion_state.books = {}
+    return _deletion_state.books
+
+
+def _format_datetime(value):
+    """Форматує дату так само, як це робить JSON-рендерер DRF."""
+    return JSONEncoder().default(value) if value is not None else None
+
+
+def _recent_entry(book):
+    """Формує елемент списку "Остання активність" для книги."""
+    return {
+        "id": book.id,
+        "title": book.title,
+        "author": book.author,
+        "status": book.status,
+        "addedDate": _format_datetime(book.addedDate),
+    }
+
+
+def _book_contribution(book):
+    """Обчислює внесок однієї книги у лічильники статистики.
+
+    Args:
+        book (Book | None): Стан книги (або `None`, якщо книги не існує).
+
+    Returns:
+        tuple: Пара `(scalars, keyed)`, де `scalars` — словник приростів скалярних
+        полів, а `keyed` — словник приростів для полів-розподілів.
+    """
+    scalars = dict.fromkeys(SCALAR_FIELDS, 0)
+    keyed = {field: {} for field in KEYED_FIELDS}
+    if book is None:
+        return scalars, keyed
+
+    scalars["total_books"] = 1
+    if book.status in STATUS_COUNTERS:
+        scalars[STATUS_COUNTERS[book.status]] = 1
+    if book.isFavorite:
+        scalars["favorite_count"] = 1
+    if book.isCustom:
+        scalars["custom_count"] = 1
+
+    keyed["genre_counts"][book.genre] = 1
+    keyed["author_counts"][book.author] = 1
+
+    if book.status == "read":
+        if book.totalPages is not None:
+            scalars["read_pages_total"] = book.totalPages
+            scalars["read_pages_books"] = 1
+        if book.rating is not None:
+            scalars["rating_total"] = book.rating
+            scalars["rating_count"] = 1
+        if book.endDate:
+            keyed["monthly_read_counts"][str(book.endDate)[:7]] = 1
+
+    return scalars, keyed
+
+
+def _book_delta(old, new):
+    """Різниця внесків нового та старого стану книги."""
+    old_scalars, old_keyed = _book_contribution(old)
+    new_scalars, new_keyed = _book_contribution(new)
+
+    scalars = {
+        field: new_scalars[field] - old_scalars[field] for field in SCALAR_FIELDS
+    }
+    keyed = {}
+    for field in KEYED_FIELDS:
+        diff = dict(new_keyed[field])
+        for key, value in old_keyed[field].items():
+            diff[key] = diff.get(key, 0) - value
+        keyed[field] = {key: value for key, value in diff.items() if value}
+    return scalars, keyed
+
+
+def apply_delta(user_id, scalars=None, keyed=None, recent=None):
+    """Застосовує дельти до матеріалізованої статистики користувача.
+
+    Якщо запис статистики ще не створено, дельта ігнорується: статистика
+    буде обчислена з нуля при першому зверненні.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        scalars (dict, optional): Прирости скалярних лічильників.
+        keyed (dict, optional): Прирости лічильників-розподілів.
+        recent (callable, optional): Функція, що оновлює `recent_books` на місці.
+    """
+    scalars = {field: value for field, value in (scalars or {}).items() if value}
+    keyed = {field: value for field, value in (keyed or {}).items() if value}
+    if not (scalars or keyed or recent):
+        return
+
+    with transaction.atomic():
+        stats = UserReadingStats.objects.select_for_update().filter(pk=user_id).first()
+        if stats is None:
+            return
+
+        for field, value in scalars.items():
+            setattr(stats, field, getattr(stats, field) + value)
+
+        for field, deltas in keyed.items():
+            counters = getattr(stats, field)
+            for key, value in deltas.items():
+                total = counters.get(key, 0) + value
+                if total > 0:
+                    counters[key] = total
+                else:
+                    counters.pop(key, None)
+
+        if recent is not None:
+            recent(stats)
+
+        stats.save()
+
+
+def _recent_books(user_id):
+    """Повертає останні додані книги користувача безпосередньо з БД."""
+    books = Book.objects.filter(user_id=user_id).order_by("-addedDate")[
+        :RECENT_BOOKS_LIMIT
+    ]
+    return [_recent_entry(book) for book in books]
+
+
+def compute_stats(user):
+    """Обчислює всі поля `UserReadingStats` з нуля.
+
+    Скалярні показники рахуються однопрохідними умовними агрегатами
+    (`tracker.aggregates`), розподіли — окремими GROUP BY запитами.
+
+    Args:
+        user (User): Користувач, для якого рахується статистика.
+
+    Returns:
+        dict: Значення полів моделі `UserReadingStats`.
+    """
+    all_books = Book.objects.filter(user=user)
+
+    monthly_read_counts = {
+        month.strftime("%Y-%m"): count
+        for month, count in all_books.filter(status="read", endDate__isnull=False)
+        .annotate(month=TruncMonth("endDate"))
+        .values_list("month")
+        .annotate(count=Count("id"))
+        .order_by()
+    }
+
+    return {
+        **book_aggregates(user),
+        **session_aggregates(user),
+        "genre_counts": dict(
+            all_books.values_list("genre").annotate(count=Count("id")).order_by()
+        ),
+        "author_counts": dict(
+            all_books.values_list("author").annotate(count=Count("id")).order_by()
+        ),
+        "monthly_read_counts": monthly_read_counts,
+        "recent_books": _recent_books(user.pk),
+    }
+
+
+def rebuild_user_stats(user):
+    """Перераховує статистику користувача з нуля та зберігає результат.
+
+    Args:
+        user (User): Користувач, для якого перебудовується статистика.
+
+    Returns:
+        tuple: Пара `(stats, drift)`, де `stats` — збережений `UserReadingStats`,
+        а `drift` — словник `{поле: (збережене значення, фактичне значення)}`
+        для полів, що розійшлися з даними (порожній для щойно створеного запису).
+    """
+    values = compute_stats(user)
+
+    with transaction.atomic():
+        stats, created = UserReadingStats.objects.select_for_update().get_or_create(
+            user=user, defaults=values
+        )
+        drift = {}
+        if not created:
+            for field, value in values.items():
+                current = getattr(stats, field)
+                if current != value:
+                    drift[field] = (current, value)
+                    setattr(stats, field, value)
+            if drift:
+                stats.save()
+
+    if drift:
+        logger.warning(f"Reading stats drift for user {user.pk}: {sorted(drift)}")
+    return stats, drift
+
+
+def get_user_stats(user):
+    """Повертає матеріалізовану статистику, створюючи її за потреби.
+
+    У звичайному випадку це один запит за первинним ключем.
+
+    Args:
+        user (User): Поточний користувач.
+
+    Returns:
+        UserReadingStats: Актуальна статистика користувача.
+    """
+    stats = UserReadingStats.objects.filter(pk=user.pk).first()
+    if stats is None:
+        stats, _ = rebuild_user_stats(user)
+    return stats
+
+
+def build_dashboard(stats, user):
+    """Формує відповідь ендпоінту статистики з матеріалізованого запису.
+
+    Args:
+        stats (UserReadingStats): Статистика користувача.
+        user (User): Користувач (потрібна річна мета).
+
+    Returns:
+        dict: Дані для дашборду у форматі, який очікує фронтенд.
+    """
+    current_year = timezone.now().year
+    year_prefix = f"{current_year}-"
+
+    monthly = sorted(
+        (int(key[5:7]), count)
+        for key, count in stats.monthly_read_counts.items()
+        if key.startswith(year_prefix)
+    )
+    read_this_year_count = sum(count for _, count in monthly)
+
+    genre_stats = [
+        {"genre": genre, "count": count}
+        for genre, count in sorted(
+            stats.genre_counts.items(), key=lambda item: (-item[1], item[0])
+        )
+    ]
+    author_stats = [
+        {"author": author, "count": count}
+        for author, count in sorted(
+            stats.author_counts.items(), key=lambda item: (-item[1], item[0])
+        )[:TOP_AUTHORS_LIMIT]
+    ]
+
+    avg_rating = (
+        stats.rating_total / stats.rating_count if stats.rating_count else 0.0
+    )
+    avg_pages_per_book = (
+        stats.read_pages_total / stats.read_pages_books
+        if stats.read_pages_books
+        else 0.0
+    )
+    avg_duration_session = (
+        stats.session_duration_total / stats.session_duration_count
+        if stats.session_duration_count
+        else 0.0
+    )
+    avg_time_per_book = (
+        stats.session_duration_total / stats.books_with_sessions
+        if stats.books_with_sessions > 0
+        else 0
+    )
+
+    return {
+        "yearlyGoal": user.yearly_goal,
+        "booksReadThisYear": read_this_year_count,
+        "progressToGoal": (
+            min(100, int((read_this_year_count / user.yearly_goal) * 100))
+            if user.yearly_goal > 0
+            else 0
+        ),
+        # Загальна статистика
+        "totalBooks": stats.total_books,
+        "readCount": stats.read_count,
+        "averageRating": round(avg_rating, 1),
+        "genresCount": len(genre_stats),
+        "totalPagesRead": stats.read_pages_total,
+        "averagePagesPerBook": round(avg_pages_per_book, 0),
+        "reading": stats.reading_count,
+        "want": stats.want_count,
+        "fav": stats.favorite_count,
+        "customCount": stats.custom_count,
+        # Статистика часу
+        "totalReadingTime": stats.session_duration_total,
+        "totalReadingSessions": stats.session_count,
+        "averageSessionDuration": round(avg_duration_session, 0),
+        "averageTimePerBook": round(avg_time_per_book, 0),
+        # Дані для графіків
+        "genreStats": genre_stats,
+        "monthlyStats": [
+            {"month": MONTH_NAMES.get(month), "count": count}
+            for month, count in monthly
+        ],
+        "authorStats": author_stats,
+        "lastActivity": stats.recent_books,
+    }
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ: КНИГИ ---
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, created, **kwargs):
+    """Застосовує дельту статистики після створення або оновлення книги."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if not created and previous is None:
+        # Стан до збереження невідомий: дельту обчислити неможливо
+        return
+
+    scalars, keyed = _book_delta(previous, instance)
+    entry = _recent_entry(instance)
+
+    def update_recent(stats):
+        recent = [item for item in stats.recent_books if item["id"] != instance.id]
+        if created:
+            stats.recent_books = [entry, *recent][:RECENT_BOOKS_LIMIT]
+        elif len(recent) != len(stats.recent_books):
+            stats.recent_books = [
+                entry if item["id"] == instance.id else item
+                for item in stats.recent_books
+            ]
+
+    apply_delta(instance.user_id, scalars, keyed, recent=update_recent)
+
+
+@receiver(pre_delete, sender=Book)
+def book_pre_delete(sender, instance, **kwargs):
+    """Фіксує агрегати сесій книги до їх каскадного видалення."""
+    _deleting_books()[instance.pk] = ReadingSession.objects.filter(
+        book_id=instance.pk
+    ).aggregate(
+        session_count=Count("id"),
+        session_duration_total=Coalesce(Sum("duration"), 0),
+        session_duration_count=Count("duration"),
+    )
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    """Віднімає внесок видаленої книги та всіх її сесій зі статистики."""
+    sessions = _deleting_books().pop(instance.pk, None)
+    if sessions is None:
+        return
+
+    scalars, keyed = _book_delta(instance, None)
+    for field, value in sessions.items():
+        scalars[field] -= value
+    if sessions["session_duration_count"]:
+        scalars["books_with_sessions"] -= 1
+
+    def update_recent(stats):
+        if any(item["id"] == instance.pk for item in stats.recent_books):
+            stats.recent_books = _recent_books(instance.user_id)
+
+    apply_delta(instance.user_id, scalars, keyed, recent=update_recent)
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ: СЕСІЇ ЧИТАННЯ ---
+
+
+def book_owner_id(instance):
+    """Визначає власника сесії чи циклу читання через пов'язану книгу.
+
+    Якщо книга вже завантажена разом з об'єктом, додатковий запит не виконується.
+    """
+    if type(instance).book.is_cached(instance):
+        return instance.book.user_id
+    return (
+        Book.objects.filter(pk=instance.book_id).values_list("user_id", flat=True).first()
+    )
+
+
+def _has_timed_sessions(book_id):
+    """Перевіряє, чи має книга хоча б одну сесію із заповненою тривалістю."""
+    return ReadingSession.objects.filter(
+        book_id=book_id, duration__isnull=False
+    ).exists()
+
+
+@receiver(post_save, sender=ReadingSession)
+def session_saved(sender, instance, created, **kwargs):
+    """Оновлює лічильники часу читання після створення або зміни сесії."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    old_exists = previous is not None
+    old_duration = previous["duration"] if old_exists else None
+    new_duration = instance.duration
+
+    if not created and old_duration == new_duration:
+        return
+
+    scalars = {
+        "session_count": 1 if created else 0,
+        "session_duration_total": (new_duration or 0) - (old_duration or 0),
+        "session_duration_count": (new_duration is not None)
+        - (old_exists and old_duration is not None),
+    }
+
+    # Книга з'являється у "книгах із сесіями", коли отримує першу сесію з тривалістю,
+    # і зникає звідти, коли таких сесій не лишилось
+    if scalars["session_duration_count"] > 0:
+        if not ReadingSession.objects.filter(
+            book_id=instance.book_id, duration__isnull=False
+        ).exclude(pk=instance.pk).exists():
+            scalars["books_with_sessions"] = 1
+    elif scalars["session_duration_count"] < 0:
+        if not _has_timed_sessions(instance.book_id):
+            scalars["books_with_sessions"] = -1
+
+    apply_delta(book_owner_id(instance), scalars)
+
+
+@receiver(post_delete, sender=ReadingSession)
+def session_deleted(sender, instance, **kwargs):
+    """Віднімає видалену сесію зі статистики (крім каскадного видалення книги)."""
+    if instance.book_id in _deleting_books():
+        return
+    user_id = book_owner_id(instance)
+    if user_id is None:
+        return
+
+    scalars = {
+        "session_count": -1,
+        "session_duration_total": -(instance.duration or 0),
+        "session_duration_count": -(instance.duration is not None),
+    }
+    if instance.duration is not None and not _has_timed_sessions(instance.book_id):
+        scalars["books_with_sessions"] = -1
+
+    apply_delta(user_id, scalars)
+
+
+
+# --- ОБРОБНИК МАСОВИХ ОПЕРАЦІЙ ---
+
+
+@receiver(books_bulk_saved)
+def books_bulk_saved_handler(sender, user_id, created, updated, sessions, **kwargs):
+    """Застосовує сумарну дельту пакета книг і автоматичних сесій одним оновленням."""
+    scalars = dict.fromkeys(SCALAR_FIELDS, 0)
+    keyed = {field: {} for field in KEYED_FIELDS}
+    for previous, book in [*((None, book) for book in created), *updated]:
+        book_scalars, book_keyed = _book_delta(previous, book)
+        for field, value in book_scalars.items():
+            scalars[field] += value
+        for field, deltas in book_keyed.items():
+            for key, value in deltas.items():
+                keyed[field][key] = keyed[field].get(key, 0) + value
+
+    scalars["session_count"] += len(sessions)
+    scalars["session_duration_total"] += sum(session.duration or 0 for session in sessions)
+    scalars["session_duration_count"] += sum(session.duration is not None for session in sessions)
+    timed_books = {session.book_id for session in sessions if session.duration is not None}
+    if timed_books:
+        already_timed = set(
+            ReadingSession.objects.filter(book_id__in=timed_books, duration__isnull=False)
+            .exclude(pk__in=[session.pk for session in sessions])
+            .values_list("book_id", flat=True)
+            .distinct()
+        )
+        scalars["books_with_sessions"] += len(timed_books - already_timed)
+
+    entries = {book.pk: _recent_entry(book) for _, book in updated}
+    new_entries = [_recent_entry(book) for book in reversed(created)]
+
+    def update_recent(stats):
+        recent = [entries.get(item["id"], item) for item in stats.recent_books]
+        stats.recent_books = [*new_entries, *recent][:RECENT_BOOKS_LIMIT]
+
+    apply_delta(user_id, scalars, keyed, recent=update_recent)
+
+
+@receiver(sessions_compacted)
+def sessions_compacted_handler(sender, user_id, merged, **kwargs):
+    """Віднімає об'єднані сесії з лічильників (сумарна тривалість не змінюється)."""
+    scalars = dict.fromkeys(("session_count", "session_duration_total", "session_duration_count"), 0)
+    for previous, survivor, removed in merged:
+        scalars["session_count"] -= len(removed)
+        scalars["session_duration_total"] += (
+            (survivor.duration or 0) - (previous["duration"] or 0) - sum(session.duration or 0 for session in removed)
+        )
+        scalars["session_duration_count"] += (
+            (survivor.duration is not None)
+            - (previous["duration"] is not None)
+            - sum(session.duration is not None for session in removed)
+        )
+    apply_delta(user_id, scalars)
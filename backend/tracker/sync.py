@@ -0,0 +1,216 @@
+"""
+Модуль дельта-синхронізації бібліотеки для клієнтів із локальною копією даних.
+
+Клієнт надсилає маркер (`token`) з попередньої відповіді й отримує лише
+книги, сесії, нотатки, цитати та цикли читання, змінені після нього, а
+також видалені з того часу об'єкти (tombstones). Кожна відповідь містить
+новий маркер, тож узгодження теплого кешу — це один невеликий запит,
+вартість якого залежить від кількості змін, а не від розміру бібліотеки:
+
+* зміни відбираються за `updatedAt` (індекси `(user, updatedAt)` для книг,
+  нотаток і цитат, `updatedAt` для сесій і циклів);
+* видалення фіксуються сигналами в журналі `Tombstone`; записи дочірніх
+  об'єктів каскадно видаленої книги додаються одним `bulk_create`.
+
+Маркер підписаний (`django.core.signing`) і прив'язаний до користувача.
+Вибірка починається трохи раніше за час маркера (`SYNC_OVERLAP`), щоб не
+пропустити транзакції, що фіксувалися одночасно з попереднім запитом;
+повторно отримані об'єкти клієнт просто перезаписує. Якщо маркер старший
+за строк зберігання журналу видалень, повертається повний знімок.
+"""
+
+import datetime
+import threading
+
+from django.conf import settings
+from django.core import signing
+from django.db.models.signals import post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+from rest_framework import serializers
+
+from .compaction import sessions_compacted
+from .models import Book, Note, Quote, ReadingCycle, ReadingSession, Tombstone, User
+from .projections import build_projection
+from .serializers import (
+    BookSerializer,
+    NoteSerializer,
+    QuoteSerializer,
+    ReadingCycleSyncSerializer,
+    ReadingSessionSerializer,
+)
+from .stats import book_owner_id
+
+#: Сіль підпису маркерів синхронізації.
+TOKEN_SALT = "tracker.sync"
+
+#: Перекриття вибірки з попереднім маркером (для одночасних транзакцій).
+SYNC_OVERLAP = datetime.timedelta(seconds=5)
+
+#: Типи об'єктів журналу видалень для моделей.
+TOMBSTONE_KINDS = {
+    Book: "book",
+    ReadingSession: "session",
+    Note: "note",
+    Quote: "quote",
+    ReadingCycle: "cycle",
+}
+
+_deletion_state = threading.local()
+
+
+def _deleting_books():
+    # {book_id: (user_id, записи видалень її дочірніх об'єктів)}
+    if not hasattr(_deletion_state, "books"):
+        _deletion_state.books = {}
+    return _deletion_state.books
+
+
+def _deleting_users():
+    if not hasattr(_deletion_state, "users"):
+        _deletion_state.users = set()
+    return _deletion_state.users
+
+
+def tombstone_retention():
+    """Строк зберігання журналу видалень (`TRACKER_TOMBSTONE_RETENTION_DAYS`)."""
+    return datetime.timedelta(days=getattr(settings, "TRACKER_TOMBSTONE_RETENTION_DAYS", 90))
+
+
+def make_token(user_id, moment):
+    """Створює підписаний маркер синхронізації для користувача."""
+    return signing.dumps({"u": user_id, "t": moment.isoformat()}, salt=TOKEN_SALT)
+
+
+def read_token(user_id, token):
+    """Перевіряє маркер і повертає збережений у ньому час.
+
+    Raises:
+        ValueError: Маркер пошкоджений, підроблений або виданий іншому користувачу.
+    """
+    try:
+        payload = signing.loads(token, salt=TOKEN_SALT)
+    except signing.BadSignature as exc:
+        raise ValueError("invalid sync token") from exc
+    if payload.get("u") != user_id:
+        raise ValueError("sync token belongs to another user")
+    return datetime.datetime.fromisoformat(payload["t"])
+
+
+def library_collections(user_id):
+    """Набори даних бібліотеки користувача та серіалізатори їхнього представлення.
+
+    Використовується синхронізацією та експортом (`tracker.exports`).
+    """
+    book_fields = [name for name in BookSerializer.Meta.fields if name not in BookSerializer.EXPANDABLE_FIELDS]
+    return [
+        ("books", Book.objects.filter(user_id=user_id), BookSerializer(fields=book_fields)),
+        ("sessions", ReadingSession.objects.filter(book__user_id=user_id), ReadingSessionSerializer()),
+        ("notes", Note.objects.filter(user_id=user_id), NoteSerializer()),
+        ("quotes", Quote.objects.filter(user_id=user_id), QuoteSerializer()),
+        ("cycles", ReadingCycle.objects.filter(book__user_id=user_id), ReadingCycleSyncSerializer()),
+    ]
+
+
+def changes_since(user_id, since=None):
+    """Формує відповідь синхронізації.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        since (datetime | None): Час з маркера; `None` — повний знімок.
+
+    Returns:
+        dict: Новий маркер `token`, ознака повного знімка `full`, змінені
+        об'єкти за колекціями та видалення `deleted` (`type`, `id`, `deletedAt`).
+    """
+    now = timezone.now()
+    full = since is None or since < now - tombstone_retention()
+    cutoff = None if full else since - SYNC_OVERLAP
+
+    payload = {"token": make_token(user_id, now), "full": full}
+    for name, queryset, serializer in library_collections(user_id):
+        if cutoff is not None:
+            queryset = queryset.filter(updatedAt__gt=cutoff)
+        projection = build_projection(serializer)
+        payload[name] = [projection.represent(row) for row in projection.values(queryset.order_by("id"))]
+
+    deleted = []
+    if cutoff is not None:
+        tombstones = Tombstone.objects.filter(user_id=user_id, deletedAt__gt=cutoff).order_by("id")
+        represent = serializers.DateTimeField().to_representation
+        deleted = [
+            {"type": kind, "id": object_id, "deletedAt": represent(deleted_at)}
+            for kind, object_id, deleted_at in tombstones.values_list("kind", "object_id", "deletedAt")
+        ]
+    payload["deleted"] = deleted
+    return payload
+
+
+def purge_tombstones(before=None):
+    """Видаляє записи журналу, старші за строк зберігання.
+
+    Returns:
+        int: Кількість видалених записів.
+    """
+    before = before or timezone.now() - tombstone_retention()
+    deleted, _ = Tombstone.objects.filter(deletedAt__lt=before).delete()
+    return deleted
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ ---
+
+
+@receiver(pre_delete, sender=User)
+def user_pre_delete(sender, instance, **kwargs):
+    """Журнал видалень користувача видаляється разом із ним — нові записи не потрібні."""
+    _deleting_users().add(instance.pk)
+
+
+@receiver(post_delete, sender=User)
+def user_deleted(sender, instance, **kwargs):
+    _deleting_users().discard(instance.pk)
+
+
+@receiver(pre_delete, sender=Book)
+def book_pre_delete(sender, instance, **kwargs):
+    """Починає збирати записи видалень дочірніх об'єктів книги."""
+    _deleting_books()[instance.pk] = (instance.user_id, [])
+
+
+@receiver(post_delete, sender=Book)
+def book_deleted(sender, instance, **kwargs):
+    """Записує видалення книги та її дочірніх об'єктів одним запитом."""
+    _, tombstones = _deleting_books().pop(instance.pk, (None, []))
+    if instance.user_id in _deleting_users():
+        return
+    tombstones.append(Tombstone(user_id=instance.user_id, kind="book", object_id=instance.pk))
+    Tombstone.objects.bulk_create(tombstones)
+
+
+@receiver(post_delete, sender=ReadingSession)
+@receiver(post_delete, sender=Note)
+@receiver(post_delete, sender=Quote)
+@receiver(post_delete, sender=ReadingCycle)
+def child_deleted(sender, instance, **kwargs):
+    """Записує видалення сесії, нотатки, цитати чи циклу читання."""
+    kind = TOMBSTONE_KINDS[sender]
+    if instance.book_id in _deleting_books():
+        # Власник відомий з книги; запис буде додано разом із нею
+        user_id, tombstones = _deleting_books()[instance.book_id]
+        tombstones.append(Tombstone(user_id=user_id, kind=kind, object_id=instance.pk))
+        return
+
+    user_id = instance.user_id if hasattr(instance, "user_id") else book_owner_id(instance)
+    if user_id is None or user_id in _deleting_users():
+        return
+    Tombstone.objects.create(user_id=user_id, kind=kind, object_id=instance.pk)
+
+
+@receiver(sessions_compacted)
+def sessions_compacted_handler(sender, user_id, merged, **kwargs):
+    """Записує видалення сесій, об'єднаних під час ущільнення, одним запитом."""
+    Tombstone.objects.bulk_create(
+        Tombstone(user_id=user_id, kind="session", object_id=session.pk)
+        for _, _, removed in merged
+        for session in removed
+    )
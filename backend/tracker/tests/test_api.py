@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, patch
 
 from django.contrib.auth import get_user_model
 from django.urls import reverse
@@ -177,17 +177,15 @@ class AuthAPITestCase(APITestCase):
         self.assertEqual(self.user.yearly_goal, 50)
         self.assertEqual(self.user.bio, "Updated bio for integration test")
 
-    @patch('tracker.views.requests.get')
+    @patch('tracker.external_search.google_books.search', new_callable=AsyncMock)
     def test_08_external_search_integration(self, mock_get):
         """4.1 Позитивна перевірка: пошук книги через зовнішнє API (з моком).
-        **Архітектурне рішення:** Використання бібліотеки `requests` з механізмом Mocking.
+        **Архітектурне рішення:** Використання клієнта Google Books з механізмом Mocking.
         Тест демонструє, як система обробляє відповіді від зовнішніх сервісів, 
         ізолюючи внутрішню логіку від мережевих затримок.
         """
         # Налаштовуємо Mock, щоб не робити реальний запит до Google
-        mock_response = MagicMock()
-        mock_response.status_code = 200
-        mock_response.json.return_value = {
+        mock_get.return_value = {
             "items": [
                 {
                     "id": "123",
@@ -200,15 +198,14 @@ class AuthAPITestCase(APITestCase):
                 }
             ]
         }
-        mock_get.return_value = mock_response
 
         search_url = reverse('external-search')
         response = self.client.get(search_url, {'q': 'Mocked', 'filter': 'title'})
 
         self.assertEqual(response.status_code, 200)
         # Перевіряємо, що наша View коректно розпарсила відповідь від Google
-        self.assertEqual(len(response.data['results']), 1)
-        self.assertEqual(response.data['results'][0]['title'], "Mocked Book")
+        self.assertEqual(len(response.json()['results']), 1)
+        self.assertEqual(response.json()['results'][0]['title'], "Mocked Book")
 
     def test_09_add_book_success(self):
         """5.1 Позитивна перевірка: додавання книги до бібліотеки."""
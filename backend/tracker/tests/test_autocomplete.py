@@ -0,0 +1,81 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Book, BookTrigram
+from tracker.trigrams import book_trigrams, trigrams
+
+User = get_user_model()
+
+
+class AutocompleteTests(TestCase):
+    """Тести нечіткого автодоповнення за триграмним індексом."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.dune = Book.objects.create(user=self.user, title="Dune", author="Frank Herbert")
+        self.kobzar = Book.objects.create(user=self.user, title="Кобзар", author="Тарас Шевченко")
+        Book.objects.create(user=self.user, title="Dubliners", author="James Joyce")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def suggest(self, query):
+        response = self.client.get(reverse("book-autocomplete"), {"q": query})
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.data["results"]]
+
+    def test_trigrams_are_normalized(self):
+        """Регістр, діакритика та розділові знаки не впливають на триграми."""
+        self.assertEqual(trigrams("Émile!"), trigrams("emile"))
+        self.assertIn("  d", trigrams("Dune"))
+
+    def test_prefix_typo_and_author(self):
+        """Знаходить книгу за початком назви, з одруківкою та за автором."""
+        self.assertEqual(self.suggest("dun")[0], self.dune.pk)
+        self.assertEqual(self.suggest("herbret")[0], self.dune.pk)
+        self.assertEqual(self.suggest("шевченко")[0], self.kobzar.pk)
+        self.assertEqual(self.suggest("xyzzy"), [])
+
+    def test_index_is_maintained_incrementally(self):
+        """Створення, перейменування та видалення книги оновлюють індекс."""
+        self.assertEqual(
+            set(self.dune.trigrams.values_list("trigram", flat=True)),
+            book_trigrams("Dune", "Frank Herbert"),
+        )
+
+        self.dune.title = "Children of Dune"
+        self.dune.save()
+        self.assertEqual(
+            set(self.dune.trigrams.values_list("trigram", flat=True)),
+            book_trigrams("Children of Dune", "Frank Herbert"),
+        )
+        self.assertEqual(self.suggest("childrn")[0], self.dune.pk)
+
+        self.dune.delete()
+        self.assertFalse(BookTrigram.objects.filter(book_id=self.dune.pk).exists())
+
+    def test_unrelated_save_does_not_touch_index(self):
+        """Збереження без зміни назви чи автора не звертається до індексу."""
+        self.dune.rating = 5
+        with CaptureQueriesContext(connection) as context:
+            self.dune.save()
+        self.assertFalse(any("tracker_booktrigram" in query["sql"] for query in context.captured_queries))
+
+    def test_scoped_to_user(self):
+        """Підказки містять лише книги поточного користувача."""
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        messiah = Book.objects.create(user=other, title="Dune Messiah", author="Frank Herbert")
+        suggestions = self.suggest("dune")
+        self.assertEqual(suggestions[0], self.dune.pk)
+        self.assertNotIn(messiah.pk, suggestions)
+
+    def test_requires_query(self):
+        """Порожній запит повертає 400."""
+        self.assertEqual(self.client.get(reverse("book-autocomplete")).status_code, 400)
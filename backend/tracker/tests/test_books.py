@@ -0,0 +1,160 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracker.models import Book, Note, Quote, ReadingSession
+from tracker.serializers import BookSerializer
+
+User = get_user_model()
+
+
+class BookRepresentationTests(TestCase):
+    """Тести розріджених наборів полів (`?fields=` / `?expand=`) для книг."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        for i in range(3):
+            book = Book.objects.create(
+                user=self.user, title=f"Book {i}", author="Author", totalPages=100
+            )
+            ReadingSession.objects.create(book=book, pages_read=10, duration=60)
+            Note.objects.create(user=self.user, book=book, content="Нотатка")
+            Quote.objects.create(user=self.user, book=book, content="Цитата")
+        self.book = book
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_list_is_compact_by_default(self):
+        """Список без параметрів не містить вкладених колекцій і не завантажує їх."""
+        # Один SELECT книг: без COUNT і без запитів до вкладених таблиць
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("book-list"))
+
+        book = response.data["results"][0]
+        self.assertEqual(tuple(book), BookSerializer.LIST_FIELDS)
+
+    def test_list_expand_prefetches_only_requested(self):
+        """`expand` додає вкладені колекції та префетчить лише їх."""
+        with self.assertNumQueries(3):
+            response = self.client.get(
+                reverse("book-list"), {"expand": "book_notes,readingSessions"}
+            )
+
+        book = response.data["results"][0]
+        self.assertEqual(len(book["book_notes"]), 1)
+        self.assertEqual(len(book["readingSessions"]), 1)
+        self.assertNotIn("book_quotes", book)
+        self.assertNotIn("reading_cycles", book)
+
+    def test_fields_selects_representation(self):
+        """`fields` обмежує представлення як списку, так і деталей книги."""
+        response = self.client.get(reverse("book-list"), {"fields": "id,title"})
+        self.assertEqual(set(response.data["results"][0]), {"id", "title"})
+
+        response = self.client.get(
+            reverse("book-detail", args=[self.book.pk]),
+            {"fields": "id,status", "expand": "book_quotes"},
+        )
+        self.assertEqual(set(response.data), {"id", "status", "book_quotes"})
+
+    def test_empty_fields_falls_back_to_default(self):
+        """Порожній `fields` (чи лише коми) дає типове представлення, а не порожні об'єкти."""
+        for value in ("", ",", " , "):
+            with self.subTest(fields=value):
+                response = self.client.get(reverse("book-list"), {"fields": value})
+                self.assertEqual(tuple(response.data["results"][0]), tuple(BookSerializer.LIST_FIELDS))
+
+                response = self.client.get(reverse("book-detail", args=[self.book.pk]), {"fields": value})
+                self.assertEqual(tuple(response.data), BookSerializer.Meta.fields)
+
+    def test_detail_is_full_by_default(self):
+        """Деталі книги за замовчуванням містять усі поля та вкладені колекції."""
+        response = self.client.get(reverse("book-detail", args=[self.book.pk]))
+
+        self.assertEqual(tuple(response.data), BookSerializer.Meta.fields)
+        self.assertEqual(len(response.data["book_quotes"]), 1)
+
+
+class BookSaveTests(TestCase):
+    """Тести збереження книги з відстеженням змінених полів (`TrackedFieldsMixin`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        Book.objects.create(user=self.user, title="Dune", author="Herbert", genre="sci-fi", totalPages=400)
+        self.book = Book.objects.get(title="Dune")
+
+    def book_queries(self, context):
+        return [query["sql"] for query in context.captured_queries if '"tracker_book"' in query["sql"].split(" WHERE ")[0]]
+
+    def test_update_writes_only_changed_fields_without_select(self):
+        """Оновлення книги — один вузький UPDATE без попереднього SELECT."""
+        self.book.rating = 5
+        with CaptureQueriesContext(connection) as context:
+            self.book.save()
+
+        (sql,) = self.book_queries(context)
+        self.assertTrue(sql.startswith("UPDATE"))
+        columns = sql.split(" SET ")[1].split(" WHERE ")[0]
+        self.assertIn('"rating"', columns)
+        self.assertIn('"updatedAt"', columns)
+        self.assertNotIn('"title"', columns)
+        self.assertEqual(self.book.changed_fields(), set())
+
+    def test_auto_session_from_page_delta(self):
+        """Приріст сторінок створює сесію читання на різницю з попереднім значенням."""
+        self.book.currentPage = 40
+        self.book.save()
+        self.book.currentPage = 100
+        with CaptureQueriesContext(connection) as context:
+            self.book.save()
+
+        self.assertEqual(list(self.book.reading_sessions.order_by("id").values_list("pages_read", flat=True)), [40, 60])
+        self.assertEqual(self.book.progress, 25)
+        self.assertFalse(any(sql.startswith("SELECT") for sql in self.book_queries(context)))
+
+    def test_auto_finish_when_pages_reach_total(self):
+        """Остання сторінка робить книгу прочитаною з датою завершення та 100%."""
+        self.book.status = "reading"
+        self.book.save()
+        self.book.currentPage = 400
+        self.book.save()
+
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.status, self.book.progress), ("read", 100))
+        self.assertEqual(self.book.endDate, timezone.now().date())
+        self.assertEqual(self.book.startDate, timezone.now().date())
+        self.assertEqual(self.book.reading_sessions.get().pages_read, 400)
+
+    def test_forced_full_progress_when_marked_read(self):
+        """Ручна зміна статусу на 'read' підтягує сторінки й створює сесію на решту."""
+        self.book.currentPage = 100
+        self.book.save()
+        self.book.status = "read"
+        self.book.save()
+
+        stored = Book.objects.get(pk=self.book.pk)
+        self.assertEqual((stored.currentPage, stored.progress, stored.status), (400, 100, "read"))
+        self.assertEqual(list(self.book.reading_sessions.order_by("id").values_list("pages_read", flat=True)), [100, 300])
+
+    def test_untracked_instance_falls_back_to_select(self):
+        """Екземпляр, створений вручну з `pk`, читає попередній стан з БД."""
+        self.book.currentPage = 50
+        self.book.save()
+        detached = Book(
+            pk=self.book.pk, user=self.user, title="Dune", author="Herbert", genre="sci-fi",
+            totalPages=400, currentPage=80, addedDate=self.book.addedDate,
+        )
+        detached.save()
+        self.assertEqual(detached._previous_state.currentPage, 50)
+        self.assertEqual(list(self.book.reading_sessions.order_by("id").values_list("pages_read", flat=True)), [50, 30])
@@ -0,0 +1,143 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracker.models import Book, BookTrigram, DailyReadingRollup, ReadingSession, SearchDocument, Tombstone
+from tracker.rollups import rebuild_user_rollups
+from tracker.stats import get_user_stats, rebuild_user_stats
+from tracker.trigrams import book_trigrams
+
+User = get_user_model()
+
+
+class BulkBooksTests(TestCase):
+    """Тести масових операцій над книгами (`/api/books/bulk/`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.dune = Book.objects.create(user=self.user, title="Dune", author="Herbert", totalPages=400)
+        self.kobzar = Book.objects.create(user=self.user, title="Кобзар", author="Шевченко", totalPages=300)
+        get_user_stats(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def bulk(self, payload, expected=200):
+        response = self.client.post(reverse("book-bulk"), payload, format="json")
+        self.assertEqual(response.status_code, expected, response.data)
+        return response.data
+
+    def assertNoDrift(self):
+        """Похідні дані після пакета мають збігатися з перебудовою з нуля."""
+        rollups = list(DailyReadingRollup.objects.filter(user=self.user).values_list("day", "pages_read", "books_finished"))
+        self.assertEqual(rebuild_user_stats(self.user)[1], {})
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+        self.assertEqual(
+            list(DailyReadingRollup.objects.filter(user=self.user).values_list("day", "pages_read", "books_finished")),
+            rollups,
+        )
+
+    def test_create_update_delete_in_one_request(self):
+        """Пакет застосовує всі три типи операцій і повертає результат кожного елемента."""
+        data = self.bulk(
+            {
+                "create": [
+                    {"title": "Solaris", "author": "Lem", "genre": "sci-fi", "status": "reading", "totalPages": 200, "currentPage": 50},
+                    {"title": "Ubik", "author": "Dick", "genre": "sci-fi", "status": "read", "totalPages": 220},
+                ],
+                "update": [{"id": self.dune.pk, "currentPage": 400}],
+                "delete": [self.kobzar.pk],
+            }
+        )
+        solaris_result, ubik_result = data["results"]["create"]
+        self.assertEqual(solaris_result["status"], "created")
+        self.assertEqual(solaris_result["book"]["progress"], 25)
+        self.assertEqual(data["results"]["update"][0]["status"], "updated")
+        self.assertEqual(data["results"]["delete"], [{"index": 0, "id": self.kobzar.pk, "status": "deleted"}])
+
+        solaris = Book.objects.get(pk=solaris_result["id"])
+        self.assertEqual((solaris.status, solaris.startDate), ("reading", timezone.now().date()))
+        ubik = Book.objects.get(pk=ubik_result["id"])
+        self.assertEqual((ubik.progress, ubik.currentPage, ubik.endDate), (100, 220, timezone.now().date()))
+        self.dune.refresh_from_db()
+        self.assertEqual((self.dune.status, self.dune.progress, self.dune.endDate), ("read", 100, timezone.now().date()))
+        self.assertFalse(Book.objects.filter(pk=self.kobzar.pk).exists())
+        self.assertTrue(Tombstone.objects.filter(kind="book", object_id=self.kobzar.pk).exists())
+
+        # Автоматичні сесії — лише для приросту сторінок
+        self.assertEqual(
+            sorted(ReadingSession.objects.values_list("book_id", "pages_read")),
+            sorted([(solaris.pk, 50), (ubik.pk, 220), (self.dune.pk, 400)]),
+        )
+        self.assertNoDrift()
+
+    def test_indexes_follow_bulk_changes(self):
+        """Пошуковий і триграмний індекси оновлюються для нових і перейменованих книг."""
+        data = self.bulk(
+            {
+                "create": [{"title": "Solaris", "author": "Lem", "genre": "sci-fi", "description": "Океан"}],
+                "update": [{"id": self.dune.pk, "title": "Dune Messiah"}, {"id": self.kobzar.pk, "rating": 5}],
+            }
+        )
+        solaris_id = data["results"]["create"][0]["id"]
+        self.assertEqual(
+            set(BookTrigram.objects.filter(book_id=solaris_id).values_list("trigram", flat=True)),
+            book_trigrams("Solaris", "Lem"),
+        )
+        self.assertEqual(
+            set(BookTrigram.objects.filter(book=self.dune).values_list("trigram", flat=True)),
+            book_trigrams("Dune Messiah", "Herbert"),
+        )
+        self.assertEqual(
+            SearchDocument.objects.get(kind="book", object_id=solaris_id).content, "Океан"
+        )
+        self.assertEqual(SearchDocument.objects.get(kind="book", object_id=self.dune.pk).title, "Dune Messiah Herbert")
+
+    def test_invalid_item_rolls_back_whole_batch(self):
+        """Одна некоректна операція — жодних змін і помилка для конкретного елемента."""
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        foreign = Book.objects.create(user=other, title="Foreign", author="X")
+        data = self.bulk(
+            {
+                "create": [{"title": "Solaris", "author": "Lem", "genre": "sci-fi"}, {"author": "No title"}],
+                "update": [{"id": foreign.pk, "rating": 1}],
+                "delete": [self.dune.pk],
+            },
+            expected=400,
+        )
+        self.assertIn("error", data)
+        self.assertEqual(data["results"]["create"][1]["status"], "invalid")
+        self.assertIn("title", data["results"]["create"][1]["errors"])
+        self.assertEqual(data["results"]["update"][0]["status"], "not_found")
+        self.assertEqual(Book.objects.filter(user=self.user).count(), 2)
+        self.assertFalse(Book.objects.filter(title="Solaris").exists())
+
+    def test_query_count_does_not_grow_with_batch(self):
+        """Кількість запитів не залежить від кількості книг у пакеті."""
+
+        def run(size):
+            payload = {
+                "create": [
+                    {"title": f"Книга {i}", "author": "A", "genre": "x", "totalPages": 100, "currentPage": 10} for i in range(size)
+                ]
+            }
+            with CaptureQueriesContext(connection) as context:
+                self.bulk(payload)
+            return len(context.captured_queries)
+
+        run(1)  # прогрів: часовий пояс користувача та рядки зведень дня
+        self.assertEqual(run(3), run(30))
+        self.assertNoDrift()
+
+    def test_rejects_oversized_or_malformed_payload(self):
+        """Завеликий пакет, не масиви або тіло, що не є об'єктом, повертають 400."""
+        self.bulk({"create": {"title": "x"}}, expected=400)
+        self.bulk([{"title": "x"}], expected=400)
+        self.bulk({"delete": list(range(1000))}, expected=400)
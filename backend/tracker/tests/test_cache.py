@@ -0,0 +1,98 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.cache import get_generation, require_shared_cache
+from tracker.models import Book, Note, ReadingSession
+
+User = get_user_model()
+
+
+class VersionedCacheTests(TestCase):
+    """Тести версіонованого кешу відповідей користувача.
+
+    Повторні запити мають обслуговуватися з кешу без звернень до БД,
+    а будь-яка зміна бібліотеки — інвалідувати кеш через нове покоління.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.book = Book.objects.create(
+            user=self.user, title="Dune", author="Herbert", genre="Sci-Fi", totalPages=400
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_repeat_dashboard_is_cache_hit(self):
+        """Повторне відкриття дашборду не виконує жодного SQL-запиту."""
+        first = self.client.get(reverse("reading-stats"))
+        with self.assertNumQueries(0):
+            second = self.client.get(reverse("reading-stats"))
+        self.assertEqual(first.data, second.data)
+
+    def test_changes_bump_generation(self):
+        """Збереження та видалення пов'язаних об'єктів змінюють покоління."""
+        generation = get_generation(self.user.pk)
+
+        note = Note.objects.create(user=self.user, book=self.book, content="Spice")
+        self.assertNotEqual(get_generation(self.user.pk), generation)
+
+        generation = get_generation(self.user.pk)
+        note.delete()
+        self.assertNotEqual(get_generation(self.user.pk), generation)
+
+        generation = get_generation(self.user.pk)
+        ReadingSession.objects.create(book=self.book, duration=60)
+        self.assertNotEqual(get_generation(self.user.pk), generation)
+
+    def test_book_change_invalidates_cached_responses(self):
+        """Після зміни книги дашборд, категорії та список книг перераховуються."""
+        self.client.get(reverse("reading-stats"))
+        self.client.get(reverse("category-stats"))
+        self.client.get(reverse("book-list"))
+
+        self.book.status = "read"
+        self.book.save()
+
+        self.assertEqual(self.client.get(reverse("reading-stats")).data["readCount"], 1)
+        self.assertEqual(self.client.get(reverse("category-stats")).data["read"], 1)
+        books = self.client.get(reverse("book-list")).data["results"]
+        self.assertEqual(books[0]["status"], "read")
+
+    def test_first_book_page_cached_per_filter(self):
+        """Перша сторінка списку кешується окремо для кожного набору фільтрів."""
+        self.client.get(reverse("book-list"), {"status": "reading"})
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse("book-list"), {"status": "reading"})
+        self.assertEqual(response.data["results"], [])
+
+        response = self.client.get(reverse("book-list"))
+        self.assertEqual(len(response.data["results"]), 1)
+
+    def test_cache_is_per_user(self):
+        """Кеш одного користувача не потрапляє у відповіді іншого."""
+        self.client.get(reverse("category-stats"))
+
+        other = User.objects.create_user(
+            username="other", email="other@gmail.com", password="QA_User01!"
+        )
+        client = APIClient()
+        client.force_authenticate(other)
+        self.assertEqual(client.get(reverse("category-stats")).data["all"], 0)
+
+    def test_shared_cache_is_required_without_debug(self):
+        """Без DEBUG кеш у пам'яті процесу заборонено; спільний бекенд дозволено."""
+        locmem = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+        with override_settings(DEBUG=False, CACHES=locmem), self.assertRaises(ImproperlyConfigured):
+            require_shared_cache()
+        with override_settings(DEBUG=True, CACHES=locmem):
+            require_shared_cache()
+        shared = {"default": {"BACKEND": "django.core.cache.backends.db.DatabaseCache", "LOCATION": "tracker_cache"}}
+        with override_settings(DEBUG=False, CACHES=shared):
+            require_shared_cache()
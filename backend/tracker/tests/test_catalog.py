@@ -0,0 +1,128 @@
+import datetime
+from unittest import mock
+
+import httpx
+from django.contrib.auth import get_user_model
+from django.db import DatabaseError
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tracker.catalog import local_catalog, normalize_isbn, query_digest
+from tracker.external_search import make_key, search_cache
+from tracker.models import Book, CatalogQuery, CatalogVolume
+
+User = get_user_model()
+
+
+def volume(google_id, title, isbn=None, description="Опис."):
+    info = {"title": title, "authors": ["Автор"], "description": description}
+    if isbn:
+        info["industryIdentifiers"] = [{"type": "ISBN_13" if len(isbn) == 13 else "ISBN_10", "identifier": isbn}]
+    return {"id": google_id, "volumeInfo": info}
+
+
+@override_settings(TRACKER_CATALOG_TTL=3600, GOOGLE_BOOKS_API_KEY="test")
+class CatalogTests(TestCase):
+    """Тести спільного каталогу томів Google Books."""
+
+    def setUp(self):
+        search_cache.clear()
+        local_catalog.clear()
+        self.addCleanup(search_cache.clear)
+        self.addCleanup(local_catalog.clear)
+        self.user = User.objects.create_user(username="reader", email="reader@gmail.com", password="QA_User01!")
+        self.auth = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    def search(self, query, expected_status=200):
+        response = self.client.get(reverse("external-search"), {"q": query}, headers=self.auth)
+        self.assertEqual(response.status_code, expected_status, response.content)
+        return response.json().get("results")
+
+    def test_normalize_isbn(self):
+        """ISBN-10 перетворюється на ISBN-13, дефіси відкидаються."""
+        self.assertEqual(normalize_isbn("0-306-40615-2"), "9780306406157")
+        self.assertEqual(normalize_isbn("978-0-306-40615-7"), "9780306406157")
+        self.assertEqual(normalize_isbn("080442957X"), "9780804429573")
+        self.assertIsNone(normalize_isbn("ISBN"))
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_results_are_served_from_catalog(self, mock_search):
+        """Після очищення кешу процесу повторний пошук не звертається до Google."""
+        mock_search.return_value = {"items": [volume("g-1", "Кобзар", "9789660350409"), volume("g-2", "Гайдамаки")]}
+        first = self.search("Кобзар")
+        self.assertEqual([result["title"] for result in first], ["Кобзар", "Гайдамаки"])
+        self.assertEqual(first[0]["isbn"], "9789660350409")
+
+        search_cache.clear()
+        with self.assertNumQueries(2):
+            second = self.search("  кобзар")
+        self.assertEqual(second, first)
+        self.assertEqual(mock_search.await_count, 1)
+        self.assertEqual((local_catalog.stats()["misses"], local_catalog.stats()["hits"]), (1, 1))
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_volumes_are_deduplicated(self, mock_search):
+        """Томи з тим самим Google ID чи ISBN зберігаються одним рядком."""
+        mock_search.return_value = {
+            "items": [volume("g-1", "Solaris", "0-306-40615-2"), volume("g-9", "Solaris (reprint)", "9780306406157")]
+        }
+        results = self.search("Solaris")
+        self.assertEqual([result["id"] for result in results], ["g-1"])
+
+        mock_search.return_value = {"items": [volume("g-1", "Solaris", "9780306406157", description="Новий опис.")]}
+        self.search("Лем")
+        self.assertEqual(CatalogVolume.objects.count(), 1)
+        self.assertEqual(CatalogVolume.objects.get().description, "Новий опис.")
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_stale_entry_is_refreshed_or_served_on_failure(self, mock_search):
+        """Застарілий запит оновлюється з Google, а при збої віддається як є."""
+        mock_search.return_value = {"items": [volume("g-1", "Dune")]}
+        self.search("Dune")
+        key = make_key("Dune", 0, "uk|en")
+        CatalogQuery.objects.filter(key=query_digest(key)).update(fetchedAt=timezone.now() - datetime.timedelta(hours=2))
+
+        search_cache.clear()
+        mock_search.side_effect = httpx.ConnectError("offline")
+        self.assertEqual(self.search("Dune")[0]["title"], "Dune")
+        self.assertEqual(local_catalog.stats()["fallbacks"], 1)
+
+        search_cache.clear()
+        mock_search.side_effect = None
+        mock_search.return_value = {"items": [volume("g-2", "Dune Messiah"), volume("g-1", "Dune")]}
+        self.assertEqual([result["id"] for result in self.search("Dune")], ["g-2", "g-1"])
+        self.assertEqual(local_catalog.stats()["stale"], 1)
+
+        # Запит, якого немає в каталозі, при збої Google повертає 503
+        mock_search.side_effect = httpx.ConnectError("offline")
+        self.search("Solaris", expected_status=503)
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_catalog_outage_falls_back_to_google(self, mock_search):
+        """Помилка БД каталогу не ламає пошук: результат береться з Google."""
+        mock_search.return_value = {"items": [volume("g-1", "Dune")]}
+        with mock.patch("tracker.catalog.lookup", side_effect=DatabaseError("down")), \
+                mock.patch("tracker.catalog.store", side_effect=DatabaseError("down")):
+            results = self.search("Dune")
+        self.assertEqual(results[0]["id"], "g-1")
+        self.assertEqual(mock_search.await_count, 1)
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_book_references_catalog_volume(self, mock_search):
+        """Книга, додана з пошуку, посилається на том каталогу."""
+        mock_search.return_value = {"items": [volume("g-1", "Кобзар")]}
+        result = self.search("Кобзар")[0]
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        response = client.post(
+            reverse("book-list"),
+            {"title": result["title"], "author": result["author"], "genre": result["genre"], "catalogId": result["catalogId"]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201, response.data)
+        self.assertEqual(response.data["catalogId"], result["catalogId"])
+        self.assertEqual(Book.objects.get().catalog.googleId, "g-1")
@@ -0,0 +1,108 @@
+import datetime
+import io
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.core.signals import request_finished
+from django.db.models import Sum
+from django.test import TestCase, override_settings
+
+from tracker.compaction import compact_sessions
+from tracker.models import Book, ReadingSession, SearchDocument, Tombstone
+from tracker.rollups import rebuild_user_rollups
+from tracker.stats import get_user_stats, rebuild_user_stats
+
+User = get_user_model()
+
+UTC = datetime.timezone.utc
+
+
+class SessionCompactionTests(TestCase):
+    """Тести ущільнення старих сесій читання (`tracker.compaction`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!", timezone="Europe/Kyiv"
+        )
+        self.book = Book.objects.create(user=self.user, title="Dune", author="Herbert", genre="sci-fi", status="reading")
+        # 10 січня за Києвом: три сесії (остання — 00:30 11 січня за Києвом)
+        self.first = self.session(datetime.datetime(2024, 1, 10, 7, 0, tzinfo=UTC), 10, 600, note="Пустеля")
+        self.session(datetime.datetime(2024, 1, 10, 12, 0, tzinfo=UTC), 5, None, quote="Страх — убивця розуму")
+        self.session(datetime.datetime(2024, 1, 10, 21, 0, tzinfo=UTC), 7, 300, note="Спеція")
+        self.session(datetime.datetime(2024, 1, 10, 22, 30, tzinfo=UTC), 3, 60)
+        # Нещодавні сесії не ущільнюються
+        self.session(datetime.datetime.now(UTC) - datetime.timedelta(minutes=2), 4, 100)
+        self.session(datetime.datetime.now(UTC) - datetime.timedelta(minutes=1), 6, 100)
+        get_user_stats(self.user)
+        rebuild_user_stats(self.user)
+        rebuild_user_rollups(self.user)
+
+    def session(self, moment, pages, duration, note=None, quote=None):
+        session = ReadingSession.objects.create(
+            book=self.book, pages_read=pages, duration=duration, note=note, quote=quote
+        )
+        ReadingSession.objects.filter(pk=session.pk).update(date=moment)
+        return session
+
+    def totals(self):
+        return ReadingSession.objects.aggregate(pages=Sum("pages_read"), seconds=Sum("duration"))
+
+    def test_merges_one_row_per_book_per_day(self):
+        """Старі сесії дня об'єднуються в найранішу; суми, тексти й похідні дані зберігаються."""
+        totals = self.totals()
+        removed = list(
+            ReadingSession.objects.filter(date__lt=datetime.datetime(2024, 1, 10, 22, 0, tzinfo=UTC))
+            .exclude(pk=self.first.pk)
+            .values_list("pk", flat=True)
+        )
+
+        report = compact_sessions()
+
+        self.assertEqual((report.groups, report.sessions_before, report.sessions_after, report.reclaimed), (1, 3, 1, 2))
+        self.assertEqual(self.totals(), totals)
+        self.assertEqual(ReadingSession.objects.count(), 4)
+        merged = ReadingSession.objects.get(pk=self.first.pk)
+        self.assertEqual(
+            (merged.pages_read, merged.duration, merged.note, merged.quote),
+            (22, 900, "Пустеля\n\nСпеція", "Страх — убивця розуму"),
+        )
+        self.assertEqual(
+            list(SearchDocument.objects.filter(kind="session").values_list("object_id", "content")),
+            [(self.first.pk, "Пустеля\n\nСпеція")],
+        )
+        self.assertEqual(
+            sorted(Tombstone.objects.filter(kind="session").values_list("object_id", flat=True)), sorted(removed)
+        )
+        self.assertEqual(rebuild_user_stats(self.user)[1], {})
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+
+        # Повторний запуск нічого не змінює
+        self.assertEqual(compact_sessions().reclaimed, 0)
+
+    def test_command_dry_run_reports_without_changes(self):
+        """Пробний запуск звітує про звільнені рядки й час запитів, не змінюючи БД."""
+        output = io.StringIO()
+        call_command("compact_sessions", dry_run=True, repeat=1, stdout=output)
+        self.assertIn("звільнено рядків: 2", output.getvalue())
+        self.assertIn("Запити статистики сесій", output.getvalue())
+        self.assertEqual(ReadingSession.objects.count(), 6)
+        self.assertFalse(Tombstone.objects.exists())
+
+        call_command("compact_sessions", user=self.user.email, days=0, stdout=output)
+        self.assertEqual(ReadingSession.objects.count(), 3)
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+
+    def test_periodic_hook_runs_once_per_interval(self):
+        """Хук після запиту ущільнює сесії лише раз за інтервал і вимкнений за замовчуванням."""
+        request_finished.send(sender=None)
+        self.assertEqual(ReadingSession.objects.count(), 6)
+
+        with override_settings(TRACKER_SESSION_COMPACTION_INTERVAL_HOURS=24):
+            request_finished.send(sender=None)
+            self.assertEqual(ReadingSession.objects.count(), 4)
+            self.session(datetime.datetime(2024, 2, 1, 8, 0, tzinfo=UTC), 1, 1)
+            self.session(datetime.datetime(2024, 2, 1, 9, 0, tzinfo=UTC), 1, 1)
+            request_finished.send(sender=None)
+            self.assertEqual(ReadingSession.objects.count(), 6)
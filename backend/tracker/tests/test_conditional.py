@@ -0,0 +1,96 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.cache import bump_generation
+from tracker.models import Book, Note
+
+User = get_user_model()
+
+
+class ConditionalGetTests(TestCase):
+    """Тести умовних запитів (`ETag` / `304 Not Modified`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.book = Book.objects.create(user=self.user, title="Dune", author="Herbert")
+        Note.objects.create(user=self.user, book=self.book, content="Нотатка")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_unchanged_resources_return_304(self):
+        """Повторний запит з ETag повертає 304 без запитів до БД і без серіалізації."""
+        urls = [
+            reverse("book-list"),
+            reverse("book-detail", args=[self.book.pk]),
+            reverse("note-list"),
+            reverse("quote-list"),
+            reverse("reading-stats"),
+            reverse("category-stats"),
+            reverse("stats-streak"),
+        ]
+        for url in urls:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertIn("ETag", response)
+                self.assertNotIn("Last-Modified", response)
+
+                with (
+                    self.assertNumQueries(0),
+                    mock.patch("rest_framework.renderers.JSONRenderer.render") as render,
+                ):
+                    response = self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"])
+                self.assertEqual(response.status_code, 304)
+                render.assert_not_called()
+
+    def test_change_invalidates_etag(self):
+        """Будь-яка зміна бібліотеки змінює валідатор."""
+        etag = self.client.get(reverse("book-list"))["ETag"]
+
+        self.book.rating = 5
+        self.book.save()
+
+        response = self.client.get(reverse("book-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_generation_from_shared_cache_invalidates_etag(self):
+        """Зміна, записана іншим воркером у спільний кеш, змінює валідатор цього процесу."""
+        etag = self.client.get(reverse("book-list"))["ETag"]
+
+        # Інший процес обробив зміну без сигналів у цьому: покоління оновлено лише в кеші
+        bump_generation(self.user.pk)
+
+        response = self.client.get(reverse("book-list"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_if_modified_since_alone_does_not_return_304(self):
+        """Без `Last-Modified` дата клієнта не дає 304 для зміни в ту саму секунду."""
+        self.client.get(reverse("book-list"))
+        self.book.rating = 5
+        self.book.save()
+
+        # Дата, не старша за будь-який Last-Modified, дала б 304 при його наявності
+        response = self.client.get(reverse("book-list"), HTTP_IF_MODIFIED_SINCE="Sat, 01 Jan 2100 00:00:00 GMT")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["results"][0]["rating"], 5)
+
+    def test_etag_depends_on_query(self):
+        """Різні фільтри та сторінки мають різні ETag."""
+        first = self.client.get(reverse("book-list"))["ETag"]
+        filtered = self.client.get(reverse("book-list"), {"status": "read"})["ETag"]
+        self.assertNotEqual(first, filtered)
+
+        response = self.client.get(
+            reverse("book-list"), {"status": "read"}, HTTP_IF_NONE_MATCH=first
+        )
+        self.assertEqual(response.status_code, 200)
@@ -0,0 +1,171 @@
+import asyncio
+import datetime
+import io
+import json
+import warnings
+import zipfile
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.handlers.asgi import ASGIHandler
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tracker.imports import import_library
+from tracker.models import Book, Note, Quote, ReadingCycle, ReadingSession
+
+User = get_user_model()
+
+
+class LibraryExportTests(TestCase):
+    """Тести потокового експорту бібліотеки (`/api/export/`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.dune = Book.objects.create(
+            user=self.user, title="Dune", author="Herbert", genre="sci-fi", status="reading", totalPages=400
+        )
+        ReadingSession.objects.create(book=self.dune, pages_read=40, duration=600, note="Пустеля")
+        ReadingCycle.objects.create(
+            book=self.dune, start_date=datetime.date(2020, 1, 1), end_date=datetime.date(2020, 2, 1)
+        )
+        Note.objects.create(user=self.user, book=self.dune, content="Нотатка")
+        Quote.objects.create(user=self.user, book=self.dune, content="Страх — убивця розуму")
+        self.kobzar = Book.objects.create(user=self.user, title="Кобзар", author="Шевченко", genre="поезія")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def export(self, export_format):
+        response = self.client.get(reverse("library-export"), {"format": export_format})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertIn("attachment", response["Content-Disposition"])
+        return b"".join(response.streaming_content)
+
+    def test_jsonl_nests_collections_per_book(self):
+        """Кожен рядок JSON lines — книга з власними вкладеними колекціями."""
+        lines = [json.loads(line) for line in self.export("jsonl").decode().splitlines()]
+        self.assertEqual([line["title"] for line in lines], ["Dune", "Кобзар"])
+        dune, kobzar = lines
+        self.assertEqual([session["pages_read"] for session in dune["readingSessions"]], [40])
+        self.assertNotIn("book", dune["readingSessions"][0])
+        self.assertEqual(dune["reading_cycles"][0]["start_date"], "2020-01-01")
+        self.assertEqual([note["content"] for note in dune["book_notes"]], ["Нотатка"])
+        self.assertEqual(len(dune["book_quotes"]), 1)
+        self.assertEqual(
+            [kobzar[key] for key in ("readingSessions", "reading_cycles", "book_notes", "book_quotes")],
+            [[], [], [], []],
+        )
+
+    def test_exports_round_trip_through_import(self):
+        """CSV та JSON lines експорту імпортуються назад (JSON lines — з історією читання)."""
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        report = import_library(other, io.BytesIO(self.export("csv")))
+        self.assertEqual((report.created, report.skipped), (2, 0))
+        self.assertEqual(
+            set(Book.objects.filter(user=other).values_list("title", "status", "totalPages")),
+            {("Dune", "reading", 400), ("Кобзар", "want-to-read", None)},
+        )
+
+        third = User.objects.create_user(username="t", email="t@gmail.com", password="QA_User01!")
+        report = import_library(third, io.BytesIO(self.export("jsonl")), "jsonl")
+        self.assertEqual(report.created, 2)
+        dune = Book.objects.get(user=third, title="Dune")
+        self.assertEqual(list(dune.reading_sessions.values_list("pages_read", "duration")), [(40, 600)])
+        self.assertEqual(dune.reading_cycles.count(), 1)
+
+    def test_zip_contains_all_collections(self):
+        """ZIP-архів містить CSV для книг, сесій, нотаток, цитат і циклів."""
+        with zipfile.ZipFile(io.BytesIO(self.export("zip"))) as archive:
+            self.assertEqual(
+                sorted(archive.namelist()), ["books.csv", "cycles.csv", "notes.csv", "quotes.csv", "sessions.csv"]
+            )
+            books = archive.read("books.csv").decode().splitlines()
+            self.assertEqual(len(books), 3)
+            self.assertTrue(books[0].startswith("id,title,author"))
+            self.assertIn("Страх — убивця розуму", archive.read("quotes.csv").decode())
+
+    def test_first_bytes_before_whole_dataset_is_read(self):
+        """Відповідь віддається порціями: перша — після одного запиту книг."""
+        for i in range(5):
+            Book.objects.create(user=self.user, title=f"Книга {i}", author="A", genre="x")
+        with mock.patch("tracker.exports.CHUNK_SIZE", 2):
+            response = self.client.get(reverse("library-export"), {"format": "csv"})
+            chunks = iter(response.streaming_content)
+            with CaptureQueriesContext(connection) as context:
+                first = next(chunks)
+            self.assertEqual(len(context.captured_queries), 1)
+            self.assertEqual(len(first.decode().splitlines()), 3)
+            self.assertEqual(len(b"".join([first, *chunks]).decode().splitlines()), 8)
+
+    def test_scoped_to_user_and_validates_format(self):
+        """Експорт містить лише власні книги; невідомий формат — 400."""
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        Book.objects.create(user=other, title="Foreign", author="X", genre="x")
+        self.assertNotIn(b"Foreign", self.export("csv"))
+        self.assertEqual(self.client.get(reverse("library-export"), {"format": "xml"}).status_code, 400)
+
+
+class LibraryExportASGITests(TransactionTestCase):
+    """Експорт через ASGI-обробник Django (потоки запиту бачать лише зафіксовані дані)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username="reader", email="reader@gmail.com", password="QA_User01!")
+        for i in range(5):
+            Book.objects.create(user=self.user, title=f"Книга {i}", author="A", genre="x")
+
+    async def request(self, path, query):
+        token = str(RefreshToken.for_user(self.user).access_token)
+        scope = {
+            "type": "http",
+            "asgi": {"version": "3.0"},
+            "http_version": "1.1",
+            "method": "GET",
+            "scheme": "http",
+            "path": path,
+            "raw_path": path.encode(),
+            "query_string": query.encode(),
+            "root_path": "",
+            "headers": [(b"host", b"testserver"), (b"authorization", f"Bearer {token}".encode())],
+            "client": ("127.0.0.1", 5000),
+            "server": ("testserver", 80),
+        }
+        messages = []
+        incoming = [{"type": "http.request", "body": b"", "more_body": False}]
+        finished = asyncio.Event()
+
+        async def receive():
+            if incoming:
+                return incoming.pop()
+            # Клієнт не розриває з'єднання, доки відповідь не надіслано
+            await finished.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            messages.append(message)
+            if message["type"] == "http.response.body" and not message.get("more_body"):
+                finished.set()
+
+        await ASGIHandler()(scope, receive, send)
+        return messages
+
+    async def test_export_is_streamed_under_asgi(self):
+        """Під ASGI експорт віддається порціями без збирання всього ітератора в пам'яті."""
+        with mock.patch("tracker.exports.CHUNK_SIZE", 2), warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            messages = await self.request(reverse("library-export"), "format=csv")
+
+        self.assertEqual(messages[0]["status"], 200)
+        self.assertFalse([warning for warning in caught if "synchronous iterators" in str(warning.message)])
+        bodies = [message["body"] for message in messages[1:] if message.get("body")]
+        self.assertGreater(len(bodies), 2)
+        self.assertEqual(len(b"".join(bodies).decode().splitlines()), 6)
@@ -0,0 +1,295 @@
+import asyncio
+import threading
+from unittest import mock
+
+import httpx
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tracker.catalog import local_catalog
+from tracker.external_search import (
+    HIT,
+    MISS,
+    STALE,
+    SearchResultCache,
+    SingleFlight,
+    _run_in_background,
+    background_loop,
+    make_key,
+    request_scoped_loop,
+    search_cache,
+)
+
+User = get_user_model()
+
+
+def google_response(*titles):
+    return {"items": [{"id": f"g-{index}", "volumeInfo": {"title": title}} for index, title in enumerate(titles)]}
+
+
+@override_settings(TRACKER_SEARCH_CACHE_TTL=60, TRACKER_SEARCH_CACHE_STALE=300, GOOGLE_BOOKS_API_KEY="test")
+class ExternalSearchCacheTests(TestCase):
+    """Тести кешу результатів Google Books (`/api/search/external/`)."""
+
+    def setUp(self):
+        search_cache.clear()
+        self.addCleanup(search_cache.clear)
+        self.now = 1000.0
+        patcher = mock.patch.object(search_cache, "clock", lambda: self.now)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.refreshes = []
+        patcher = mock.patch.object(search_cache, "revalidate", self.refreshes.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.prefetches = []
+        patcher = mock.patch.object(search_cache, "prefetcher", self.prefetches.append)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        # Кеш процесу перевіряється без локального каталогу (див. test_catalog)
+        patcher = mock.patch.object(local_catalog, "search", lambda key, fetch: fetch())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.auth = {"Authorization": f"Bearer {RefreshToken.for_user(self.user).access_token}"}
+
+    def search(self, query, **params):
+        response = self.client.get(reverse("external-search"), {"q": query, "filter": "title", **params}, headers=self.auth)
+        self.assertEqual(response.status_code, 200, response.content)
+        return response
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_normalized_query_is_served_from_cache(self, mock_search):
+        """Запит, що відрізняється регістром і пробілами, не звертається до Google."""
+        mock_search.return_value = google_response("Кобзар")
+
+        first = self.search("Кобзар  Шевченко")
+        second = self.search(" кобзар шевченко ")
+
+        self.assertEqual((first["X-Cache"], second["X-Cache"]), (MISS, HIT))
+        self.assertEqual(second.json()["results"], first.json()["results"])
+        self.assertEqual(mock_search.await_count, 1)
+
+        # Інша сторінка результатів — окремий запис
+        self.assertEqual(self.search("Кобзар Шевченко", startIndex=20)["X-Cache"], MISS)
+        self.assertEqual(mock_search.await_count, 2)
+        self.assertEqual(mock_search.call_args.kwargs["params"]["startIndex"], "20")
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_stale_entry_is_returned_and_revalidated(self, mock_search):
+        """Після TTL віддається старий результат, а оновлення виконується окремо."""
+        mock_search.return_value = google_response("Dune")
+        self.search("Dune")
+
+        self.now += 61
+        mock_search.return_value = google_response("Dune Messiah")
+        stale = self.search("Dune")
+        self.assertEqual(stale["X-Cache"], STALE)
+        self.assertEqual(stale.json()["results"][0]["title"], "Dune")
+        # Поки оновлення не завершилося, повторний запит не запускає ще одне
+        self.search("Dune")
+        self.assertEqual(len(self.refreshes), 1)
+
+        async_to_sync(self.refreshes[0])()
+        fresh = self.search("Dune")
+        self.assertEqual((fresh["X-Cache"], fresh.json()["results"][0]["title"]), (HIT, "Dune Messiah"))
+        self.assertEqual(mock_search.await_count, 2)
+
+        # Після вікна stale запис вважається відсутнім
+        self.now += 61 + 300
+        self.assertEqual(self.search("Dune")["X-Cache"], MISS)
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_failures_are_not_cached(self, mock_search):
+        """Помилка Google повертає 503 і не потрапляє в кеш; помилка оновлення зберігає старий запис."""
+        mock_search.side_effect = httpx.ConnectError("offline")
+        response = self.client.get(reverse("external-search"), {"q": "Dune"}, headers=self.auth)
+        self.assertEqual(response.status_code, 503)
+
+        mock_search.side_effect = None
+        mock_search.return_value = google_response("Dune")
+        self.assertEqual(self.search("Dune")["X-Cache"], MISS)
+
+        self.now += 61
+        mock_search.side_effect = httpx.ReadTimeout("slow")
+        self.assertEqual(self.search("Dune")["X-Cache"], STALE)
+        async_to_sync(self.refreshes.pop())()
+        self.assertEqual(self.search("Dune").json()["results"][0]["title"], "Dune")
+        async_to_sync(self.refreshes.pop())()
+        self.assertEqual(search_cache.stats()["refreshErrors"], 2)
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_next_page_is_prefetched(self, mock_search):
+        """Після повної сторінки наступна завантажується наперед і віддається з кешу."""
+        mock_search.return_value = google_response("Коротка сторінка")
+        self.search("Кобзар")
+        self.assertEqual(self.prefetches, [])
+
+        mock_search.return_value = google_response(*(f"Dune {index}" for index in range(20)))
+        self.search("Dune")
+        self.assertEqual(len(self.prefetches), 1)
+        async_to_sync(self.prefetches.pop())()
+        self.assertEqual(mock_search.call_args.kwargs["params"]["startIndex"], 20)
+
+        self.assertEqual(self.search("Dune", startIndex=20)["X-Cache"], HIT)
+        self.assertEqual(mock_search.await_count, 3)
+        stats = search_cache.stats()
+        # Друга сторінка теж повна — запущено завантаження третьої
+        self.assertEqual((stats["prefetches"], stats["prefetchHits"], stats["prefetchHitRatio"]), (2, 1, 0.5))
+
+    @override_settings(TRACKER_SEARCH_PREFETCH_CONCURRENCY=1)
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_prefetch_concurrency_is_bounded(self, mock_search):
+        """Понад ліміт процесу попередні завантаження пропускаються, а не стають у чергу."""
+        mock_search.return_value = google_response(*(f"Book {index}" for index in range(20)))
+        self.search("Dune")
+        self.search("Solaris")
+        self.assertEqual(len(self.prefetches), 1)
+        self.assertEqual((search_cache.stats()["prefetching"], search_cache.stats()["prefetchSkipped"]), (1, 1))
+
+        async_to_sync(self.prefetches.pop())()
+        self.search("Kobzar")
+        self.assertEqual(len(self.prefetches), 1)
+
+        with override_settings(TRACKER_SEARCH_PREFETCH_CONCURRENCY=0):
+            self.search("Hamlet")
+        self.assertEqual(len(self.prefetches), 1)
+
+    def test_request_joins_running_prefetch(self):
+        """Запит сторінки, що саме завантажується наперед, чекає на той самий виклик."""
+        # Довготривалий цикл, як у воркера ASGI (не цикл `async_to_sync` одного запиту)
+        asyncio.run(self.join_running_prefetch())
+
+    async def join_running_prefetch(self):
+        cache = SearchResultCache(ttl=60, stale=0, max_size=10)
+        calls = []
+
+        async def fetch():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return ["page 2"]
+
+        async def failing_fetch():
+            raise httpx.ConnectError("offline")
+
+        key = make_key("dune", 20)
+        self.assertTrue(cache.prefetch(key, fetch))
+        self.assertFalse(cache.prefetch(key, fetch))
+        await asyncio.sleep(0)
+        self.assertEqual(await cache.get_or_fetch(key, fetch), (["page 2"], MISS))
+        self.assertTrue(cache.prefetch(make_key("dune", 40), failing_fetch))
+        while cache.stats()["prefetching"]:
+            await asyncio.sleep(0.01)
+
+        self.assertEqual(cache.lookup(key), (["page 2"], HIT))
+        stats = cache.stats()
+        self.assertEqual((len(calls), stats["prefetchHits"], stats["prefetchErrors"]), (1, 1, 1))
+        self.assertEqual(cache.lookup(make_key("dune", 40)), (None, MISS))
+
+    def test_background_work_outlives_request_loop(self):
+        """Під WSGI фонова задача виконується у фоновому циклі, а не скасовується разом із запитом."""
+        done = threading.Event()
+        loops = []
+
+        async def refresh():
+            await asyncio.sleep(0.05)
+            loops.append(asyncio.get_running_loop())
+            done.set()
+
+        async def request():
+            self.assertTrue(request_scoped_loop())
+            _run_in_background(refresh)
+
+        async_to_sync(request)()
+        self.assertTrue(done.wait(2))
+        self.assertEqual(loops, [background_loop()])
+
+    def test_lru_eviction(self):
+        """Понад ліміт витісняється найдавніше використаний запис."""
+        cache = SearchResultCache(ttl=60, stale=0, max_size=2)
+        cache.store(make_key("a"), ["a"])
+        cache.store(make_key("b"), ["b"])
+        cache.lookup(make_key("a"))
+        cache.store(make_key("c"), ["c"])
+
+        self.assertEqual(cache.lookup(make_key("b")), (None, MISS))
+        self.assertEqual(cache.lookup(make_key("a")), (["a"], HIT))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    async def test_concurrent_identical_searches_are_coalesced(self):
+        """Одночасні однакові запити чекають на один виклик Google; різні — ні."""
+        calls = []
+
+        async def slow_search(params):
+            calls.append(params["q"])
+            # Довше, ніж обробка всіх 30 запитів до входу в single-flight
+            await asyncio.sleep(0.3)
+            return google_response(params["q"])
+
+        async def search(query):
+            response = await self.async_client.get(reverse("external-search"), {"q": query}, headers=self.auth)
+            return response.status_code, response.json()["results"][0]["title"]
+
+        with mock.patch("tracker.external_search.google_books.search", side_effect=slow_search):
+            same = await asyncio.gather(*(search("Solaris") for _ in range(30)))
+            distinct = await asyncio.gather(*(search(f"Solaris {index}") for index in range(5)))
+
+        self.assertEqual(set(same), {(200, "Solaris")})
+        self.assertEqual([title for _, title in distinct], [f"Solaris {index}" for index in range(5)])
+        self.assertEqual(len(calls), 6)
+        self.assertEqual(search_cache.stats()["coalesced"], 29)
+
+    async def test_cancelled_waiter_does_not_cancel_shared_call(self):
+        """Скасування одного очікувача не зупиняє спільний виклик для інших."""
+        flight = SingleFlight()
+
+        async def fetch():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        first = asyncio.ensure_future(flight.run("key", fetch))
+        second = asyncio.ensure_future(flight.run("key", fetch))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        self.assertEqual(await second, "result")
+        self.assertTrue(first.cancelled())
+        self.assertEqual(flight.coalesced, 1)
+
+    async def test_authentication_is_required(self):
+        """Без дійсного JWT-токена асинхронне представлення відповідає 401."""
+        url = reverse("external-search")
+        response = await self.async_client.get(url, {"q": "Dune"})
+        self.assertEqual(response.status_code, 401)
+        self.assertIn("Bearer", response["WWW-Authenticate"])
+
+        response = await self.async_client.get(url, {"q": "Dune"}, headers={"Authorization": "Bearer invalid"})
+        self.assertEqual(response.status_code, 401)
+        self.assertEqual(response.json()["code"], "token_not_valid")
+
+    @mock.patch("tracker.external_search.google_books.search", new_callable=mock.AsyncMock)
+    def test_admin_stats_endpoint(self, mock_search):
+        """Лічильники доступні лише адміністраторам; DELETE очищає кеш."""
+        mock_search.return_value = google_response("Dune")
+        self.search("Dune")
+        self.search("dune")
+        url = reverse("external-search-cache")
+        client = APIClient()
+        client.force_authenticate(self.user)
+        self.assertEqual(client.get(url).status_code, 403)
+
+        admin = User.objects.create_superuser(username="admin", email="admin@gmail.com", password="QA_Admin01!")
+        client.force_authenticate(admin)
+        stats = client.get(url).data
+        self.assertEqual((stats["hits"], stats["misses"], stats["stale"], stats["size"]), (1, 1, 0, 1))
+        self.assertEqual(stats["hitRatio"], 0.5)
+
+        self.assertEqual(client.delete(url).status_code, 204)
+        self.assertEqual(client.get(url).data["size"], 0)
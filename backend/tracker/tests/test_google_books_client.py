@@ -0,0 +1,261 @@
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+import httpx
+from django.contrib.auth import get_user_model
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from tracker.external_search import CircuitBreaker, CircuitOpenError, GoogleBooksClient, google_books, search_cache
+
+User = get_user_model()
+
+
+class _StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+    # Keep-alive з'єднання клієнта не мають блокувати зупинку сервера
+    block_on_close = False
+    # Сотні одночасних з'єднань у замірах
+    request_queue_size = 1024
+
+
+class StubGoogleBooks:
+    """Локальний HTTP-сервер, що імітує пошук томів Google Books.
+
+    Відповіді задаються чергою `(статус, затримка[, тіло])`; коли вона порожня,
+    сервер відповідає 200 з однією книгою. Рахує запити та TCP-з'єднання.
+    """
+
+    def __init__(self):
+        self.responses = []
+        self.requests = 0
+        self.connections = 0
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Заголовки й тіло пишуться окремо: без TCP_NODELAY keep-alive чекає на відкладений ACK
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                stub.connections += 1
+
+            def do_GET(self):
+                stub.requests += 1
+                status, delay, *body = stub.responses.pop(0) if stub.responses else (200, 0)
+                time.sleep(delay)
+                body = body[0] if body else json.dumps({"items": [{"id": "stub", "volumeInfo": {"title": "Stub Book"}}]}).encode()
+                try:
+                    self.send_response(status)
+                    self.send_header("Content-Type", "application/json")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    # Клієнт уже закрив з'єднання за тайм-аутом
+                    self.close_connection = True
+
+            def log_message(self, *args):
+                pass
+
+        self.server = _StubServer(("127.0.0.1", 0), Handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server.server_address[1]}/books/v1/volumes"
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+@override_settings(
+    TRACKER_GOOGLE_BOOKS_RETRIES=2,
+    TRACKER_GOOGLE_BOOKS_TIMEOUT=4,
+    TRACKER_GOOGLE_BOOKS_DEADLINE=6,
+    GOOGLE_BOOKS_API_KEY="test",
+)
+class GoogleBooksClientTests(TestCase):
+    """Тести асинхронного клієнта Google Books з пулом з'єднань, повторами та запобіжником."""
+
+    def setUp(self):
+        self.stub = StubGoogleBooks()
+        self.addCleanup(self.stub.close)
+        self.now = 1000.0
+        self.breaker = CircuitBreaker(threshold=3, reset_timeout=30, clock=lambda: self.now)
+        self.google = GoogleBooksClient(url=self.stub.url, breaker=self.breaker)
+        patcher = mock.patch.object(GoogleBooksClient, "backoff", return_value=0.01)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    async def test_connections_are_reused(self):
+        """Послідовні запити йдуть одним keep-alive з'єднанням."""
+        for _ in range(5):
+            data = await self.google.search({"q": "intitle:Dune"})
+        await self.google.aclose()
+
+        self.assertEqual(data["items"][0]["volumeInfo"]["title"], "Stub Book")
+        self.assertEqual((self.stub.requests, self.stub.connections), (5, 1))
+
+    async def test_transient_errors_are_retried(self):
+        """Відповіді 5xx/429 повторюються; 4xx повертається одразу й не розмикає запобіжник."""
+        self.stub.responses = [(503, 0), (429, 0)]
+        self.assertEqual((await self.google.search({"q": "Dune"}))["items"][0]["id"], "stub")
+        self.assertEqual(self.stub.requests, 3)
+        self.assertEqual(self.google.stats()["retries"], 2)
+
+        self.stub.responses = [(400, 0)]
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.google.search({"q": "Dune"})
+        await self.google.aclose()
+        self.assertEqual(self.stub.requests, 4)
+        self.assertEqual(self.breaker.stats()["state"], CircuitBreaker.CLOSED)
+
+    @override_settings(TRACKER_GOOGLE_BOOKS_RETRIES=0)
+    async def test_circuit_breaker_fails_fast_and_recovers(self):
+        """Після порогу невдач запити не доходять до сервера; пробна спроба замикає запобіжник."""
+        self.stub.responses = [(500, 0)] * 3
+        for _ in range(3):
+            with self.assertRaises(httpx.HTTPStatusError):
+                await self.google.search({"q": "Dune"})
+        self.assertEqual(self.breaker.stats()["state"], CircuitBreaker.OPEN)
+
+        with self.assertRaises(CircuitOpenError):
+            await self.google.search({"q": "Dune"})
+        self.assertEqual(self.stub.requests, 3)
+
+        # Пробна спроба після `reset_timeout` невдала — запобіжник знову розімкнено
+        self.now += 30
+        self.stub.responses = [(502, 0)]
+        with self.assertRaises(httpx.HTTPStatusError):
+            await self.google.search({"q": "Dune"})
+        with self.assertRaises(CircuitOpenError):
+            await self.google.search({"q": "Dune"})
+
+        self.now += 30
+        await self.google.search({"q": "Dune"})
+        await self.google.aclose()
+        self.assertEqual(self.breaker.stats(), {"state": CircuitBreaker.CLOSED, "failures": 0, "opened": 2, "rejected": 2})
+        self.assertEqual(self.stub.requests, 5)
+
+    async def open_circuit(self):
+        """Розмикає запобіжник і переводить його в стан `half-open`."""
+        self.stub.responses = [(500, 0)] * 3
+        with override_settings(TRACKER_GOOGLE_BOOKS_RETRIES=0):
+            for _ in range(3):
+                with self.assertRaises(httpx.HTTPStatusError):
+                    await self.google.search({"q": "Dune"})
+        self.now += 30
+
+    async def test_aborted_trial_reopens_circuit(self):
+        """Тайм-аут пулу чи скасування пробної спроби знову розмикають запобіжник."""
+        await self.open_circuit()
+        with mock.patch.object(httpx.AsyncClient, "get", side_effect=httpx.PoolTimeout("pool is busy")):
+            with self.assertRaises(httpx.PoolTimeout):
+                await self.google.search({"q": "Dune"})
+        self.assertEqual((self.breaker.state, self.breaker.opened_at), (CircuitBreaker.OPEN, self.now))
+        with self.assertRaises(CircuitOpenError):
+            await self.google.search({"q": "Dune"})
+
+        self.now += 30
+        self.stub.responses = [(200, 1)]
+        trial = asyncio.ensure_future(self.google.search({"q": "Dune"}))
+        await asyncio.sleep(0.2)
+        trial.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await trial
+        self.assertEqual((self.breaker.state, self.breaker.opened_at), (CircuitBreaker.OPEN, self.now))
+
+        # Після наступного `reset_timeout` пробна спроба знову дозволена
+        self.now += 30
+        await self.google.search({"q": "Dune"})
+        await self.google.aclose()
+        self.assertEqual(self.breaker.state, CircuitBreaker.CLOSED)
+
+    async def test_invalid_body_is_http_error(self):
+        """Тіло відповіді, що не є JSON, — помилка httpx, а не `ValueError`."""
+        self.stub.responses = [(200, 0, b"<html>")]
+        with self.assertRaises(httpx.DecodingError):
+            await self.google.search({"q": "Dune"})
+        await self.google.aclose()
+
+    @override_settings(TRACKER_GOOGLE_BOOKS_TIMEOUT=0.2, TRACKER_GOOGLE_BOOKS_DEADLINE=0.5)
+    async def test_deadline_bounds_slow_upstream(self):
+        """Тайм-аути повторюються лише в межах загального ліміту часу."""
+        self.stub.responses = [(200, 1)] * 3
+        started = time.monotonic()
+        with self.assertRaises(httpx.TimeoutException):
+            await self.google.search({"q": "Dune"})
+        await self.google.aclose()
+        self.assertLess(time.monotonic() - started, 0.9)
+
+    @override_settings(TRACKER_GOOGLE_BOOKS_RETRIES=0, TRACKER_GOOGLE_BOOKS_BREAKER_THRESHOLD=2)
+    def test_view_returns_503_while_circuit_is_open(self):
+        """Представлення повертає наявну відповідь 503, не звертаючись до Google."""
+        search_cache.clear()
+        google_books.reset()
+        self.addCleanup(search_cache.clear)
+        self.addCleanup(google_books.reset)
+        patcher = mock.patch.object(google_books, "url", self.stub.url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        user = User.objects.create_user(username="reader", email="reader@gmail.com", password="QA_User01!")
+        auth = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        self.stub.responses = [(503, 0)] * 2
+        for query in ("Dune", "Kobzar", "Solaris"):
+            response = self.client.get(reverse("external-search"), {"q": query}, headers=auth)
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.json(), {"error": "Не вдалося підключитися до зовнішнього API пошуку."})
+
+        self.assertEqual(self.stub.requests, 2)
+        self.assertEqual(google_books.stats()["circuit"]["rejected"], 1)
+
+    def test_view_returns_503_for_invalid_body(self):
+        """Некоректне тіло відповіді Google — 503, а не 500."""
+        search_cache.clear()
+        google_books.reset()
+        self.addCleanup(search_cache.clear)
+        self.addCleanup(google_books.reset)
+        patcher = mock.patch.object(google_books, "url", self.stub.url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        user = User.objects.create_user(username="reader", email="reader@gmail.com", password="QA_User01!")
+        auth = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        self.stub.responses = [(200, 0, b"not json")]
+        response = self.client.get(reverse("external-search"), {"q": "Dune"}, headers=auth)
+        self.assertEqual(response.status_code, 503)
+
+    def test_request_loop_client_is_closed(self):
+        """Пул з'єднань циклу запиту під WSGI закривається наприкінці запиту."""
+        search_cache.clear()
+        google_books.reset()
+        self.addCleanup(search_cache.clear)
+        self.addCleanup(google_books.reset)
+        patcher = mock.patch.object(google_books, "url", self.stub.url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        user = User.objects.create_user(username="reader", email="reader@gmail.com", password="QA_User01!")
+        auth = {"Authorization": f"Bearer {RefreshToken.for_user(user).access_token}"}
+        closed = []
+        aclose = httpx.AsyncClient.aclose
+
+        async def record_aclose(client):
+            closed.append(client)
+            await aclose(client)
+
+        with mock.patch.object(search_cache, "prefetcher", lambda func: None), \
+                mock.patch.object(httpx.AsyncClient, "aclose", record_aclose):
+            response = self.client.get(reverse("external-search"), {"q": "Dune"}, headers=auth)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(closed), 1)
+        self.assertTrue(closed[0].is_closed)
@@ -0,0 +1,149 @@
+import datetime
+import io
+import json
+import os
+import tempfile
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.imports import import_library
+from tracker.models import Book, DailyReadingRollup, ReadingCycle, ReadingSession, SearchDocument
+from tracker.rollups import rebuild_user_rollups
+from tracker.stats import get_user_stats, rebuild_user_stats
+
+User = get_user_model()
+
+GOODREADS_CSV = (
+    "Book Id,Title,Author,My Rating,Number of Pages,Year Published,Original Publication Year,"
+    "Date Read,Date Added,Bookshelves,Exclusive Shelf,My Review\n"
+    '1,Dune,Frank Herbert,5,412,2005,1965,2024/03/10,2024/01/02,"sci-fi, favorites",read,Шедевр\n'
+    "2,Кобзар,Тарас Шевченко,0,300,2010,,,2024/01/03,currently-reading,currently-reading,\n"
+    "3,Solaris,Stanisław Lem,0,,1961,,,2024/01/04,,to-read,\n"
+)
+
+
+class LibraryImportTests(TestCase):
+    """Тести потокового імпорту бібліотеки (`tracker.imports`, `/api/import/`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        get_user_stats(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertNoDrift(self):
+        """Статистика та зведення після імпорту збігаються з перебудовою з нуля."""
+        self.assertEqual(rebuild_user_stats(self.user)[1], {})
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+
+    def test_goodreads_export(self):
+        """Експорт Goodreads розпізнається за заголовками; дата прочитання дає історичну сесію."""
+        report = import_library(self.user, io.BytesIO(GOODREADS_CSV.encode()))
+        self.assertEqual((report.processed, report.created, report.skipped), (3, 3, 0))
+
+        dune = Book.objects.get(title="Dune")
+        self.assertEqual(
+            (dune.status, dune.rating, dune.genre, dune.year, dune.isFavorite, dune.note),
+            ("read", 5, "sci-fi", 1965, True, "Шедевр"),
+        )
+        self.assertEqual((dune.endDate, dune.currentPage, dune.progress), (datetime.date(2024, 3, 10), 412, 100))
+        session = dune.reading_sessions.get()
+        self.assertEqual((session.pages_read, session.date.date()), (412, datetime.date(2024, 3, 10)))
+
+        kobzar = Book.objects.get(title="Кобзар")
+        self.assertEqual((kobzar.status, kobzar.rating, kobzar.genre), ("reading", None, "Без жанру"))
+        self.assertEqual(Book.objects.get(title="Solaris").status, "want-to-read")
+        self.assertEqual(
+            DailyReadingRollup.objects.get(user=self.user, day=datetime.date(2024, 3, 10)).books_finished, 1
+        )
+        self.assertNoDrift()
+
+    def test_invalid_rows_are_reported_and_skipped(self):
+        """Некоректні рядки пропускаються з номером рядка, решта імпортується."""
+        content = "title,author,status,totalPages\nDune,Herbert,read,400\n,Nobody,read,10\nUbik,Dick,unknown,200\n"
+        report = import_library(self.user, io.BytesIO(content.encode()))
+        self.assertEqual((report.created, report.skipped), (1, 2))
+        self.assertEqual([error["line"] for error in report.errors], [3, 4])
+        self.assertIn("title", report.errors[0]["errors"])
+        self.assertIn("status", report.errors[1]["errors"])
+
+    def test_jsonl_with_history(self):
+        """JSON lines з явними сесіями та циклами створює історію читання."""
+        lines = [
+            {
+                "title": "Dune",
+                "author": "Herbert",
+                "genre": "sci-fi",
+                "status": "read",
+                "totalPages": 400,
+                "startDate": "2024-02-01",
+                "endDate": "2024-02-20",
+                "readingSessions": [
+                    {"date": "2024-02-01T20:00:00Z", "pages_read": 150, "duration": 3600, "note": "Пустеля"},
+                    {"date": "2024-02-20", "pages_read": 250, "duration": 5400},
+                ],
+                "reading_cycles": [{"start_date": "2020-01-01", "end_date": "2020-02-01"}],
+            },
+            "not an object",
+        ]
+        content = "\n".join(json.dumps(line) for line in lines) + "\n{broken\n"
+        report = import_library(self.user, io.BytesIO(content.encode()), "jsonl")
+        self.assertEqual((report.created, report.skipped), (1, 2))
+
+        dune = Book.objects.get(title="Dune")
+        self.assertEqual(
+            sorted(dune.reading_sessions.values_list("pages_read", "duration")), [(150, 3600), (250, 5400)]
+        )
+        self.assertEqual(
+            list(ReadingCycle.objects.values_list("start_date", "end_date")),
+            [(datetime.date(2020, 1, 1), datetime.date(2020, 2, 1))],
+        )
+        self.assertTrue(SearchDocument.objects.filter(kind="session", content="Пустеля").exists())
+        self.assertNoDrift()
+
+    def test_rows_are_written_in_batches(self):
+        """Книги записуються пакетами, прогрес повідомляється після кожного."""
+        content = "title,author\n" + "".join(f"Книга {i},Автор\n" for i in range(5))
+        seen = []
+        report = import_library(
+            self.user, io.BytesIO(content.encode()), batch_size=2, on_progress=lambda r: seen.append(r.created)
+        )
+        self.assertEqual(seen, [2, 4, 5])
+        self.assertEqual(report.as_dict()["created"], 5)
+        self.assertFalse(ReadingSession.objects.exists())
+
+    def test_upload_endpoint(self):
+        """Ендпоінт приймає файл і повертає звіт; без файлу чи з невідомим форматом — 400."""
+        upload = SimpleUploadedFile("goodreads_library_export.csv", GOODREADS_CSV.encode())
+        response = self.client.post(reverse("library-import"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["created"], 3)
+        self.assertIn("rowsPerSecond", response.data)
+
+        self.assertEqual(self.client.post(reverse("library-import"), {}, format="multipart").status_code, 400)
+        upload = SimpleUploadedFile("books.csv", b"title\n")
+        response = self.client.post(reverse("library-import"), {"file": upload, "format": "xml"}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+        upload = SimpleUploadedFile("books.csv", b"title,author\n\xff\xfe,x\n")
+        response = self.client.post(reverse("library-import"), {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command(self):
+        """Команда імпортує файл з диска для користувача за email."""
+        with tempfile.NamedTemporaryFile("w", suffix=".csv", delete=False, encoding="utf-8") as handle:
+            handle.write(GOODREADS_CSV)
+        self.addCleanup(os.unlink, handle.name)
+        output = io.StringIO()
+        call_command("import_library", handle.name, user=self.user.email, stdout=output)
+        self.assertEqual(Book.objects.filter(user=self.user).count(), 3)
+        self.assertIn("рядків/с", output.getvalue())
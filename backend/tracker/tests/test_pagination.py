@@ -0,0 +1,122 @@
+import base64
+import json
+from urllib.parse import parse_qs, urlsplit
+
+from django.contrib.auth import get_user_model
+from django.core import signing
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Book, Note, Quote, ReadingSession
+from tracker.pagination import CURSOR_SALT
+
+User = get_user_model()
+
+
+class KeysetPaginationTests(TestCase):
+    """Тести пагінації за курсором (`KeysetPagination`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        # 45 книг з повторюваними оцінками, жанрами та назвами, щоб перевірити
+        # коректне розрізнення рівних ключів за `id`
+        for i in range(45):
+            book = Book.objects.create(
+                user=self.user,
+                title=f"Book {i % 7}",
+                author="Author",
+                genre=["Drama", "Sci-Fi", "Poetry"][i % 3],
+                rating=[None, 1, 3, 5][i % 4],
+            )
+            Note.objects.create(user=self.user, book=book, content=f"Note {i}")
+            Quote.objects.create(user=self.user, book=book, content=f"Quote {i}")
+            ReadingSession.objects.create(book=book, pages_read=i)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def walk(self, url, params=None):
+        """Проходить усі сторінки за посиланнями `next` і повертає id елементів."""
+        ids = []
+        response = self.client.get(url, params or {})
+        while True:
+            self.assertEqual(response.status_code, 200)
+            self.assertNotIn("count", response.data)
+            ids.extend(item["id"] for item in response.data["results"])
+            if not response.data["next"]:
+                return ids
+            response = self.client.get(response.data["next"])
+
+    def test_books_default_order(self):
+        """Книги йдуть від нових до старих без пропусків і дублікатів."""
+        ids = self.walk(reverse("book-list"))
+        expected = list(
+            Book.objects.filter(user=self.user)
+            .order_by("-addedDate", "-id")
+            .values_list("id", flat=True)
+        )
+        self.assertEqual(ids, expected)
+
+    def test_books_sort_modes(self):
+        """Режими `sort` зберігають порядок на межах сторінок."""
+        books = list(Book.objects.filter(user=self.user))
+        expected = {
+            "rating-desc": sorted(books, key=lambda b: (-(b.rating or 0), b.title, b.id)),
+            "rating-asc": sorted(books, key=lambda b: (b.rating or 0, b.title, b.id)),
+            "genre": sorted(books, key=lambda b: (b.genre, b.title, b.id)),
+        }
+        for sort, ordered in expected.items():
+            with self.subTest(sort=sort):
+                ids = self.walk(reverse("book-list"), {"sort": sort, "status": "want-to-read"})
+                self.assertEqual(ids, [book.id for book in ordered])
+
+    def test_notes_quotes_and_sessions(self):
+        """Нотатки, цитати та сесії пагінуються за складеними ключами."""
+        self.assertEqual(
+            self.walk(reverse("note-list")),
+            list(Note.objects.order_by("-createdAt", "-id").values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            self.walk(reverse("quote-list"), {"ordering": "book__title"}),
+            list(Quote.objects.order_by("book__title", "id").values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            self.walk(reverse("session-list")),
+            list(ReadingSession.objects.order_by("-date", "-id").values_list("id", flat=True)),
+        )
+
+    def test_deep_page_single_query(self):
+        """Наступна сторінка — один запит без COUNT незалежно від глибини."""
+        first = self.client.get(reverse("note-list"))
+        with self.assertNumQueries(1):
+            self.client.get(first.data["next"])
+
+    def test_page_number_opt_in(self):
+        """Параметр `page` вмикає посторінковий режим із загальною кількістю."""
+        response = self.client.get(reverse("book-list"), {"page": 2})
+
+        self.assertEqual(response.data["count"], 45)
+        self.assertEqual(len(response.data["results"]), 20)
+        self.assertIn("previous", response.data)
+
+    def test_invalid_cursor(self):
+        """Пошкоджений курсор повертає 404."""
+        response = self.client.get(reverse("note-list"), {"cursor": "not-a-cursor"})
+        self.assertEqual(response.status_code, 404)
+
+    def test_tampered_cursor(self):
+        """Непідписаний, змінений курсор або значення не того типу повертають 404."""
+        url = reverse("book-list")
+        cursor = parse_qs(urlsplit(self.client.get(url).data["next"]).query)["cursor"][0]
+        self.assertEqual(self.client.get(url, {"cursor": cursor[:-2] + "xx"}).status_code, 404)
+
+        for values in (["x", "y"], [{"a": 1}, 1], [None, None], ["2026-01-01T00:00:00+00:00"]):
+            unsigned = base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+            self.assertEqual(self.client.get(url, {"cursor": unsigned}).status_code, 404, values)
+            # Навіть з дійсним підписом значення перевіряються полями сортування
+            signed = signing.dumps(values, salt=CURSOR_SALT)
+            self.assertEqual(self.client.get(url, {"cursor": signed}).status_code, 404, values)
@@ -0,0 +1,90 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracker.models import Book, ReadingSession
+from tracker.rollups import rebuild_user_rollups
+from tracker.stats import get_user_stats, rebuild_user_stats
+
+User = get_user_model()
+
+
+class ProgressUpdateTests(TestCase):
+    """Тести швидкого оновлення прогресу (`/api/books/{id}/progress/`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.book = Book.objects.create(
+            user=self.user, title="Dune", author="Herbert", genre="sci-fi", status="reading", totalPages=8
+        )
+        get_user_stats(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def progress(self, page, book=None, expected=200):
+        response = self.client.post(
+            reverse("book-progress", args=[(book or self.book).pk]), {"currentPage": page}, format="json"
+        )
+        self.assertEqual(response.status_code, expected, response.data)
+        return response.data
+
+    def test_fast_path_is_two_statements(self):
+        """Типове оновлення — один INSERT сесії та один UPDATE книги, без SELECT книги."""
+        with CaptureQueriesContext(connection) as context:
+            data = self.progress(3)
+
+        self.assertEqual(data, {"id": self.book.pk, "currentPage": 3, "progress": 38, "status": "reading", "pagesRead": 3})
+        book_statements = [query["sql"] for query in context.captured_queries if '"tracker_book"' in query["sql"]]
+        self.assertEqual(len(book_statements), 2)
+        self.assertTrue(book_statements[0].startswith('INSERT INTO "tracker_readingsession"'))
+        self.assertTrue(book_statements[1].startswith('UPDATE "tracker_book"'))
+
+        self.book.refresh_from_db()
+        self.assertEqual((self.book.currentPage, self.book.progress, self.book.startDate), (3, 38, timezone.now().date()))
+        self.assertEqual(self.book.reading_sessions.get().pages_read, 3)
+
+    def test_progress_matches_book_save_rounding(self):
+        """Прогрес з БД збігається з `round()` у `Book.save`, зокрема для половинних значень."""
+        for page in range(1, 8):
+            expected = Book(totalPages=8, currentPage=page)
+            expected.apply_lifecycle_rules(timezone.now().date())
+            self.assertEqual(self.progress(page)["progress"], expected.progress, page)
+
+    def test_finishing_and_going_back_use_regular_save(self):
+        """Завершення книги та зменшення сторінки проходять правила `Book.save`."""
+        self.progress(5)
+        self.assertEqual(self.progress(2)["pagesRead"], 0)
+        data = self.progress(8)
+        self.assertEqual((data["status"], data["progress"], data["pagesRead"]), ("read", 100, 6))
+
+        self.book.refresh_from_db()
+        self.assertEqual(self.book.endDate, timezone.now().date())
+        self.assertEqual(
+            list(ReadingSession.objects.order_by("id").values_list("pages_read", flat=True)), [5, 6]
+        )
+
+    def test_read_models_stay_consistent(self):
+        """Статистика та щоденні зведення після швидкого шляху не розходяться з перебудовою."""
+        self.progress(2)
+        self.progress(4)
+        self.progress(8)
+        self.assertEqual(rebuild_user_stats(self.user)[1], {})
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+
+    def test_validation_and_ownership(self):
+        """Некоректна сторінка — 400, чужа або відсутня книга — 404."""
+        self.progress(-1, expected=400)
+        self.progress("abc", expected=400)
+        self.progress(9, expected=400)
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        foreign = Book.objects.create(user=other, title="Foreign", author="X", genre="x", totalPages=100)
+        self.progress(10, book=foreign, expected=404)
+        self.assertEqual(Book.objects.get(pk=foreign.pk).currentPage, 0)
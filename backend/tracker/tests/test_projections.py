@@ -0,0 +1,84 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Book, Note, Quote
+from tracker.views import BookViewSet, NoteViewSet, QuoteViewSet
+
+User = get_user_model()
+
+
+class ValuesFastPathTests(TestCase):
+    """Швидкий шлях списків має давати побайтово ту саму відповідь, що й серіалізатор."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        for i in range(25):
+            book = Book.objects.create(
+                user=self.user,
+                title=f"Книга «{i}» \"lit\"",
+                author="Автор" if i % 2 else "",
+                genre="Drama",
+                year=1900 + i if i % 3 else None,
+                rating=[None, 2, 5][i % 3],
+                status=["reading", "read", "want-to-read"][i % 3],
+                totalPages=300 if i % 4 else None,
+                currentPage=i,
+                cover=None if i % 5 else "https://example.com/cover.jpg",
+                note="Примітка\nз переносом" if i % 2 else None,
+                isFavorite=i % 2 == 0,
+                externalRating=4.25 if i % 2 else None,
+                endDate=datetime.date(2026, 1, i + 1) if i % 3 == 1 else None,
+            )
+            Note.objects.create(user=self.user, book=book, content=f"Нотатка {i} 📚")
+            Quote.objects.create(
+                user=self.user, book=book, content=f"Цитата {i}", isFavorite=i % 3 == 0
+            )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def assertSameAsSerializer(self, viewset, url, params=None):
+        """Порівнює байти відповіді швидкого шляху та серіалізатора на всіх сторінках."""
+        fast = self.client.get(url, params)
+        cache.clear()
+        with mock.patch.object(viewset, "values_fast_path", False):
+            slow = self.client.get(url, params)
+        self.assertEqual(fast.status_code, 200)
+        self.assertEqual(fast.content, slow.content)
+        return fast
+
+    def test_books_identical(self):
+        """Компактний список, `fields`, сортування та наступна сторінка книг."""
+        url = reverse("book-list")
+        response = self.assertSameAsSerializer(BookViewSet, url)
+        self.assertSameAsSerializer(BookViewSet, response.data["next"])
+        self.assertSameAsSerializer(BookViewSet, url, {"sort": "rating-desc"})
+        self.assertSameAsSerializer(BookViewSet, url, {"fields": "id,title,startDate"})
+        self.assertSameAsSerializer(BookViewSet, url, {"page": 2})
+
+    def test_notes_and_quotes_identical(self):
+        """Нотатки та цитати з приєднаними `bookTitle`, `bookAuthor`, `user_email`."""
+        self.assertSameAsSerializer(NoteViewSet, reverse("note-list"))
+        self.assertSameAsSerializer(QuoteViewSet, reverse("quote-list"))
+        self.assertSameAsSerializer(
+            QuoteViewSet, reverse("quote-list"), {"ordering": "book__title", "isFavorite": "true"}
+        )
+
+    def test_fast_path_is_single_query(self):
+        """Цитати з даними книги та користувача читаються одним запитом з JOIN."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("quote-list"))
+        self.assertEqual(response.data["results"][0]["user_email"], "reader@gmail.com")
+
+    def test_nested_expand_falls_back_to_serializer(self):
+        """Вкладені колекції обслуговуються звичайним серіалізатором."""
+        response = self.client.get(reverse("book-list"), {"expand": "book_notes"})
+        self.assertEqual(len(response.data["results"][0]["book_notes"]), 1)
@@ -0,0 +1,275 @@
+import datetime
+import time
+import zoneinfo
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracker.models import Book, DailyReadingRollup, ReadingCycle, ReadingSession
+from tracker.rollups import ZONE_TIMEOUT, daily_rows, rebuild_user_rollups, user_zone
+
+User = get_user_model()
+
+
+def moment(day):
+    """Полудень заданого дня у поточному часовому поясі."""
+    return timezone.make_aware(datetime.datetime.combine(day, datetime.time(12)))
+
+
+def add_session(book, day, **fields):
+    """Створює сесію та переносить її на заданий день (`date` має `auto_now_add`)."""
+    session = ReadingSession.objects.create(book=book, **fields)
+    session.date = moment(day)
+    session.save()
+    return session
+
+
+class DailyRollupTests(TestCase):
+    """Тести щоденних зведень (`DailyReadingRollup`) та статистики за період."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.book = Book.objects.create(
+            user=self.user, title="Dune", author="Herbert", totalPages=400
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def rollups(self):
+        return {
+            row.day: (row.pages_read, row.seconds_read, row.sessions_count, row.books_finished)
+            for row in DailyReadingRollup.objects.filter(user=self.user)
+        }
+
+    def assertNoDrift(self):
+        """Інкрементальні зведення мають збігатися з перебудовою з нуля."""
+        expected = self.rollups()
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+        self.assertEqual(self.rollups(), expected)
+
+    def test_sessions_update_their_day(self):
+        """Створення, перенесення та видалення сесії змінюють зведення відповідних днів."""
+        day = datetime.date(2026, 3, 10)
+        session = add_session(self.book, day, pages_read=20, duration=600)
+        add_session(self.book, day, pages_read=5, duration=None)
+        self.assertEqual(self.rollups()[day], (25, 600, 2, 0))
+
+        session.date = moment(day + datetime.timedelta(days=1))
+        session.save()
+        self.assertEqual(self.rollups()[day], (5, 0, 1, 0))
+        self.assertEqual(self.rollups()[day + datetime.timedelta(days=1)], (20, 600, 1, 0))
+        self.assertNoDrift()
+
+        session.delete()
+        self.assertEqual(self.rollups()[day + datetime.timedelta(days=1)], (0, 0, 0, 0))
+        self.assertNoDrift()
+
+    def test_book_progress_and_finish(self):
+        """Автоматична сесія з `Book.save` та завершення книги потрапляють у зведення."""
+        self.book.currentPage = 400
+        self.book.save()
+
+        today = timezone.localdate()
+        self.assertEqual(self.rollups()[today], (400, 0, 1, 1))
+        self.assertNoDrift()
+
+        self.book.endDate = datetime.date(2025, 12, 31)
+        self.book.save()
+        self.assertEqual(self.rollups()[today], (400, 0, 1, 0))
+        self.assertEqual(self.rollups()[datetime.date(2025, 12, 31)], (0, 0, 0, 1))
+        self.assertNoDrift()
+
+    def test_cycles_and_book_deletion(self):
+        """Цикли читання рахуються як завершення; видалення книги знімає весь її внесок."""
+        add_session(self.book, datetime.date(2026, 1, 5), pages_read=50)
+        ReadingCycle.objects.create(
+            book=self.book,
+            start_date=datetime.date(2025, 1, 1),
+            end_date=datetime.date(2025, 2, 1),
+        )
+        self.assertEqual(self.rollups()[datetime.date(2025, 2, 1)], (0, 0, 0, 1))
+        self.assertNoDrift()
+
+        self.book.delete()
+        self.assertTrue(all(values == (0, 0, 0, 0) for values in self.rollups().values()))
+
+    def test_user_deletion_leaves_no_rollups(self):
+        """Видалення користувача не відновлює його каскадно видалені зведення."""
+        self.book.currentPage = 400
+        self.book.save()
+        add_session(self.book, datetime.date(2025, 6, 1), pages_read=10)
+
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertFalse(DailyReadingRollup.objects.filter(user_id=user_id).exists())
+
+    def test_range_endpoint_buckets(self):
+        """Ендпоінт групує дні в інтервали та заповнює порожні інтервали нулями."""
+        for day, pages in [(datetime.date(2026, 1, 5), 10), (datetime.date(2026, 3, 2), 30)]:
+            add_session(self.book, day, pages_read=pages, duration=60)
+
+        response = self.client.get(
+            reverse("stats-range"), {"from": "2026-01-01", "to": "2026-03-31", "bucket": "month"}
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            [(row["start"], row["pagesRead"]) for row in response.data["results"]],
+            [("2026-01-01", 10), ("2026-02-01", 0), ("2026-03-01", 30)],
+        )
+        self.assertEqual(
+            response.data["totals"],
+            {"pagesRead": 40, "secondsRead": 120, "sessions": 2, "booksFinished": 0},
+        )
+
+        response = self.client.get(
+            reverse("stats-range"), {"from": "2026-01-01", "to": "2026-01-11", "bucket": "week"}
+        )
+        self.assertEqual(
+            [row["start"] for row in response.data["results"]],
+            ["2025-12-29", "2026-01-05"],
+        )
+
+    def test_range_endpoint_validation(self):
+        """Некоректні параметри повертають 400 з описом помилки."""
+        url = reverse("stats-range")
+        for params in [
+            {"from": "2026-13-01"},
+            {"bucket": "decade"},
+            {"from": "2026-02-01", "to": "2026-01-01"},
+            {"from": "2000-01-01", "to": "2026-01-01", "bucket": "day"},
+        ]:
+            response = self.client.get(url, params)
+            self.assertEqual(response.status_code, 400, params)
+            self.assertIn("error", response.data)
+
+        # Останні інтервали календаря не виходять за `date.max`
+        for bucket in ("day", "week", "month", "year"):
+            response = self.client.get(url, {"from": "9999-12-01", "to": "9999-12-31", "bucket": bucket})
+            self.assertEqual(response.status_code, 200, bucket)
+            self.assertEqual(response.data["totals"]["pagesRead"], 0)
+
+    def test_past_years_are_cached(self):
+        """Минулі роки читаються з кешу, доки історію не змінено."""
+        old_day = datetime.date(timezone.localdate().year - 1, 6, 1)
+        session = add_session(self.book, old_day, pages_read=10)
+        start, end = old_day.replace(month=1, day=1), old_day.replace(month=12, day=31)
+
+        daily_rows(self.user.pk, start, end)
+        with self.assertNumQueries(0):
+            self.assertEqual(daily_rows(self.user.pk, start, end)[old_day][0], 10)
+
+        session.pages_read = 15
+        session.save()
+        self.assertEqual(daily_rows(self.user.pk, start, end)[old_day][0], 15)
+
+
+class ActivityIndexTests(TestCase):
+    """Тести теплової карти та серій читання в часовому поясі користувача."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader",
+            email="reader@gmail.com",
+            password="QA_User01!",
+            timezone="America/New_York",
+        )
+        self.book = Book.objects.create(user=self.user, title="Dune", author="Herbert")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def add_session_at(self, moment_utc, pages=10):
+        session = ReadingSession.objects.create(book=self.book, pages_read=pages)
+        session.date = moment_utc
+        session.save()
+        return session
+
+    def test_days_bucketed_in_user_timezone(self):
+        """Сесія о 02:00 UTC належить попередньому дню в Нью-Йорку."""
+        self.add_session_at(datetime.datetime(2026, 3, 10, 2, tzinfo=datetime.UTC))
+
+        self.assertEqual(
+            list(
+                DailyReadingRollup.objects.filter(
+                    user=self.user, sessions_count__gt=0
+                ).values_list("day", flat=True)
+            ),
+            [datetime.date(2026, 3, 9)],
+        )
+
+    def test_timezone_change_rebuilds_rollups(self):
+        """Зміна часового поясу в профілі перерозподіляє сесії по днях."""
+        self.add_session_at(datetime.datetime(2026, 3, 10, 2, tzinfo=datetime.UTC))
+
+        response = self.client.patch(reverse("user-profile"), {"timezone": "Europe/Kyiv"})
+
+        self.assertEqual(response.status_code, 200)
+        rows = DailyReadingRollup.objects.filter(user=self.user, sessions_count__gt=0)
+        self.assertEqual([row.day for row in rows], [datetime.date(2026, 3, 10)])
+
+    def test_cached_timezone_expires(self):
+        """Пояс, змінений в обхід сигналів (інший процес), застосовується після `ZONE_TIMEOUT`."""
+        self.assertEqual(user_zone(self.user.pk), zoneinfo.ZoneInfo("America/New_York"))
+        User.objects.filter(pk=self.user.pk).update(timezone="Europe/Kyiv")
+        self.assertEqual(user_zone(self.user.pk), zoneinfo.ZoneInfo("America/New_York"))
+
+        later = time.time() + ZONE_TIMEOUT + 1
+        with mock.patch("django.core.cache.backends.locmem.time.time", return_value=later):
+            self.assertEqual(user_zone(self.user.pk), zoneinfo.ZoneInfo("Europe/Kyiv"))
+
+    def test_invalid_timezone_rejected(self):
+        """Невідомий часовий пояс не проходить валідацію профілю."""
+        response = self.client.patch(reverse("user-profile"), {"timezone": "Mars/Olympus"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_streaks(self):
+        """Поточна серія триває, якщо остання активність була вчора."""
+        zone = zoneinfo.ZoneInfo("America/New_York")
+        today = timezone.localdate(timezone=zone)
+        days_ago = [1, 2, 3, 10, 11, 12, 13, 14, 30]
+        for offset in days_ago:
+            day = today - datetime.timedelta(days=offset)
+            self.add_session_at(
+                datetime.datetime.combine(day, datetime.time(12), tzinfo=zone)
+            )
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("stats-streak"))
+
+        self.assertEqual(
+            response.data,
+            {
+                "current": 3,
+                "longest": 5,
+                "lastActiveDay": (today - datetime.timedelta(days=1)).isoformat(),
+            },
+        )
+
+    def test_heatmap(self):
+        """Теплова карта містить 365 днів і читає зведення одним запитом."""
+        zone = zoneinfo.ZoneInfo("America/New_York")
+        today = timezone.localdate(timezone=zone)
+        self.add_session_at(datetime.datetime.combine(today, datetime.time(9), tzinfo=zone), 42)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("stats-heatmap"))
+
+        days = response.data["days"]
+        self.assertEqual(len(days), 365)
+        self.assertEqual(days[-1], {
+            "date": today.isoformat(),
+            "pagesRead": 42,
+            "secondsRead": 0,
+            "sessions": 1,
+            "booksFinished": 0,
+        })
+        self.assertEqual(days[0]["sessions"], 0)
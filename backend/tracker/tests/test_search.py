@@ -0,0 +1,127 @@
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker import search
+from tracker.models import Book, Note, Quote, ReadingSession, SearchDocument
+
+User = get_user_model()
+
+
+class LibrarySearchTests(TestCase):
+    """Тести повнотекстового пошуку по бібліотеці та синхронізації індексу."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.other = User.objects.create_user(
+            username="other", email="other@gmail.com", password="QA_User01!"
+        )
+        self.book = Book.objects.create(
+            user=self.user,
+            title="Dune",
+            author="Frank Herbert",
+            description="Пустельна планета Арракіс і прянощі.",
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def find(self, query, **params):
+        response = self.client.get(reverse("library-search"), {"q": query, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.data["results"]
+
+    def test_fts_index_is_used(self):
+        """Тестова БД SQLite створюється з таблицею FTS5."""
+        self.assertTrue(search.fts_available())
+
+    def test_all_sources_are_searchable(self):
+        """Опис книги, нотатки, цитати та нотатки сесій потрапляють в індекс."""
+        note = Note.objects.create(user=self.user, book=self.book, content="Спайс тече повільно")
+        quote = Quote.objects.create(user=self.user, book=self.book, content="Страх убиває розум")
+        session = ReadingSession.objects.create(book=self.book, pages_read=10, note="Спайс у пустелі")
+
+        self.assertEqual([(r["type"], r["id"]) for r in self.find("страх")], [("quote", quote.pk)])
+        found = {(r["type"], r["id"]) for r in self.find("спайс")}
+        self.assertEqual(found, {("note", note.pk), ("session", session.pk)})
+        results = self.find("арракіс")
+        self.assertEqual(results[0]["type"], "book")
+        self.assertEqual(results[0]["bookTitle"], "Dune")
+        self.assertIn("<mark>Арракіс</mark>", results[0]["snippet"])
+
+    def test_prefix_and_all_words(self):
+        """Слова шукаються як префікси, документ має містити всі слова."""
+        Note.objects.create(user=self.user, book=self.book, content="Прянощі та пісок")
+        self.assertEqual(len(self.find("прян")), 2)
+        self.assertEqual(len(self.find("прян пісок")), 1)
+
+    def test_title_ranks_higher(self):
+        """Збіг у назві книги важить більше за збіг у тексті нотатки."""
+        Note.objects.create(user=self.user, book=self.book, content="Нагадало Dune знову")
+        for i in range(5):
+            Note.objects.create(user=self.user, book=self.book, content=f"Інша нотатка {i}")
+        results = self.find("dune")
+        self.assertEqual([r["type"] for r in results], ["book", "note"])
+        self.assertGreater(results[0]["rank"], results[1]["rank"])
+
+    def test_results_are_scoped_to_user(self):
+        """Користувач бачить лише власні документи."""
+        other_book = Book.objects.create(user=self.other, title="Арракіс", author="X")
+        Note.objects.create(user=self.other, book=other_book, content="Арракіс")
+        self.assertEqual([r["bookId"] for r in self.find("арракіс")], [self.book.pk])
+
+    def test_index_follows_updates_and_deletes(self):
+        """Зміни та видалення вихідних об'єктів відображаються в індексі."""
+        note = Note.objects.create(user=self.user, book=self.book, content="Перша версія")
+        note.content = "Друга версія"
+        note.save()
+        self.assertEqual(self.find("перша"), [])
+        self.assertEqual(len(self.find("друга")), 1)
+
+        session = ReadingSession.objects.create(book=self.book, pages_read=5, note="Сесійна думка")
+        session.note = ""
+        session.save()
+        self.assertEqual(self.find("сесійна"), [])
+
+        self.book.description = "Інший опис"
+        self.book.save()
+        self.assertEqual(self.find("арракіс"), [])
+
+        note.delete()
+        self.assertEqual(self.find("друга"), [])
+
+    def test_book_delete_cascades(self):
+        """Видалення книги прибирає документи книги та її дочірніх об'єктів."""
+        Note.objects.create(user=self.user, book=self.book, content="Нотатка")
+        Quote.objects.create(user=self.user, book=self.book, content="Цитата")
+        self.book.delete()
+        self.assertFalse(SearchDocument.objects.exists())
+        self.assertEqual(self.find("нотатка"), [])
+
+    def test_snippet_escapes_html(self):
+        """Текст користувача екранується, підсвічування — лише тегами <mark>."""
+        Note.objects.create(user=self.user, book=self.book, content="<b>жирний</b> текст")
+        snippet = self.find("жирний")[0]["snippet"]
+        self.assertIn("&lt;b&gt;<mark>жирний</mark>&lt;/b&gt;", snippet)
+
+    def test_fallback_without_fts(self):
+        """Без FTS5 пошук працює через резервний шлях з тим самим форматом."""
+        Note.objects.create(user=self.user, book=self.book, content="Dune нагадує про пустелю")
+        with mock.patch.object(search, "fts_available", return_value=False):
+            results = self.find("dune")
+            self.assertEqual([r["type"] for r in results], ["book", "note"])
+            self.assertIn("<mark>Dune</mark>", results[1]["snippet"])
+            self.assertEqual(self.find("відсутнє"), [])
+
+    def test_query_validation(self):
+        """Порожній запит чи некоректний limit дають 400, синтаксис FTS5 у запиті ігнорується."""
+        self.assertEqual(self.client.get(reverse("library-search")).status_code, 400)
+        response = self.client.get(reverse("library-search"), {"q": "dune", "limit": "x"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.find('"dune")*'), self.find("dune"))
@@ -0,0 +1,109 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Book, ReadingSession
+from tracker.series import lttb
+
+User = get_user_model()
+
+UTC = datetime.timezone.utc
+
+
+class SessionSeriesTests(TestCase):
+    """Тести часових рядів сесій (`/api/sessions/series/`, `/api/books/{id}/sessions/series/`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!", timezone="Europe/Kyiv"
+        )
+        self.dune = Book.objects.create(user=self.user, title="Dune", author="Herbert", genre="sci-fi", status="reading")
+        self.kobzar = Book.objects.create(user=self.user, title="Кобзар", author="Шевченко", genre="поезія", status="reading")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def session(self, book, moment, pages, duration=600):
+        session = ReadingSession.objects.create(book=book, pages_read=pages, duration=duration)
+        ReadingSession.objects.filter(pk=session.pk).update(date=moment)
+
+    def series(self, url=None, expected=200, **params):
+        response = self.client.get(url or reverse("session-series"), params)
+        self.assertEqual(response.status_code, expected, response.data)
+        return response.data
+
+    def test_day_buckets_in_user_timezone(self):
+        """Сесії групуються за днями в поясі користувача; порожні дні не повертаються."""
+        self.session(self.dune, datetime.datetime(2024, 3, 9, 22, 30, tzinfo=UTC), 10)  # 10 березня за Києвом
+        self.session(self.kobzar, datetime.datetime(2024, 3, 10, 8, 0, tzinfo=UTC), 5, duration=None)
+        self.session(self.dune, datetime.datetime(2024, 3, 12, 8, 0, tzinfo=UTC), 7)
+
+        data = self.series()
+        self.assertEqual(
+            [(row["start"][:10], row["pagesRead"], row["secondsRead"], row["sessions"]) for row in data["results"]],
+            [("2024-03-10", 15, 600, 2), ("2024-03-12", 7, 600, 1)],
+        )
+        self.assertTrue(data["results"][0]["start"].endswith("+02:00"))
+        self.assertEqual(data["totals"], {"pagesRead": 22, "secondsRead": 1200, "sessions": 3})
+        self.assertFalse(data["downsampled"])
+
+        data = self.series(bucket="week", **{"from": "2024-03-11"})
+        self.assertEqual([(row["start"][:10], row["pagesRead"]) for row in data["results"]], [("2024-03-11", 7)])
+
+        data = self.series(bucket="hour", to="2024-03-10")
+        self.assertEqual([row["start"] for row in data["results"]], ["2024-03-10T00:00:00+02:00", "2024-03-10T10:00:00+02:00"])
+
+    def test_book_series_is_scoped(self):
+        """Ряд книги містить лише її сесії; чужа книга — 404."""
+        self.session(self.dune, datetime.datetime(2024, 3, 10, 8, 0, tzinfo=UTC), 10)
+        self.session(self.kobzar, datetime.datetime(2024, 3, 10, 9, 0, tzinfo=UTC), 5)
+
+        data = self.series(reverse("book-session-series", args=[self.dune.pk]))
+        self.assertEqual((data["book"], data["totals"]["pagesRead"]), (self.dune.pk, 10))
+
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        foreign = Book.objects.create(user=other, title="Foreign", author="X", genre="x")
+        self.series(reverse("book-session-series", args=[foreign.pk]), expected=404)
+
+    def test_downsampling_keeps_shape_and_totals(self):
+        """LTTB зменшує ряд до `points` точок, зберігаючи краї та пік; підсумки — за повним рядом."""
+        start = datetime.datetime(2024, 1, 1, 8, 0, tzinfo=UTC)
+        for day in range(120):
+            self.session(self.dune, start + datetime.timedelta(days=day), 500 if day == 57 else 10)
+
+        with CaptureQueriesContext(connection) as context:
+            data = self.series(reverse("book-session-series", args=[self.dune.pk]), points=12)
+        self.assertEqual(sum("GROUP BY" in query["sql"] for query in context.captured_queries), 1)
+
+        self.assertEqual((data["count"], len(data["results"]), data["downsampled"]), (120, 12, True))
+        self.assertEqual(data["results"][0]["start"][:10], "2024-01-01")
+        self.assertEqual(data["results"][-1]["start"][:10], "2024-04-29")
+        self.assertIn(500, [row["pagesRead"] for row in data["results"]])
+        self.assertEqual(data["totals"]["pagesRead"], 119 * 10 + 500)
+
+    def test_lttb_selection(self):
+        """Короткий ряд повертається без змін; вибрані індекси зростають."""
+        self.assertEqual(lttb([0, 1, 2], [1, 2, 3], 5), [0, 1, 2])
+        xs = list(range(50))
+        ys = [0] * 50
+        ys[20] = 100
+        indices = lttb(xs, ys, 5)
+        self.assertEqual(len(indices), 5)
+        self.assertEqual(indices, sorted(indices))
+        self.assertIn(20, indices)
+
+    def test_validation(self):
+        """Некоректні bucket, дати чи points — 400."""
+        self.series(expected=400, bucket="month")
+        self.series(expected=400, **{"from": "2024-13-01"})
+        self.series(expected=400, **{"from": "2024-03-02", "to": "2024-03-01"})
+        self.series(expected=400, points=2)
+        self.series(expected=400, points="many")
+        # Кінець календаря не переповнює межу періоду
+        self.assertEqual(self.series(**{"from": "9999-12-01", "to": "9999-12-31"})["results"], [])
@@ -0,0 +1,129 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Book, ReadingSession
+from tracker.rollups import rebuild_user_rollups
+from tracker.stats import get_user_stats, rebuild_user_stats
+
+User = get_user_model()
+
+
+class SessionBatchTests(TestCase):
+    """Тести пакетного прийому сесій з ключами ідемпотентності (`/api/sessions/batch/`)."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.dune = Book.objects.create(user=self.user, title="Dune", author="Herbert", genre="sci-fi")
+        self.kobzar = Book.objects.create(
+            user=self.user, title="Кобзар", author="Шевченко", genre="поезія", status="reading"
+        )
+        get_user_stats(self.user)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def upload(self, sessions, expected=200):
+        response = self.client.post(reverse("session-batch"), {"sessions": sessions}, format="json")
+        self.assertEqual(response.status_code, expected, response.data)
+        return response.data
+
+    def payload(self):
+        return [
+            {"key": "t-1", "book": self.dune.pk, "date": "2024-03-10T20:00:00Z", "pages_read": 20, "duration": 1200},
+            {"key": "t-2", "book": self.dune.pk, "pages_read": 15, "duration": 900, "note": "Пустеля"},
+            {"key": "t-3", "book": self.kobzar.pk, "pages_read": 5},
+        ]
+
+    def test_batch_is_created_with_few_queries(self):
+        """Сесії записуються пакетом: один запит книг, статус книги оновлюється один раз."""
+        with CaptureQueriesContext(connection) as context:
+            data = self.upload(self.payload())
+
+        self.assertEqual([result["status"] for result in data["results"]], ["created"] * 3)
+        book_selects = [q["sql"] for q in context.captured_queries if q["sql"].startswith('SELECT') and 'FROM "tracker_book"' in q["sql"]]
+        self.assertEqual(len(book_selects), 1)
+        inserts = [q["sql"] for q in context.captured_queries if q["sql"].startswith('INSERT INTO "tracker_readingsession"')]
+        self.assertEqual(len(inserts), 1)
+
+        self.dune.refresh_from_db()
+        self.assertEqual((self.dune.status, self.dune.startDate), ("reading", datetime.date.today()))
+        session = ReadingSession.objects.get(client_key="t-1")
+        self.assertEqual((session.pk, session.date.date()), (data["results"][0]["session"], datetime.date(2024, 3, 10)))
+        self.assertEqual(rebuild_user_stats(self.user)[1], {})
+        self.assertEqual(rebuild_user_rollups(self.user), 0)
+
+    def test_retry_is_idempotent(self):
+        """Повторне відправлення пакета не створює сесій і повертає їхні ідентифікатори."""
+        first = self.upload(self.payload())
+        retried = self.upload([*self.payload(), {**self.payload()[0], "key": "t-4"}, self.payload()[0]])
+
+        self.assertEqual(
+            [result["status"] for result in retried["results"]],
+            ["duplicate", "duplicate", "duplicate", "created", "duplicate"],
+        )
+        self.assertEqual(
+            [result["session"] for result in retried["results"][:3]],
+            [result["session"] for result in first["results"]],
+        )
+        self.assertEqual(retried["results"][4]["session"], first["results"][0]["session"])
+        self.assertEqual(ReadingSession.objects.count(), 4)
+        self.assertEqual(rebuild_user_stats(self.user)[1], {})
+
+    def test_invalid_and_foreign_items_are_skipped(self):
+        """Некоректні сесії та сесії чужих книг пропускаються, решта записується."""
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        foreign = Book.objects.create(user=other, title="Foreign", author="X", genre="x")
+        data = self.upload(
+            [
+                {"key": "a", "book": foreign.pk, "pages_read": 1},
+                {"key": "b", "book": self.dune.pk, "pages_read": -1},
+                {"book": self.dune.pk, "pages_read": 3},
+                "not an object",
+                {"key": "c", "book": self.dune.pk, "pages_read": 3},
+            ]
+        )
+        self.assertEqual(
+            [result["status"] for result in data["results"]],
+            ["not_found", "invalid", "invalid", "invalid", "created"],
+        )
+        self.assertIn("pages_read", data["results"][1]["errors"])
+        self.assertFalse(foreign.reading_sessions.exists())
+        self.assertEqual(list(ReadingSession.objects.values_list("client_key", flat=True)), ["c"])
+
+    def test_concurrent_insert_of_same_key(self):
+        """Ключ, записаний паралельним запитом після перевірки, дає `duplicate`, а не помилку."""
+        existing = ReadingSession.objects.create(book=self.dune, client_key="t-1", pages_read=20)
+        original = ReadingSession.objects.filter
+        calls = []
+
+        def stale_filter(*args, **kwargs):
+            # Перша перевірка ключів «не бачить» сесію, записану паралельно
+            if "client_key__in" in kwargs and not calls:
+                calls.append(kwargs)
+                return ReadingSession.objects.none()
+            return original(*args, **kwargs)
+
+        with mock.patch.object(ReadingSession.objects, "filter", side_effect=stale_filter):
+            data = self.upload(self.payload())
+        self.assertEqual(
+            [(result["status"], result["session"]) for result in data["results"][:1]], [("duplicate", existing.pk)]
+        )
+        self.assertEqual(ReadingSession.objects.filter(client_key="t-1").count(), 1)
+        self.assertEqual(ReadingSession.objects.exclude(client_key=None).count(), 3)
+
+    def test_request_validation(self):
+        """Порожній, некоректний чи завеликий пакет — 400."""
+        self.upload([], expected=400)
+        self.upload("nope", expected=400)
+        with mock.patch("tracker.views.SESSION_BATCH_MAX_ITEMS", 2):
+            self.upload(self.payload(), expected=400)
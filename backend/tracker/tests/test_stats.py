@@ -0,0 +1,176 @@
+import datetime
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from tracker.models import Book, ReadingSession, UserReadingStats
+from tracker.stats import compute_stats, get_user_stats, rebuild_user_stats
+
+User = get_user_model()
+
+
+class UserReadingStatsTests(TestCase):
+    """Тести матеріалізованої статистики читання (`UserReadingStats`).
+
+    Перевіряють, що інкрементальні дельти дають той самий результат,
+    що й повний перерахунок, а ендпоінт віддає дані одним запитом.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        # Створюємо запис статистики заздалегідь, щоб наступні зміни йшли дельтами
+        get_user_stats(self.user)
+
+    def assertNoDrift(self):
+        """Інкрементальний стан має збігатися з перерахунком з нуля."""
+        stats = UserReadingStats.objects.get(pk=self.user.pk)
+        expected = compute_stats(self.user)
+        actual = {field: getattr(stats, field) for field in expected}
+        self.assertEqual(actual, expected)
+
+    def test_book_lifecycle_deltas(self):
+        """Створення, зміна статусу, оцінки та видалення книги оновлюють лічильники."""
+        book = Book.objects.create(
+            user=self.user, title="Dune", author="Herbert", genre="Sci-Fi", totalPages=400
+        )
+        Book.objects.create(
+            user=self.user, title="Emma", author="Austen", genre="Drama", isFavorite=True
+        )
+        self.assertNoDrift()
+
+        book.currentPage = 120
+        book.status = "reading"
+        book.save()
+        self.assertNoDrift()
+
+        book.currentPage = 400
+        book.rating = 5
+        book.save()
+        stats = UserReadingStats.objects.get(pk=self.user.pk)
+        self.assertEqual(stats.read_count, 1)
+        self.assertEqual(stats.read_pages_total, 400)
+        self.assertNoDrift()
+
+        book.delete()
+        self.assertNoDrift()
+        self.assertEqual(UserReadingStats.objects.get(pk=self.user.pk).total_books, 1)
+
+    def test_session_deltas(self):
+        """Сесії змінюють сумарний час, а книга з сесіями рахується один раз."""
+        book = Book.objects.create(
+            user=self.user, title="Dune", author="Herbert", genre="Sci-Fi", totalPages=400
+        )
+        first = ReadingSession.objects.create(book=book, duration=600)
+        ReadingSession.objects.create(book=book, duration=300)
+        ReadingSession.objects.create(book=book, duration=None)
+        self.assertNoDrift()
+
+        first.duration = 900
+        first.save()
+        self.assertNoDrift()
+
+        first.delete()
+        self.assertNoDrift()
+
+        stats = UserReadingStats.objects.get(pk=self.user.pk)
+        self.assertEqual(stats.session_count, 2)
+        self.assertEqual(stats.books_with_sessions, 1)
+
+    def test_rebuild_reports_drift(self):
+        """Зміни в обхід сигналів виявляються як розбіжність при перерахунку."""
+        Book.objects.create(user=self.user, title="Dune", author="Herbert", genre="Sci-Fi")
+        Book.objects.filter(user=self.user).update(isFavorite=True)
+
+        _, drift = rebuild_user_stats(self.user)
+
+        self.assertEqual(drift, {"favorite_count": (0, 1)})
+        _, drift = rebuild_user_stats(self.user)
+        self.assertEqual(drift, {})
+
+    def test_dashboard_endpoint_uses_read_model(self):
+        """Ендпоінт статистики читає лише матеріалізований запис."""
+        Book.objects.create(
+            user=self.user,
+            title="Dune",
+            author="Herbert",
+            genre="Sci-Fi",
+            status="read",
+            totalPages=400,
+            rating=4,
+            endDate=datetime.date.today(),
+        )
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        with self.assertNumQueries(1):
+            response = client.get(reverse("reading-stats"))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["totalBooks"], 1)
+        self.assertEqual(response.data["booksReadThisYear"], 1)
+        self.assertEqual(response.data["averageRating"], 4.0)
+        self.assertEqual(response.data["genreStats"], [{"genre": "Sci-Fi", "count": 1}])
+        self.assertEqual(response.data["lastActivity"][0]["title"], "Dune")
+
+
+class StatsQueryCountTests(TestCase):
+    """Фіксує кількість SQL-запитів ендпоінтів статистики.
+
+    Скалярні показники мають обчислюватися одним скануванням `tracker_book`
+    та одним скануванням `tracker_readingsession` незалежно від кількості
+    статусів і прапорців.
+    """
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        for i, status in enumerate(["reading", "read", "want-to-read"] * 3):
+            book = Book.objects.create(
+                user=self.user,
+                title=f"Book {i}",
+                author=f"Author {i % 2}",
+                genre="Drama",
+                status=status,
+                totalPages=100,
+                isFavorite=i % 2 == 0,
+                isCustom=i % 3 == 0,
+            )
+            ReadingSession.objects.create(book=book, duration=60)
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def test_cold_dashboard_query_count(self):
+        """Перше відкриття дашборду: пошук запису + побудова статистики з нуля.
+
+        1 пошук за PK, 2 однопрохідні агрегати, 3 GROUP BY (жанри, автори,
+        місяці), 1 останні книги та 6 запитів збереження (savepoint-и,
+        повторна перевірка запису та вставка).
+        """
+        with self.assertNumQueries(13):
+            response = self.client.get(reverse("reading-stats"))
+        self.assertEqual(response.data["totalBooks"], 9)
+        self.assertEqual(response.data["totalReadingSessions"], 12)
+
+    def test_warm_dashboard_query_count(self):
+        """Після інвалідації кешу дашборд читає лише один запис за первинним ключем."""
+        self.client.get(reverse("reading-stats"))
+        cache.clear()
+        with self.assertNumQueries(1):
+            self.client.get(reverse("reading-stats"))
+
+    def test_category_counts_single_query(self):
+        """Лічильники вкладок бібліотеки рахуються одним запитом."""
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("category-stats"))
+        self.assertEqual(
+            response.data,
+            {"all": 9, "reading": 3, "read": 3, "want": 3, "fav": 5, "customCount": 3},
+        )
@@ -0,0 +1,121 @@
+import datetime
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from tracker import sync
+from tracker.models import Book, Note, Quote, ReadingCycle, ReadingSession, Tombstone
+
+User = get_user_model()
+
+
+class DeltaSyncTests(TestCase):
+    """Тести дельта-синхронізації (`/api/sync/`) та журналу видалень."""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="reader", email="reader@gmail.com", password="QA_User01!"
+        )
+        self.book = Book.objects.create(user=self.user, title="Dune", author="Herbert")
+        self.note = Note.objects.create(user=self.user, book=self.book, content="Нотатка")
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def sync(self, since=None):
+        response = self.client.get(reverse("sync"), {"since": since} if since else {})
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def later(self, seconds):
+        """Зсуває "зараз" уперед, щоб зміни були поза вікном перекриття маркера."""
+        return mock.patch(
+            "django.utils.timezone.now",
+            return_value=timezone.now() + datetime.timedelta(seconds=seconds),
+        )
+
+    def test_full_snapshot_without_token(self):
+        """Без маркера повертається вся бібліотека без вкладених колекцій."""
+        data = self.sync()
+        self.assertTrue(data["full"])
+        self.assertEqual([book["id"] for book in data["books"]], [self.book.pk])
+        self.assertNotIn("book_notes", data["books"][0])
+        self.assertEqual(data["books"][0]["title"], "Dune")
+        self.assertEqual([note["id"] for note in data["notes"]], [self.note.pk])
+        self.assertEqual(data["deleted"], [])
+
+    def test_only_changes_after_token(self):
+        """З маркером повертаються лише змінені та нові об'єкти."""
+        with self.later(60):
+            token = self.sync()["token"]
+        with self.later(120):
+            self.note.content = "Оновлена"
+            self.note.save()
+            session = ReadingSession.objects.create(book=self.book, pages_read=5)
+            quote = Quote.objects.create(user=self.user, book=self.book, content="Цитата")
+            cycle = ReadingCycle.objects.create(
+                book=self.book, start_date=datetime.date(2025, 1, 1), end_date=datetime.date(2025, 2, 1)
+            )
+            data = self.sync(token)
+
+        self.assertFalse(data["full"])
+        self.assertEqual(data["books"], [])
+        self.assertEqual([note["content"] for note in data["notes"]], ["Оновлена"])
+        self.assertEqual([row["id"] for row in data["sessions"]], [session.pk])
+        self.assertEqual([row["id"] for row in data["quotes"]], [quote.pk])
+        self.assertEqual(
+            data["cycles"],
+            [{"id": cycle.pk, "book": self.book.pk, "start_date": "2025-01-01", "end_date": "2025-02-01"}],
+        )
+
+    def test_deletions_are_reported_as_tombstones(self):
+        """Видалення, зокрема каскадні разом із книгою, потрапляють у `deleted`."""
+        session = ReadingSession.objects.create(book=self.book, pages_read=5)
+        other = Book.objects.create(user=self.user, title="Other", author="X")
+        lone = Note.objects.create(user=self.user, book=other, content="Окрема")
+        expected = {("note", lone.pk), ("note", self.note.pk), ("session", session.pk), ("book", self.book.pk)}
+        with self.later(60):
+            token = self.sync()["token"]
+        with self.later(120):
+            lone.delete()
+            self.book.delete()
+            data = self.sync(token)
+
+        self.assertEqual({(row["type"], row["id"]) for row in data["deleted"]}, expected)
+        self.assertEqual(data["books"], [])
+
+    def test_warm_sync_cost_does_not_depend_on_library_size(self):
+        """Узгодження без змін — фіксована кількість запитів і порожні колекції."""
+        for i in range(30):
+            Book.objects.create(user=self.user, title=f"Книга {i}", author="A")
+        with self.later(60):
+            token = self.sync()["token"]
+        with self.later(120), self.assertNumQueries(6):
+            data = self.sync(token)
+        for name in ("books", "sessions", "notes", "quotes", "cycles", "deleted"):
+            self.assertEqual(data[name], [])
+
+    def test_invalid_or_foreign_token_rejected(self):
+        """Підроблений маркер чи маркер іншого користувача повертають 400."""
+        response = self.client.get(reverse("sync"), {"since": "garbage"})
+        self.assertEqual(response.status_code, 400)
+
+        other = User.objects.create_user(username="o", email="o@gmail.com", password="QA_User01!")
+        foreign = sync.make_token(other.pk, timezone.now())
+        self.assertEqual(self.client.get(reverse("sync"), {"since": foreign}).status_code, 400)
+
+    def test_expired_token_returns_full_snapshot(self):
+        """Маркер, старший за строк зберігання журналу, дає повний знімок."""
+        token = sync.make_token(self.user.pk, timezone.now() - datetime.timedelta(days=365))
+        self.assertTrue(self.sync(token)["full"])
+
+    def test_user_deletion_writes_no_tombstones(self):
+        """Видалення користувача не залишає записів журналу."""
+        user_id = self.user.pk
+        self.user.delete()
+        self.assertFalse(Tombstone.objects.filter(user_id=user_id).exists())
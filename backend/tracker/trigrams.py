@@ -0,0 +1,187 @@
+"""
+Модуль нечіткого автодоповнення назв і авторів книг за триграмами.
+
+Назва та автор книги нормалізуються (нижній регістр, без діакритики та
+розділових знаків) і розбиваються на триграми так само, як у `pg_trgm`:
+кожне слово доповнюється двома пробілами зліва та одним справа. Унікальні
+триграми книги зберігаються в таблиці `BookTrigram` з індексом
+`(user, trigram, book)`.
+
+Пошук виконується у два кроки:
+
+1. Один запит за індексом: книги користувача, що мають спільні з запитом
+   триграми, впорядковані за кількістю збігів (не більше `CANDIDATES`).
+   Малоселективні триграми першої літери слова в цьому кроці не беруть
+   участі, тож запит обходить лише короткі списки книг.
+2. Кандидати ранжуються в Python за часткою триграм запиту, знайдених у
+   книзі (запит зазвичай є початком назви), та за подібністю Жаккара.
+
+Одруківки змінюють лише кілька триграм, тому книга з помилкою в запиті все
+одно має достатньо збігів. Індекс оновлюється сигналами інкрементально:
+при перейменуванні додаються й видаляються лише змінені триграми.
+"""
+
+import unicodedata
+
+from django.db import connection
+from django.db.models import Count
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .bulk import books_bulk_saved
+from .models import Book, BookTrigram
+
+#: Максимальна кількість підказок автодоповнення.
+MAX_SUGGESTIONS = 20
+
+#: Кількість кандидатів, що ранжуються після запиту за індексом.
+CANDIDATES = 200
+
+#: Мінімальна частка триграм запиту, яку має містити книга.
+MIN_SIMILARITY = 0.4
+
+
+def normalize(text):
+    """Приводить текст до нижнього регістру без діакритики та розділових знаків.
+
+    Returns:
+        list: Слова нормалізованого тексту.
+    """
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return "".join(char if char.isalnum() else " " for char in stripped.casefold()).split()
+
+
+def trigrams(text):
+    """Повертає множину триграм тексту (у стилі `pg_trgm`)."""
+    result = set()
+    for word in normalize(text):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def book_trigrams(title, author):
+    """Повертає триграми назви та автора книги."""
+    return trigrams(title) | trigrams(author)
+
+
+def index_book(book, existing=None):
+    """Синхронізує триграми книги з її поточними назвою та автором.
+
+    Args:
+        book (Book): Збережена книга.
+        existing (set | None): Триграми, що вже є в індексі (порожня множина
+            для нової книги, триграми попереднього стану для зміненої). Якщо
+            `None`, вони читаються з БД.
+    """
+    current = book_trigrams(book.title, book.author)
+    if existing is None:
+        existing = set(BookTrigram.objects.filter(book_id=book.pk).values_list("trigram", flat=True))
+
+    removed = existing - current
+    if removed:
+        BookTrigram.objects.filter(book_id=book.pk, trigram__in=removed).delete()
+    added = current - existing
+    if added:
+        BookTrigram.objects.bulk_create(
+            [BookTrigram(user_id=book.user_id, book_id=book.pk, trigram=trigram) for trigram in added],
+            ignore_conflicts=True,
+        )
+
+
+def index_books(books, replace=()):
+    """Індексує пакет книг: старі триграми `replace` видаляються одним запитом.
+
+    Args:
+        books (Iterable[Book]): Нові або перейменовані книги.
+        replace (Iterable[int]): Ідентифікатори книг, чиї триграми вже є в індексі.
+    """
+    replace = list(replace)
+    if replace:
+        BookTrigram.objects.filter(book_id__in=replace).delete()
+    rows = [
+        (book.user_id, book.pk, trigram)
+        for book in books
+        for trigram in book_trigrams(book.title, book.author)
+    ]
+    if not rows:
+        return
+    # Пакет із тисяч рядків: `executemany` без створення екземплярів моделі
+    # (`bulk_create` витрачав на них більшу частину часу імпорту)
+    quote = connection.ops.quote_name
+    columns = ", ".join(quote(BookTrigram._meta.get_field(name).column) for name in ("user", "book", "trigram"))
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"INSERT INTO {quote(BookTrigram._meta.db_table)} ({columns}) VALUES (%s, %s, %s)", rows
+        )
+
+
+def autocomplete(user_id, query, limit=10):
+    """Повертає книги користувача, назва чи автор яких нечітко збігаються з запитом.
+
+    Args:
+        user_id (int): Ідентифікатор користувача.
+        query (str): Введений текст (можливо, неповний або з одруківками).
+        limit (int): Максимальна кількість результатів.
+
+    Returns:
+        list: Словники `id`, `title`, `author`, `cover`, `status`, `score`
+        за спаданням подібності.
+    """
+    wanted = trigrams(query)
+    if not wanted:
+        return []
+
+    # Триграми першої літери слова ("  d") є в кожній п'ятій-десятій книзі,
+    # тому кандидати відбираються за рештою триграм (якщо вони є)
+    selective = {trigram for trigram in wanted if not trigram.startswith("  ")} or wanted
+    hits = dict(
+        BookTrigram.objects.filter(user_id=user_id, trigram__in=selective)
+        .values("book_id")
+        .annotate(hits=Count("book_id"))
+        .order_by("-hits")
+        .values_list("book_id", "hits")[:CANDIDATES]
+    )
+    minimum = MIN_SIMILARITY * len(selective)
+    candidates = [book_id for book_id, count in hits.items() if count >= minimum]
+    if not candidates:
+        return []
+
+    scored = []
+    books = Book.objects.filter(pk__in=candidates).values("id", "title", "author", "cover", "status")
+    for book in books:
+        own = book_trigrams(book["title"], book["author"])
+        common = len(wanted & own)
+        coverage = common / len(wanted)
+        jaccard = common / len(wanted | own)
+        scored.append((coverage, jaccard, book))
+    scored.sort(key=lambda item: (item[0], item[1]), reverse=True)
+
+    return [{**book, "score": round(coverage, 3)} for coverage, _, book in scored[:limit]]
+
+
+# --- ОБРОБНИКИ СИГНАЛІВ ---
+
+
+@receiver(post_save, sender=Book)
+def book_saved(sender, instance, created, **kwargs):
+    """Оновлює триграми нової або перейменованої книги (видалення — каскадне)."""
+    previous = None if created else getattr(instance, "_previous_state", None)
+    if previous is not None and (previous.title, previous.author) == (instance.title, instance.author):
+        return
+    if created:
+        index_book(instance, existing=set())
+    elif previous is not None:
+        index_book(instance, existing=book_trigrams(previous.title, previous.author))
+    else:
+        index_book(instance)
+
+
+@receiver(books_bulk_saved)
+def books_bulk_saved_handler(sender, created, updated, **kwargs):
+    """Індексує нові книги пакета та переіндексує перейменовані."""
+    renamed = [
+        book for previous, book in updated if (previous.title, previous.author) != (book.title, book.author)
+    ]
+    index_books([*created, *renamed], replace=[book.pk for book in renamed])
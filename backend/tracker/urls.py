@@ -51,10 +51,28 @@ urlpatterns = [
     path("profile/", UserProfileView.as_view(), name="user-profile"),
     #: Кінцева точка для отримання глобальної статистики читання.
     path("stats/", ReadingStatsAPIView.as_view(), name="reading-stats"),
+    #: Кількість книг за категоріями (вкладки бібліотеки).
+    path("stats/categories/", views.get_stats, name="category-stats"),
+    #: Статистика читання за період із групуванням за днями/тижнями/місяцями/роками.
+    path("stats/range/", views.StatsRangeAPIView.as_view(), name="stats-range"),
+    #: Теплова карта активності за останні 365 днів.
+    path("stats/heatmap/", views.HeatmapAPIView.as_view(), name="stats-heatmap"),
+    #: Поточна та найдовша серія днів читання.
+    path("stats/streak/", views.StreakAPIView.as_view(), name="stats-streak"),
+    #: Дельта-синхронізація бібліотеки (зміни та видалення після маркера).
+    path("sync/", views.SyncAPIView.as_view(), name="sync"),
+    #: Потоковий імпорт бібліотеки з файлу (CSV, Goodreads, JSON lines).
+    path("import/", views.LibraryImportAPIView.as_view(), name="library-import"),
+    #: Потоковий експорт бібліотеки (CSV, JSON lines, ZIP).
+    path("export/", views.LibraryExportAPIView.as_view(), name="library-export"),
     #: Технічний ендпоінт для збору помилок із фронтенд-частини (React).
     path("logs/frontend/", views.frontend_log_view, name="frontend-logs"),
+    #: Повнотекстовий пошук по описах книг, нотатках, цитатах і нотатках сесій.
+    path("search/library/", views.LibrarySearchAPIView.as_view(), name="library-search"),
     #: Проксі-маршрут для взаємодії з Google Books API.
     path("search/external/", ExternalSearchAPIView.as_view(), name="external-search"),
+    #: Лічильники та очищення кешу зовнішнього пошуку (для адміністраторів).
+    path("search/external/cache/", views.ExternalSearchCacheAPIView.as_view(), name="external-search-cache"),
     #: Ендпоінт для відправки повідомлень зворотного зв'язку адміністрації.
     path("feedback/", views.FeedbackAPIView.as_view(), name="feedback"),
 ]
@@ -12,27 +12,58 @@
 доступу користувачів виключно до власних даних.
 """
 
+import csv
+import datetime
 import json
 import logging
 import re
 
-import requests
+import httpx
 from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
 from django.core.mail import send_mail
-from django.db.models import Avg, Count, FloatField, Sum
-from django.db.models.functions import Coalesce, ExtractMonth
-from django.http import JsonResponse
+from django.db.models.functions import Coalesce
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render
 from django.utils import timezone
+from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from rest_framework import generics, status, viewsets
-from rest_framework.decorators import action, api_view
-from rest_framework.exceptions import PermissionDenied
-from rest_framework.permissions import IsAuthenticated
+from rest_framework.decorators import action, api_view, permission_classes
+from rest_framework.exceptions import AuthenticationFailed, NotAuthenticated, PermissionDenied
+from rest_framework.negotiation import BaseContentNegotiation
+from rest_framework.parsers import MultiPartParser
+from rest_framework.permissions import IsAdminUser, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
-
+from rest_framework_simplejwt.authentication import JWTStatelessUserAuthentication
+
+from .aggregates import category_counts
+from .bulk import apply_bulk
+from .cache import cached_payload
+from .catalog import isbn_from_identifiers, local_catalog
+from .conditional import conditional_get
+from .exports import CONTENT_TYPES as EXPORT_CONTENT_TYPES
+from .exports import EXPORTERS, async_chunks
+from .external_search import google_books, make_key, request_scoped_loop, search_cache
+from .imports import FORMATS as IMPORT_FORMATS
+from .imports import import_library
+from .ingest import MAX_ITEMS as SESSION_BATCH_MAX_ITEMS
+from .ingest import record_sessions
 from .models import Book, Note, Quote, ReadingCycle, ReadingSession
+from .progress import record_progress
+from .projections import ValuesListMixin
+from .rollups import (
+    BUCKETS,
+    MAX_BUCKETS,
+    bucket_count,
+    heatmap,
+    range_stats,
+    rebuild_user_rollups,
+    streaks,
+    user_today,
+)
+from .search import MAX_RESULTS, search_library
 from .serializers import (
     BookSerializer,
     NoteSerializer,
@@ -40,6 +71,11 @@ from .serializers import (
     ReadingSessionSerializer,
     UserSerializer,
 )
+from .series import BUCKETS as SERIES_BUCKETS
+from .series import MAX_POINTS, MIN_POINTS, session_series
+from .stats import build_dashboard, get_user_stats
+from .sync import changes_since, read_token
+from .trigrams import MAX_SUGGESTIONS, autocomplete
 
 
 def custom_404_view(request, exception):
@@ -135,17 +171,112 @@ class UserFilteredModelViewSet(viewsets.ModelViewSet):
         )
 
 
-class BookViewSet(UserFilteredModelViewSet):
+def _split_param(value):
+    """Розбиває параметр-список (`a,b,c`) на назви; `None`, якщо параметр відсутній або порожній."""
+    if value is None:
+        return None
+    # Порожнє значення (`?fields=`, `?fields=,`) рівнозначне відсутньому параметру
+    return [name.strip() for name in value.split(",") if name.strip()] or None
+
+
+def _session_series_response(request, book_id=None):
+    """Перевіряє параметри часового ряду сесій і формує відповідь.
+
+    Query Params:
+        bucket (str): 'hour', 'day' (за замовчуванням) або 'week'.
+        from (str): Перший день періоду (YYYY-MM-DD), необов'язковий.
+        to (str): Останній день періоду (YYYY-MM-DD), необов'язковий.
+        points (int): Максимальна кількість точок (LTTB), необов'язковий.
+    """
+    bucket = request.query_params.get("bucket", "day")
+    if bucket not in SERIES_BUCKETS:
+        return Response(
+            {"error": f"Параметр bucket має бути одним із: {', '.join(SERIES_BUCKETS)}."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    try:
+        start, end = (
+            datetime.date.fromisoformat(value) if value else None
+            for value in (request.query_params.get("from"), request.query_params.get("to"))
+        )
+    except ValueError:
+        return Response(
+            {"error": "Дати мають бути у форматі YYYY-MM-DD."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    if start and end and start > end:
+        return Response(
+            {"error": "Початок періоду не може бути пізніше за його кінець."},
+            status=status.HTTP_400_BAD_REQUEST,
+        )
+    points = request.query_params.get("points")
+    if points is not None:
+        try:
+            points = int(points)
+        except ValueError:
+            points = None
+        if points is None or not MIN_POINTS <= points <= MAX_POINTS:
+            return Response(
+                {"error": f"Параметр points має бути цілим числом від {MIN_POINTS} до {MAX_POINTS}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+    return Response(session_series(request.user.pk, bucket, book_id, start, end, points))
+
+
+class BookViewSet(ValuesListMixin, UserFilteredModelViewSet):
     """ViewSet для управління книгами користувача (CRUD операції).
     Реалізує складну логіку серверної фільтрації та сортування.
     Використовує `prefetch_related` для оптимізації SQL-запитів до
-    пов'язаних сутностей (сесій, нотаток).
+    пов'язаних сутностей (сесій, нотаток) — лише тих, що потрапляють у відповідь.
+
+    Запити на читання підтримують параметри:
+    - `fields` — перелік полів відповіді (наприклад, `?fields=id,title,status`);
+    - `expand` — вкладені колекції (`readingSessions`, `reading_cycles`,
+      `book_notes`, `book_quotes`), що додаються до представлення.
+
+    Список за замовчуванням повертає компактне представлення
+    (`BookSerializer.LIST_FIELDS`) без вкладених колекцій, деталі книги —
+    повне представлення.
     """
 
     queryset = Book.objects.all()
     serializer_class = BookSerializer
     filter_fields = ["status", "genre", "isFavorite"]
 
+    def get_representation_fields(self):
+        """Визначає поля відповіді та вкладені колекції для поточного запиту.
+
+        Returns:
+            tuple: `(fields, expand)`, де `fields` дорівнює `None` для повного
+            представлення.
+        """
+        if self.action not in ("list", "retrieve"):
+            return None, []
+
+        fields = _split_param(self.request.query_params.get("fields"))
+        expand = _split_param(self.request.query_params.get("expand")) or []
+        if fields is None and self.action == "list":
+            fields = BookSerializer.LIST_FIELDS
+        return fields, expand
+
+    def get_serializer(self, *args, **kwargs):
+        """Створює серіалізатор із розрідженим набором полів для запитів на читання."""
+        fields, expand = self.get_representation_fields()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+            kwargs.setdefault("expand", expand)
+        return super().get_serializer(*args, **kwargs)
+
+    def get_prefetch_relations(self):
+        """Повертає зв'язки, які потрібно попередньо завантажити для відповіді."""
+        fields, expand = self.get_representation_fields()
+        requested = BookSerializer.EXPANDABLE_FIELDS if fields is None else {*fields, *expand}
+        return [
+            relation
+            for name, relation in BookSerializer.EXPANDABLE_FIELDS.items()
+            if name in requested
+        ]
+
     def get_queryset(self):
         """
         Розширена логіка отримання книг з урахуванням параметрів URL.
@@ -153,16 +284,15 @@ class BookViewSet(UserFilteredModelViewSet):
         Підтримує:
         - Фільтрацію за `status` та `isFavorite`.
         - Сортування за рейтингом (`rating-desc/asc`) та жанром.
-        - Префетчинг для уникнення N+1 при серіалізації вкладених даних.
+        - Префетчинг для уникнення N+1 при серіалізації вкладених даних
+          (лише для колекцій, що потрапляють у відповідь).
         """
 
         # Базова фільтрація по поточному юзеру
         queryset = super().get_queryset()
 
         # Оптимізація запитів
-        queryset = queryset.prefetch_related(
-            "reading_sessions", "book_notes", "book_quotes", "reading_cycles"
-        )
+        queryset = queryset.prefetch_related(*self.get_prefetch_relations())
 
         # --- ЛОГІКА ФІЛЬТРАЦІЇ ---
         # Параметри з URL запиту
@@ -182,20 +312,267 @@ class BookViewSet(UserFilteredModelViewSet):
             queryset = queryset.filter(isCustom=True)
             
         # --- ЛОГІКА СОРТУВАННЯ ---
+        # Кожен порядок закінчується `id`, щоб ключ пагінації за курсором був
+        # унікальним. Книги без оцінки йдуть як оцінка 0 (останніми при спаданні).
         sort_by = self.request.query_params.get("sort")
 
+        if sort_by in ("rating-desc", "rating-asc"):
+            queryset = queryset.annotate(rating_key=Coalesce("rating", 0))
         if sort_by == "rating-desc":
-            queryset = queryset.order_by("-rating", "title")
+            queryset = queryset.order_by("-rating_key", "title", "id")
         elif sort_by == "rating-asc":
-            queryset = queryset.order_by("rating", "title")
+            queryset = queryset.order_by("rating_key", "title", "id")
         elif sort_by == "genre":
-            queryset = queryset.order_by("genre", "title")
+            queryset = queryset.order_by("genre", "title", "id")
         else:
             # За замовчуванням: спочатку нові додані
-            queryset = queryset.order_by("-addedDate")
+            queryset = queryset.order_by("-addedDate", "-id")
 
         return queryset
     
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        """Повертає список книг; перша сторінка кешується для кожного набору фільтрів.
+
+        HomePage запитує першу сторінку при кожному рендері, тому її відповідь
+        зберігається у версіонованому кеші користувача та інвалідується при
+        будь-якій зміні бібліотеки. Наступні сторінки завжди читаються з БД.
+        """
+        first_page = request.query_params.get("page", "1") == "1"
+        if not first_page or "cursor" in request.query_params:
+            return super().list(request, *args, **kwargs)
+
+        payload = cached_payload(
+            request.user.pk,
+            "books",
+            lambda: super(BookViewSet, self).list(request, *args, **kwargs).data,
+            params=request.query_params,
+        )
+        return Response(payload)
+
+    @conditional_get
+    def retrieve(self, request, *args, **kwargs):
+        """Повертає книгу; підтримує умовні запити (`ETag` / `304`)."""
+        return super().retrieve(request, *args, **kwargs)
+
+    @action(detail=False, methods=["get"])
+    def autocomplete(self, request):
+        """Нечітке автодоповнення за назвою та автором книг користувача.
+
+        Використовує триграмний індекс (`tracker.trigrams`), тому враховує
+        неповні слова та одруківки і не сканує всю бібліотеку.
+
+        Query Params:
+            q (str): Введений текст.
+            limit (int): Кількість підказок (за замовчуванням 10, максимум 20).
+
+        Returns:
+            Response: JSON з ключами `query` та `results` (`id`, `title`,
+            `author`, `cover`, `status`, `score`).
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "Параметр q є обов'язковим."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(MAX_SUGGESTIONS, max(1, int(request.query_params.get("limit", 10))))
+        except ValueError:
+            return Response(
+                {"error": "Параметр limit має бути цілим числом."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"query": query, "results": autocomplete(request.user.pk, query, limit)})
+
+    #: Максимальна кількість операцій в одному масовому запиті.
+    BULK_MAX_ITEMS = 500
+
+    @action(detail=False, methods=["post"], url_path="bulk")
+    def bulk(self, request):
+        """Масове створення, оновлення та видалення книг в одній транзакції.
+
+        Усі операції спочатку валідуються; якщо хоча б одна некоректна,
+        жодна зміна не застосовується. Запис виконує `tracker.bulk.apply_bulk`
+        (`bulk_create` / `bulk_update` з векторизованими правилами життєвого циклу).
+
+        Request Body:
+            create (list[dict]): Дані нових книг.
+            update (list[dict]): Зміни існуючих книг (обов'язкове поле `id`).
+            delete (list[int]): Ідентифікатори книг для видалення.
+
+        Returns:
+            Response: HTTP 200 з результатами для кожного елемента (`create`,
+            `update`, `delete`) або HTTP 400 з `error` та помилками елементів.
+        """
+        if not isinstance(request.data, dict):
+            return Response(
+                {"error": "Тіло запиту має бути об'єктом з полями create, update та delete."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        creates = request.data.get("create") or []
+        updates = request.data.get("update") or []
+        deletes = request.data.get("delete") or []
+        if not all(isinstance(items, list) for items in (creates, updates, deletes)):
+            return Response(
+                {"error": "Поля create, update та delete мають бути масивами."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(creates) + len(updates) + len(deletes) > self.BULK_MAX_ITEMS:
+            return Response(
+                {"error": f"Не більше {self.BULK_MAX_ITEMS} операцій за один запит."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        def book_id(value):
+            try:
+                return int(value)
+            except (TypeError, ValueError):
+                return None
+
+        update_ids = [book_id(item.get("id")) if isinstance(item, dict) else None for item in updates]
+        delete_ids = [book_id(value) for value in deletes]
+        books = Book.objects.filter(
+            user=request.user, pk__in=[pk for pk in update_ids + delete_ids if pk is not None]
+        ).in_bulk()
+
+        results = {"create": [], "update": [], "delete": []}
+        valid = True
+        created_data = []
+        for index, item in enumerate(creates):
+            serializer = BookSerializer(data=item if isinstance(item, dict) else {})
+            if serializer.is_valid():
+                created_data.append(serializer.validated_data)
+                results["create"].append({"index": index, "status": "ok"})
+            else:
+                valid = False
+                results["create"].append({"index": index, "status": "invalid", "errors": serializer.errors})
+
+        changes = []
+        seen = set()
+        for index, (item, pk) in enumerate(zip(updates, update_ids)):
+            book = books.get(pk)
+            if book is None or pk in seen:
+                valid = False
+                results["update"].append(
+                    {"index": index, "id": pk, "status": "duplicate" if book else "not_found"}
+                )
+                continue
+            seen.add(pk)
+            data = {key: value for key, value in item.items() if key != "id"}
+            serializer = BookSerializer(book, data=data, partial=True)
+            if serializer.is_valid():
+                changes.append((book, serializer.validated_data))
+                results["update"].append({"index": index, "id": pk, "status": "ok"})
+            else:
+                valid = False
+                results["update"].append({"index": index, "id": pk, "status": "invalid", "errors": serializer.errors})
+
+        for index, pk in enumerate(delete_ids):
+            if pk not in books or pk in seen:
+                valid = False
+                results["delete"].append(
+                    {"index": index, "id": pk, "status": "duplicate" if pk in books else "not_found"}
+                )
+                continue
+            seen.add(pk)
+            results["delete"].append({"index": index, "id": pk, "status": "deleted"})
+
+        if not valid:
+            return Response(
+                {"error": "Пакет містить некоректні операції; зміни не застосовано.", "results": results},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        created, updated, _ = apply_bulk(
+            request.user, creates=created_data, updates=changes, delete_ids=delete_ids
+        )
+        represent = BookSerializer(fields=BookSerializer.LIST_FIELDS).to_representation
+        for result, book in zip(results["create"], created):
+            result.update(status="created", id=book.pk, book=represent(book))
+        for result, book in zip(results["update"], updated):
+            result.update(status="updated", book=represent(book))
+
+        logger.info(
+            f"Масова зміна книг користувача {request.user.pk}: "
+            f"+{len(created)} ~{len(updated)} -{len(delete_ids)}"
+        )
+        return Response({"results": results})
+
+    @action(detail=True, methods=["post"])
+    def progress(self, request, pk=None):
+        """Швидке оновлення поточної сторінки книги ("я на сторінці N").
+
+        Типовий випадок (сторінка збільшилась, книга не дочитана) записується
+        двома інструкціями без читання та серіалізації книги
+        (`tracker.progress.record_progress`); решта — звичайним `Book.save`.
+
+        Request Body:
+            currentPage (int): Нова поточна сторінка.
+
+        Returns:
+            Response: HTTP 200 з `id`, `currentPage`, `progress`, `status` та
+            `pagesRead` (сторінки автоматичної сесії), HTTP 400 для некоректної
+            сторінки або HTTP 404, якщо книги немає.
+        """
+        page = request.data.get("currentPage")
+        if isinstance(page, str) and page.isdigit():
+            page = int(page)
+        if not isinstance(page, int) or isinstance(page, bool) or page < 0:
+            return Response(
+                {"error": "Поле currentPage має бути невід'ємним цілим числом."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            book_id = int(pk)
+        except (TypeError, ValueError):
+            book_id = None
+
+        payload = record_progress(request.user.pk, book_id, page) if book_id is not None else None
+        if payload is not None:
+            return Response(payload)
+
+        book = Book.objects.filter(user=request.user, pk=book_id).first() if book_id is not None else None
+        if book is None:
+            return Response({"error": "Книгу не знайдено."}, status=status.HTTP_404_NOT_FOUND)
+        if book.totalPages and page > book.totalPages:
+            return Response(
+                {"error": "Поточна сторінка не може бути більшою за загальну кількість сторінок."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        old_page = book.currentPage
+        book.currentPage = page
+        book.save()
+        return Response(
+            {
+                "id": book.pk,
+                "currentPage": book.currentPage,
+                "progress": book.progress,
+                "status": book.status,
+                "pagesRead": max(0, book.currentPage - old_page),
+            }
+        )
+
+    @action(detail=True, methods=["get"], url_path="sessions/series", url_name="session-series")
+    @conditional_get
+    def series(self, request, pk=None):
+        """Часовий ряд сесій книги: сторінки, секунди та кількість сесій за інтервал.
+
+        Дані групуються одним запитом у БД; параметри — як у
+        `/api/sessions/series/` (`bucket`, `from`, `to`, `points`).
+
+        Returns:
+            Response: JSON часового ряду або HTTP 404, якщо книги немає.
+        """
+        try:
+            book_id = int(pk)
+        except (TypeError, ValueError):
+            book_id = None
+        if book_id is None or not Book.objects.filter(user=request.user, pk=book_id).exists():
+            return Response({"error": "Книгу не знайдено."}, status=status.HTTP_404_NOT_FOUND)
+        return _session_series_response(request, book_id)
+
     @action(detail=True, methods=['post'])
     def start_re_reading(self, request, pk=None):
         """Користувацька дія (Custom Action) для початку повторного читання книги.
@@ -258,10 +635,12 @@ class ReadingSessionViewSet(viewsets.ModelViewSet):
         """Отримує сесії читання лише для книг, що належать поточному користувачу.
 
         Returns:
-            QuerySet: Сесії читання користувача.
+            QuerySet: Сесії читання користувача (спочатку найновіші).
 
         """
-        return ReadingSession.objects.filter(book__user=self.request.user)
+        return ReadingSession.objects.filter(book__user=self.request.user).order_by(
+            "-date", "-id"
+        )
 
     def perform_create(self, serializer):
         """Створює нову сесію читання. Перевіряє права доступу до книги та
@@ -295,16 +674,76 @@ class ReadingSessionViewSet(viewsets.ModelViewSet):
         serializer.save()
         logger.info(f"New reading session added for book {book.id}")
 
+    @action(detail=False, methods=["post"])
+    def batch(self, request):
+        """Пакетний прийом сесій з офлайн-таймера з ключами ідемпотентності.
 
-class NoteViewSet(UserFilteredModelViewSet):
+        Власність книг перевіряється одним запитом, нові сесії записуються
+        одним `bulk_create`, а сесії з уже збереженими ключами повертаються
+        як `duplicate`, тож повторне відправлення пакета безпечне
+        (`tracker.ingest.record_sessions`).
+
+        Request Body:
+            sessions (list): Сесії з полями `key` (унікальний для клієнта),
+                `book`, `date`, `pages_read`, `duration`, `note`.
+
+        Returns:
+            Response: HTTP 200 з `results` (статус `created`, `duplicate`,
+            `not_found` або `invalid` для кожної сесії у порядку запиту) або
+            HTTP 400 для некоректного тіла запиту.
+        """
+        items = request.data.get("sessions") if isinstance(request.data, dict) else None
+        if not isinstance(items, list) or not items:
+            return Response(
+                {"error": "Поле sessions має бути непорожнім масивом."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if len(items) > SESSION_BATCH_MAX_ITEMS:
+            return Response(
+                {"error": f"Пакет не може містити більше ніж {SESSION_BATCH_MAX_ITEMS} сесій."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        results = record_sessions(request.user, items)
+        created = sum(result["status"] == "created" for result in results)
+        logger.info(f"User {request.user.id} uploaded {len(items)} sessions in a batch ({created} new)")
+        return Response({"results": results})
+
+    @action(detail=False, methods=["get"])
+    @conditional_get
+    def series(self, request):
+        """Часовий ряд усіх сесій користувача для графіків темпу читання.
+
+        Сесії групуються за годинами, днями або тижнями (у часовому поясі
+        користувача) одним запитом; довгий ряд можна зменшити до `points`
+        точок алгоритмом LTTB.
+
+        Query Params:
+            bucket (str): 'hour', 'day' (за замовчуванням) або 'week'.
+            from (str): Перший день періоду (YYYY-MM-DD), необов'язковий.
+            to (str): Останній день періоду (YYYY-MM-DD), необов'язковий.
+            points (int): Максимальна кількість точок, необов'язковий.
+
+        Returns:
+            Response: JSON з інтервалами `results` та підсумками `totals`.
+        """
+        return _session_series_response(request)
+
+
+class NoteViewSet(ValuesListMixin, UserFilteredModelViewSet):
     """ViewSet для управління нотатками користувача."""
 
-    queryset = Note.objects.all()
+    queryset = Note.objects.select_related("book").order_by("-createdAt", "-id")
     serializer_class = NoteSerializer
     filter_fields = ["isFavorite"]
 
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        """Повертає нотатки; підтримує умовні запити (`ETag` / `304`)."""
+        return super().list(request, *args, **kwargs)
+
 
-class QuoteViewSet(UserFilteredModelViewSet):
+class QuoteViewSet(ValuesListMixin, UserFilteredModelViewSet):
     """ViewSet для управління колекцією цитат користувача.
 
     Успадковує логіку ізоляції даних від `UserFilteredModelViewSet` 
@@ -313,9 +752,17 @@ class QuoteViewSet(UserFilteredModelViewSet):
     на клієнтській стороні (React).
     """
     
-    queryset = Quote.objects.all()
+    queryset = Quote.objects.select_related("book")
     serializer_class = QuoteSerializer
 
+    #: Підтримувані значення параметра `ordering` та відповідні порядки сортування.
+    ORDERINGS = {
+        "-createdAt": ("-createdAt", "-id"),
+        "createdAt": ("createdAt", "id"),
+        "book__title": ("book__title", "id"),
+        "-book__title": ("-book__title", "-id"),
+    }
+
     def get_queryset(self):
         """Формує набір даних (QuerySet) на основі параметрів HTTP-запиту.
 
@@ -327,6 +774,7 @@ class QuoteViewSet(UserFilteredModelViewSet):
             isFavorite (str): Якщо дорівнює 'true', залишає лише обрані цитати.
             ordering (str): Вказує поле для сортування (наприклад, '-createdAt' 
                 для нових записів спочатку, або 'book__title' за алфавітом).
+                Непідтримувані значення замінюються на '-createdAt'.
 
         Returns:
             QuerySet: Кінцевий набір об'єктів `Quote`, готовий до серіалізації 
@@ -341,13 +789,19 @@ class QuoteViewSet(UserFilteredModelViewSet):
         if is_favorite == 'true':
             queryset = queryset.filter(isFavorite=True)
             
-        # Сортування 
+        # Сортування (лише підтримувані порядки, кожен закінчується `id`)
         ordering = self.request.query_params.get('ordering')
-        if ordering:
-            queryset = queryset.order_by(ordering)
-            
+        queryset = queryset.order_by(
+            *self.ORDERINGS.get(ordering, self.ORDERINGS["-createdAt"])
+        )
+
         return queryset
 
+    @conditional_get
+    def list(self, request, *args, **kwargs):
+        """Повертає цитати; підтримує умовні запити (`ETag` / `304`)."""
+        return super().list(request, *args, **kwargs)
+
 
 class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
     """API View для перегляду та оновлення профілю поточного користувача."""
@@ -363,6 +817,18 @@ class UserProfileView(generics.RetrieveUpdateDestroyAPIView):
 
         """
         return self.request.user
+
+    def perform_update(self, serializer):
+        """Зберігає профіль; при зміні часового поясу перебудовує щоденні зведення.
+
+        Args:
+            serializer: Серіалізатор з валідованими даними профілю.
+        """
+        previous_timezone = serializer.instance.timezone
+        user = serializer.save()
+        if user.timezone != previous_timezone:
+            logger.info(f"User {user.id} changed timezone to {user.timezone}")
+            rebuild_user_rollups(user)
     
     def perform_destroy(self, instance):
         """
@@ -378,10 +844,16 @@ class ReadingStatsAPIView(APIView):
 
     permission_classes = [IsAuthenticated]
 
+    @conditional_get
     def get(self, request, *args, **kwargs):
-        """Обчислює та повертає зведену статистику користувача:
+        """Повертає зведену статистику користувача:
         виконання річної мети, кількість сторінок, час читання та статистику за жанрами.
 
+        Дані беруться з матеріалізованої моделі `UserReadingStats`, яка
+        підтримується інкрементально, тому запит зводиться до одного пошуку
+        за первинним ключем. Готова відповідь додатково кешується до
+        наступної зміни бібліотеки користувача.
+
         Args:
             request: Об'єкт HTTP запиту.
 
@@ -392,134 +864,276 @@ class ReadingStatsAPIView(APIView):
         logger.info(f"Generating reading stats for user {request.user.id}")
 
         user = request.user
-        current_year = timezone.now().year
+        payload = cached_payload(
+            user.pk, "stats", lambda: build_dashboard(get_user_stats(user), user)
+        )
 
-        all_books = Book.objects.filter(user=user)
-        read_books = all_books.filter(status="read")
+        logger.debug(f"Stats successfully served for user {user.id}")
 
-        read_this_year_count = read_books.filter(endDate__year=current_year).count()
+        return Response(payload)
 
-        time_stats = ReadingSession.objects.filter(book__user=user).aggregate(
-            total_duration_minutes=Coalesce(Sum("duration"), 0),
-            avg_duration_session=Coalesce(
-                Avg("duration"), 0.0, output_field=FloatField()
-            ),
-            total_sessions=Count("id"),
-        )
 
-        page_stats = read_books.aggregate(
-            total_pages_read=Coalesce(Sum("totalPages"), 0),
-            avg_rating=Coalesce(Avg("rating"), 0.0, output_field=FloatField()),
-            avg_pages_per_book=Coalesce(
-                Avg("totalPages"), 0.0, output_field=FloatField()
-            ),
-        )
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+@conditional_get
+def get_stats(request):
+    """Повертає загальну кількість книг за категоріями для поточного користувача.
 
-        genre_stats = (
-            all_books.values("genre").annotate(count=Count("genre")).order_by("-count")
-        )
+    Усі лічильники обчислюються одним запитом з умовними агрегатами,
+    результат кешується до наступної зміни бібліотеки користувача.
+    """
+    user = request.user
+    return Response(cached_payload(user.pk, "categories", lambda: category_counts(user)))
 
-        author_stats = (
-            all_books.values("author")
-            .annotate(count=Count("author"))
-            .order_by("-count")[:5]
-        )
 
-        monthly_data = (
-            read_books.filter(endDate__year=current_year)
-            .annotate(month_num=ExtractMonth("endDate"))
-            .values("month_num")
-            .annotate(count=Count("id"))
-            .order_by("month_num")
-        )
+class StatsRangeAPIView(APIView):
+    """API View статистики читання за довільний період із групуванням за інтервалами."""
 
-        month_map = {
-            1: "Січень",
-            2: "Лютий",
-            3: "Березень",
-            4: "Квітень",
-            5: "Травень",
-            6: "Червень",
-            7: "Липень",
-            8: "Серпень",
-            9: "Вересень",
-            10: "Жовтень",
-            11: "Листопад",
-            12: "Грудень",
-        }
-        monthly_stats = [
-            {"month": month_map.get(item["month_num"]), "count": item["count"]}
-            for item in monthly_data
-        ]
+    permission_classes = [IsAuthenticated]
 
-        last_activity = all_books.order_by("-addedDate")[:5].values(
-            "id", "title", "author", "status", "addedDate"
-        )
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        """Повертає сторінки, час читання, сесії та завершені книги за період.
+
+        Дані беруться зі щоденних зведень `DailyReadingRollup`, тому вартість
+        запиту залежить від кількості днів у періоді, а не від кількості сесій.
+
+        Query Params:
+            from (str): Початок періоду (YYYY-MM-DD), за замовчуванням 1 січня.
+            to (str): Кінець періоду (YYYY-MM-DD), за замовчуванням сьогодні
+                (у часовому поясі користувача).
+            bucket (str): 'day', 'week', 'month' (за замовчуванням) або 'year'.
+
+        Returns:
+            Response: JSON з інтервалами `results` та підсумками `totals`.
+        """
+        today = user_today(request.user.pk)
+        bucket = request.query_params.get("bucket", "month")
+        try:
+            start = datetime.date.fromisoformat(
+                request.query_params.get("from") or today.replace(month=1, day=1).isoformat()
+            )
+            end = datetime.date.fromisoformat(
+                request.query_params.get("to") or today.isoformat()
+            )
+        except ValueError:
+            return Response(
+                {"error": "Дати мають бути у форматі YYYY-MM-DD."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        if bucket not in BUCKETS:
+            return Response(
+                {"error": f"Параметр bucket має бути одним із: {', '.join(BUCKETS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if start > end:
+            return Response(
+                {"error": "Початок періоду не може бути пізніше за його кінець."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if bucket_count(start, end, bucket) > MAX_BUCKETS:
+            return Response(
+                {"error": f"Період містить більше ніж {MAX_BUCKETS} інтервалів."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        return Response(range_stats(request.user.pk, start, end, bucket))
+
+
+class HeatmapAPIView(APIView):
+    """API View теплової карти активності читання за останній рік."""
+
+    permission_classes = [IsAuthenticated]
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        """Повертає активність за кожен із останніх 365 днів у часовому поясі користувача.
+
+        Дані читаються одним запитом зі щоденних зведень `DailyReadingRollup`.
+
+        Returns:
+            Response: JSON з межами періоду та списком днів.
+        """
+        return Response(heatmap(request.user.pk))
+
+
+class StreakAPIView(APIView):
+    """API View серій читання (днів поспіль із сесіями)."""
+
+    permission_classes = [IsAuthenticated]
+
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        """Повертає поточну та найдовшу серію читання користувача.
+
+        Returns:
+            Response: JSON з ключами `current`, `longest` та `lastActiveDay`.
+        """
+        return Response(streaks(request.user.pk))
+
+
+class SyncAPIView(APIView):
+    """API View дельта-синхронізації бібліотеки для клієнтів із локальним кешем."""
+
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, *args, **kwargs):
+        """Повертає об'єкти, змінені або видалені після маркера `since`.
+
+        Query Params:
+            since (str, optional): Маркер `token` з попередньої відповіді.
+                Без нього повертається повний знімок бібліотеки.
+
+        Returns:
+            Response: JSON з ключами `token`, `full`, `books`, `sessions`,
+            `notes`, `quotes`, `cycles` та `deleted`. Якщо `full` дорівнює
+            `true`, клієнт має замінити локальну копію повністю.
+        """
+        since = None
+        if request.query_params.get("since"):
+            try:
+                since = read_token(request.user.pk, request.query_params["since"])
+            except ValueError:
+                return Response(
+                    {"error": "Недійсний маркер синхронізації."},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+        return Response(changes_since(request.user.pk, since))
+
+
+class IgnoreFormatContentNegotiation(BaseContentNegotiation):
+    """Узгодження вмісту без урахування `?format=` (параметр має інше значення)."""
+
+    def select_parser(self, request, parsers):
+        return parsers[0]
+
+    def select_renderer(self, request, renderers, format_suffix=None):
+        return renderers[0], renderers[0].media_type
+
+
+class LibraryExportAPIView(APIView):
+    """API View потокового експорту всієї бібліотеки (CSV, JSON lines, ZIP)."""
+
+    permission_classes = [IsAuthenticated]
+    content_negotiation_class = IgnoreFormatContentNegotiation
+
+    def get(self, request, *args, **kwargs):
+        """Віддає бібліотеку потоком (`tracker.exports`).
+
+        Query Params:
+            format (str): `csv` (книги), `jsonl` (книги з вкладеними сесіями,
+                циклами, нотатками й цитатами) або `zip` (CSV усіх наборів даних).
+                За замовчуванням `jsonl`.
+
+        Returns:
+            StreamingHttpResponse: Файл експорту (`Content-Disposition: attachment`)
+            або HTTP 400 для невідомого формату.
+        """
+        export_format = request.query_params.get("format", "jsonl")
+        if export_format not in EXPORTERS:
+            return Response(
+                {"error": f"Формат має бути одним із: {', '.join(EXPORTERS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        chunks = EXPORTERS[export_format](request.user.pk)
+        if isinstance(request._request, ASGIRequest):
+            # Синхронний ітератор Django під ASGI спершу зібрав би в пам'яті цілком
+            chunks = async_chunks(chunks)
+        response = StreamingHttpResponse(chunks, content_type=EXPORT_CONTENT_TYPES[export_format])
+        filename = f"library-{timezone.localdate().isoformat()}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        logger.info(f"Export ({export_format}) started for user {request.user.pk}")
+        return response
 
-        books_with_sessions_count = (
-            all_books.annotate(total_session_duration=Sum("reading_sessions__duration"))
-            .filter(total_session_duration__isnull=False)
-            .count()
-        )
 
-        avg_time_per_book = (
-            time_stats["total_duration_minutes"] / books_with_sessions_count
-            if books_with_sessions_count > 0
-            else 0
+class LibraryImportAPIView(APIView):
+    """API View імпорту бібліотеки з файлу (CSV, експорт Goodreads, JSON lines)."""
+
+    permission_classes = [IsAuthenticated]
+    parser_classes = [MultiPartParser]
+
+    def post(self, request, *args, **kwargs):
+        """Потоково імпортує книги з завантаженого файлу (`tracker.imports`).
+
+        Request Body (multipart):
+            file (File): Файл імпорту.
+            format (str, optional): `csv`, `goodreads` або `jsonl`. За
+                замовчуванням визначається за розширенням файлу; експорт
+                Goodreads розпізнається за заголовками CSV.
+
+        Returns:
+            Response: HTTP 200 зі звітом (`processed`, `created`, `skipped`,
+            `errors`, `seconds`, `rowsPerSecond`) або HTTP 400, якщо файл
+            відсутній чи не розбирається (зі звітом про вже імпортовані рядки).
+        """
+        upload = request.FILES.get("file")
+        if upload is None:
+            return Response(
+                {"error": "Файл імпорту (file) є обов'язковим."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        import_format = request.data.get("format") or (
+            "jsonl" if upload.name.lower().endswith((".jsonl", ".ndjson")) else "csv"
         )
+        if import_format not in IMPORT_FORMATS:
+            return Response(
+                {"error": f"Формат має бути одним із: {', '.join(IMPORT_FORMATS)}."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
 
-        logger.debug(f"Stats successfully calculated for user {user.id}")
+        progress = []
+        try:
+            report = import_library(request.user, upload.file, import_format, on_progress=progress.append)
+        except (UnicodeDecodeError, csv.Error) as exc:
+            logger.warning(f"Import failed for user {request.user.pk}: {exc}")
+            payload = {"error": "Файл не вдалося розібрати (очікується UTF-8)."}
+            if progress:
+                payload["report"] = progress[-1].as_dict()
+            return Response(payload, status=status.HTTP_400_BAD_REQUEST)
 
-        return Response(
-            {
-                "yearlyGoal": user.yearly_goal,
-                "booksReadThisYear": read_this_year_count,
-                "progressToGoal": (
-                    min(100, int((read_this_year_count / user.yearly_goal) * 100))
-                    if user.yearly_goal > 0
-                    else 0
-                ),
-                # Загальна статистика
-                "totalBooks": all_books.count(),
-                "readCount": read_books.count(),
-                "averageRating": round(page_stats["avg_rating"], 1),
-                "genresCount": len(genre_stats),
-                "totalPagesRead": page_stats["total_pages_read"],
-                "averagePagesPerBook": round(page_stats["avg_pages_per_book"], 0),
-                "reading": all_books.filter(status="reading").count(),
-                "want": all_books.filter(status="want-to-read").count(),
-                "fav": all_books.filter(isFavorite=True).count(),
-                "customCount": all_books.filter(isCustom=True).count(),
-                # Статистика часу
-                "totalReadingTime": time_stats["total_duration_minutes"],
-                "totalReadingSessions": time_stats["total_sessions"],
-                "averageSessionDuration": round(time_stats["avg_duration_session"], 0),
-                "averageTimePerBook": round(avg_time_per_book, 0),
-                # Дані для графіків
-                "genreStats": list(genre_stats),
-                "monthlyStats": monthly_stats,
-                "authorStats": list(author_stats),
-                "lastActivity": list(last_activity),
-            }
+        logger.info(
+            f"Import for user {request.user.pk}: {report.created} books, "
+            f"{report.skipped} skipped, {report.rows_per_second:.0f} rows/s"
         )
+        return Response(report.as_dict())
 
 
-@api_view(["GET"])
-def get_stats(request):
-    """Повертає загальну кількість книг за категоріями для поточного користувача."""
-    user_books = Book.objects.filter(user=request.user)
-    data = {
-        "all": user_books.count(),
-        "reading": user_books.filter(status="reading").count(),
-        "read": user_books.filter(status="read").count(),
-        "want": user_books.filter(status="want-to-read").count(),
-        "fav": user_books.filter(isFavorite=True).count(),
-        'customCount': user_books.filter(isCustom=True).count(),
-    }
-    return Response(data)
+class LibrarySearchAPIView(APIView):
+    """API View повнотекстового пошуку по бібліотеці користувача."""
+
+    permission_classes = [IsAuthenticated]
 
+    @conditional_get
+    def get(self, request, *args, **kwargs):
+        """Шукає слова запиту в описах книг, нотатках, цитатах і нотатках сесій.
+
+        Query Params:
+            q (str): Пошуковий запит (кожне слово шукається як префікс).
+            limit (int): Кількість результатів (за замовчуванням 20, максимум 50).
+
+        Returns:
+            Response: JSON з ключами `query` та `results` (за спаданням
+            релевантності, з фрагментами тексту, де збіги позначено `<mark>`).
+        """
+        query = request.query_params.get("q", "").strip()
+        if not query:
+            return Response(
+                {"error": "Параметр q є обов'язковим."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(MAX_RESULTS, max(1, int(request.query_params.get("limit", 20))))
+        except ValueError:
+            return Response(
+                {"error": "Параметр limit має бути цілим числом."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        return Response({"query": query, "results": search_library(request.user.pk, query, limit)})
 
-class ExternalSearchAPIView(APIView):
+
+class ExternalSearchAPIView(View):
     """
     Проксі-шлюз для інтеграції з Google Books API.
 
@@ -529,9 +1143,39 @@ class ExternalSearchAPIView(APIView):
     2. **Нормалізація**: перетворення складного та надлишкового об'єкта Google Books
        у спрощений формат, що відповідає моделі `Book` застосунку.
     3. **Очищення**: видалення потенційно небезпечних HTML-тегів із зовнішніх анотацій.
+       Відформатовані томи зберігаються у спільному каталозі (`tracker.catalog`),
+       який відповідає на повторні запити без звернення до Google. Наступна
+       сторінка результатів завантажується в кеш наперед.
+    4. **Асинхронність**: представлення асинхронне (звичайне Django `View`, бо
+       `APIView` DRF синхронне), тож під ASGI очікування Google не блокує воркер.
+       Автентифікація — той самий JWT, що й у DRF, але без запиту користувача
+       до БД (`JWTStatelessUserAuthentication`, `request.user` — `TokenUser`).
     """
 
-    permission_classes = [IsAuthenticated]
+    authentication_class = JWTStatelessUserAuthentication
+
+    async def dispatch(self, request, *args, **kwargs):
+        """Автентифікує запит JWT-токеном (як `IsAuthenticated` у DRF) і передає обробнику."""
+        authenticator = self.authentication_class()
+        headers = {"WWW-Authenticate": authenticator.authenticate_header(request)}
+        try:
+            # Лише перевірка підпису й строку дії токена, без запиту до БД
+            result = authenticator.authenticate(request)
+        except AuthenticationFailed as exc:
+            # Формат відповіді як в обробнику винятків DRF
+            data = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+            return JsonResponse(data, status=status.HTTP_401_UNAUTHORIZED, headers=headers)
+        if result is None:
+            return JsonResponse(
+                {"detail": str(NotAuthenticated.default_detail)}, status=status.HTTP_401_UNAUTHORIZED, headers=headers
+            )
+        request.user = result[0]
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        finally:
+            if request_scoped_loop():
+                # Цикл запиту під WSGI закривається — разом із ним і пул з'єднань
+                await google_books.aclose()
 
     def _clean_html(self, raw_html):
         """Видаляє HTML-теги з переданого тексту за допомогою регулярних виразів.
@@ -589,6 +1233,7 @@ class ExternalSearchAPIView(APIView):
 
         return {
             "id": item["id"],  # Використовується Google ID як зовнішній ID
+            "isbn": isbn_from_identifiers(volume_info.get("industryIdentifiers")),
             "title": title,
             "author": ", ".join(authors),
             "genre": genre,
@@ -603,36 +1248,56 @@ class ExternalSearchAPIView(APIView):
             "isFavorite": False,
         }
 
-    def get(self, request, *args, **kwargs):
+    async def _fetch_google_books(self, params):
+        """Виконує запит до Google Books API та форматує знайдені книги.
+
+        Args:
+            params (dict): Параметри запиту (`q`, `startIndex`, `key` тощо).
+
+        Returns:
+            list[dict]: Відформатовані книги (див. `_format_google_book`).
+
+        Raises:
+            httpx.HTTPError: Помилка мережі, статус 4xx/5xx або розімкнений
+                запобіжник.
+        """
+        # Спільний клієнт: пул з'єднань, повтори та запобіжник
+        data = await google_books.search(params=params)
+
+        items = data.get("items", [])
+        logger.info(f"Google API returned {len(items)} results for query '{params['q']}'")
+        return [self._format_google_book(item) for item in items]
+
+    async def get(self, request, *args, **kwargs):
         """Обробляє GET-запит для пошуку книг.
 
         Формує запит до Google Books API на основі переданих параметрів,
         отримує результати, форматує їх та повертає на клієнт.
 
         Args:
-            request (Request): Об'єкт запиту DRF. Очікує query-параметри:
+            request (HttpRequest): Об'єкт запиту Django. Очікує query-параметри:
                 - q (str): Рядок пошуку.
                 - filter (str, optional): Критерій пошуку ('title', 'author', 'genre', 'all').
                 - `startIndex`: зміщення для пагінації.
 
         Returns:
-            Response: Відповідь зі статусом 200 та списком відформатованих книг
+            JsonResponse: Відповідь зі статусом 200 та списком відформатованих книг
                       або статусом 500/503 у разі помилки конфігурації/сервера.
 
         """
         if not settings.GOOGLE_BOOKS_API_KEY:
             logger.critical("Google Books API Key is missing in settings.py")
-            return Response(
+            return JsonResponse(
                 {"error": "Ключ Google Books API не налаштований у settings.py."},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR,
             )
 
-        query = request.query_params.get("q", "")
-        search_filter = request.query_params.get("filter", "all")
-        start_index = request.query_params.get("startIndex", 0)
+        query = request.GET.get("q", "").strip()
+        search_filter = request.GET.get("filter", "all")
+        start_index = request.GET.get("startIndex", 0)
 
         if not query:
-            return Response({"results": []})
+            return JsonResponse({"results": []})
 
         logger.info(
             f"Searching for '{query}' via Google Books API (Filter: {search_filter})"
@@ -662,31 +1327,57 @@ class ExternalSearchAPIView(APIView):
             "langRestrict": "uk|en",
         }
 
-        GOOGLE_API_URL = "https://www.googleapis.com/books/v1/volumes"
-
+        key = make_key(full_query, start_index, params["langRestrict"])
         try:
-            response = requests.get(GOOGLE_API_URL, params=params, timeout=5)
-            response.raise_for_status()
-            data = response.json()
-
-            count = len(data.get("items", []))
-            logger.info(f"Google API returned {count} results for query '{query}'")
-
-            if "items" in data:
-                formatted_results = [
-                    self._format_google_book(item) for item in data["items"]
-                ]
-                return Response({"results": formatted_results})
-            else:
-                return Response({"results": []})
-
-        except requests.exceptions.RequestException as e:
+            # Спільний кеш результатів: повторні запити не звертаються до Google,
+            # одночасні однакові запити чекають на одну відповідь. Промахи кешу
+            # спершу читають локальний каталог
+            formatted_results, cache_state = await search_cache.get_or_fetch(
+                key, lambda: local_catalog.search(key, lambda: self._fetch_google_books(params))
+            )
+        except httpx.HTTPError as e:
             logger.error(f"Google Books API Request failed: {str(e)}", exc_info=True)
-            return Response(
+            return JsonResponse(
                 {"error": "Не вдалося підключитися до зовнішнього API пошуку."},
                 status=status.HTTP_503_SERVICE_UNAVAILABLE,
             )
 
+        # Сторінка майже повна — імовірно, користувач попросить наступну.
+        # Каталог може об'єднати дублікати за ISBN, тож повна сторінка Google
+        # буває коротшою за `maxResults`
+        if len(formatted_results) >= params["maxResults"] // 2:
+            next_params = {**params, "startIndex": key[1] + params["maxResults"]}
+            next_key = make_key(full_query, next_params["startIndex"], params["langRestrict"])
+            search_cache.prefetch(
+                next_key, lambda: local_catalog.search(next_key, lambda: self._fetch_google_books(next_params))
+            )
+
+        return JsonResponse({"results": formatted_results}, headers={"X-Cache": cache_state})
+
+
+class ExternalSearchCacheAPIView(APIView):
+    """Стан кешу зовнішнього пошуку (лише для адміністраторів).
+
+    GET повертає лічильники `hits`, `misses`, `stale`, `refreshes`,
+    `refreshErrors`, `evictions`, попередніх завантажень (`prefetches`,
+    `prefetchHits`, `prefetchErrors`, `prefetchSkipped`), розмір кешу та
+    частки влучань для поточного процесу, `upstream` — лічильники клієнта Google Books і стан
+    запобіжника, а також `catalog` — лічильники й розмір локального каталогу;
+    DELETE очищає кеш і лічильники (томи каталогу зберігаються).
+    """
+
+    permission_classes = [IsAdminUser]
+
+    def get(self, request, *args, **kwargs):
+        return Response(
+            {**search_cache.stats(), "upstream": google_books.stats(), "catalog": local_catalog.stats()}
+        )
+
+    def delete(self, request, *args, **kwargs):
+        search_cache.clear()
+        local_catalog.clear()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
 
 class FeedbackAPIView(APIView):
     """
@@ -228,7 +228,8 @@ export const apiBooks = {
    * Використовується для відображення книг за статусами.
    * @async
    * @param {string|null} url - Повна адреса (для пагінації).
-   * @param {Object} params - Параметри фільтрації (status, sort).
+   * @param {Object} params - Параметри фільтрації (status, sort) та представлення
+   *   (fields, expand — вкладені колекції, яких немає в компактному списку).
    * @returns {Promise<Object>} Результати пошуку та мета-дані пагінації.
    */
   async getAllBooks(url = null, params = {}) {
@@ -307,6 +308,98 @@ export const apiBooks = {
     return response.data;
   },
 
+  /**
+   * Дельта-синхронізація локальної копії бібліотеки.
+   * Повертає лише книги, сесії, нотатки, цитати та цикли, змінені після
+   * маркера, і список видалених об'єктів (`deleted`).
+   * @async
+   * @param {string|null} [since=null] - Маркер `token` з попередньої відповіді
+   *   (без нього — повний знімок).
+   * @returns {Promise<Object>} Зміни, видалення та новий маркер `token`.
+   */
+  async sync(since = null) {
+    const response = await API.get("/sync/", { params: since ? { since } : {} });
+    return response.data;
+  },
+
+  /**
+   * Імпорт бібліотеки з файлу (CSV, експорт Goodreads або JSON lines).
+   * @async
+   * @param {File} file - Файл імпорту.
+   * @param {string} [format] - `csv`, `goodreads` або `jsonl` (за замовчуванням — за розширенням).
+   * @returns {Promise<Object>} Звіт: `processed`, `created`, `skipped`, `errors`, `rowsPerSecond`.
+   */
+  async importLibrary(file, format) {
+    const formData = new FormData();
+    formData.append("file", file);
+    if (format) formData.append("format", format);
+    const response = await API.post("/import/", formData, {
+      headers: { "Content-Type": "multipart/form-data" },
+    });
+    return response.data;
+  },
+
+  /**
+   * Пакетне відправлення сесій з офлайн-таймера (безпечне для повторів).
+   * @async
+   * @param {Array<Object>} sessions - Сесії з `key` (унікальний ідентифікатор клієнта), `book`, `date`, `pages_read`, `duration`, `note`.
+   * @returns {Promise<Object>} `results` зі статусом кожної сесії (`created`, `duplicate`, `not_found`, `invalid`).
+   */
+  async uploadSessions(sessions) {
+    const response = await API.post("/sessions/batch/", { sessions });
+    return response.data;
+  },
+
+  /**
+   * Часовий ряд сесій читання (для графіків темпу).
+   * @async
+   * @param {Object} [params] - `bucket` (`hour`, `day`, `week`), `from`, `to`, `points`.
+   * @param {number|string} [bookId] - ID книги; без нього — усі сесії користувача.
+   * @returns {Promise<Object>} Інтервали `results` та підсумки `totals`.
+   */
+  async getSessionSeries(params = {}, bookId = null) {
+    const url = bookId ? `/books/${bookId}/sessions/series/` : "/sessions/series/";
+    const response = await API.get(url, { params });
+    return response.data;
+  },
+
+  /**
+   * Експорт усієї бібліотеки файлом.
+   * @async
+   * @param {string} [format="jsonl"] - `jsonl`, `csv` або `zip`.
+   * @returns {Promise<Blob>} Вміст файлу експорту.
+   */
+  async exportLibrary(format = "jsonl") {
+    const response = await API.get("/export/", { params: { format }, responseType: "blob" });
+    return response.data;
+  },
+
+  /**
+   * Швидке оновлення поточної сторінки книги.
+   * @async
+   * @param {number|string} id - ID книги.
+   * @param {number} currentPage - Нова поточна сторінка.
+   * @returns {Promise<Object>} `id`, `currentPage`, `progress`, `status` та `pagesRead`.
+   */
+  async updateProgress(id, currentPage) {
+    const response = await API.post(`/books/${id}/progress/`, { currentPage });
+    return response.data;
+  },
+
+  /**
+   * Масове створення, оновлення та видалення книг однією транзакцією.
+   * @async
+   * @param {Object} operations - Операції пакета.
+   * @param {Array<Object>} [operations.create=[]] - Дані нових книг.
+   * @param {Array<Object>} [operations.update=[]] - Зміни книг (з полем `id`).
+   * @param {Array<number>} [operations.delete=[]] - ID книг для видалення.
+   * @returns {Promise<Object>} Результати для кожного елемента (`results`).
+   */
+  async bulk({ create = [], update = [], delete: remove = [] }) {
+    const response = await API.post("/books/bulk/", { create, update, delete: remove });
+    return response.data;
+  },
+
   /**
    * Фіксація сесії читання для книги.
    * @async
@@ -79,7 +79,10 @@ const AccountPage = () => {
       const [userData, statsData, booksRes] = await Promise.all([
         apiUser.getProfile(),
         apiBooks.getStats(),
-        apiBooks.getAllBooks(null, { limit: 1000 }) 
+        apiBooks.getAllBooks(null, {
+          limit: 1000,
+          expand: "readingSessions,book_notes,book_quotes",
+        })
       ]);
 
       const mappedProfile = {
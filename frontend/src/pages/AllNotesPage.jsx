@@ -36,8 +36,8 @@ const AllNotesPage = () => {
   /** @type {[Array, Function]} Список поточних нотаток на екрані */
   const [notes, setNotes] = useState([]);
 
-  /** @type {[number, Function]} Загальна кількість нотаток у базі (для лічильника) */
-  const [totalNotes, setTotalNotes] = useState(0);
+  /** @type {[number|null, Function]} Загальна кількість нотаток (лише в посторінковому режимі API) */
+  const [totalNotes, setTotalNotes] = useState(null);
 
   /** @type {[boolean, Function]} Стан первинного завантаження */
   const [isLoading, setIsLoading] = useState(true);
@@ -216,9 +216,12 @@ const AllNotesPage = () => {
           </span>
           <span className="text-2xl font-black text-primary leading-none">
             {notes.length}{" "}
-            <span className="text-sm font-medium opacity-60">
-              / {totalNotes}
-            </span>
+            {/* Курсорна пагінація не повертає count — показуємо лише завантажені */}
+            {totalNotes !== null && (
+              <span className="text-sm font-medium opacity-60">
+                / {totalNotes}
+              </span>
+            )}
           </span>
         </div>
       </div>
@@ -35,8 +35,8 @@ const AllQuotesPage = () => {
   /** @type {[Array, Function]} Список поточних цитат на екрані */
   const [quotes, setQuotes] = useState([]);
 
-  /** @type {[number, Function]} Загальна кількість цитат у базі (для лічильника) */
-  const [totalQuotes, setTotalQuotes] = useState(0);
+  /** @type {[number|null, Function]} Загальна кількість цитат (лише в посторінковому режимі API) */
+  const [totalQuotes, setTotalQuotes] = useState(null);
 
   /** @type {[boolean, Function]} Стан первинного завантаження сторінки */
   const [isLoading, setIsLoading] = useState(true);
@@ -221,9 +221,12 @@ const AllQuotesPage = () => {
           </span>
           <span className="text-2xl font-black text-primary leading-none">
             {quotes.length}{" "}
-            <span className="text-sm font-medium opacity-60">
-              / {totalQuotes}
-            </span>
+            {/* Курсорна пагінація не повертає count — показуємо лише завантажені */}
+            {totalQuotes !== null && (
+              <span className="text-sm font-medium opacity-60">
+                / {totalQuotes}
+              </span>
+            )}
           </span>
         </div>
       </div>
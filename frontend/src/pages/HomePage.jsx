@@ -80,7 +80,8 @@ export default function HomePage() {
       try {
         setIsLoading(true);
 
-        const params = { page: page }; // Передаємо сторінку на бекенд
+        // Передаємо сторінку на бекенд; нотатки потрібні для редагування з картки
+        const params = { page: page, expand: "book_notes" };
         
         if (currentFilter === "favorite") params.isFavorite = "true";
         else if (currentFilter === "custom") params.isCustom = "true";
@@ -283,6 +283,7 @@ export default function SearchPage() {
         description: bookToConfirm.description,
         externalRating: bookToConfirm.externalRating, 
         ratingsCount: bookToConfirm.ratingsCount,
+        catalogId: bookToConfirm.catalogId,
         isCustom: false 
       });
       